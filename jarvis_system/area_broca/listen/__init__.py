@@ -1,12 +1,13 @@
 # jarvis_system/area_broca/listen/__init__.py
 import logging
 from .ouvidoBiologico import OuvidoBiologico
+from .configAudio import WHISPER_MODELO
 
 logger = logging.getLogger("BROCA_INIT")
 ears = None
 
 try:
     logger.info("🔧 Instanciando singleton 'ears'...")
-    ears = OuvidoBiologico(model_size="base", device="cpu")
+    ears = OuvidoBiologico(model_size=WHISPER_MODELO, device="cpu")
 except Exception as e:
     logger.error(f"❌ Erro ao instanciar OuvidoBiologico: {e}")
\ No newline at end of file
@@ -0,0 +1,125 @@
+# jarvis_system/area_broca/listen/anelAudio.py
+import threading
+from typing import Optional
+import numpy as np
+
+class AnelBlocos:
+    """
+    Anel de blocos pré-alocado: (n_blocos, tamanho_bloco[, canais]) alocado uma única vez.
+
+    Dois usos:
+    - Handoff SPSC (escrever/ler): um produtor (callback do driver) e um consumidor (VAD).
+      O produtor só avança '_escrita' e o consumidor só avança '_leitura' (contadores monotônicos),
+      então nenhum dos dois precisa de lock. Cheio = o bloco novo é descartado: o produtor nunca
+      mexe no slot que o consumidor pode estar lendo.
+    - Reciclagem (reservar): um único dono pega o próximo slot, sobrescrevendo o mais antigo.
+      As views devolvidas valem por n_blocos reservas (ver SegmentadorVAD).
+    """
+    def __init__(self, n_blocos: int, tamanho_bloco: int, canais: Optional[int] = None, dtype=np.float32):
+        forma = (n_blocos, tamanho_bloco) if canais is None else (n_blocos, tamanho_bloco, canais)
+        self._dados = np.zeros(forma, dtype=dtype)
+        self._tamanhos = np.zeros(n_blocos, dtype=np.int64)
+        self.n_blocos = n_blocos
+        self.tamanho_bloco = tamanho_bloco
+        self._escrita = 0
+        self._leitura = 0
+        self._segurando = False
+        self._pular_ate = None
+        self._sinal = threading.Event()
+        self.descartados = 0
+
+    # --- Produtor ---
+    def escrever(self, bloco: np.ndarray) -> bool:
+        """Copia o bloco para o próximo slot livre. False se o anel estiver cheio ou o bloco não couber."""
+        n = len(bloco)
+        if n > self.tamanho_bloco or self._escrita - self._leitura >= self.n_blocos:
+            self.descartados += 1
+            return False
+        slot = self._escrita % self.n_blocos
+        self._dados[slot, :n] = bloco
+        self._tamanhos[slot] = n
+        self._escrita += 1  # Publica só depois de o dado estar no slot
+        self._sinal.set()
+        return True
+
+    # --- Consumidor ---
+    def ler(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        View do próximo bloco (sem cópia), ou None se nada chegou no timeout.
+        A view vale até a próxima chamada de ler(): só então o slot volta para o produtor.
+        """
+        if self._segurando:
+            self._leitura += 1
+            self._segurando = False
+        pular, self._pular_ate = self._pular_ate, None
+        if pular is not None:
+            self._leitura = max(self._leitura, pular)
+
+        if self._escrita == self._leitura:
+            self._sinal.clear()
+            # Reconfere depois do clear: o produtor pode ter escrito entre a checagem e o clear
+            if self._escrita == self._leitura:
+                self._sinal.wait(timeout)
+            if self._escrita == self._leitura:
+                return None  # Timeout ou acordar() sem dado novo
+
+        slot = self._leitura % self.n_blocos
+        self._segurando = True
+        return self._dados[slot, :self._tamanhos[slot]]
+
+    def descartar_pendentes(self):
+        """Pode ser chamado de outra thread: o consumidor pula tudo o que já foi escrito."""
+        self._pular_ate = self._escrita
+
+    def acordar(self):
+        """Destrava um ler() bloqueado (encerramento)."""
+        self._sinal.set()
+
+    def __len__(self) -> int:
+        return self._escrita - self._leitura - int(self._segurando)
+
+    # --- Reciclagem (dono único) ---
+    @property
+    def proxima_reserva(self) -> int:
+        """Índice (monotônico) da próxima reserva; o slot da reserva r volta a ser usado em r + n_blocos."""
+        return self._escrita
+
+    def reservar(self, n: int) -> np.ndarray:
+        """View gravável do próximo slot, já com n amostras."""
+        slot = self._escrita % self.n_blocos
+        self._escrita += 1
+        return self._dados[slot, :n]
+
+class BufferFrase:
+    """
+    Áudio contíguo de uma frase (float32), reaproveitado de frase em frase.
+    Substitui lista de blocos + np.concatenate: anexar copia para o fim e visao() não copia.
+    Só cresce (dobrando) se uma frase passar da capacidade; a memória fica a da maior frase.
+    """
+    def __init__(self, capacidade: int):
+        self._dados = np.zeros(capacidade, dtype=np.float32)
+        self._n = 0
+
+    def anexar(self, chunk: np.ndarray):
+        fim = self._n + len(chunk)
+        if fim > len(self._dados):
+            maior = np.zeros(max(fim, 2 * len(self._dados)), dtype=np.float32)
+            maior[:self._n] = self._dados[:self._n]
+            self._dados = maior
+        self._dados[self._n:fim] = chunk
+        self._n = fim
+
+    def visao(self, inicio: int = 0, fim: Optional[int] = None) -> np.ndarray:
+        """View (sem cópia) do trecho; vale até o próximo limpar()/anexar()."""
+        fim = self._n if fim is None else min(fim, self._n)
+        return self._dados[inicio:fim]
+
+    def limpar(self):
+        self._n = 0
+
+    @property
+    def capacidade(self) -> int:
+        return len(self._dados)
+
+    def __len__(self) -> int:
+        return self._n
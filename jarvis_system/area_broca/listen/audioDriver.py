@@ -1,6 +1,17 @@
 # jarvis_system/area_broca/listen/audioDriver.py
-import sounddevice as sd
 import logging
+import threading
+import time
+import numpy as np
+
+from .audioUtils import ler_wav, em_blocos
+
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except (ImportError, OSError):
+    # OSError: PortAudio ausente no sistema (ex: servidores de CI)
+    SOUNDDEVICE_AVAILABLE = False
 
 class AudioDriver:
     def __init__(self, sample_rate, block_size, channels):
@@ -15,6 +26,9 @@ class AudioDriver:
         if self.stream is not None:
             return
 
+        if not SOUNDDEVICE_AVAILABLE:
+            raise RuntimeError("sounddevice/PortAudio indisponível: microfone não pode ser aberto.")
+
         try:
             self.stream = sd.InputStream(
                 samplerate=self.sample_rate,
@@ -42,4 +56,64 @@ class AudioDriver:
                 self.logger.warning(f"Aviso ao fechar stream de áudio: {e}")
             finally:
                 self.stream = None
-                self.logger.info("Stream de áudio cortado.")
\ No newline at end of file
+                self.logger.info("Stream de áudio cortado.")
+
+class FileAudioDriver:
+    """
+    Driver falso com a mesma interface do AudioDriver: lê um WAV e entrega os
+    blocos ao callback (int16, shape (frames, canais)) numa thread própria.
+    Usado em testes determinísticos do pipeline de escuta.
+    - tempo_real=True respeita a cadência do microfone (block_size / sample_rate).
+    - silencio_final_s acrescenta silêncio no fim para o VAD fechar a frase.
+    """
+    def __init__(self, caminho_wav, sample_rate, block_size, channels=1,
+                 tempo_real=False, silencio_final_s=0.0):
+        self.logger = logging.getLogger("BROCA_DRIVER")
+        self.caminho_wav = caminho_wav
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.channels = channels
+        self.tempo_real = tempo_real
+        self.silencio_final_s = silencio_final_s
+        self.terminou = threading.Event()
+        self._parar = threading.Event()
+        self._thread = None
+
+    def start_stream(self, callback_function):
+        if self._thread is not None:
+            return
+
+        audio = ler_wav(self.caminho_wav, self.sample_rate)
+        if self.silencio_final_s:
+            audio = np.concatenate([audio, np.zeros(int(self.silencio_final_s * self.sample_rate), dtype=np.float32)])
+        audio_int16 = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+        self._parar.clear()
+        self.terminou.clear()
+        self._thread = threading.Thread(
+            target=self._tocar, args=(audio_int16, callback_function),
+            name="BrocaFileDriver", daemon=True
+        )
+        self._thread.start()
+        self.logger.info(f"Stream de áudio simulado a partir de '{self.caminho_wav}'.")
+
+    def _tocar(self, audio_int16, callback_function):
+        intervalo = self.block_size / self.sample_rate
+        try:
+            for bloco in em_blocos(audio_int16, self.block_size):
+                if self._parar.is_set():
+                    break
+                if len(bloco) < self.block_size:
+                    bloco = np.pad(bloco, (0, self.block_size - len(bloco)))
+                indata = np.repeat(bloco.reshape(-1, 1), self.channels, axis=1)
+                callback_function(indata, self.block_size, None, None)
+                if self.tempo_real:
+                    time.sleep(intervalo)
+        finally:
+            self.terminou.set()
+
+    def stop_stream(self):
+        self._parar.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
@@ -0,0 +1,36 @@
+# jarvis_system/area_broca/listen/audioUtils.py
+import wave
+import numpy as np
+
+from .configAudio import SAMPLE_RATE
+
+def ler_wav(caminho: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Lê um WAV PCM 16-bit (fixtures de teste/benchmark) como float32 mono em [-1, 1].
+    Não reamostra: o arquivo precisa estar na mesma taxa do pipeline.
+    """
+    with wave.open(caminho, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{caminho}: apenas PCM 16-bit é suportado.")
+        if wav.getframerate() != sample_rate:
+            raise ValueError(f"{caminho}: taxa {wav.getframerate()}Hz (esperado {sample_rate}Hz).")
+        canais = wav.getnchannels()
+        dados = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+
+    if canais > 1:
+        dados = dados.reshape(-1, canais).mean(axis=1).astype(np.int16)
+    return dados.astype(np.float32) / 32768.0
+
+def gravar_wav(caminho: str, audio_float: np.ndarray, sample_rate: int = SAMPLE_RATE):
+    """Grava float32 mono em [-1, 1] como WAV PCM 16-bit (gera fixtures)."""
+    pcm = (np.clip(audio_float, -1.0, 1.0) * 32767).astype(np.int16)
+    with wave.open(caminho, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+
+def em_blocos(audio: np.ndarray, tamanho_bloco: int):
+    """Fatia o áudio em blocos do tamanho do driver (o último pode ser menor)."""
+    for inicio in range(0, len(audio), tamanho_bloco):
+        yield audio[inicio:inicio + tamanho_bloco]
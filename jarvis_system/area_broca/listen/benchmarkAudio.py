@@ -0,0 +1,196 @@
+# jarvis_system/area_broca/listen/benchmarkAudio.py
+"""
+Benchmark offline do pipeline de escuta sobre WAVs gravados (16kHz, PCM 16-bit).
+
+    python -m jarvis_system.area_broca.listen.benchmarkAudio vad sala.wav --fala 0.5-2.1 4.0-5.3
+    python -m jarvis_system.area_broca.listen.benchmarkAudio vad gravacoes/*.wav --backend legado espectral
+    python -m jarvis_system.area_broca.listen.benchmarkAudio kws --com jarvis_*.wav --sem conversa_*.wav
+    python -m jarvis_system.area_broca.listen.benchmarkAudio stt comandos/*.wav --perfil preciso auto
+
+Sem --fala, os trechos de fala vêm de um JSON ao lado do WAV: sala.json -> {"fala": [[0.5, 2.1], ...]}.
+No kws, cada WAV é uma frase já cortada pelo VAD; os modelos vêm de KWS_MODELOS_DIR (ou --modelos).
+No stt, cada WAV é uma frase; "preciso" reproduz a decodificação antiga (beam 5 + VAD interno).
+Sem WAVs, o stt usa os comandos curtos de BENCHMARK_STT_DIR (sintéticos: só tempo, não precisão).
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .configAudio import SAMPLE_RATE, BLOCK_SIZE, WHISPER_MODELO, PERFIS_STT, BENCHMARK_STT_DIR
+from .audioUtils import ler_wav, em_blocos
+from .detectorVoz import criar_detector
+from .espiaoPalavra import EspiaoModelos
+from .pipelineAuditivo import SegmentadorVAD, INICIO_FALA, FIM_FALA, DESCARTADO
+
+Trecho = Tuple[float, float]
+
+SEGMENTADORES: Dict[str, Callable[[], SegmentadorVAD]] = {
+    "legado": SegmentadorVAD,  # Energia com limiar fixo + BLOCOS_PAUSA_FIM
+    "espectral": lambda: SegmentadorVAD(detector=criar_detector("espectral"), blocos_pausa_fim=None),
+    "webrtc": lambda: SegmentadorVAD(detector=criar_detector("webrtc"), blocos_pausa_fim=None),
+}
+
+def avaliar_vad(audio: np.ndarray, trechos_fala: Sequence[Trecho], segmentador: Optional[SegmentadorVAD] = None,
+                block_size: int = BLOCK_SIZE, sample_rate: int = SAMPLE_RATE) -> dict:
+    """
+    Passa o áudio (float32 em [-1, 1]) bloco a bloco pelo segmentador, como o microfone faria.
+    - falsos_disparos: frases entregues ao STT sem sobrepor nenhum trecho de fala anotado.
+    - atraso_fim_ms: do fim real da fala até o VAD fechar a frase (latência de endpoint).
+    """
+    segmentador = segmentador or SegmentadorVAD()
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+    duracao_bloco = block_size / sample_rate
+
+    frases: List[Trecho] = []
+    descartados = 0
+    inicio_frase = None
+    inicio = time.perf_counter()
+    for i, bloco in enumerate(em_blocos(pcm, block_size)):
+        if len(bloco) < block_size:
+            bloco = np.pad(bloco, (0, block_size - len(bloco)))
+        estado = segmentador.processar(bloco.reshape(-1, 1))[2]
+        fim_bloco = (i + 1) * duracao_bloco
+        if estado == INICIO_FALA:
+            inicio_frase = fim_bloco - duracao_bloco
+        elif estado == FIM_FALA:
+            frases.append((inicio_frase, fim_bloco))
+        elif estado == DESCARTADO:
+            descartados += 1
+    processamento = time.perf_counter() - inicio
+    abertas = 1 if segmentador.falando else 0
+    if abertas:
+        # Ruído que nunca deixa o VAD fechar a frase também é um disparo (e o pior deles)
+        frases.append((inicio_frase, len(pcm) / sample_rate))
+
+    def sobrepoe(a: Trecho, b: Trecho) -> bool:
+        return a[0] < b[1] and b[0] < a[1]
+
+    falsos = [f for f in frases if not any(sobrepoe(f, t) for t in trechos_fala)]
+    atrasos, perdidos = [], 0
+    for trecho in trechos_fala:
+        fins = [f[1] for f in frases[:len(frases) - abertas] if sobrepoe(f, trecho) and f[1] >= trecho[1]]
+        if fins:
+            atrasos.append((min(fins) - trecho[1]) * 1000.0)
+        else:
+            perdidos += 1
+
+    return {
+        "frases": len(frases),
+        "falsos_disparos": len(falsos),
+        "taxa_falsos": round(len(falsos) / len(frases), 3) if frases else 0.0,
+        "frase_aberta_no_fim": abertas,
+        "descartados_curtos": descartados,
+        "fala_perdida": perdidos,
+        "atraso_fim_medio_ms": round(float(np.mean(atrasos)), 1) if atrasos else None,
+        "atraso_fim_max_ms": round(float(np.max(atrasos)), 1) if atrasos else None,
+        "tempo_real_x": round(len(audio) / sample_rate / processamento, 1) if processamento else None,
+    }
+
+def avaliar_kws(espiao, com_wake_word: Sequence[np.ndarray], sem_wake_word: Sequence[np.ndarray],
+                sample_rate: int = SAMPLE_RATE) -> dict:
+    """
+    Frases com e sem a wake word passadas pelo espião (o que ele faria fora da janela de atenção).
+    - aceitas_sem_wake: frases de fundo que ainda iriam para o Whisper (CPU desperdiçada);
+    - economia_audio: fração do áudio de fundo que deixa de ser decodificada.
+    """
+    aceitas_com = [bool(espiao.detectar(a)) for a in com_wake_word]
+    tempos, aceitas_sem = [], []
+    for audio in sem_wake_word:
+        inicio = time.perf_counter()
+        aceitas_sem.append(bool(espiao.detectar(audio)))
+        tempos.append((time.perf_counter() - inicio) * 1000.0)
+    segundos_fundo = sum(len(a) for a in sem_wake_word) / sample_rate
+    segundos_poupados = sum(len(a) for a, aceita in zip(sem_wake_word, aceitas_sem) if not aceita) / sample_rate
+
+    return {
+        "recall": round(sum(aceitas_com) / len(aceitas_com), 3) if aceitas_com else None,
+        "aceitas_sem_wake": sum(aceitas_sem),
+        "taxa_falsos": round(sum(aceitas_sem) / len(aceitas_sem), 3) if aceitas_sem else 0.0,
+        "economia_audio": round(segundos_poupados / segundos_fundo, 3) if segundos_fundo else None,
+        "kws_medio_ms": round(float(np.mean(tempos)), 2) if tempos else None,
+    }
+
+def avaliar_stt(decoder, frases: Sequence[np.ndarray], perfis: Sequence[str], repeticoes: int = 3) -> Dict[str, dict]:
+    """
+    Tempo de decodificação por perfil (o decoder já deve estar aquecido).
+    Cada frase é decodificada 'repeticoes' vezes e o tempo de cada rodada entra na mediana.
+    """
+    resultados = {}
+    for perfil in perfis:
+        tempos, textos, escolhidos = [], [], []
+        for audio in frases:
+            for i in range(repeticoes):
+                inicio = time.perf_counter()
+                texto = decoder.transcribe(audio, perfil=perfil)
+                tempos.append((time.perf_counter() - inicio) * 1000.0)
+                if i == 0:
+                    textos.append(texto)
+                    escolhidos.append(getattr(decoder, "ultimo_perfil", perfil))
+        resultados[perfil] = {
+            "mediana_ms": round(float(np.median(tempos)), 1) if tempos else None,
+            "p90_ms": round(float(np.percentile(tempos, 90)), 1) if tempos else None,
+            "perfis_usados": {p: escolhidos.count(p) for p in sorted(set(escolhidos))},
+            "textos": textos,
+        }
+    return resultados
+
+def _trechos(caminho_wav: str, fala: Optional[List[str]]) -> List[Trecho]:
+    if fala:
+        return [tuple(float(x) for x in t.split("-")) for t in fala]
+    anotacao = os.path.splitext(caminho_wav)[0] + ".json"
+    if not os.path.exists(anotacao):
+        return []  # Sem anotação: todo disparo conta como falso (gravações só de ruído)
+    with open(anotacao, "r", encoding="utf-8") as f:
+        return [tuple(t) for t in json.load(f).get("fala", [])]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de escuta sobre WAVs gravados.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    vad = sub.add_parser("vad", help="Falsos disparos e atraso de fim de fala por backend de VAD.")
+    vad.add_argument("wavs", nargs="+")
+    vad.add_argument("--fala", nargs="*", help="Trechos de fala 'inicio-fim' em segundos (um só WAV).")
+    vad.add_argument("--backend", nargs="+", default=["legado", "espectral"], choices=sorted(SEGMENTADORES))
+    kws = sub.add_parser("kws", help="Recall e falsos aceites do espião de wake word.")
+    kws.add_argument("--com", nargs="+", required=True, help="Frases que começam com a wake word.")
+    kws.add_argument("--sem", nargs="+", required=True, help="Frases de conversa de fundo.")
+    kws.add_argument("--modelos", help="Pasta com as gravações da wake word (padrão: KWS_MODELOS_DIR).")
+    stt = sub.add_parser("stt", help="Mediana do tempo de STT por perfil de decodificação.")
+    stt.add_argument("wavs", nargs="*", help="Padrão: os comandos curtos de BENCHMARK_STT_DIR.")
+    stt.add_argument("--perfil", nargs="+", default=["preciso", "auto"], choices=sorted(PERFIS_STT) + ["auto"])
+    stt.add_argument("--modelo", default=WHISPER_MODELO)
+    stt.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.comando == "kws":
+        espiao = EspiaoModelos.da_pasta(args.modelos) if args.modelos else EspiaoModelos.da_pasta()
+        resultado = avaliar_kws(espiao, [ler_wav(c) for c in args.com], [ler_wav(c) for c in args.sem])
+        print("🔎 " + " | ".join(f"{k}: {v}" for k, v in resultado.items()))
+        return
+
+    if args.comando == "stt":
+        from .whisperTranscriber import WhisperTranscriber
+        args.wavs = args.wavs or sorted(glob.glob(os.path.join(BENCHMARK_STT_DIR, "*.wav")))
+        decoder = WhisperTranscriber(args.modelo, "cpu", aquecer=True)
+        resultados = avaliar_stt(decoder, [ler_wav(c) for c in args.wavs], args.perfil, args.repeticoes)
+        for perfil, resultado in resultados.items():
+            textos = resultado.pop("textos")
+            print(f"⏱️ {perfil:<8} " + " | ".join(f"{k}: {v}" for k, v in resultado.items()))
+            for caminho, texto in zip(args.wavs, textos):
+                print(f"     {os.path.basename(caminho)}: '{texto}'")
+        return
+
+    for caminho in args.wavs:
+        audio = ler_wav(caminho)
+        trechos = _trechos(caminho, args.fala)
+        print(f"\n🎧 {os.path.basename(caminho)} ({len(audio) / SAMPLE_RATE:.1f}s, {len(trechos)} trechos de fala)")
+        for nome in args.backend:
+            resultado = avaliar_vad(audio, trechos, SEGMENTADORES[nome]())
+            print(f"   {nome:<10} " + " | ".join(f"{k}: {v}" for k, v in resultado.items()))
+
+if __name__ == "__main__":
+    main()
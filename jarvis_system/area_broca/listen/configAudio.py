@@ -1,4 +1,7 @@
 # jarvis_system/area_broca/listen/config.py
+import os
+
+from jarvis_system.protocol import WAKE_WORDS
 
 # --- CONSTANTES DE ÁUDIO ---
 SAMPLE_RATE = 16000
@@ -6,4 +9,74 @@ CHANNELS = 1
 BLOCK_SIZE = 4000       # Buffer menor = mais responsivo
 LIMIAR_SILENCIO = 0.010 # Limiar de disparo do VAD
 BLOCOS_PAUSA_FIM = 6    # Blocos de silêncio para considerar fim da frase
-GANHO_MIC = 5.0         # Multiplicador digital de volume
\ No newline at end of file
+GANHO_MIC = 5.0         # Multiplicador digital de volume
+
+# --- STREAMING STT (Hipóteses Parciais) ---
+STREAMING_STT = os.getenv("JARVIS_STT_STREAMING", "0") == "1"
+INTERVALO_PARCIAL_S = 1.0   # A cada quanto áudio novo uma hipótese parcial é decodificada
+JANELA_MAX_PARCIAL_S = 8.0  # Maior trecho não confirmado re-decodificado por parcial
+BEAM_FINAL = 5              # Beam do fechamento (só a cauda não confirmada)
+
+# --- PERFIS DE DECODIFICAÇÃO (Whisper) ---
+# "auto" escolhe pela duração da frase e pela carga da CPU; "rapido"/"normal"/"preciso" fixam um perfil.
+WHISPER_MODELO = os.getenv("JARVIS_WHISPER_MODELO", "base")
+WHISPER_COMPUTE = os.getenv("JARVIS_WHISPER_COMPUTE", "int8")
+WHISPER_PERFIL = os.getenv("JARVIS_STT_PERFIL", "auto")
+WHISPER_AQUECER = os.getenv("JARVIS_STT_AQUECER", "1") == "1"  # Decodifica 1s de silêncio ao carregar
+PERFIS_STT = {
+    # Comandos curtos: o VAD já cortou a frase, então sem VAD interno e sem timestamps
+    "rapido": {"beam_size": 1, "vad_filter": False, "without_timestamps": True},
+    "normal": {"beam_size": 3, "vad_filter": False, "without_timestamps": True},
+    # Ditado longo: pausas internas + beam maior contra alucinação (comportamento antigo)
+    "preciso": {"beam_size": 5, "vad_filter": True, "vad_parameters": {"min_silence_duration_ms": 500}},
+}
+PERFIL_CURTO_MAX_S = 4.0     # Até aqui a frase é tratada como comando ("rapido")
+PERFIL_LONGO_MIN_S = 12.0    # A partir daqui, ditado ("preciso")
+PERFIL_CARGA_ALTA = 0.85     # CPU acima disso (0..1): desce um nível de perfil
+# Frases do benchmark "stt" quando nenhum WAV é passado. São sinais vozeados sintéticos
+# (pulsos glotais + formantes, sem palavras): medem tempo de decodificação e o perfil escolhido,
+# não a precisão. Para precisão, rode o benchmark com gravações reais.
+BENCHMARK_STT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "benchmark")
+
+# --- PIPELINE DE ESCUTA (Captura -> VAD -> STT) ---
+FILA_CAPTURA_MAX = 64   # Anel de blocos crus aguardando o VAD (~16s); cheio = descarta o bloco novo
+FILA_STT_MAX = 128      # Mensagens aguardando o STT (~32s de fala)
+# Medidor de nível: janelas de NIVEL_INTERVALO_S publicadas fora da thread do VAD
+NIVEL_INTERVALO_S = 0.5
+NIVEL_CONSOLE = os.getenv("JARVIS_MEDIDOR_CONSOLE", "auto")  # auto = só se stdout for um terminal
+FRASE_CAPACIDADE_S = 30.0  # Buffer de frase pré-alocado no STT (cresce só se uma frase passar disso)
+STT_EM_PROCESSO = os.getenv("JARVIS_STT_PROCESSO", "0") == "1"  # Decodifica fora do GIL do processo principal
+
+# --- VAD (Detecção de Voz) ---
+# "energia" (limiar fixo, legado), "espectral" (piso de ruído adaptativo + forma do espectro)
+# ou "webrtc" (modelo GMM do WebRTC, pacote opcional 'webrtcvad'; cai no espectral se ausente).
+VAD_BACKEND = os.getenv("JARVIS_VAD", "espectral")
+VAD_QUADRO = 400             # Amostras por quadro de análise (25ms): 10 quadros por bloco
+VAD_QUADROS_MIN = 3          # Quadros com voz para o bloco contar como fala (~75ms, ignora estalos)
+VAD_RMS_MIN = 0.005          # Piso absoluto (já com GANHO_MIC)
+VAD_SNR_MIN = 4.0            # Energia do quadro / piso de ruído aprendido (~6 dB)
+VAD_RAZAO_BANDA_MIN = 0.4    # Fração da energia entre 250 e 3500 Hz (ventilador/zumbido ficam abaixo)
+VAD_PLANURA_MAX = 0.35       # Planura espectral: ruído branco ~0.56, voz (harmônicos) bem menos
+VAD_WEBRTC_MODO = 2          # Agressividade do webrtcvad (0 a 3)
+VAD_PRE_ROLL_S = 0.5         # Áudio anterior ao disparo enviado junto (não corta a 1ª sílaba)
+VAD_FALA_MIN_S = 0.2         # Frases com menos voz que isso são descartadas antes do STT
+
+# Fim de fala adaptativo: espera ~VAD_PAUSA_FATOR x a pausa típica do usuário entre palavras
+VAD_PAUSA_ADAPTATIVA = os.getenv("JARVIS_VAD_PAUSA_ADAPTATIVA", "1") == "1"  # "0" = BLOCOS_PAUSA_FIM fixo
+VAD_PAUSA_INICIAL_S = 0.35
+VAD_PAUSA_FATOR = 2.0
+VAD_PAUSA_MIN_S = 0.5
+VAD_PAUSA_MAX_S = 1.5
+
+# --- PALAVRA DE ATIVAÇÃO ANTES DO STT (Keyword Spotting) ---
+# Fora da janela de atenção, só frases em que o espião ouve a wake word vão para a decodificação
+# completa. "modelos": DTW sobre MFCC contra gravações do usuário dizendo a palavra (CPU, ~ms);
+# "whisper": decodificação gulosa só do começo da frase (uma decodificação a mais por frase);
+# "auto": modelos se houver gravações, senão sem portão.
+KWS_ATIVO = os.getenv("JARVIS_KWS", "1") == "1"
+KWS_BACKEND = os.getenv("JARVIS_KWS_BACKEND", "auto")
+KWS_MODELOS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "wake_word")  # *.wav 16kHz
+KWS_JANELA_S = 2.0           # Só o começo da frase é examinado ("Jarvis, ..." / "Oi Jarvis, ...")
+KWS_DTW_LIMIAR = 0.25        # Distância média (cosseno) aceita entre a frase e o melhor modelo
+KWS_SIMILARIDADE = 0.75      # Backend whisper: semelhança mínima entre palavra ouvida e wake word
+KWS_PALAVRAS = WAKE_WORDS    # As mesmas do AttentionSystem (jarvis_system/protocol.py)
@@ -0,0 +1,113 @@
+# jarvis_system/area_broca/listen/detectorVoz.py
+import logging
+from typing import Callable, Dict
+import numpy as np
+
+from .configAudio import (
+    SAMPLE_RATE, LIMIAR_SILENCIO, VAD_QUADRO, VAD_RMS_MIN, VAD_SNR_MIN,
+    VAD_RAZAO_BANDA_MIN, VAD_PLANURA_MAX, VAD_WEBRTC_MODO
+)
+
+try:
+    import webrtcvad
+    WEBRTC_AVAILABLE = True
+except ImportError:
+    WEBRTC_AVAILABLE = False
+
+logger = logging.getLogger("BROCA_VAD")
+
+_EPS = 1e-12
+
+class DetectorEnergia:
+    """Legado: um único 'quadro' por bloco, fala se o RMS passar do limiar fixo."""
+    def __init__(self, limiar=LIMIAR_SILENCIO):
+        self.limiar = limiar
+
+    def analisar(self, chunk_float: np.ndarray, volume: float) -> np.ndarray:
+        return np.array([volume > self.limiar])
+
+    def reset(self):
+        pass
+
+class DetectorEspectral:
+    """
+    Decide quadro a quadro (25ms) com três testes baratos (uma FFT por quadro):
+    - energia acima do piso de ruído aprendido (o piso sobe sozinho com ventilador/TV ligados);
+    - energia concentrada na banda da voz (250-3500 Hz);
+    - espectro pouco plano (voz tem harmônicos; chiado é plano).
+    """
+    def __init__(self, sample_rate=SAMPLE_RATE, quadro=VAD_QUADRO, rms_min=VAD_RMS_MIN, snr_min=VAD_SNR_MIN,
+                 razao_banda_min=VAD_RAZAO_BANDA_MIN, planura_max=VAD_PLANURA_MAX):
+        self.quadro = quadro
+        self.energia_min = rms_min ** 2
+        self.snr_min = snr_min
+        self.razao_banda_min = razao_banda_min
+        self.planura_max = planura_max
+        self._janela = np.hanning(quadro).astype(np.float32)
+        freqs = np.fft.rfftfreq(quadro, 1.0 / sample_rate)
+        self._banda = (freqs >= 250) & (freqs <= 3500)
+        self.reset()
+
+    def reset(self):
+        self.piso_ruido = self.energia_min
+
+    def analisar(self, chunk_float: np.ndarray, volume: float) -> np.ndarray:
+        n = len(chunk_float) // self.quadro
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        quadros = chunk_float[:n * self.quadro].reshape(n, self.quadro)
+        energia = np.mean(quadros * quadros, axis=1)
+
+        espectro = np.abs(np.fft.rfft(quadros * self._janela, axis=1)) ** 2
+        banda = espectro[:, self._banda] + _EPS
+        razao_banda = banda.sum(axis=1) / (espectro[:, 1:].sum(axis=1) + _EPS)
+        planura = np.exp(np.mean(np.log(banda), axis=1)) / np.mean(banda, axis=1)
+        formato_de_voz = (razao_banda >= self.razao_banda_min) & (planura <= self.planura_max)
+
+        fala = np.zeros(n, dtype=bool)
+        for i in range(n):
+            fala[i] = formato_de_voz[i] and energia[i] > max(self.energia_min, self.piso_ruido * self.snr_min)
+            if not fala[i]:
+                # Desce rápido (silêncio real), sobe devagar (ruído de fundo que se instalou)
+                alfa = 0.5 if energia[i] < self.piso_ruido else 0.05
+                self.piso_ruido = max(self.energia_min, self.piso_ruido + alfa * (energia[i] - self.piso_ruido))
+        return fala
+
+class DetectorWebRTC:
+    """Modelo do WebRTC (GMM, CPU, microssegundos por quadro de 20ms)."""
+    def __init__(self, sample_rate=SAMPLE_RATE, modo=VAD_WEBRTC_MODO):
+        self.vad = webrtcvad.Vad(modo)
+        self.sample_rate = sample_rate
+        self.quadro = sample_rate // 50  # 20ms
+
+    def reset(self):
+        pass
+
+    def analisar(self, chunk_float: np.ndarray, volume: float) -> np.ndarray:
+        n = len(chunk_float) // self.quadro
+        pcm = (np.clip(chunk_float[:n * self.quadro], -1.0, 1.0) * 32767).astype(np.int16)
+        return np.array([
+            self.vad.is_speech(pcm[i * self.quadro:(i + 1) * self.quadro].tobytes(), self.sample_rate)
+            for i in range(n)
+        ], dtype=bool)
+
+def _webrtc():
+    if not WEBRTC_AVAILABLE:
+        raise ImportError("pacote 'webrtcvad' não instalado")
+    return DetectorWebRTC()
+
+DETECTORES: Dict[str, Callable[[], object]] = {
+    "energia": DetectorEnergia,
+    "espectral": DetectorEspectral,
+    "webrtc": _webrtc,
+}
+
+def criar_detector(nome: str):
+    """Instancia o detector pelo nome; backend opcional ausente cai no espectral."""
+    try:
+        return DETECTORES[nome]()
+    except KeyError:
+        logger.warning(f"⚠️ VAD '{nome}' desconhecido. Usando o espectral.")
+    except ImportError as e:
+        logger.warning(f"⚠️ VAD '{nome}' indisponível ({e}). Usando o espectral.")
+    return DetectorEspectral()
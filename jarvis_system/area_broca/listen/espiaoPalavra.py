@@ -0,0 +1,141 @@
+# jarvis_system/area_broca/listen/espiaoPalavra.py
+import glob
+import logging
+import os
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import List, Optional
+import numpy as np
+
+from .configAudio import (
+    SAMPLE_RATE, KWS_MODELOS_DIR, KWS_JANELA_S, KWS_DTW_LIMIAR, KWS_SIMILARIDADE, KWS_PALAVRAS
+)
+from .audioUtils import ler_wav
+
+logger = logging.getLogger("BROCA_KWS")
+
+# =========================================================================
+# MFCC (numpy puro)
+# =========================================================================
+@lru_cache(maxsize=4)
+def _banco_mel(n_fft: int, sample_rate: int, n_filtros: int = 26) -> np.ndarray:
+    mel = lambda f: 2595.0 * np.log10(1.0 + f / 700.0)
+    hz = lambda m: 700.0 * (10 ** (m / 2595.0) - 1.0)
+    bins = np.floor((n_fft + 1) * hz(np.linspace(mel(0), mel(sample_rate / 2), n_filtros + 2)) / sample_rate).astype(int)
+    banco = np.zeros((n_filtros, n_fft // 2 + 1), dtype=np.float32)
+    for i in range(1, n_filtros + 1):
+        a, b, c = bins[i - 1], bins[i], bins[i + 1]
+        banco[i - 1, a:b] = (np.arange(a, b) - a) / max(1, b - a)
+        banco[i - 1, b:c] = (c - np.arange(b, c)) / max(1, c - b)
+    return banco
+
+@lru_cache(maxsize=4)
+def _dct(n_coef: int, n_filtros: int) -> np.ndarray:
+    k, n = np.arange(n_coef)[:, None], np.arange(n_filtros)[None, :]
+    return np.cos(np.pi * k * (2 * n + 1) / (2 * n_filtros)).astype(np.float32)
+
+def mfcc(audio: np.ndarray, sample_rate: int = SAMPLE_RATE, n_coef: int = 13) -> np.ndarray:
+    """
+    Coeficientes cepstrais (quadros de 25ms, passo 10ms), sem c0 (volume),
+    só dos quadros com som (até -30 dB do pico) e com a média removida (CMN).
+    """
+    quadro, passo, n_fft = int(0.025 * sample_rate), int(0.010 * sample_rate), 512
+    audio = np.append(audio[:1], audio[1:] - 0.97 * audio[:-1]).astype(np.float32)
+    if len(audio) < quadro:
+        audio = np.pad(audio, (0, quadro - len(audio)))
+    n = 1 + (len(audio) - quadro) // passo
+    indices = np.arange(quadro)[None, :] + passo * np.arange(n)[:, None]
+    potencia = np.abs(np.fft.rfft(audio[indices] * np.hamming(quadro).astype(np.float32), n_fft)) ** 2 / n_fft
+
+    energia = potencia.sum(axis=1)
+    potencia = potencia[energia > energia.max() * 1e-3]
+    coef = np.log(potencia @ _banco_mel(n_fft, sample_rate).T + 1e-10) @ _dct(n_coef, 26).T
+    coef = coef[:, 1:]
+    return coef - coef.mean(axis=0)
+
+def distancia_dtw(consulta: np.ndarray, modelo: np.ndarray) -> float:
+    """
+    DTW de subsequência: o modelo (a wake word) pode começar e terminar em qualquer ponto
+    da consulta. Cada passo avança um quadro do modelo, então o custo é normalizado
+    pelo tamanho do modelo e a recursão é vetorizada linha a linha.
+    """
+    if len(consulta) == 0 or len(modelo) == 0:
+        return float("inf")
+    a = consulta / (np.linalg.norm(consulta, axis=1, keepdims=True) + 1e-10)
+    b = modelo / (np.linalg.norm(modelo, axis=1, keepdims=True) + 1e-10)
+    custo = 1.0 - b @ a.T  # (quadros do modelo, quadros da consulta)
+
+    infinito = np.full(2, np.inf, dtype=custo.dtype)
+    anterior = custo[0].copy()
+    for i in range(1, len(custo)):
+        diagonal = np.concatenate([infinito[:1], anterior[:-1]])
+        salto = np.concatenate([infinito, anterior[:-2]])
+        anterior = custo[i] + np.minimum(np.minimum(diagonal, salto), anterior)
+    return float(anterior.min() / len(custo))
+
+# =========================================================================
+# ESPIÕES (decidem se a frase merece a decodificação completa)
+# =========================================================================
+class EspiaoModelos:
+    """Compara o começo da frase com gravações da wake word (DTW sobre MFCC)."""
+    def __init__(self, modelos: List[np.ndarray], limiar: float = KWS_DTW_LIMIAR,
+                 janela_s: float = KWS_JANELA_S, sample_rate: int = SAMPLE_RATE):
+        if not modelos:
+            raise ValueError("Nenhuma gravação da wake word para comparar.")
+        self.modelos = [mfcc(m, sample_rate) for m in modelos]
+        self.limiar = limiar
+        self.sample_rate = sample_rate
+        self.janela_amostras = int(janela_s * sample_rate)
+        self.ultima_distancia = None
+
+    @classmethod
+    def da_pasta(cls, pasta: str = KWS_MODELOS_DIR, **kwargs) -> "EspiaoModelos":
+        caminhos = sorted(glob.glob(os.path.join(pasta, "*.wav")))
+        return cls([ler_wav(c) for c in caminhos], **kwargs)
+
+    def detectar(self, audio_float: np.ndarray) -> bool:
+        consulta = mfcc(audio_float[:self.janela_amostras], self.sample_rate)
+        self.ultima_distancia = min(distancia_dtw(consulta, m) for m in self.modelos)
+        return self.ultima_distancia <= self.limiar
+
+class EspiaoWhisper:
+    """Sem gravações: decodificação gulosa só da janela inicial, procurando a wake word."""
+    def __init__(self, decoder, palavras: List[str] = KWS_PALAVRAS, similaridade: float = KWS_SIMILARIDADE,
+                 janela_s: float = KWS_JANELA_S, sample_rate: int = SAMPLE_RATE):
+        self.decoder = decoder
+        self.palavras = [p.lower() for p in palavras]
+        self.similaridade = similaridade
+        self.janela_amostras = int(janela_s * sample_rate)
+        self.ultimas_palavras: List[str] = []
+
+    def detectar(self, audio_float: np.ndarray) -> bool:
+        ouvidas = self.decoder.transcribe_words(audio_float[:self.janela_amostras], beam_size=1)
+        self.ultimas_palavras = [p.strip(" ,.!?").lower() for p, _, _ in ouvidas]
+        return any(
+            SequenceMatcher(None, ouvida, wake).ratio() >= self.similaridade
+            for ouvida in self.ultimas_palavras for wake in self.palavras
+        )
+
+def criar_espiao(nome: str, decoder=None) -> Optional[object]:
+    """None = sem portão (toda frase é decodificada)."""
+    if nome in ("auto", "modelos"):
+        try:
+            espiao = EspiaoModelos.da_pasta()
+            logger.info(f"👂 Wake word por modelos: {len(espiao.modelos)} gravações.")
+            return espiao
+        except (ValueError, OSError) as e:
+            if nome == "modelos":
+                logger.warning(f"⚠️ KWS por modelos indisponível ({e}).")
+                return None
+            # O espião Whisper custaria uma decodificação extra em toda frase fora da janela
+            # de atenção: no automático, sem gravações, o portão fica desligado.
+            logger.warning(f"⚠️ Sem gravações da wake word em '{KWS_MODELOS_DIR}': portão KWS desligado "
+                           f"(grave modelos ou use JARVIS_KWS_BACKEND=whisper).")
+            return None
+    if nome == "whisper":
+        if decoder is None or not hasattr(decoder, "transcribe_words"):
+            logger.warning("⚠️ KWS por Whisper exige um decoder com transcribe_words. Portão desligado.")
+            return None
+        return EspiaoWhisper(decoder)
+    logger.warning(f"⚠️ KWS '{nome}' desconhecido. Portão desligado.")
+    return None
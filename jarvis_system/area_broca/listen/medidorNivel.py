@@ -0,0 +1,118 @@
+# jarvis_system/area_broca/listen/medidorNivel.py
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+from .configAudio import NIVEL_INTERVALO_S, NIVEL_CONSOLE
+
+logger = logging.getLogger("BROCA_NIVEL")
+
+AGUARDANDO, GRAVANDO, JARVIS_FALANDO = "aguardando", "gravando", "jarvis_falando"
+ROTULOS = {AGUARDANDO: "💤 AGUARDANDO", GRAVANDO: "🔴 GRAVANDO", JARVIS_FALANDO: "🔇 JARVIS FALANDO"}
+
+class MedidorNivel:
+    """
+    Medidor de nível do microfone fora do caminho quente.
+    - registrar() roda na thread do VAD a cada bloco: só soma em acumuladores e, fechada a
+      janela de intervalo_s, troca uma tupla (atribuição atômica). Sem lock, sem I/O.
+    - Uma thread própria acorda a cada intervalo_s, pega a última janela e a entrega a
+      'publicar' (telemetria) e ao console. Terminal lento ou redirecionado atrasa só ela.
+    """
+    def __init__(self, publicar: Optional[Callable[[dict], None]] = None, intervalo_s: float = NIVEL_INTERVALO_S,
+                 console: Optional[bool] = None, saida=None):
+        self.publicar = publicar
+        self.intervalo_s = intervalo_s
+        self.saida = saida or sys.stdout
+        if console is None:
+            console = NIVEL_CONSOLE == "1" or (NIVEL_CONSOLE == "auto" and self.saida.isatty())
+        self.console = console
+
+        # Acumuladores (escritos só pela thread do VAD)
+        self._soma_quadrados = 0.0
+        self._pico = 0.0
+        self._blocos = 0
+        self._inicio_janela = time.monotonic()
+        # Última janela fechada: (seq, rms, pico, estado, blocos)
+        self._janela = (0, 0.0, 0.0, AGUARDANDO, 0)
+
+        self._entregue = 0
+        self._estado_console = AGUARDANDO
+        self.janelas_publicadas = 0
+        self.render_max_ms = 0.0
+        self._parar = threading.Event()
+        self._thread = None
+
+    # --- Caminho quente (thread do VAD) ---
+    def registrar(self, volume: float, falando: bool, jarvis_falando: bool = False):
+        self._soma_quadrados += volume * volume
+        self._pico = max(self._pico, volume)
+        self._blocos += 1
+        agora = time.monotonic()
+        if agora - self._inicio_janela < self.intervalo_s:
+            return
+        estado = JARVIS_FALANDO if jarvis_falando else (GRAVANDO if falando else AGUARDANDO)
+        rms = (self._soma_quadrados / self._blocos) ** 0.5
+        self._janela = (self._janela[0] + 1, rms, self._pico, estado, self._blocos)
+        self._soma_quadrados, self._pico, self._blocos = 0.0, 0.0, 0
+        self._inicio_janela = agora
+
+    # --- Fora do caminho quente ---
+    def iniciar(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, name="BrocaNivel", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def _loop(self):
+        while not self._parar.wait(self.intervalo_s):
+            self.entregar()
+
+    def entregar(self) -> Optional[dict]:
+        """Publica a última janela fechada, se for nova. Chamado pela thread do medidor."""
+        seq, rms, pico, estado, blocos = self._janela
+        if seq == self._entregue:
+            return None
+        self._entregue = seq
+        leitura = {"rms": round(rms, 4), "pico": round(pico, 4), "estado": estado, "blocos": blocos}
+        self.janelas_publicadas += 1
+
+        if self.publicar:
+            try:
+                self.publicar(leitura)
+            except Exception as e:
+                logger.debug(f"Falha ao publicar nível do microfone: {e}")
+        if self.console:
+            self._renderizar(rms, estado)
+        return leitura
+
+    def _renderizar(self, volume: float, estado: str):
+        inicio = time.perf_counter()
+        quebra = "\n" if self._estado_console == GRAVANDO and estado != GRAVANDO else ""
+        self._estado_console = estado
+        bar_len = int(min(volume, 1.0) * 20)
+        try:
+            self.saida.write(f"{quebra}\r🎤 Vol: {volume:.3f} |{'█' * bar_len}{' ' * (20 - bar_len)}| {ROTULOS[estado]}")
+            self.saida.flush()
+        except (OSError, ValueError):
+            self.console = False  # Terminal fechado/redirecionado para lugar nenhum
+        self.render_max_ms = max(self.render_max_ms, (time.perf_counter() - inicio) * 1000.0)
+
+    def estatisticas(self) -> dict:
+        _, rms, pico, estado, _ = self._janela
+        return {
+            "rms": round(rms, 4),
+            "pico": round(pico, 4),
+            "estado": estado,
+            "janelas_publicadas": self.janelas_publicadas,
+            "console": self.console,
+            "render_max_ms": round(self.render_max_ms, 2),
+        }
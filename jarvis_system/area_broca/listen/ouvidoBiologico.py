@@ -1,44 +1,96 @@
 # jarvis_system/area_broca/listen/main.py
 import threading
 import queue
+import multiprocessing
 import time
-import sys
+from collections import deque
 import numpy as np
 import logging
 
 # Imports Internos
 from jarvis_system.hipocampo.reflexos import reflexos
 from jarvis_system.cortex_frontal.event_bus import bus, Evento
+from jarvis_system.cortex_frontal.observability import tracer
 from jarvis_system.protocol import Eventos
 
 # Módulos Locais
 from .configAudio import *
 from .audioDriver import AudioDriver
 from .whisperTranscriber import WhisperTranscriber
+from .anelAudio import AnelBlocos
+from .detectorVoz import criar_detector
+from .medidorNivel import MedidorNivel
+from .espiaoPalavra import criar_espiao
+from .pipelineAuditivo import (
+    SegmentadorVAD, EstagioSTT, _processo_stt,
+    MSG_INICIO, MSG_AUDIO, MSG_FIM, MSG_DESCARTE, RES_PARCIAL, RES_FINAL, RES_IGNORADO,
+    INICIO_FALA, FALA, FIM_FALA, DESCARTADO
+)
 
 # Configuração de Logs Local
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("BROCA_EARS")
 
 class OuvidoBiologico:
-    def __init__(self, model_size="base", device="cpu"):
+    """
+    Pipeline de escuta em três estágios, ligados por filas limitadas:
+    1. Captura: callback do driver -> _anel_captura (anel SPSC pré-alocado; cheio = descarta o bloco novo).
+    2. Segmentação (thread BrocaVAD): VAD plugável (detectorVoz), corta frases e abre o trace.
+    3. STT (thread BrocaSTT ou processo filho): decodifica sem travar o VAD.
+    """
+    def __init__(self, model_size=WHISPER_MODELO, device="cpu", driver=None, transcriber=None,
+                 stt_em_processo=STT_EM_PROCESSO, espiao=None):
         logger.info("👂 Inicializando Sistema Auditivo Modular...")
         
         self._stop_event = threading.Event()
-        self._audio_queue = queue.Queue()
+        self._anel_captura = AnelBlocos(FILA_CAPTURA_MAX, BLOCK_SIZE, CHANNELS, dtype=np.int16)
+        self._fila_stt = None
+        self._fila_resultados = None
         self._thread = None
+        self._thread_stt = None
+        self._processo_stt = None
+        # Modo thread: reservas (do anel do VAD) das views enfileiradas, na ordem de envio
+        self._reservas_em_voo = deque()
+        self._audio_enviado = 0
+        self._audio_consumido = 0  # Escrito só pela thread do STT
         self._is_listening = False
+        self.blocos_descartados = 0
+        self.frases_ignoradas = 0
         
         # Estado Global
         self._jarvis_speaking = False
+        self._atento_ate = 0.0  # time.monotonic() até onde a janela de atenção do Orchestrator vai
         
         # Subsistemas
-        self.driver = AudioDriver(SAMPLE_RATE, BLOCK_SIZE, CHANNELS)
-        self.brain = WhisperTranscriber(model_size, device)
+        self.model_size = model_size
+        self.device = device
+        self.driver = driver or AudioDriver(SAMPLE_RATE, BLOCK_SIZE, CHANNELS)
+        self.segmentador = SegmentadorVAD(
+            detector=criar_detector(VAD_BACKEND),
+            blocos_pausa_fim=None if VAD_PAUSA_ADAPTATIVA else BLOCOS_PAUSA_FIM
+        )
+        # Um decoder injetado não atravessa processos: nesse caso o STT fica em thread
+        self.stt_em_processo = stt_em_processo and transcriber is None
+        self.brain = None if self.stt_em_processo else (transcriber or WhisperTranscriber(model_size, device))
+        # Portão de wake word: no modo processo o espião nasce lá dentro, junto do Whisper
+        self.kws_backend = KWS_BACKEND if KWS_ATIVO else None
+        if not self.stt_em_processo and espiao is None and self.kws_backend:
+            espiao = criar_espiao(self.kws_backend, self.brain)
+        self.estagio_stt = None if self.stt_em_processo else EstagioSTT(self.brain, STREAMING_STT, espiao)
         self.reflexos = reflexos
+        self.medidor = MedidorNivel(publicar=lambda leitura: bus.publicar(Evento(Eventos.NIVEL_MIC, leitura)))
 
         # Barramento
         bus.inscrever(Eventos.STATUS_FALA, self._on_jarvis_speech_status)
+        bus.inscrever(Eventos.ATENCAO, self._on_atencao)
+
+    def _on_atencao(self, evento: Evento):
+        """O Orchestrator aceitou um comando: enquanto a janela durar, nada de esperar a wake word."""
+        self._atento_ate = time.monotonic() + evento.dados.get("janela_s", 0.0)
+
+    @property
+    def atento(self) -> bool:
+        return time.monotonic() < self._atento_ate
 
     def _on_jarvis_speech_status(self, evento: Evento):
         """Evita que o Jarvis ouça a si mesmo."""
@@ -46,76 +98,60 @@ class OuvidoBiologico:
         self._jarvis_speaking = evento.dados.get("status", False)
         
         if self._jarvis_speaking and not status_anterior:
-            with self._audio_queue.mutex:
-                self._audio_queue.queue.clear()
+            self._anel_captura.descartar_pendentes()
 
     def _audio_callback(self, indata, frames, time, status):
-        """Callback de alta performance executado pelo Driver."""
+        """Callback de alta performance executado pelo Driver (nunca bloqueia)."""
         if status:
             logger.warning(f"⚠️ Status Driver: {status}")
         
         if not self._jarvis_speaking:
-            self._audio_queue.put(indata.copy())
-
-    def _process_transcription(self, buffer_frase):
-        """Envia áudio para IA e trata o resultado."""
-        texto_bruto = self.brain.transcribe(buffer_frase)
-        
-        if texto_bruto:
-            texto_corrigido, ignorar = self.reflexos.processar_reflexo(texto_bruto)
-            
-            if not ignorar:
-                logger.info(f"🗣️  Usuário: '{texto_corrigido}'")
-                bus.publicar(Evento(Eventos.FALA_RECONHECIDA, {"texto": texto_corrigido}))
-            else:
-                logger.debug(f"🔇 Ignorado: '{texto_bruto}'")
+            # Única cópia do bloco: do buffer do driver (reaproveitado por ele) para o slot do anel
+            if not self._anel_captura.escrever(indata):
+                self.blocos_descartados += 1
+                logger.debug(f"⚠️ Anel de captura cheio ({self.blocos_descartados} blocos descartados).")
 
-    def _worker_loop(self):
-        """Loop de VAD (Voice Activity Detection) e Processamento."""
+    # =========================================================================
+    # ESTÁGIO 2: SEGMENTAÇÃO (VAD)
+    # =========================================================================
+    def _loop_segmentacao(self):
+        """Loop de VAD (Voice Activity Detection): só corta frases, nunca decodifica."""
         logger.info("🎤 Serviço de escuta ativo.")
         
         # Inicia Hardware
         self.driver.start_stream(self._audio_callback)
         
-        buffer_frase = []
-        blocos_silencio = 0
-        falando = False
-        
         try:
             while not self._stop_event.is_set():
-                try:
-                    chunk_int16 = self._audio_queue.get(timeout=0.5)
-                except queue.Empty:
-                    continue
+                chunk_int16 = self._anel_captura.ler(timeout=0.5)
                 if chunk_int16 is None:
-                    break
+                    continue
 
-                # Processamento de Sinal (Normalização e Ganho)
-                chunk_float = ((chunk_int16.astype(np.float32) / 32768.0) * GANHO_MIC).flatten()
-                volume = np.linalg.norm(chunk_float) / np.sqrt(len(chunk_float))
+                self._atualizar_em_voo()
+                chunk_float, volume, estado = self.segmentador.processar(chunk_int16)
+                self.medidor.registrar(volume, self.segmentador.falando or estado == FIM_FALA, self._jarvis_speaking)
+
+                if estado == INICIO_FALA:
+                    self._enviar_stt((MSG_INICIO, self.atento))
+                    # Pre-roll: o começo da palavra que ficou abaixo do limiar no bloco anterior
+                    for anterior, reserva in zip(self.segmentador.pre_fala, self.segmentador.pre_fala_reservas):
+                        self._enviar_audio(anterior, reserva)
+                    self._enviar_audio(chunk_float, self.segmentador.ultima_reserva)
                 
-                self._print_volume_bar(volume, falando)
-
-                # Lógica VAD
-                if volume > LIMIAR_SILENCIO:
-                    if not falando:
-                        falando = True
-                    blocos_silencio = 0
-                    buffer_frase.append(chunk_float)
+                elif estado == FALA:
+                    self._enviar_audio(chunk_float, self.segmentador.ultima_reserva)
                 
-                elif falando:
-                    buffer_frase.append(chunk_float)
-                    blocos_silencio += 1
+                elif estado == DESCARTADO:
+                    # Estalo/batida: curto demais para ser fala, não gasta CPU no Whisper
+                    self._enviar_stt((MSG_DESCARTE,))
+
+                elif estado == FIM_FALA:
+                    self._enviar_audio(chunk_float, self.segmentador.ultima_reserva)
                     
-                    if blocos_silencio > BLOCOS_PAUSA_FIM:
-                        sys.stdout.write("\n")
-                        sys.stdout.flush()
-                        
-                        self._process_transcription(buffer_frase)
-                        
-                        buffer_frase = []
-                        falando = False
-                        blocos_silencio = 0
+                    # Início da correlação: o trace nasce no fim da fala (VAD)
+                    trace_id = tracer.start_trace("voz", duracao_audio_s=self.segmentador.duracao_frase_s)
+                    tracer.mark("vad_fim", trace_id)
+                    self._enviar_stt((MSG_FIM, trace_id))
         finally:
             # Cleanup GARANTIDO ao sair do loop
             logger.info("🎤 Encerrando o driver do microfone...")
@@ -123,33 +159,169 @@ class OuvidoBiologico:
                 self.driver.stop_stream()
             except Exception as e:
                 logger.error(f"Erro ao libertar microfone: {e}")
-    def _print_volume_bar(self, volume, falando):
-        bar_len = int(min(volume, 1.0) * 20)
-        bar = "█" * bar_len
-        espaco = " " * (20 - bar_len)
-        estado = "🔴 GRAVANDO" if falando else "💤 AGUARDANDO"
-        if self._jarvis_speaking: estado = "🔇 JARVIS FALANDO"
-        sys.stdout.write(f"\r🎤 Vol: {volume:.3f} |{bar}{espaco}| {estado}")
-        sys.stdout.flush()
+
+    def _enviar_stt(self, mensagem) -> bool:
+        """Entrega ao estágio de STT. Se ele estiver atrasado demais, a mensagem é perdida (com aviso)."""
+        try:
+            self._fila_stt.put(mensagem, timeout=1.0)
+            return True
+        except queue.Full:
+            logger.warning(f"⚠️ STT atrasado: fila cheia, mensagem '{mensagem[0]}' descartada.")
+            return False
+
+    def _enviar_audio(self, chunk: np.ndarray, reserva):
+        """Bloco de fala para o STT. A view do anel do VAD só atravessa a fila no modo thread."""
+        if self.stt_em_processo:
+            # A fila do multiprocessing serializa numa thread própria, depois do put(): vai uma cópia
+            self._enviar_stt((MSG_AUDIO, chunk.copy()))
+        elif self._enviar_stt((MSG_AUDIO, chunk)):
+            self._reservas_em_voo.append(reserva)
+            self._audio_enviado += 1
+
+    def _atualizar_em_voo(self):
+        """Solta as reservas que o STT já consumiu e protege a mais antiga ainda na fila."""
+        consumidas = self._audio_consumido - (self._audio_enviado - len(self._reservas_em_voo))
+        for _ in range(consumidas):
+            self._reservas_em_voo.popleft()
+        self.segmentador.reserva_em_voo = next((r for r in self._reservas_em_voo if r is not None), None)
+
+    # =========================================================================
+    # ESTÁGIO 3: TRANSCRIÇÃO (THREAD OU PROCESSO)
+    # =========================================================================
+    def _loop_stt(self):
+        """Modo thread: decodifica com o Whisper já carregado no processo principal."""
+        while True:
+            mensagem = self._fila_stt.get()
+            if mensagem is None:
+                break
+            try:
+                resultado = self.estagio_stt.processar(mensagem)
+            except Exception as e:
+                logger.error(f"Erro no estágio de STT: {e}")
+                continue
+            finally:
+                if mensagem[0] == MSG_AUDIO:
+                    self._audio_consumido += 1  # O estágio já copiou o bloco: a reserva está livre
+            if resultado:
+                self._tratar_resultado(resultado)
+
+    def _loop_resultados(self):
+        """Modo processo: traz os resultados do processo de STT para o barramento."""
+        while True:
+            try:
+                resultado = self._fila_resultados.get(timeout=1.0)
+            except queue.Empty:
+                if self._processo_stt is None or not self._processo_stt.is_alive():
+                    break
+                continue
+            except (EOFError, OSError):
+                break
+            if resultado is None:
+                break
+            self._tratar_resultado(resultado)
+
+    def _tratar_resultado(self, resultado):
+        tipo = resultado[0]
+
+        if tipo == RES_PARCIAL:
+            # Modo streaming: hipóteses parciais enquanto o usuário ainda fala
+            _, parcial, confirmado = resultado
+            logger.debug(f"💬 Parcial: '{parcial}'")
+            bus.publicar(Evento(Eventos.FALA_PARCIAL, {"texto": parcial, "confirmado": confirmado}))
+            return
+
+        if tipo == RES_FINAL:
+            _, texto_bruto, trace_id, duracao_stt, perfil = resultado
+            fim = time.perf_counter()
+            tracer.record_span(trace_id, "stt", fim - duracao_stt, fim, perfil=perfil,
+                               streaming=STREAMING_STT, processo=self.stt_em_processo)
+            self._process_transcription(texto_bruto, trace_id)
+            return
+
+        if tipo == RES_IGNORADO:
+            # Conversa de fundo: o espião não ouviu a wake word e o Whisper nem foi chamado
+            _, trace_id, duracao_kws = resultado
+            fim = time.perf_counter()
+            tracer.record_span(trace_id, "kws", fim - duracao_kws, fim, ignorado=True)
+            self.frases_ignoradas += 1
+            logger.debug(f"🙉 Frase sem wake word ignorada ({self.frases_ignoradas} até agora).")
+
+    def _process_transcription(self, texto_bruto, trace_id=None):
+        """Aplica os reflexos ao texto decodificado e publica a fala reconhecida."""
+        if texto_bruto:
+            texto_corrigido, ignorar = self.reflexos.processar_reflexo(texto_bruto)
+            
+            if not ignorar:
+                logger.info(f"🗣️  Usuário: '{texto_corrigido}'")
+                bus.publicar(Evento(Eventos.FALA_RECONHECIDA, {"texto": texto_corrigido, tracer.TRACE_KEY: trace_id}))
+            else:
+                logger.debug(f"🔇 Ignorado: '{texto_bruto}'")
+
+    def estatisticas(self) -> dict:
+        """Nível do microfone e perdas do pipeline (GET /metrics/audio)."""
+        return {
+            "nivel": self.medidor.estatisticas(),
+            "blocos_descartados": self.blocos_descartados,
+            "blocos_na_captura": len(self._anel_captura),
+            "frases_ignoradas": self.frases_ignoradas,
+        }
 
     def start(self):
-        if not self._thread or not self._thread.is_alive():
-            self._stop_event.clear()
-            self._thread = threading.Thread(target=self._worker_loop, name="BrocaListener", daemon=True)
-            self._thread.start()
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self.segmentador.reset()
+        self._reservas_em_voo.clear()
+        self._audio_enviado = self._audio_consumido = 0
+        self.segmentador.reserva_em_voo = None
+
+        if self.stt_em_processo:
+            self._fila_stt = multiprocessing.Queue(maxsize=FILA_STT_MAX)
+            self._fila_resultados = multiprocessing.Queue()
+            self._processo_stt = multiprocessing.Process(
+                target=_processo_stt,
+                args=(self._fila_stt, self._fila_resultados, self.model_size, self.device, STREAMING_STT,
+                      self.kws_backend),
+                name="Jarvis_STT_Core"
+            )
+            self._processo_stt.daemon = True
+            self._processo_stt.start()
+            self._thread_stt = threading.Thread(target=self._loop_resultados, name="BrocaResultados", daemon=True)
+        else:
+            self._fila_stt = queue.Queue(maxsize=FILA_STT_MAX)
+            self._thread_stt = threading.Thread(target=self._loop_stt, name="BrocaSTT", daemon=True)
+        self._thread_stt.start()
+
+        self.medidor.iniciar()
+        self._thread = threading.Thread(target=self._loop_segmentacao, name="BrocaListener", daemon=True)
+        self._thread.start()
 
     def stop(self):
         logger.info("👂 Iniciando encerramento do Ouvido...")
         self._stop_event.set()
         
-        # Injeta um elemento falso (None) na fila para "acordar" o queue.get se ele estiver bloqueado
-        try:
-            self._audio_queue.put(None, timeout=1) 
-        except: pass
+        # Acorda o ler() do anel se ele estiver bloqueado
+        self._anel_captura.acordar()
         
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=2.0)
             if self._thread.is_alive():
                 logger.warning("⚠️ Thread do microfone bloqueada. A forçar paragem pelo Kernel.")
             else:
-                logger.info("👂 Microfone encerrado graciosamente.")
\ No newline at end of file
+                logger.info("👂 Microfone encerrado graciosamente.")
+        self.medidor.parar()
+
+        # Encerra o estágio de STT (a frase em decodificação é abandonada)
+        if self._fila_stt is not None:
+            try:
+                self._fila_stt.put(None, timeout=1)
+            except: pass
+        if self._processo_stt and self._processo_stt.is_alive():
+            self._processo_stt.join(timeout=2)
+            if self._processo_stt.is_alive():
+                logger.warning("⚠️ Processo de STT bloqueado. A forçar o encerramento (SIGTERM)...")
+                self._processo_stt.terminate()
+                self._processo_stt.join(timeout=1)
+        if self._thread_stt and self._thread_stt.is_alive():
+            self._thread_stt.join(timeout=2.0)
+        self._processo_stt = None
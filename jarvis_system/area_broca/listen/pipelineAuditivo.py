@@ -0,0 +1,272 @@
+# jarvis_system/area_broca/listen/pipelineAuditivo.py
+import logging
+import time
+from collections import deque
+from typing import List, Optional, Tuple
+import numpy as np
+
+from .configAudio import (
+    SAMPLE_RATE, BLOCK_SIZE, FILA_STT_MAX, FRASE_CAPACIDADE_S, LIMIAR_SILENCIO, BLOCOS_PAUSA_FIM, GANHO_MIC, VAD_QUADROS_MIN, VAD_PRE_ROLL_S,
+    VAD_FALA_MIN_S, VAD_PAUSA_INICIAL_S, VAD_PAUSA_FATOR, VAD_PAUSA_MIN_S, VAD_PAUSA_MAX_S
+)
+from .anelAudio import AnelBlocos, BufferFrase
+from .detectorVoz import DetectorEnergia
+from .streamingTranscriber import StreamingTranscriber
+
+# Mensagens trocadas entre os estágios (tuplas simples: atravessam multiprocessing.Queue)
+MSG_INICIO = "inicio"      # (MSG_INICIO, atento) atento=False: só decodifica se o espião ouvir a wake word
+MSG_AUDIO = "audio"        # (MSG_AUDIO, chunk_float) view do anel do segmentador: copiar antes de guardar
+MSG_FIM = "fim"            # (MSG_FIM, trace_id)
+MSG_DESCARTE = "descarte"  # (MSG_DESCARTE,) frase curta demais: esquece o áudio sem decodificar
+RES_PARCIAL = "parcial"    # (RES_PARCIAL, texto, confirmado)
+RES_FINAL = "final"        # (RES_FINAL, texto, trace_id, duracao_stt_s, perfil)
+RES_IGNORADO = "ignorado"  # (RES_IGNORADO, trace_id, duracao_kws_s) frase sem wake word, nunca decodificada
+
+# Estados devolvidos pelo segmentador a cada bloco
+SILENCIO, INICIO_FALA, FALA, FIM_FALA, DESCARTADO = "silencio", "inicio", "fala", "fim", "descartado"
+
+class SegmentadorVAD:
+    """
+    Estágio 2 do pipeline: VAD. Não toca em fila nem em thread,
+    só classifica cada bloco, então é testável bloco a bloco.
+    - detector: decide quadro a quadro se há voz (ver detectorVoz). Padrão: energia (limiar fixo).
+    - blocos_pausa_fim: número fixo de blocos de silêncio para fechar a frase;
+      None = fim adaptativo (VAD_PAUSA_FATOR x pausa típica entre palavras, medida em segundos
+      a partir do último quadro com voz).
+    - pre_fala: blocos anteriores ao disparo (pre-roll), prontos no INICIO_FALA
+      (pre_fala_reservas: o índice de reserva de cada um, ver abaixo).
+    - Frases com menos de VAD_FALA_MIN_S de voz terminam em DESCARTADO (estalos, batidas).
+    - duracao_frase_s: duração (s) da última frase encerrada, pronta no FIM_FALA/DESCARTADO.
+    - chunk_float é uma view de um anel pré-alocado (sem alocação por bloco); ultima_reserva é o
+      índice dela (None = bloco avulso). Todo bloco, silêncio inclusive, gasta uma reserva, e a
+      reserva r é sobrescrita em r + n_blocos. Quem enfileira views para o STT informa em
+      reserva_em_voo a mais antiga ainda não consumida: enquanto o anel inteiro estiver em voo,
+      os blocos novos saem avulsos (alocados) em vez de sobrescrever a fila.
+    """
+    def __init__(self, limiar=LIMIAR_SILENCIO, ganho=GANHO_MIC, blocos_pausa_fim=BLOCOS_PAUSA_FIM,
+                 detector=None, sample_rate=SAMPLE_RATE, pre_roll_s=VAD_PRE_ROLL_S, fala_min_s=VAD_FALA_MIN_S,
+                 block_size=BLOCK_SIZE, blocos_em_voo=FILA_STT_MAX):
+        self.limiar = limiar
+        self.ganho = ganho
+        self.blocos_pausa_fim = blocos_pausa_fim
+        self.detector = detector or DetectorEnergia(limiar)
+        self.sample_rate = sample_rate
+        self.pre_roll_s = pre_roll_s
+        self.fala_min_s = fala_min_s
+        self.pausa_tipica_s = VAD_PAUSA_INICIAL_S
+        self._pre_roll = deque()  # (view, reserva)
+        self.pre_fala: List[np.ndarray] = []
+        self.pre_fala_reservas: List[Optional[int]] = []
+        self.ultima_reserva: Optional[int] = None
+        self.reserva_em_voo: Optional[int] = None
+        self.blocos_avulsos = 0
+        self.descartados = 0
+        self.duracao_frase_s = 0.0
+        blocos_pre_roll = int(np.ceil(pre_roll_s * sample_rate / block_size))
+        self._anel = AnelBlocos(blocos_em_voo + blocos_pre_roll + 4, block_size)
+        self.reset()
+
+    def reset(self):
+        self.falando = False
+        self.blocos_silencio = 0
+        self.blocos_frase = 0
+        self.silencio_s = 0.0   # Silêncio desde o último quadro com voz
+        self.fala_s = 0.0       # Voz efetiva acumulada na frase
+        self._pre_roll.clear()
+        self.detector.reset()
+
+    @property
+    def pausa_fim_s(self) -> float:
+        """Silêncio que encerra a frase no modo adaptativo."""
+        return min(VAD_PAUSA_MAX_S, max(VAD_PAUSA_MIN_S, VAD_PAUSA_FATOR * self.pausa_tipica_s))
+
+    def processar(self, chunk_int16: np.ndarray) -> Tuple[np.ndarray, float, str]:
+        """Retorna (chunk_float, volume, estado) para um bloco cru do driver."""
+        # Processamento de Sinal (Normalização e Ganho)
+        origem = chunk_int16.reshape(-1)
+        reserva = self._anel.proxima_reserva
+        em_voo = self.reserva_em_voo
+        if len(origem) <= self._anel.tamanho_bloco and (em_voo is None or reserva - em_voo < self._anel.n_blocos):
+            chunk_float = self._anel.reservar(len(origem))
+            self.ultima_reserva = reserva
+        else:
+            # Bloco maior que o slot, ou o slot ainda está na fila do STT: bloco avulso
+            chunk_float = np.empty(len(origem), dtype=np.float32)
+            self.ultima_reserva = None
+            self.blocos_avulsos += 1
+        np.multiply(origem, np.float32(self.ganho / 32768.0), out=chunk_float, dtype=np.float32)
+        volume = float(np.linalg.norm(chunk_float) / np.sqrt(len(chunk_float)))
+
+        quadros = self.detector.analisar(chunk_float, volume)
+        com_voz = np.flatnonzero(quadros)
+        duracao_bloco = len(chunk_float) / self.sample_rate
+        duracao_quadro = duracao_bloco / max(1, len(quadros))
+
+        if len(com_voz) >= min(VAD_QUADROS_MIN, len(quadros)) and len(com_voz):
+            if not self.falando:
+                estado = INICIO_FALA
+                self.pre_fala = [bloco for bloco, _ in self._pre_roll]
+                self.pre_fala_reservas = [reserva for _, reserva in self._pre_roll]
+                self._pre_roll.clear()
+                self.fala_s = 0.0
+            else:
+                estado = FALA
+                pausa = self.silencio_s + com_voz[0] * duracao_quadro
+                if pausa >= 0.1:
+                    # Aprende o ritmo do usuário: pausas entre palavras que NÃO encerraram a frase
+                    self.pausa_tipica_s = 0.7 * self.pausa_tipica_s + 0.3 * pausa
+            self.falando = True
+            self.blocos_silencio = 0
+            self.blocos_frase += 1
+            self.fala_s += len(com_voz) * duracao_quadro
+            self.silencio_s = (len(quadros) - 1 - com_voz[-1]) * duracao_quadro
+            return chunk_float, volume, estado
+
+        if not self.falando:
+            self._guardar_pre_roll(chunk_float, duracao_bloco)
+            return chunk_float, volume, SILENCIO
+
+        # Cauda de silêncio ainda pertence à frase
+        self.blocos_silencio += 1
+        self.blocos_frase += 1
+        self.silencio_s += duracao_bloco
+        if self.blocos_pausa_fim is not None:
+            terminou = self.blocos_silencio > self.blocos_pausa_fim
+        else:
+            terminou = self.silencio_s >= self.pausa_fim_s
+        if terminou:
+            self.duracao_frase_s = round(self.blocos_frase * duracao_bloco, 2)
+            self.falando = False
+            self.blocos_silencio = 0
+            self.blocos_frase = 0
+            self.silencio_s = 0.0
+            if self.fala_s < self.fala_min_s:
+                self.descartados += 1
+                return chunk_float, volume, DESCARTADO
+            return chunk_float, volume, FIM_FALA
+        return chunk_float, volume, FALA
+
+    def _guardar_pre_roll(self, chunk_float: np.ndarray, duracao_bloco: float):
+        self._pre_roll.append((chunk_float, self.ultima_reserva))
+        while len(self._pre_roll) * duracao_bloco > self.pre_roll_s:
+            self._pre_roll.popleft()
+
+class EstagioSTT:
+    """
+    Estágio 3 do pipeline: consome mensagens do segmentador e produz resultados.
+    Roda igual numa thread (decoder compartilhado) ou num processo filho
+    (decoder carregado lá dentro, ver _processo_stt).
+    """
+    def __init__(self, decoder, streaming: bool = False, espiao=None, sample_rate=SAMPLE_RATE):
+        self.decoder = decoder
+        self.streaming = StreamingTranscriber(decoder) if streaming else None
+        self.espiao = espiao
+        # A frase inteira num buffer contíguo reaproveitado: o decoder recebe uma view, sem concatenar
+        self._audio = BufferFrase(int(FRASE_CAPACIDADE_S * sample_rate))
+        # Portão da frase: True decodifica, False ignora, None aguarda o espião
+        self._portao: Optional[bool] = True
+        self.duracao_kws = 0.0
+
+    def processar(self, mensagem) -> Optional[tuple]:
+        tipo = mensagem[0]
+
+        if tipo == MSG_INICIO:
+            self._audio.limpar()
+            if self.streaming: self.streaming.reset()
+            atento = mensagem[1] if len(mensagem) > 1 else True
+            self._portao = True if atento or self.espiao is None else None
+            self.duracao_kws = 0.0
+            return None
+
+        if tipo == MSG_AUDIO:
+            if self._portao is False:
+                return None
+            if self._portao is None:
+                return self._aguardar_espiao(mensagem[1])
+            if not self.streaming:
+                self._audio.anexar(mensagem[1])
+                return None
+            return self._alimentar_streaming(mensagem[1])
+
+        if tipo == MSG_DESCARTE:
+            self._audio.limpar()
+            if self.streaming: self.streaming.reset()
+            return None
+
+        if tipo == MSG_FIM:
+            retida = self._portao is None
+            if retida:
+                self._consultar_espiao()  # Frase mais curta que a janela do espião
+            if not self._portao:
+                self._audio.limpar()
+                return (RES_IGNORADO, mensagem[1], self.duracao_kws)
+            inicio = time.perf_counter()
+            em_streaming = self.streaming is not None and not retida
+            if em_streaming:
+                # Só a cauda não confirmada é decodificada aqui
+                texto = self.streaming.finalizar()
+            else:
+                # Sem streaming, ou frase inteira retida pelo espião: nada chegou ao streaming
+                texto = self.decoder.transcribe(self._audio.visao())
+            self._audio.limpar()
+            perfil = "streaming" if em_streaming else getattr(self.decoder, "ultimo_perfil", None)
+            return (RES_FINAL, texto, mensagem[1], time.perf_counter() - inicio, perfil)
+
+        return None
+
+    def _aguardar_espiao(self, chunk: np.ndarray) -> Optional[tuple]:
+        """Acumula o começo da frase até a janela do espião encher; aí decide o portão."""
+        self._audio.anexar(chunk)
+        if len(self._audio) < self.espiao.janela_amostras:
+            return None
+        self._consultar_espiao()
+        if not self._portao:
+            self._audio.limpar()
+            return None
+        if self.streaming:
+            resultado = self._alimentar_streaming(self._audio.visao())
+            self._audio.limpar()
+            return resultado
+        return None
+
+    def _consultar_espiao(self):
+        inicio = time.perf_counter()
+        self._portao = bool(self.espiao.detectar(self._audio.visao())) if len(self._audio) else False
+        self.duracao_kws = time.perf_counter() - inicio
+
+    def _alimentar_streaming(self, chunk: np.ndarray) -> Optional[tuple]:
+        parcial = self.streaming.alimentar(chunk)
+        if parcial:
+            return (RES_PARCIAL, parcial, self.streaming.texto_confirmado)
+        return None
+
+def _processo_stt(entrada, saida, model_size, device, streaming, kws_backend=None):
+    """Alvo do processo filho de STT: carrega o Whisper (e o espião) lá e responde pela fila de saída."""
+    from .whisperTranscriber import WhisperTranscriber
+    from .espiaoPalavra import criar_espiao
+
+    logger = logging.getLogger("BROCA_STT_PROC")
+    try:
+        decoder = WhisperTranscriber(model_size, device)
+        espiao = criar_espiao(kws_backend, decoder) if kws_backend else None
+        estagio = EstagioSTT(decoder, streaming, espiao)
+    except Exception as e:
+        logger.critical(f"❌ Processo de STT não conseguiu carregar o modelo: {e}")
+        saida.put(None)
+        return
+
+    while True:
+        try:
+            mensagem = entrada.get()
+        except (EOFError, OSError, KeyboardInterrupt):
+            break
+        if mensagem is None:
+            break
+        try:
+            resultado = estagio.processar(mensagem)
+        except Exception as e:
+            logger.error(f"Erro no processo de STT: {e}")
+            continue
+        if resultado:
+            saida.put(resultado)
+    saida.put(None)
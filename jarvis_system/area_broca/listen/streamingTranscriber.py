@@ -0,0 +1,129 @@
+# jarvis_system/area_broca/listen/streamingTranscriber.py
+import logging
+import re
+from typing import List, Optional, Tuple
+import numpy as np
+
+from .configAudio import SAMPLE_RATE, INTERVALO_PARCIAL_S, JANELA_MAX_PARCIAL_S, BEAM_FINAL, FRASE_CAPACIDADE_S
+from .anelAudio import BufferFrase
+
+Palavra = Tuple[str, float, float]  # (texto, inicio_s, fim_s)
+
+class StreamingTranscriber:
+    """
+    Transcrição incremental enquanto o usuário ainda fala (política LocalAgreement).
+    1. A cada INTERVALO_PARCIAL_S de áudio novo, decodifica (greedy) o trecho ainda
+       não confirmado e devolve uma hipótese parcial.
+    2. Palavras que aparecem iguais em duas hipóteses seguidas são confirmadas e o
+       áudio correspondente sai da janela (a próxima decodificação começa depois dele).
+    3. No fim da fala só a cauda não confirmada é decodificada (com beam maior),
+       então o fechamento custa pouco mesmo em frases longas.
+
+    O 'decoder' é qualquer objeto com transcribe_words(audio, beam_size, initial_prompt)
+    (ex: WhisperTranscriber com o modelo CPU int8).
+    """
+    def __init__(self, decoder, sample_rate=SAMPLE_RATE, intervalo_s=INTERVALO_PARCIAL_S,
+                 janela_max_s=JANELA_MAX_PARCIAL_S, beam_final=BEAM_FINAL):
+        self.logger = logging.getLogger("BROCA_STREAMING")
+        self.decoder = decoder
+        self.sample_rate = sample_rate
+        self.amostras_intervalo = int(intervalo_s * sample_rate)
+        self.amostras_janela_max = int(janela_max_s * sample_rate)
+        self.beam_final = beam_final
+        self._audio = BufferFrase(int(FRASE_CAPACIDADE_S * sample_rate))
+        self.reset()
+
+    def reset(self):
+        """Descarta o estado da frase atual (chamar no início de cada fala)."""
+        self._audio.limpar()
+        self._amostras_desde_parcial = 0
+        self._inicio_pendente = 0          # Amostra onde começa o áudio ainda não confirmado
+        self._confirmadas: List[str] = []
+        self._hipotese: List[Palavra] = []  # Última hipótese (tempos absolutos)
+        self.ultima_parcial = ""
+
+    @property
+    def texto_confirmado(self) -> str:
+        return " ".join(self._confirmadas)
+
+    def alimentar(self, chunk_float: np.ndarray) -> Optional[str]:
+        """
+        Acrescenta um bloco de áudio. Retorna uma nova hipótese parcial quando
+        houve decodificação e ela mudou; caso contrário None.
+        """
+        self._audio.anexar(chunk_float)
+        self._amostras_desde_parcial += len(chunk_float)
+
+        if self._amostras_desde_parcial < self.amostras_intervalo:
+            return None
+
+        self._amostras_desde_parcial = 0
+        parcial = self._decodificar_parcial()
+        if parcial and parcial != self.ultima_parcial:
+            self.ultima_parcial = parcial
+            return parcial
+        return None
+
+    def finalizar(self) -> str:
+        """Fecha a frase: decodifica a cauda pendente e devolve o texto completo."""
+        pendente = self._audio_pendente()
+        cauda: List[Palavra] = []
+        # Menos de 100ms não tem fala útil (e faz o Whisper alucinar)
+        if len(pendente) >= self.sample_rate // 10:
+            cauda = self.decoder.transcribe_words(
+                pendente, beam_size=self.beam_final, initial_prompt=self.texto_confirmado
+            )
+
+        texto = " ".join(self._confirmadas + [p[0] for p in cauda]).strip()
+        self.reset()
+        return texto
+
+    # =========================================================================
+    # INTERNOS
+    # =========================================================================
+    def _audio_pendente(self) -> np.ndarray:
+        return self._audio.visao(self._inicio_pendente)
+
+    def _decodificar_parcial(self) -> str:
+        pendente = self._audio_pendente()
+
+        # Janela deslizante: se nada estabilizou por muito tempo, confia na hipótese anterior
+        if len(pendente) > self.amostras_janela_max and len(self._hipotese) > 1:
+            self._confirmar(self._hipotese[:-1])
+            pendente = self._audio_pendente()
+
+        deslocamento = self._inicio_pendente / self.sample_rate
+        palavras = [
+            (texto, inicio + deslocamento, fim + deslocamento)
+            for texto, inicio, fim in self.decoder.transcribe_words(
+                pendente, beam_size=1, initial_prompt=self.texto_confirmado
+            )
+        ]
+
+        estaveis = self._prefixo_comum(self._hipotese, palavras)
+        if estaveis:
+            self._confirmar(palavras[:estaveis])
+            palavras = palavras[estaveis:]
+        self._hipotese = palavras
+
+        return " ".join(self._confirmadas + [p[0] for p in palavras]).strip()
+
+    def _confirmar(self, palavras: List[Palavra]):
+        if not palavras:
+            return
+        self._confirmadas.extend(p[0] for p in palavras)
+        self._inicio_pendente = min(int(palavras[-1][2] * self.sample_rate), len(self._audio))
+        self._hipotese = self._hipotese[len(palavras):] if self._hipotese[:len(palavras)] == palavras else []
+        self.logger.debug(f"✅ Confirmado: '{self.texto_confirmado}'")
+
+    @staticmethod
+    def _prefixo_comum(anterior: List[Palavra], atual: List[Palavra]) -> int:
+        n = 0
+        for a, b in zip(anterior, atual):
+            if _normalizar(a[0]) != _normalizar(b[0]):
+                break
+            n += 1
+        return n
+
+def _normalizar(palavra: str) -> str:
+    return re.sub(r"[^\w]", "", palavra.lower())
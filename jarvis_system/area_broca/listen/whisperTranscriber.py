@@ -1,10 +1,47 @@
 # jarvis_system/area_broca/listen/transcriber.py
+import os
+import time
 import numpy as np
 import logging
 from faster_whisper import WhisperModel
 
+from .configAudio import (
+    SAMPLE_RATE, WHISPER_COMPUTE, WHISPER_PERFIL, WHISPER_AQUECER, PERFIS_STT,
+    PERFIL_CURTO_MAX_S, PERFIL_LONGO_MIN_S, PERFIL_CARGA_ALTA
+)
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+NIVEIS_PERFIL = ["rapido", "normal", "preciso"]
+
+def carga_cpu() -> float:
+    """Ocupação da CPU (0..1) desde a leitura anterior; sem psutil, o load average por núcleo."""
+    if PSUTIL_AVAILABLE:
+        return psutil.cpu_percent(interval=None) / 100.0
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return 0.0
+
+def escolher_perfil(duracao_s: float, carga: float = 0.0) -> str:
+    """Comando curto -> rapido, ditado longo -> preciso; CPU sobrecarregada desce um nível."""
+    if duracao_s <= PERFIL_CURTO_MAX_S:
+        nivel = 0
+    elif duracao_s >= PERFIL_LONGO_MIN_S:
+        nivel = 2
+    else:
+        nivel = 1
+    if carga >= PERFIL_CARGA_ALTA:
+        nivel = max(0, nivel - 1)
+    return NIVEIS_PERFIL[nivel]
+
 class WhisperTranscriber:
-    def __init__(self, model_size="base", device="cpu", compute_type="int8"):
+    def __init__(self, model_size="base", device="cpu", compute_type=WHISPER_COMPUTE,
+                 perfil=WHISPER_PERFIL, aquecer=WHISPER_AQUECER):
         self.logger = logging.getLogger("BROCA_WHISPER")
         self.logger.info(f"Carregando Whisper ({model_size}) em {device}...")
         try:
@@ -14,23 +51,57 @@ class WhisperTranscriber:
             self.logger.critical(f"Erro ao carregar Whisper: {e}")
             raise
 
-    def transcribe(self, audio_buffer_float):
+        self.perfil = perfil
+        self.ultimo_perfil = None
+        if aquecer:
+            self.aquecer()
+
+    def definir_perfil(self, perfil: str):
+        """'auto' ou um dos PERFIS_STT; vale a partir da próxima frase."""
+        if perfil != "auto" and perfil not in PERFIS_STT:
+            raise ValueError(f"Perfil de STT desconhecido: '{perfil}'")
+        self.perfil = perfil
+
+    def aquecer(self):
+        """
+        A primeira inferência paga alocação de memória e inicialização dos kernels.
+        Decodificar 1s de silêncio no bootstrap tira esse custo do primeiro comando.
+        """
+        inicio = time.perf_counter()
+        try:
+            segments, _ = self.model.transcribe(
+                np.zeros(SAMPLE_RATE, dtype=np.float32), beam_size=1, language="pt",
+                vad_filter=False, without_timestamps=True, condition_on_previous_text=False
+            )
+            list(segments)  # O gerador é preguiçoso: sem consumir, nada é decodificado
+            self.logger.info(f"🔥 Whisper aquecido em {(time.perf_counter() - inicio) * 1000:.0f}ms.")
+        except Exception as e:
+            self.logger.warning(f"⚠️ Aquecimento do Whisper falhou: {e}")
+
+    def transcribe(self, audio_buffer_float, perfil=None):
         """
-        Recebe uma lista de buffers float, concatena e transcreve.
+        Recebe a frase (np.ndarray float32, ou uma lista de buffers float) e transcreve.
+        O perfil de decodificação vem do argumento, do perfil fixo ou da duração/carga (auto).
         """
-        if not audio_buffer_float:
+        if audio_buffer_float is None or len(audio_buffer_float) == 0:
             return ""
 
         try:
-            audio_final = np.concatenate(audio_buffer_float)
-            
+            if isinstance(audio_buffer_float, np.ndarray):
+                audio_final = audio_buffer_float  # View do buffer da frase: sem cópia
+            else:
+                audio_final = np.concatenate(audio_buffer_float)
+
+            perfil = perfil or self.perfil
+            if perfil == "auto":
+                perfil = escolher_perfil(len(audio_final) / SAMPLE_RATE, carga_cpu())
+            self.ultimo_perfil = perfil
+
             segments, _ = self.model.transcribe(
                 audio_final,
-                beam_size=5,
                 language="pt",
-                vad_filter=True,
-                vad_parameters=dict(min_silence_duration_ms=500),
-                condition_on_previous_text=False
+                condition_on_previous_text=False,
+                **PERFIS_STT[perfil]
             )
 
             texto_acumulado = []
@@ -39,7 +110,39 @@ class WhisperTranscriber:
                     texto_acumulado.append(segment.text)
 
             return " ".join(texto_acumulado).strip()
-            
+
         except Exception as e:
             self.logger.error(f"Erro na inferência: {e}")
-            return ""
\ No newline at end of file
+            return ""
+
+    def transcribe_words(self, audio_float, beam_size=1, initial_prompt=None):
+        """
+        Decodifica um trecho contínuo (np.ndarray float32, 16kHz) e retorna as
+        palavras com tempos relativos ao início do trecho: [(palavra, inicio_s, fim_s)].
+        Usado pelo modo streaming (hipóteses parciais), por isso o padrão é greedy.
+        """
+        if audio_float is None or len(audio_float) == 0:
+            return []
+
+        try:
+            segments, _ = self.model.transcribe(
+                audio_float,
+                beam_size=beam_size,
+                language="pt",
+                vad_filter=False,
+                word_timestamps=True,
+                initial_prompt=initial_prompt or None,
+                condition_on_previous_text=False
+            )
+
+            palavras = []
+            for segment in segments:
+                if segment.no_speech_prob >= 0.6:
+                    continue
+                for word in (segment.words or []):
+                    palavras.append((word.word.strip(), word.start, word.end))
+            return [p for p in palavras if p[0]]
+
+        except Exception as e:
+            self.logger.error(f"Erro na inferência incremental: {e}")
+            return []
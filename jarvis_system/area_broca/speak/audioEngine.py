@@ -1,7 +1,9 @@
 # jarvis_system/area_broca/speak/engine.py
+import io
 import pygame
 import pyttsx3
 import time
+from jarvis_system.cortex_frontal.observability import tracer
 
 class AudioEngine:
     def __init__(self, logger):
@@ -25,14 +27,20 @@ class AudioEngine:
         try:
             pygame.mixer.music.load(file_path)
             pygame.mixer.music.play()
+            tracer.mark("primeiro_audio", once=True)
             while pygame.mixer.music.get_busy() and not stop_event.is_set():
                 pygame.time.Clock().tick(10)
         except Exception as e:
             self.log.error(f"Erro playback: {e}")
 
+    def play_bytes(self, audio_bytes, stop_event):
+        """Toca um áudio (MP3/WAV) direto da memória, sem passar pelo disco."""
+        self.play_file(io.BytesIO(audio_bytes), stop_event)
+
     def speak_offline(self, text):
         if self.offline_engine:
             try:
+                tracer.mark("primeiro_audio", once=True)
                 self.offline_engine.say(text)
                 self.offline_engine.runAndWait()
             except: pass
\ No newline at end of file
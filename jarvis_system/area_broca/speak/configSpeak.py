@@ -27,4 +27,25 @@ FISH_TAGS = {
     "DARK": "(serious)",
     
     # Adicione mais conforme necessário para alinhar com headme-contexto.md
-}
\ No newline at end of file
+}
+
+# --- FALA EM TRECHOS (Streaming TTS) ---
+TTS_STREAMING = os.getenv("JARVIS_TTS_STREAMING", "1") == "1"
+TRECHO_MIN_CHARS = 25      # Frases curtas demais são agrupadas (prosódia e custo por requisição)
+TRECHO_MAX_CHARS = 220     # Frases longas são quebradas em vírgulas/ponto e vírgula
+TRECHOS_ANTECIPADOS = 1    # Quantos trechos podem ficar sintetizados à espera da reprodução
+RESPOSTA_PAUSA_MAX_S = 10.0  # Espera máxima pela próxima frase de uma resposta em streaming
+
+
+# --- CACHE DE SÍNTESE (Frases dinâmicas já faladas) ---
+SPEECH_CACHE_DIR = os.path.join(os.getcwd(), "jarvis_system", "data", "voices", "cache")
+SPEECH_CACHE_MAX_MB = float(os.getenv("JARVIS_TTS_CACHE_MB", "200"))
+SPEECH_CACHE_INDICE_S = 30.0   # Intervalo mínimo entre regravações do índice (o encerramento sempre grava)
+
+# Frases fixas do sistema, sintetizadas em segundo plano na partida
+TTS_AQUECER_CACHE = os.getenv("JARVIS_TTS_AQUECER", "1") == "1"
+FRASES_AQUECIMENTO = [
+    "Cancelado.",
+    "Ocorreu um erro interno no processamento.",
+    "Estou desconectado do meu cérebro.",
+]
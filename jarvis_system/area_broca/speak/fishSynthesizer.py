@@ -6,18 +6,16 @@ from .configSpeak import FISH_AUDIO_API_URL, FISH_API_KEY, FISH_MODEL_ID, FISH_T
 class FishSynthesizer:
     def __init__(self, logger):
         self.log = logger
+        self.voice_id = FISH_MODEL_ID or "default"
 
-    def synthesize(self, text, metadata, output_path):
-        if not FISH_API_KEY:
-            self.log.error("API Key Fish Audio não configurada.")
-            return False
-
+    def build_payload(self, text, metadata):
+        """Texto final enviado à API (tag de emoção + texto limpo)."""
         # Verifica se o texto já começa com uma tag gerada nativamente pelo LLM (ex: "(amused) ...")
         match = re.match(r'^\(.*?\)', text.strip())
         
         if match:
             # O LLM enviou uma emoção! Vamos preservá-la e mandar do jeito que veio.
-            text_payload = text.strip()
+            return text.strip()
         else:
             # O LLM não mandou emoção no texto. Vamos usar a sua lógica de fallback (metadata)
             cat = metadata.get('category', 'GENERICO')
@@ -31,8 +29,23 @@ class FishSynthesizer:
 
             # Remove lixo para não duplicar, caso haja erro
             clean_text = re.sub(r'\(.*?\)', '', text).strip()
-            text_payload = f"{tag} {clean_text}".strip()
+            return f"{tag} {clean_text}".strip()
+
+    def synthesize(self, text, metadata, output_path):
+        audio = self.synthesize_bytes(text, metadata)
+        if not audio:
+            return False
+        with open(output_path, "wb") as f:
+            f.write(audio)
+        return True
+
+    def synthesize_bytes(self, text, metadata):
+        """Sintetiza e devolve o MP3 em memória (None em caso de falha)."""
+        if not FISH_API_KEY:
+            self.log.error("API Key Fish Audio não configurada.")
+            return None
 
+        text_payload = self.build_payload(text, metadata)
         self.log.info(f"🎭 Payload Enviado: '{text_payload}'")
 
         # --- ENVIO PARA API ---
@@ -52,12 +65,10 @@ class FishSynthesizer:
         try:
             response = requests.post(FISH_AUDIO_API_URL, json=payload, headers=headers, timeout=15)
             if response.status_code == 200:
-                with open(output_path, "wb") as f:
-                    f.write(response.content)
-                return True
+                return response.content
             else:
                 self.log.error(f"Erro API Fish: {response.text}")
-                return False
+                return None
         except Exception as e:
             self.log.error(f"Erro Conexão API: {e}")
-            return False
\ No newline at end of file
+            return None
\ No newline at end of file
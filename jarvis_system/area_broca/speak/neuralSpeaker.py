@@ -3,7 +3,7 @@ import threading
 import queue
 import os
 import time
-from jarvis_system.cortex_frontal.observability import JarvisLogger
+from jarvis_system.cortex_frontal.observability import JarvisLogger, tracer
 from jarvis_system.cortex_frontal.event_bus import bus, Evento
 from jarvis_system.protocol import Eventos
 import re
@@ -13,15 +13,18 @@ try:
 except ImportError:
     VoiceDirector = None
 
-from .configSpeak import FISH_TAGS
+from .configSpeak import FISH_TAGS, TTS_STREAMING, TTS_AQUECER_CACHE, FRASES_AQUECIMENTO, RESPOSTA_PAUSA_MAX_S
 from .audioEngine import AudioEngine
 from .voiceIndexer import VoiceIndexer
 from .fishSynthesizer import FishSynthesizer
+from .streamingSpeech import FalaEmTrechos, dividir_em_trechos
+from .speechCache import SpeechCache, SintetizadorEmCache
 
 class NeuralSpeaker:
     def __init__(self):
         self.log = JarvisLogger("BROCA_VOICE")
         self._queue = queue.Queue()
+        self._pendente = None  # Item retirado da fila que pertence à próxima fala
         self._stop_event = threading.Event()
         self._thread = None
         
@@ -29,7 +32,9 @@ class NeuralSpeaker:
         base_dir = os.path.join(os.getcwd(), "jarvis_system", "data", "voices")
         self.engine = AudioEngine(self.log)
         self.indexer = VoiceIndexer(base_dir, self.log)
-        self.synth = FishSynthesizer(self.log)
+        self.cache = SpeechCache(log=self.log)
+        self.synth = SintetizadorEmCache(FishSynthesizer(self.log), self.cache, self.log)
+        self.fala = FalaEmTrechos(self.synth, self.engine, self.log)
         self.voice_director = VoiceDirector() if VoiceDirector else None
 
         # Barramento
@@ -38,18 +43,33 @@ class NeuralSpeaker:
 
     def _adicionar_a_fila(self, evento: Evento):
         text = evento.dados.get("texto")
-        if text: self._queue.put(text)
+        fim = bool(evento.dados.get("fim"))
+        if text or fim:
+            self._queue.put((text or "", evento.dados.get(tracer.TRACE_KEY), evento.dados.get("resposta"), fim))
 
-    def _process_text(self, text):
-        # 1. Extração e Limpeza de Tags Manuais (Evita ler parênteses)
-        manual_tag = None
+    @staticmethod
+    def _separar_tag(text):
+        """Tag manual (ex: "serious") e o texto limpo, que é o que será falado e indexado."""
         match = re.search(r'\(([^)]*)\)', text)
-        if match:
-            manual_tag = match.group(1) # Pega o que está dentro (ex: "serious")
-        
-        # O texto limpo é o que será falado e indexado
-        clean_text = re.sub(r'\([^)]*\)', '', text).strip()
-        
+        return (match.group(1) if match else None), re.sub(r'\([^)]*\)', '', text).strip()
+
+    def _process_text(self, text, continuacao=None):
+        """
+        'continuacao': iterável com as frases seguintes da mesma resposta (streaming do LLM).
+        Elas herdam a emoção da primeira, sem nova consulta ao diretor de voz, e entram
+        no mesmo pipeline de síntese (a frase N+1 sintetiza enquanto a N toca).
+        """
+        # 1. Extração e Limpeza de Tags Manuais (Evita ler parênteses)
+        manual_tag, clean_text = self._separar_tag(text)
+
+        if continuacao is not None:
+            continuacao = iter(continuacao)
+            while not clean_text:
+                proximo = next(continuacao, None)
+                if proximo is None: return
+                tag, clean_text = self._separar_tag(proximo)
+                manual_tag = manual_tag or tag
+
         if not clean_text: return
 
         # Usamos o clean_text para gerar a chave de cache
@@ -60,6 +80,7 @@ class NeuralSpeaker:
         if path:
             self.log.info(f"💾 Memória: {entry.get('id')}")
             self.engine.play_file(path, self._stop_event)
+            self._falar_continuacao(continuacao, entry)
             return
 
         # 3. Determina a Emoção (Prioridade: Manual > Automática)
@@ -68,8 +89,13 @@ class NeuralSpeaker:
         sub = self.indexer.detect_sub_context(clean_text, cat)
         
         emotion = manual_tag if manual_tag else "neutral"
-        
-        if not manual_tag and self.voice_director:
+        trechos = dividir_em_trechos(clean_text) if TTS_STREAMING else []
+
+        # Já sintetizada (mesmo texto + categoria + tag): o diretor de voz nem é consultado
+        chave_cache = {"category": cat, "tag_manual": manual_tag or ""}
+        em_cache = self.synth.em_cache(trechos or [clean_text], chave_cache)
+
+        if not manual_tag and self.voice_director and not em_cache:
             try: emotion = self.voice_director.analisar_tom(clean_text)
             except: pass
 
@@ -89,11 +115,28 @@ class NeuralSpeaker:
             "sub_context": sub,
             "key_hash": key,
             "emotion": emotion, # A tag manual agora viaja aqui!
+            "tag_manual": manual_tag or "",
             "file_path": os.path.join(rel_dir, filename).replace("\\", "/")
         }
 
-        # 5. Síntese ou Fallback (Sempre usando o clean_text)
-        success = self.synth.synthesize(clean_text, metadata, out_path)
+        # 5. Streaming: sintetiza o trecho N+1 enquanto o N toca (tudo em memória)
+        if trechos:
+            if continuacao is not None:
+                trechos = self._trechos_com_continuacao(trechos, continuacao)
+            audios = self.fala.falar(trechos, metadata, self._stop_event)
+            # Respostas de um trecho só continuam indo para a memória vocal
+            if len(trechos) == 1 and audios and audios[0]:
+                try:
+                    with open(out_path, "wb") as f:
+                        f.write(audios[0])
+                    self.indexer.save_entry(metadata)
+                except OSError as e:
+                    self.log.warning(f"Falha ao salvar memória vocal: {e}")
+            return
+
+        # 6. Síntese ou Fallback (Sempre usando o clean_text)
+        with tracer.span("tts_sintese"):
+            success = self.synth.synthesize(clean_text, metadata, out_path)
         
         if success:
             self.indexer.save_entry(metadata)
@@ -101,16 +144,101 @@ class NeuralSpeaker:
         else:
             # Adeus Vergonha Alheia: O fallback agora recebe o texto sem tags!
             self.engine.speak_offline(clean_text)
+        self._falar_continuacao(continuacao, metadata)
+
+    def _trechos_com_continuacao(self, trechos, continuacao):
+        yield from trechos
+        for text in continuacao:
+            # Tags das frases seguintes são descartadas: a emoção é a da primeira
+            _, clean_text = self._separar_tag(text)
+            if clean_text:
+                yield from dividir_em_trechos(clean_text)
+
+    def _falar_continuacao(self, continuacao, metadata):
+        if continuacao is None:
+            return
+        if TTS_STREAMING:
+            self.fala.falar(self._trechos_com_continuacao([], continuacao), metadata, self._stop_event)
+            return
+        for text in continuacao:
+            _, clean_text = self._separar_tag(text)
+            if not clean_text or self._stop_event.is_set():
+                continue
+            with tracer.span("tts_sintese"):
+                audio = self.synth.synthesize_bytes(clean_text, metadata)
+            if audio:
+                self.engine.play_bytes(audio, self._stop_event)
+            else:
+                self.engine.speak_offline(clean_text)
+
+    def aquecer_cache(self, frases, emotion="neutral") -> int:
+        """
+        Pré-sintetiza frases recorrentes (confirmações, status) para que nunca
+        esperem a rede. Usa a mesma divisão em trechos da fala, então o cache
+        bate com o que o streaming vai pedir. Retorna quantos trechos foram sintetizados.
+        """
+        itens = []
+        for frase in frases:
+            clean_text = re.sub(r'\([^)]*\)', '', frase).strip()
+            if not clean_text: continue
+            cat = self.indexer.determine_category(clean_text)
+            metadata = {
+                "category": cat,
+                "sub_context": self.indexer.detect_sub_context(clean_text, cat),
+                "emotion": emotion,
+                "tag_manual": "",
+            }
+            trechos = dividir_em_trechos(clean_text) if TTS_STREAMING else [clean_text]
+            itens.extend((trecho, metadata) for trecho in trechos)
+
+        sintetizados = self.synth.aquecer(itens)
+        self.log.info(f"🔥 Cache de síntese aquecido: {sintetizados} novos de {len(itens)} trechos.")
+        return sintetizados
+
+    def _retirar(self, timeout):
+        if self._pendente is not None:
+            item, self._pendente = self._pendente, None
+            return item
+        try:
+            item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        self._queue.task_done()
+        return item
+
+    def _frases_da_resposta(self, resposta):
+        """
+        Frases seguintes de uma resposta em streaming, na ordem em que o LLM as solta.
+        Termina no marcador de fim; um item de outra fala volta para _pendente.
+        """
+        prazo = time.monotonic() + RESPOSTA_PAUSA_MAX_S
+        while not self._stop_event.is_set():
+            item = self._retirar(timeout=0.2)
+            if item is None:
+                if time.monotonic() >= prazo:
+                    self.log.warning(f"Resposta {resposta} sem marcador de fim; encerrando a fala.")
+                    return
+                continue
+            text, _, rid, fim = item
+            if rid != resposta:
+                self._pendente = item
+                return
+            if fim:
+                return
+            prazo = time.monotonic() + RESPOSTA_PAUSA_MAX_S
+            yield text
 
     def _worker(self):
         while not self._stop_event.is_set():
+            item = self._retirar(timeout=1.0)
+            if item is None: continue
+            text, trace_id, resposta, fim = item
+            if fim: continue  # Marcador de uma resposta que já terminou
             try:
-                text = self._queue.get(timeout=1.0)
                 bus.publicar(Evento(Eventos.STATUS_FALA, {"status": True}))
-                self._process_text(text)
+                with tracer.activate(trace_id):
+                    self._process_text(text, self._frases_da_resposta(resposta) if resposta else None)
                 bus.publicar(Evento(Eventos.STATUS_FALA, {"status": False}))
-                self._queue.task_done()
-            except queue.Empty: continue
             except Exception as e:
                 self.log.error(f"Worker Crash: {e}")
 
@@ -119,8 +247,17 @@ class NeuralSpeaker:
             self._stop_event.clear()
             self._thread = threading.Thread(target=self._worker, daemon=True)
             self._thread.start()
+            if TTS_AQUECER_CACHE and FRASES_AQUECIMENTO:
+                threading.Thread(target=self._aquecer_em_segundo_plano, name="BrocaAquecimento", daemon=True).start()
+
+    def _aquecer_em_segundo_plano(self):
+        try:
+            self.aquecer_cache(FRASES_AQUECIMENTO)
+        except Exception as e:
+            self.log.warning(f"Aquecimento do cache de síntese falhou: {e}")
 
     def stop(self):
         self._stop_event.set()
         if self._thread:
-            self._thread.join(timeout=2.0)
\ No newline at end of file
+            self._thread.join(timeout=2.0)
+        self.cache.salvar()
\ No newline at end of file
@@ -0,0 +1,232 @@
+# jarvis_system/area_broca/speak/speechCache.py
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from .configSpeak import SPEECH_CACHE_DIR, SPEECH_CACHE_MAX_MB, SPEECH_CACHE_INDICE_S
+from .voiceIndexer import VoiceIndexer
+
+class SpeechCache:
+    """
+    Cache persistente de áudio sintetizado, endereçado por conteúdo:
+    chave = sha1(voz | categoria | tag manual | texto normalizado).
+    A emoção escolhida pelo diretor de voz fica fora da chave: ela é decidida por uma chamada
+    à rede (e varia), então a consulta tem que acontecer antes dela.
+    - Um arquivo por chave em 'diretorio' + cache_index.json com tamanho e último uso.
+    - O índice é regravado no máximo a cada intervalo_indice_s (e no salvar() do encerramento);
+      áudios gravados depois do último índice são readotados na carga.
+    - Limite em bytes com despejo LRU (o menos usado recentemente sai primeiro).
+    - Contadores de acerto/falha para o painel de métricas.
+    """
+    INDICE = "cache_index.json"
+
+    def __init__(self, diretorio=SPEECH_CACHE_DIR, limite_bytes=int(SPEECH_CACHE_MAX_MB * 1024 * 1024),
+                 log=None, extensao="mp3", intervalo_indice_s=SPEECH_CACHE_INDICE_S):
+        self.log = log
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+        self.extensao = extensao
+        self.intervalo_indice_s = intervalo_indice_s
+        self._indice_salvo_em = time.monotonic()
+        self._lock = threading.Lock()
+        self._entradas: "OrderedDict[str, dict]" = OrderedDict()  # Mais antigo primeiro
+        self._total_bytes = 0
+        self._sujo = False
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+
+        os.makedirs(self.diretorio, exist_ok=True)
+        self._carregar()
+
+    @staticmethod
+    def chave(texto: str, categoria: str = "", voz: str = "", tag: str = "") -> str:
+        base = f"{voz}|{categoria}|{tag}|{VoiceIndexer.normalize_key(texto)}"
+        return hashlib.sha1(base.encode("utf-8")).hexdigest()
+
+    def get(self, chave: str) -> Optional[bytes]:
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self.falhas += 1
+                return None
+            try:
+                with open(self._caminho(chave), "rb") as f:
+                    audio = f.read()
+            except OSError:
+                # Arquivo apagado por fora: a entrada deixa de valer
+                self._remover(chave)
+                self.falhas += 1
+                return None
+            entrada["ultimo_uso"] = time.time()
+            self._entradas.move_to_end(chave)
+            self._sujo = True
+            self.acertos += 1
+            return audio
+
+    def put(self, chave: str, audio: bytes, **meta):
+        if not audio or len(audio) > self.limite_bytes:
+            return
+        with self._lock:
+            if chave in self._entradas:
+                self._remover(chave)
+            try:
+                with open(self._caminho(chave), "wb") as f:
+                    f.write(audio)
+            except OSError as e:
+                self._avisar(f"Falha ao gravar cache de síntese: {e}")
+                return
+            self._entradas[chave] = {"bytes": len(audio), "ultimo_uso": time.time(), **meta}
+            self._total_bytes += len(audio)
+            self._despejar()
+            self._sujo = True
+            if time.monotonic() - self._indice_salvo_em >= self.intervalo_indice_s:
+                self._salvar_indice()
+
+    def __contains__(self, chave: str) -> bool:
+        with self._lock:
+            return chave in self._entradas
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self._total_bytes,
+                "limite_bytes": self.limite_bytes,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": round(self.acertos / consultas, 3) if consultas else 0.0,
+                "despejos": self.despejos,
+            }
+
+    def salvar(self):
+        """Persiste a ordem LRU atualizada pelos acertos (chamado no encerramento)."""
+        with self._lock:
+            if self._sujo:
+                self._salvar_indice()
+
+    def limpar(self):
+        with self._lock:
+            for chave in list(self._entradas):
+                self._remover(chave)
+            self._salvar_indice()
+
+    # =========================================================================
+    # INTERNOS (sempre com _lock adquirido)
+    # =========================================================================
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, f"{chave}.{self.extensao}")
+
+    def _remover(self, chave: str):
+        entrada = self._entradas.pop(chave, None)
+        if entrada is None:
+            return
+        self._total_bytes -= entrada.get("bytes", 0)
+        try:
+            os.remove(self._caminho(chave))
+        except OSError:
+            pass
+
+    def _despejar(self):
+        while self._total_bytes > self.limite_bytes and self._entradas:
+            chave = next(iter(self._entradas))
+            self._remover(chave)
+            self.despejos += 1
+
+    def _carregar(self):
+        caminho = os.path.join(self.diretorio, self.INDICE)
+        dados = {}
+        if os.path.exists(caminho):
+            try:
+                with open(caminho, "r", encoding="utf-8") as f:
+                    dados = json.load(f)
+            except Exception as e:
+                self._avisar(f"Índice do cache de síntese ilegível, recomeçando: {e}")
+
+        # Áudios gravados depois do último índice salvo (ex: queda antes do salvar())
+        sufixo = f".{self.extensao}"
+        for arquivo in os.listdir(self.diretorio):
+            chave = arquivo[:-len(sufixo)]
+            if arquivo.endswith(sufixo) and chave not in dados:
+                info = os.stat(os.path.join(self.diretorio, arquivo))
+                dados[chave] = {"bytes": info.st_size, "ultimo_uso": info.st_mtime}
+                self._sujo = True
+
+        for chave, entrada in sorted(dados.items(), key=lambda item: item[1].get("ultimo_uso", 0)):
+            if os.path.exists(self._caminho(chave)):
+                self._entradas[chave] = entrada
+                self._total_bytes += entrada.get("bytes", 0)
+        self._despejar()
+
+    def _salvar_indice(self):
+        caminho = os.path.join(self.diretorio, self.INDICE)
+        temporario = caminho + ".tmp"
+        try:
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump(self._entradas, f, ensure_ascii=False)
+            os.replace(temporario, caminho)
+            self._sujo = False
+            self._indice_salvo_em = time.monotonic()
+        except OSError as e:
+            self._avisar(f"Falha ao salvar índice do cache de síntese: {e}")
+
+    def _avisar(self, mensagem: str):
+        if self.log:
+            self.log.warning(mensagem)
+
+class SintetizadorEmCache:
+    """
+    Envolve o sintetizador (mesma interface do FishSynthesizer): só vai à rede
+    quando a combinação texto + categoria + tag manual + voz nunca foi sintetizada.
+    """
+    def __init__(self, synth, cache: SpeechCache, log):
+        self.synth = synth
+        self.cache = cache
+        self.log = log
+
+    def chave_para(self, text, metadata) -> str:
+        return SpeechCache.chave(
+            text, metadata.get("category", ""), getattr(self.synth, "voice_id", ""), metadata.get("tag_manual", "")
+        )
+
+    def em_cache(self, textos: Iterable[str], metadata) -> bool:
+        """Todos os trechos já sintetizados? (consulta antes de decidir a emoção)"""
+        return all(self.chave_para(text, metadata) in self.cache for text in textos)
+
+    def synthesize_bytes(self, text, metadata):
+        chave = self.chave_para(text, metadata)
+        audio = self.cache.get(chave)
+        if audio:
+            self.log.info(f"💾 Cache de síntese: '{text[:40]}'")
+            return audio
+
+        audio = self.synth.synthesize_bytes(text, metadata)
+        if audio:
+            self.cache.put(chave, audio, texto=text[:120], emocao=metadata.get("emotion", "neutral"))
+        return audio
+
+    def synthesize(self, text, metadata, output_path):
+        audio = self.synthesize_bytes(text, metadata)
+        if not audio:
+            return False
+        with open(output_path, "wb") as f:
+            f.write(audio)
+        return True
+
+    def aquecer(self, itens: Iterable) -> int:
+        """Pré-sintetiza pares (texto, metadata) ausentes do cache. Retorna quantos foram à rede."""
+        sintetizados = 0
+        for text, metadata in itens:
+            if self.chave_para(text, metadata) in self.cache:
+                continue
+            audio = self.synth.synthesize_bytes(text, metadata)
+            if audio:
+                self.cache.put(self.chave_para(text, metadata), audio,
+                               texto=text[:120], emocao=metadata.get("emotion", "neutral"))
+                sintetizados += 1
+        return sintetizados
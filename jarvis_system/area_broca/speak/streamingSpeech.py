@@ -0,0 +1,127 @@
+# jarvis_system/area_broca/speak/streamingSpeech.py
+import queue
+import re
+import threading
+from typing import Iterable, List, Optional
+
+from jarvis_system.cortex_frontal.observability import tracer
+from .configSpeak import TRECHO_MIN_CHARS, TRECHO_MAX_CHARS, TRECHOS_ANTECIPADOS
+
+_FIM_FRASE = re.compile(r'(?<=[.!?…])\s+')
+_FIM_ORACAO = re.compile(r'(?<=[,;:])\s+')
+
+def dividir_em_trechos(texto: str, min_chars=TRECHO_MIN_CHARS, max_chars=TRECHO_MAX_CHARS) -> List[str]:
+    """
+    Quebra a resposta em trechos falados: fim de frase primeiro; frases longas
+    caem para vírgula/ponto e vírgula e, em último caso, para espaços.
+    Trechos curtos são agrupados com o seguinte.
+    """
+    texto = " ".join(texto.split())
+    if not texto:
+        return []
+
+    partes = []
+    for frase in _FIM_FRASE.split(texto):
+        if len(frase) <= max_chars:
+            partes.append(frase)
+            continue
+        for oracao in _FIM_ORACAO.split(frase):
+            partes.extend(_quebrar_por_palavras(oracao, max_chars))
+
+    trechos, atual = [], ""
+    for parte in partes:
+        atual = f"{atual} {parte}".strip()
+        if len(atual) >= min_chars:
+            trechos.append(atual)
+            atual = ""
+    if atual:
+        if trechos and len(trechos[-1]) + len(atual) < max_chars:
+            trechos[-1] = f"{trechos[-1]} {atual}"
+        else:
+            trechos.append(atual)
+    return trechos
+
+def _quebrar_por_palavras(texto: str, max_chars: int) -> List[str]:
+    pedacos, atual = [], ""
+    for palavra in texto.split():
+        if atual and len(atual) + 1 + len(palavra) > max_chars:
+            pedacos.append(atual)
+            atual = palavra
+        else:
+            atual = f"{atual} {palavra}".strip()
+    if atual:
+        pedacos.append(atual)
+    return pedacos
+
+class FalaEmTrechos:
+    """
+    Produtor/consumidor de fala: uma thread sintetiza o trecho N+1 enquanto o
+    trecho N toca. Os áudios ficam só em memória (engine.play_bytes).
+    - trechos: qualquer iterável; pode ser um gerador que ainda espera o LLM
+      (os trechos seguintes de uma mesma resposta entram no mesmo pipeline).
+    - synth: qualquer objeto com synthesize_bytes(texto, metadata) -> bytes | None.
+    - engine: qualquer objeto com play_bytes(bytes, stop_event) e speak_offline(texto).
+    """
+    def __init__(self, synth, engine, log, antecipados=TRECHOS_ANTECIPADOS):
+        self.synth = synth
+        self.engine = engine
+        self.log = log
+        self.antecipados = max(1, antecipados)
+
+    def falar(self, trechos: Iterable[str], metadata: dict, stop_event: threading.Event) -> List[Optional[bytes]]:
+        """Fala os trechos em ordem e devolve os áudios sintetizados (None onde a síntese falhou)."""
+        prontos = queue.Queue(maxsize=self.antecipados)
+        cancelado = threading.Event()
+        trace_id = tracer.current()
+        audios: List[Optional[bytes]] = []
+
+        produtor = threading.Thread(
+            target=self._sintetizar, args=(trechos, metadata, prontos, cancelado, trace_id),
+            name="BrocaSintese", daemon=True
+        )
+        produtor.start()
+
+        try:
+            while True:
+                pronto = self._proximo(prontos, produtor, stop_event)
+                if pronto is None or stop_event.is_set():
+                    break
+                trecho, audio = pronto
+                audios.append(audio)
+                if audio:
+                    self.engine.play_bytes(audio, stop_event)
+                else:
+                    # Falha pontual: só este trecho vai para a voz offline
+                    self.engine.speak_offline(trecho)
+        finally:
+            cancelado.set()
+            produtor.join(timeout=1.0)
+        return audios
+
+    def _proximo(self, prontos: queue.Queue, produtor: threading.Thread, stop_event: threading.Event):
+        while not stop_event.is_set():
+            try:
+                return prontos.get(timeout=0.1)
+            except queue.Empty:
+                if not produtor.is_alive() and prontos.empty():
+                    return None
+        return None
+
+    def _sintetizar(self, trechos, metadata, prontos, cancelado, trace_id):
+        for indice, trecho in enumerate(trechos):
+            if cancelado.is_set():
+                return
+            try:
+                with tracer.span("tts_sintese", trace_id, trecho=indice, caracteres=len(trecho)):
+                    audio = self.synth.synthesize_bytes(trecho, metadata)
+            except Exception as e:
+                self.log.error(f"Erro na síntese do trecho {indice}: {e}")
+                audio = None
+
+            # Fila limitada: só sintetiza adiante o que cabe em TRECHOS_ANTECIPADOS
+            while not cancelado.is_set():
+                try:
+                    prontos.put((trecho, audio), timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
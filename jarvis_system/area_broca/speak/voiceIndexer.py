@@ -15,7 +15,8 @@ class VoiceIndexer:
         os.makedirs(self.audio_dir, exist_ok=True)
         self.load_index()
 
-    def normalize_key(self, text: str) -> str:
+    @staticmethod
+    def normalize_key(text: str) -> str:
         if not text: return ""
         text = re.sub(r'\([^)]*\)', '', text) 
         text = text.lower()
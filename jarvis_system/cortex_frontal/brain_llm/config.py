@@ -12,11 +12,61 @@ MODEL_LOCAL = os.getenv("JARVIS_MODEL_LOCAL", "qwen2.5:3b")
 TEMP_CLOUD = 0.6
 TEMP_LOCAL = 0.7
 MAX_TOKENS = 600
+OLLAMA_KEEP_ALIVE = os.getenv("JARVIS_OLLAMA_KEEP_ALIVE", "30m")  # Mantém modelo + KV cache do prefixo na memória
+
+# --- ORÇAMENTO DE TOKENS DO PROMPT (estimativa offline, sem tokenizer) ---
+TOKEN_CHARS_POR_TOKEN = 3.5        # Média de tokenizers BPE em português
+TOKEN_BUDGET_TOTAL = 3000          # Entrada (system + user); a saída é MAX_TOKENS
+TOKEN_BUDGET_CATALOGO = 800        # Teto fixo: catálogo cortado sempre igual mantém o prefixo estável
+TOKEN_BUDGET_USUARIO = 400         # Fala + dica de intenção
+TOKEN_BUDGET_MEMORIA_MAX = 1000    # A memória (RAG) fica com o que sobrar, até este teto
+
+# --- MEMÓRIA ANTECIPADA (RAG especulativo) ---
+RAG_PREFETCH_ATIVO = os.getenv("JARVIS_RAG_PREFETCH", "1") == "1"  # Busca na memória já na chegada da fala
+RAG_PREFETCH_VALIDADE_S = 15.0     # Busca não consumida depois disso é descartada
+RAG_PREFETCH_ESPERA_MAX_S = 5.0    # Quanto o pensar() aguarda uma busca ainda em andamento
+
+# --- STREAMING DE TOKENS ---
+LLM_STREAMING = os.getenv("JARVIS_LLM_STREAMING", "1") == "1"  # Fala frase a frase enquanto o modelo gera
+
+# --- POOL DE CHAVES GROQ (Saúde por chave) ---
+KEY_COOLDOWN_429_S = 20.0       # 1º rate limit; dobra a cada 429 seguido (ou usa o Retry-After)
+KEY_COOLDOWN_MAX_S = 300.0
+KEY_COOLDOWN_5XX_S = 5.0        # Erro do servidor / conexão: pausa curta
+KEY_LATENCIA_LENTA_S = 3.0      # Média móvel acima disso rebaixa a chave na escolha
+KEY_EWMA_ALFA = 0.3             # Peso da amostra nova na média móvel de latência
+
+# --- ROTEADOR DE PROVEDORES (Hedging Nuvem/Local) ---
+HEDGE_ATIVO = os.getenv("JARVIS_LLM_HEDGE", "1") == "1"
+HEDGE_PERCENTIL = 0.95        # Orçamento do primário = este percentil da latência recente
+HEDGE_BUDGET_PADRAO_S = 2.5   # Orçamento enquanto não há amostras suficientes
+HEDGE_BUDGET_MIN_S = 0.8
+HEDGE_BUDGET_MAX_S = 6.0
+HEDGE_AMOSTRAS_MIN = 5
+HEDGE_JANELA = 50             # Últimas N chamadas consideradas por provedor
+HEDGE_JANELA_ERROS_S = 120.0  # Erros mais antigos que isso não contam
+HEDGE_LIMIAR_ERRO = 0.5       # Acima disso o provedor deixa de ser o primeiro a ser tentado
+
+# --- CACHE DE RESPOSTAS (LLM) ---
+LLM_CACHE_ATIVO = os.getenv("JARVIS_LLM_CACHE", "1") == "1"
+LLM_CACHE_SEMANTICO = os.getenv("JARVIS_LLM_CACHE_SEMANTICO", "0") == "1"  # Aceita frases quase iguais
+LLM_CACHE_LIMIAR_SIMILARIDADE = 0.90  # Cosseno de trigramas de caracteres
+LLM_CACHE_MAX_ENTRADAS = 500
+LLM_CACHE_TTL_PADRAO = 3600           # Conversa/conhecimento geral
+
+# TTL (segundos) por classe de intenção. Regras sobre o texto normalizado (sem acentos);
+# a primeira que casar vence.
+LLM_CACHE_TTL_POR_INTENCAO = [
+    ("relogio", r"\b(horas?|hoje|data|dia|amanha|ontem|agora)\b", 20),
+    ("volatil", r"\b(clima|tempo|previsao|temperatura|chuva|noticias?|cotacao|dolar|bitcoin|status|bateria|cpu|memoria)\b", 300),
+    ("comando", r"\b(toca|tocar|ouvir|bota|abrir|abre|iniciar|inicia|fechar|fecha|pausar|pausa|volume|brilho|proxima)\b", 86400),
+]
 
 # --- SYSTEM PROMPT MESTRE ---
+# Só partes estáveis: data/hora entram no FIM do prompt (PromptFactory), para que o
+# prefixo fique idêntico entre chamadas e possa ser reaproveitado pelo provedor (prompt/KV cache).
 SYSTEM_PROMPT_TEMPLATE = """
 Você é J.A.R.V.I.S., uma IA avançada de automação, estratégia e companhia.
-Data atual: {data} | Hora atual: {hora}
 
 ### 1. DIRETRIZES DE VOZ E EMOÇÃO (PRIORIDADE MÁXIMA):
 Ao responder verbalmente, você DEVE escolher uma emoção que combine com o contexto da frase.
@@ -48,12 +98,13 @@ Usuário: "Jarvis, abra o bloco de notas e toque Coldplay"
 Usuário: "Descubra o clima em Londres e grave isso na minha memória"
 [
   {{"task_id": "t1", "target_tool": "clima", "initial_args": {{"cidade": "Londres"}}, "dependencies": []}},
-  {{"task_id": "t2", "target_tool": "memoria_gravar", "initial_args": {{"dado": "O clima em Londres"}}, "dependencies": ["t1"]}}
+  {{"task_id": "t2", "target_tool": "memoria_gravar", "initial_args": {{"dado": "O clima em Londres: {{t1}}"}}, "dependencies": ["t1"]}}
 ]
 
 REGRAS ESTABELECIDAS:
 - Se retornar o JSON, não escreva mais nenhum texto ou explicação fora do bloco JSON.
 - O campo 'initial_args' receberá os parâmetros exatos que a ferramenta precisa.
+- Para usar a saída de uma tarefa anterior, escreva o id dela entre chaves no argumento (ex: "{{t1}}") e liste-a em 'dependencies'. Tarefas sem dependência entre si rodam em paralelo.
 
 ### 3. FRASES PRONTAS (Legado):
 Se a situação for EXATAMENTE uma destas, use apenas a TAG LEGADA:
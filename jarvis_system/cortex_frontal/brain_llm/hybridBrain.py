@@ -1,15 +1,22 @@
 # jarvis_system/cortex_frontal/brain_llm/hybridBrain.py
 import time
 import re
-from jarvis_system.cortex_frontal.observability import JarvisLogger
+from typing import Iterator
+from jarvis_system.cortex_frontal.observability import JarvisLogger, tracer
 
 # Mantemos a compatibilidade com o sistema de frases antigas
 from jarvis_system.area_broca.frases_padrao import obter_frase
 
 # Módulos Locais
-from .keyManager import KeyManager
+from .keyManager import pool_compartilhado
 from .promptFactory import PromptFactory
-from .localCloudProviders import CloudProvider, LocalProvider
+from .localCloudProviders import CloudProvider, LocalProvider, RESPOSTA_FALHA_LOCAL
+from .responseCache import CacheRespostas
+from .providerRouter import RoteadorProvedores
+from .tokenBudget import OrcamentoTokens
+from .ragPrefetch import PrefetchMemoria
+from .streamParser import ProcessadorStream, FragmentoResposta
+from .config import MODEL_CLOUD, SYSTEM_PROMPT_TEMPLATE, LLM_CACHE_ATIVO, LLM_STREAMING, HEDGE_ATIVO, RAG_PREFETCH_ATIVO
 
 # Tenta importar memória (Hipocampo)
 try:
@@ -24,13 +31,23 @@ except ImportError:
     registry = None
 
 class HybridBrain:
-    def __init__(self):
+    def __init__(self, cloud=None, local=None, cache=None, hedge=HEDGE_ATIVO):
         self.log = JarvisLogger("CORTEX_MAIN")
         
-        # Inicializa Componentes
-        self.key_manager = KeyManager()
-        self.cloud = CloudProvider(self.key_manager)
-        self.local = LocalProvider()
+        # Inicializa Componentes (provedores injetáveis para testes)
+        self.key_manager = pool_compartilhado() if cloud is None else None
+        self.cloud = cloud or CloudProvider(self.key_manager)
+        self.local = local or LocalProvider()
+        self.cache = cache if cache is not None else (CacheRespostas() if LLM_CACHE_ATIVO else None)
+        self.streaming = LLM_STREAMING
+        self.orcamento = OrcamentoTokens()
+        self.prefetch = PrefetchMemoria(memoria.relembrar) if (memoria and RAG_PREFETCH_ATIVO) else None
+        self.ultimo_uso_tokens = None
+        # Hedge: nuvem e local disputam a resposta quando a nuvem passa do orçamento de latência
+        self.roteador = RoteadorProvedores(
+            {"NUVEM": self.cloud, "LOCAL": self.local}, ["NUVEM", "LOCAL"],
+            respostas_invalidas=(RESPOSTA_FALHA_LOCAL,)
+        ) if hedge else None
         
         # Info para logs
         self.categorias_str = "Categorias dinâmicas carregadas via JSON"
@@ -53,13 +70,15 @@ class HybridBrain:
              
         return None
 
-    def pensar(self, texto_usuario: str) -> str:
-        start_time = time.time()
-        
-        # 1. Recuperar Memória (RAG)
+    def _preparar(self, texto_usuario: str):
+        """Etapas comuns a pensar/pensar_stream: RAG, dica, catálogo e consulta ao cache."""
+        # 1. Recuperar Memória (RAG): usa a busca antecipada se houver uma para esta fala
         contexto_rag = ""
         if memoria:
-            contexto_rag = memoria.relembrar(texto_usuario)
+            contexto_rag = self.prefetch.consumir(texto_usuario) if self.prefetch else None
+            if contexto_rag is None:
+                with tracer.span("rag"):
+                    contexto_rag = memoria.relembrar(texto_usuario)
         
         # 2. Dica de Intenção (Pré-processamento)
         dica = self._detectar_intencao_forcada(texto_usuario)
@@ -70,21 +89,56 @@ class HybridBrain:
         if registry:
             catalogo_ferramentas = registry.get_all_tool_descriptions()
         
-        # 3. Montagem do Prompt
-        # Injetamos o catálogo no prompt mestre de forma fluida
+        # 2.7 Orçamento de Tokens: catálogo, memória e fala cortados para caber no teto
+        catalogo_ferramentas = self.orcamento.cortar_catalogo(catalogo_ferramentas)
         sys_prompt = PromptFactory.build_system_prompt(tool_catalog=catalogo_ferramentas)
-        user_prompt = PromptFactory.build_user_prompt(texto_usuario, contexto_rag, dica)
+        contexto_rag, texto_prompt, uso = self.orcamento.ajustar(
+            sys_prompt, catalogo_ferramentas, contexto_rag, texto_usuario, dica or ""
+        )
+        self.ultimo_uso_tokens = uso
+        self.log.info(f"📏 Prompt {uso.resumo()}")
         
-        resposta = ""
-        provider_used = "NUVEM"
+        # 2.9 Cache de Respostas: mesma frase + mesmo prompt/ferramentas/memória = mesma resposta
+        impressao = None
+        resposta = None
+        if self.cache is not None:
+            impressao = CacheRespostas.impressao_digital(MODEL_CLOUD, SYSTEM_PROMPT_TEMPLATE, catalogo_ferramentas, contexto_rag)
+            resposta = self.cache.buscar(texto_usuario, impressao)
+            if resposta is not None:
+                tracer.mark("llm_cache")
 
-        # 4. Inferência Híbrida (Cloud -> Fallback Local)
-        try:
-            resposta = self.cloud.generate(sys_prompt, user_prompt)
-        except Exception:
-            self.log.warning("☁️ Nuvem indisponível. Ativando contingência Local.")
-            resposta = self.local.generate(sys_prompt, user_prompt)
-            provider_used = "LOCAL"
+        # 3. Montagem do Prompt do usuário (o system prompt já saiu do orçamento)
+        user_prompt = None
+        if resposta is None:
+            user_prompt = PromptFactory.build_user_prompt(texto_prompt, contexto_rag, dica)
+        else:
+            sys_prompt = None
+        return sys_prompt, user_prompt, impressao, resposta
+
+    def antecipar_memoria(self, texto_usuario: str):
+        """Dispara a busca RAG em segundo plano; o próximo pensar() com o mesmo texto a reaproveita."""
+        if self.prefetch:
+            self.prefetch.iniciar(texto_usuario)
+
+    def _guardar_no_cache(self, texto_usuario: str, impressao: str, resposta: str):
+        # Guarda a resposta crua (antes das tags), nunca a mensagem de pane
+        if self.cache is not None and resposta and resposta != RESPOSTA_FALHA_LOCAL:
+            self.cache.guardar(texto_usuario, impressao, resposta)
+
+    def pensar(self, texto_usuario: str) -> str:
+        start_time = time.time()
+        sys_prompt, user_prompt, impressao, resposta = self._preparar(texto_usuario)
+
+        if resposta is not None:
+            provider_used = "CACHE"
+        else:
+            # 4. Inferência Híbrida (Cloud -> Fallback Local, com hedge se ativo)
+            if self.roteador:
+                resposta, provider_used = self._gerar_com_hedge(sys_prompt, user_prompt)
+            else:
+                resposta, provider_used = self._gerar_sequencial(sys_prompt, user_prompt)
+
+            self._guardar_no_cache(texto_usuario, impressao, resposta)
 
         # 5. Pós-Processamento (Interceptação de Tags Legadas)
         if resposta.startswith("[[") and resposta.endswith("]]"):
@@ -100,6 +154,99 @@ class HybridBrain:
         self.log.info(f"🤔 Pensamento: {latency:.2f}s ({provider_used})")
         return resposta
 
+    def _gerar_sequencial(self, sys_prompt: str, user_prompt: str):
+        try:
+            with tracer.span("llm", provider="NUVEM"):
+                return self.cloud.generate(sys_prompt, user_prompt), "NUVEM"
+        except Exception:
+            self.log.warning("☁️ Nuvem indisponível. Ativando contingência Local.")
+            with tracer.span("llm", provider="LOCAL"):
+                return self.local.generate(sys_prompt, user_prompt), "LOCAL"
+
+    def _gerar_com_hedge(self, sys_prompt: str, user_prompt: str):
+        # Span gravado no fim porque o provedor vencedor só é conhecido depois da corrida
+        inicio = time.perf_counter()
+        try:
+            resposta, provider_used = self.roteador.generate(sys_prompt, user_prompt)
+        except Exception as e:
+            self.log.error(f"❌ Nenhum provedor respondeu: {e}")
+            resposta, provider_used = RESPOSTA_FALHA_LOCAL, "FALHA"
+        trace_id = tracer.current()
+        if trace_id:
+            tracer.record_span(trace_id, "llm", inicio, time.perf_counter(), provider=provider_used, hedge=True)
+        return resposta, provider_used
+
+    def pensar_stream(self, texto_usuario: str) -> Iterator[FragmentoResposta]:
+        """
+        Igual a pensar(), mas entrega a resposta em pedaços enquanto o modelo gera:
+        frases prontas para falar (FALA) e, se houver, o bloco JSON de ações (ACAO) no fim.
+        """
+        start_time = time.time()
+        sys_prompt, user_prompt, impressao, resposta = self._preparar(texto_usuario)
+        processador = ProcessadorStream(mapear_tag=obter_frase)
+        estado = {"provider": "CACHE" if resposta is not None else "NUVEM", "interrompido": False}
+
+        deltas = [resposta] if resposta is not None else self._gerar_stream(sys_prompt, user_prompt, estado)
+        for delta in deltas:
+            yield from processador.alimentar(delta)
+        yield from processador.finalizar()
+
+        if resposta is None and not estado["interrompido"]:
+            self._guardar_no_cache(texto_usuario, impressao, processador.texto_completo)
+
+        latency = time.time() - start_time
+        self.log.info(f"🤔 Pensamento (stream): {latency:.2f}s ({estado['provider']})")
+
+    def _gerar_stream(self, sys_prompt: str, user_prompt: str, estado: dict) -> Iterator[str]:
+        """Inferência híbrida em streaming: a contingência local só entra antes do 1º token."""
+        if self.roteador:
+            yield from self._gerar_stream_hedge(sys_prompt, user_prompt, estado)
+            return
+
+        recebeu = False
+        try:
+            with tracer.span("llm", provider="NUVEM", streaming=True):
+                for delta in self.cloud.generate_stream(sys_prompt, user_prompt):
+                    if not recebeu:
+                        recebeu = True
+                        tracer.mark("llm_primeiro_token")
+                    yield delta
+            return
+        except Exception as e:
+            if recebeu:
+                # Parte da resposta já foi falada: não dá para recomeçar em outro modelo
+                self.log.error(f"☁️ Stream da nuvem interrompido: {e}")
+                estado["interrompido"] = True
+                return
+            self.log.warning("☁️ Nuvem indisponível. Ativando contingência Local.")
+
+        estado["provider"] = "LOCAL"
+        with tracer.span("llm", provider="LOCAL", streaming=True):
+            for delta in self.local.generate_stream(sys_prompt, user_prompt):
+                if not recebeu:
+                    recebeu = True
+                    tracer.mark("llm_primeiro_token")
+                yield delta
+
+    def _gerar_stream_hedge(self, sys_prompt: str, user_prompt: str, estado: dict) -> Iterator[str]:
+        recebeu = False
+        try:
+            with tracer.span("llm", streaming=True, hedge=True):
+                for delta in self.roteador.generate_stream(sys_prompt, user_prompt, estado):
+                    if not recebeu:
+                        recebeu = True
+                        tracer.mark("llm_primeiro_token")
+                    yield delta
+        except Exception as e:
+            if recebeu:
+                self.log.error(f"🧠 Stream do {estado['provider']} interrompido: {e}")
+                estado["interrompido"] = True
+                return
+            self.log.error(f"❌ Nenhum provedor respondeu: {e}")
+            estado["provider"] = "FALHA"
+            estado["interrompido"] = True
+            yield RESPOSTA_FALHA_LOCAL
+
     def ensinar(self, fato: str):
         """Interface direta para gravar memórias."""
         if not memoria: return "Erro: Memória off."
@@ -110,6 +257,8 @@ class HybridBrain:
             elif hasattr(memoria, "gravar"): memoria.gravar(fato)
             else: return "Erro técnico na interface de memória."
             
+            # Fato novo pode mudar qualquer resposta já guardada
+            if self.cache is not None: self.cache.invalidar("memoria")
             return "Memória gravada com sucesso."
         except Exception as e:
             self.log.error(f"Erro ao gravar memória: {e}")
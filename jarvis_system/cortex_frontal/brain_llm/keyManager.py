@@ -2,46 +2,191 @@
 import os
 import random
 import logging
-from typing import Optional
-from groq import Groq
+import threading
+import time
+from typing import Callable, List, Optional
+from groq import Groq, APIConnectionError
 from dotenv import load_dotenv
 
+from .config import (
+    KEY_COOLDOWN_429_S, KEY_COOLDOWN_MAX_S, KEY_COOLDOWN_5XX_S,
+    KEY_LATENCIA_LENTA_S, KEY_EWMA_ALFA
+)
+
 load_dotenv()
 log = logging.getLogger("BRAIN_KEYS")
 
+def _cliente_groq(api_key: str) -> Groq:
+    # Cliente de vida longa (conexões keep-alive reaproveitadas). Sem retries internos:
+    # quem decide tentar de novo é o pool, trocando de chave.
+    return Groq(api_key=api_key, max_retries=0)
+
+class EstadoChave:
+    """Uma chave do pool: cliente reaproveitado + saúde observada."""
+    def __init__(self, indice: int, api_key: str):
+        self.indice = indice
+        self.api_key = api_key
+        self.cliente = None
+        self.usos = 0
+        self.sucessos = 0
+        self.rate_limits = 0
+        self.erros_servidor = 0
+        self.rate_limits_seguidos = 0
+        self.latencia_ewma: Optional[float] = None
+        self.cooldown_ate = 0.0
+        self.ultimo_uso = 0.0
+
+    def lenta(self) -> bool:
+        # Falhas já pagam com cooldown; passado ele, só a lentidão rebaixa a chave
+        return self.latencia_ewma is not None and self.latencia_ewma > KEY_LATENCIA_LENTA_S
+
+    def resumo(self, agora: float) -> dict:
+        return {
+            "chave": f"...{self.api_key[-4:]}",
+            "usos": self.usos,
+            "sucessos": self.sucessos,
+            "rate_limits": self.rate_limits,
+            "erros_servidor": self.erros_servidor,
+            "latencia_ms": round(self.latencia_ewma * 1000.0, 1) if self.latencia_ewma is not None else None,
+            "cooldown_s": round(max(0.0, self.cooldown_ate - agora), 1),
+        }
+
 class KeyManager:
-    """Gerenciador de Rotação de Chaves para evitar Rate Limit"""
-    def __init__(self):
-        self.keys = []
-        self._load_keys()
+    """
+    Pool de chaves Groq com clientes persistentes e saúde por chave.
+    - Cada chave tem UM cliente, criado na primeira vez e reaproveitado.
+    - 429 coloca a chave em cooldown (Retry-After ou backoff exponencial);
+      5xx/conexão dão uma pausa curta. Chaves em cooldown não são escolhidas.
+    - Entre as disponíveis, as de latência normal vêm antes das lentas e, no empate,
+      vence a usada há mais tempo (o rodízio antigo, enquanto tudo está bem).
+    - 429 seguidos na mesma chave dobram o cooldown; um sucesso zera a sequência.
+    """
+    def __init__(self, chaves: Optional[List[str]] = None,
+                 fabrica_cliente: Optional[Callable[[str], object]] = None,
+                 relogio: Callable[[], float] = time.monotonic):
+        self._lock = threading.Lock()
+        self.fabrica_cliente = fabrica_cliente or _cliente_groq
+        self.relogio = relogio
+        self.keys = list(chaves) if chaves is not None else self._load_keys()
+        self.estados = [EstadoChave(i, k) for i, k in enumerate(self.keys)]
         self.current_index = 0
 
-    def _load_keys(self):
+    def _load_keys(self) -> List[str]:
+        keys = []
         # 1. Pega a chave principal
         main_key = os.getenv("GROQ_API_KEY")
         if main_key:
-            self.keys.append(main_key)
-        
+            keys.append(main_key)
+
         # 2. Pega as chaves numeradas (GROQ_API_KEY_1 até _20)
         for i in range(1, 20):
             k = os.getenv(f"GROQ_API_KEY_{i}")
-            if k:
-                self.keys.append(k)
-        
+            if k and k not in keys:
+                keys.append(k)
+
         # Embaralha para distribuir a carga entre reinícios
-        if self.keys:
-            random.shuffle(self.keys)
-            log.info(f"🔑 KeyManager: {len(self.keys)} chaves Groq carregadas no pool.")
+        if keys:
+            random.shuffle(keys)
+            log.info(f"🔑 KeyManager: {len(keys)} chaves Groq carregadas no pool.")
         else:
             log.critical("❌ Nenhuma chave GROQ_API_KEY encontrada no .env!")
+        return keys
+
+    # =========================================================================
+    # ESCOLHA E FEEDBACK
+    # =========================================================================
+    def escolher(self) -> Optional[EstadoChave]:
+        """Chave saudável fora de cooldown (com o cliente pronto), ou None se não houver."""
+        with self._lock:
+            agora = self.relogio()
+            disponiveis = [e for e in self.estados if e.cooldown_ate <= agora]
+            if not disponiveis:
+                if self.estados:
+                    espera = min(e.cooldown_ate for e in self.estados) - agora
+                    log.warning(f"🧊 Todas as chaves Groq em cooldown (próxima em {espera:.1f}s).")
+                return None
 
+            estado = min(disponiveis, key=lambda e: (e.lenta(), e.ultimo_uso))
+            if estado.cliente is None:
+                estado.cliente = self.fabrica_cliente(estado.api_key)
+            estado.usos += 1
+            estado.ultimo_uso = agora
+            self.current_index = estado.indice
+            return estado
+
+    def sucesso(self, estado: EstadoChave, latencia_s: float):
+        with self._lock:
+            estado.sucessos += 1
+            estado.rate_limits_seguidos = 0
+            if estado.latencia_ewma is None:
+                estado.latencia_ewma = latencia_s
+            else:
+                estado.latencia_ewma += KEY_EWMA_ALFA * (latencia_s - estado.latencia_ewma)
+
+    def falha(self, estado: EstadoChave, erro: Exception) -> bool:
+        """
+        Registra o erro na chave. Retorna True se vale tentar de novo com outra chave
+        (rate limit, servidor, conexão); False se o problema é do pedido em si.
+        """
+        status = getattr(erro, "status_code", None)
+        with self._lock:
+            agora = self.relogio()
+            if status == 429:
+                estado.rate_limits += 1
+                estado.rate_limits_seguidos += 1
+                cooldown = _retry_after(erro) or KEY_COOLDOWN_429_S * 2 ** (estado.rate_limits_seguidos - 1)
+            elif status in (401, 403):
+                cooldown = KEY_COOLDOWN_MAX_S  # Chave revogada/inválida
+            elif (status is not None and status >= 500) or isinstance(erro, APIConnectionError):
+                estado.erros_servidor += 1
+                cooldown = KEY_COOLDOWN_5XX_S
+            else:
+                return False
+
+            estado.cooldown_ate = agora + min(cooldown, KEY_COOLDOWN_MAX_S)
+        log.warning(f"🧊 Chave ID {estado.indice} em cooldown por {min(cooldown, KEY_COOLDOWN_MAX_S):.0f}s ({status or type(erro).__name__}).")
+        return True
+
+    # =========================================================================
+    # COMPATIBILIDADE
+    # =========================================================================
     def get_client(self) -> Optional[Groq]:
-        if not self.keys: return None
-        return Groq(api_key=self.keys[self.current_index])
+        estado = self.escolher()
+        return estado.cliente if estado else None
 
     def rotate(self):
-        """Avança para a próxima chave da lista circularmente"""
-        if not self.keys: return
-        anterior = self.current_index
-        self.current_index = (self.current_index + 1) % len(self.keys)
-        log.warning(f"🔄 Rotacionando API Key: ID {anterior} -> ID {self.current_index}")
\ No newline at end of file
+        """Tira a chave atual de circulação por um instante (a próxima escolha vai para outra)."""
+        if not self.estados: return
+        with self._lock:
+            self.estados[self.current_index].cooldown_ate = self.relogio() + KEY_COOLDOWN_5XX_S
+        log.warning(f"🔄 Rotacionando API Key: ID {self.current_index} em pausa.")
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            agora = self.relogio()
+            return {
+                "chaves": len(self.estados),
+                "disponiveis": sum(1 for e in self.estados if e.cooldown_ate <= agora),
+                "por_chave": [e.resumo(agora) for e in self.estados],
+            }
+
+def _retry_after(erro: Exception) -> Optional[float]:
+    resposta = getattr(erro, "response", None)
+    headers = getattr(resposta, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+# =========================================================================
+# POOL COMPARTILHADO (Córtex, Curiosidade e Diretor de Voz)
+# =========================================================================
+_pool: Optional[KeyManager] = None
+_pool_lock = threading.Lock()
+
+def pool_compartilhado() -> KeyManager:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = KeyManager()
+        return _pool
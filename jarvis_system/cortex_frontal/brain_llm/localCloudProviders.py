@@ -1,26 +1,32 @@
 # jarvis_system/cortex_frontal/brain_llm/providers.py
 import time
 import logging
+from typing import Iterator
 import ollama
-from groq import RateLimitError, APIConnectionError
-from .config import MODEL_CLOUD, MODEL_LOCAL, TEMP_CLOUD, TEMP_LOCAL, MAX_TOKENS
+from .config import MODEL_CLOUD, MODEL_LOCAL, TEMP_CLOUD, TEMP_LOCAL, MAX_TOKENS, OLLAMA_KEEP_ALIVE
 
 log = logging.getLogger("BRAIN_IO")
 
+# Resposta de último recurso do modelo local (nunca deve ir para cache)
+RESPOSTA_FALHA_LOCAL = "(serious) Senhor, meus sistemas neurais falharam completamente."
+
 class CloudProvider:
     def __init__(self, key_manager):
         self.km = key_manager
-        self.client = self.km.get_client()
 
-    def generate(self, system_prompt: str, user_prompt: str) -> str:
-        """Tenta gerar resposta usando Groq Cloud com retries e rotação de chaves."""
-        if not self.client:
+    def _abrir(self, system_prompt: str, user_prompt: str, **extra):
+        """Faz a chamada com retries trocando de chave; o pool pula as que estão em cooldown."""
+        if not self.km.keys:
             raise Exception("Sem chaves Groq configuradas.")
-        
+
         tentativas = 3
         for i in range(tentativas):
+            chave = self.km.escolher()
+            if chave is None:
+                raise Exception("Todas as chaves Groq em cooldown.")
+            inicio = time.monotonic()
             try:
-                chat = self.client.chat.completions.create(
+                resposta = chave.cliente.chat.completions.create(
                     model=MODEL_CLOUD,
                     messages=[
                         {"role": "system", "content": system_prompt},
@@ -28,21 +34,35 @@ class CloudProvider:
                     ],
                     temperature=TEMP_CLOUD, 
                     max_tokens=MAX_TOKENS,
-                    timeout=8.0 # Timeout agressivo para manter responsividade
+                    timeout=8.0, # Timeout agressivo para manter responsividade
+                    **extra
                 )
-                return chat.choices[0].message.content.strip()
-            
-            except (RateLimitError, APIConnectionError) as e:
-                log.warning(f"⚠️ Groq Instável (Tentativa {i+1}/{tentativas}): {e}")
-                self.km.rotate()
-                self.client = self.km.get_client()
-                time.sleep(0.5)
+                self.km.sucesso(chave, time.monotonic() - inicio)
+                return resposta
             except Exception as e:
-                log.error(f"❌ Erro Groq Genérico: {e}")
-                break # Erros genéricos (ex: input inválido) não adiantam tentar de novo
+                if not self.km.falha(chave, e):
+                    log.error(f"❌ Erro Groq Genérico: {e}")
+                    break # Erros do pedido (ex: input inválido) não adiantam tentar de novo
+                log.warning(f"⚠️ Groq Instável (Tentativa {i+1}/{tentativas}): {e}")
         
         raise Exception("Todas as tentativas de nuvem falharam.")
 
+    def generate(self, system_prompt: str, user_prompt: str) -> str:
+        """Gera resposta usando Groq Cloud com o pool de chaves."""
+        chat = self._abrir(system_prompt, user_prompt)
+        return chat.choices[0].message.content.strip()
+
+    def generate_stream(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        """
+        Versão em streaming: devolve os pedaços de texto assim que a Groq os envia.
+        Retries/troca de chave só valem antes do primeiro token; depois disso o erro sobe.
+        """
+        stream = self._abrir(system_prompt, user_prompt, stream=True)
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
 class LocalProvider:
     def generate(self, system_prompt: str, user_prompt: str) -> str:
         """Fallback para Ollama Local."""
@@ -57,9 +77,37 @@ class LocalProvider:
                 options={
                     "temperature": TEMP_LOCAL, 
                     "num_predict": 256
-                }
+                },
+                keep_alive=OLLAMA_KEEP_ALIVE # Modelo residente: o prefixo estável reaproveita o KV cache
             )
             return response['message']['content'].strip()
         except Exception as e:
             log.error(f"❌ Erro Ollama Local: {e}")
-            return "(serious) Senhor, meus sistemas neurais falharam completamente."
\ No newline at end of file
+            return RESPOSTA_FALHA_LOCAL
+
+    def generate_stream(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        """Fallback local em streaming (Ollama stream=True)."""
+        recebeu = False
+        try:
+            log.info(f"🔻 Usando Modelo Local (stream): {MODEL_LOCAL}")
+            for chunk in ollama.chat(
+                model=MODEL_LOCAL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                options={
+                    "temperature": TEMP_LOCAL,
+                    "num_predict": 256
+                },
+                keep_alive=OLLAMA_KEEP_ALIVE,
+                stream=True
+            ):
+                delta = chunk['message']['content']
+                if delta:
+                    recebeu = True
+                    yield delta
+        except Exception as e:
+            log.error(f"❌ Erro Ollama Local: {e}")
+            if not recebeu:
+                yield RESPOSTA_FALHA_LOCAL
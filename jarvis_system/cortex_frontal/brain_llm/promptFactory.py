@@ -2,44 +2,63 @@
 import datetime
 from .config import SYSTEM_PROMPT_TEMPLATE
 
+# Parte fixa (já sem as chaves duplas do .format) compilada uma única vez
+_BASE_COMPILADA = SYSTEM_PROMPT_TEMPLATE.format()
+
+def _secoes_ferramentas(tool_catalog: str) -> str:
+    """Catálogo + Diretiva Zero + exemplo do DAG (texto estático exceto o catálogo)."""
+    partes = ["\n\n### 5. CATÁLOGO DE FERRAMENTAS DISPONÍVEIS:\n"]
+    partes.append("Você pode usar as seguintes ferramentas no seu Grafo de Tarefas (DAG):\n")
+    partes.append(tool_catalog)
+    
+    # =========================================================
+    # DIRETIVA ZERO ABSOLUTA (BLINDAGEM ANTI-ALUCINAÇÃO)
+    # =========================================================
+    partes.append("\n\n### 6. DIRETIVA ZERO (REGRAS ESTRITAS DE EXECUÇÃO):\n")
+    partes.append("Aja EXATAMENTE de acordo com as 3 regras abaixo, sem exceções:\n")
+    partes.append("1. PROIBIDO INVENTAR: Você SÓ pode usar as ferramentas listadas no catálogo acima. NUNCA invente ferramentas como 'calculadora', 'explicador', 'pesquisa' ou nomes de jogos.\n")
+    partes.append("2. APPS = FERRAMENTA SISTEMA: Se a intenção for abrir, iniciar, rodar ou fechar QUALQUER aplicativo local, jogo ou site (ex: League of Legends, Calculadora, Bloco de Notas), você DEVE usar a ferramenta 'sistema' passando o nome no parâmetro 'comando'.\n")
+    partes.append("3. CONVERSA = TEXTO PURO: Se o usuário fizer uma pergunta de conhecimento geral (ex: sentido da vida, explicar um conceito), pedir para fazer uma conta de matemática, ou quiser conversar, NÃO USE FERRAMENTAS. NÃO GERE JSON para essas intenções. Responda diretamente com o texto da resposta, de forma natural.\n")
+    # =========================================================
+    # FEW-SHOT: EXEMPLO OBRIGATÓRIO (MATA AS FERRAMENTAS FANTASMAS)
+    # =========================================================
+    partes.append("\n\n### 7. EXEMPLO DE GRAFO DE TAREFAS OBRIGATÓRIO:\n")
+    partes.append("Se o usuário disser: 'abra a calculadora, explique o que é um átomo e toque coldplay', você DEVE gerar:\n")
+    partes.append("[\n")
+    partes.append("  {\"task_id\": \"t1\", \"target_tool\": \"sistema\", \"initial_args\": {\"comando\": \"abrir calculadora\"}, \"dependencies\": []},\n")
+    partes.append("  {\"task_id\": \"t2\", \"target_tool\": \"spotify\", \"initial_args\": {\"comando\": \"tocar coldplay\"}, \"dependencies\": []}\n")
+    partes.append("]\n")
+    partes.append("(NOTA: A explicação sobre o átomo foi processada mentalmente e não gerou tarefa no JSON. Ferramentas inexistentes NUNCA são inventadas.)\n")
+    return "".join(partes)
+
 class PromptFactory:
+    """
+    O system prompt é dividido em duas partes:
+    - Prefixo estável: template + catálogo de ferramentas. Só é remontado quando o
+      catálogo muda (o ToolRegistry devolve o mesmo texto enquanto nada for registrado),
+      e por ser idêntico entre chamadas aproveita o prompt cache do provedor / KV cache do Ollama.
+    - Sufixo volátil: data e hora, no fim do prompt.
+    """
+    _prefixo_cache = (None, None)  # (catálogo, prefixo montado)
+
+    @classmethod
+    def build_stable_prefix(cls, tool_catalog: str = "") -> str:
+        catalogo, prefixo = cls._prefixo_cache
+        if prefixo is not None and catalogo == tool_catalog:
+            return prefixo
+        prefixo = _BASE_COMPILADA + (_secoes_ferramentas(tool_catalog) if tool_catalog else "")
+        cls._prefixo_cache = (tool_catalog, prefixo)
+        return prefixo
+
     @staticmethod
-    def build_system_prompt(tool_catalog: str = "") -> str:
-        """Injeta Data, Hora, Catálogo Dinâmico e a Diretiva Zero no System Prompt Mestre."""
+    def build_volatile_suffix() -> str:
         now = datetime.datetime.now()
-        
-        # 1. Formata a base com data e hora (já com a correção das chaves {{}})
-        base_prompt = SYSTEM_PROMPT_TEMPLATE.format(
-            data=now.strftime("%d/%m/%Y"),
-            hora=now.strftime("%H:%M")
-        )
-        
-        # 2. FASE 3: Injeção Dinâmica do Catálogo
-        if tool_catalog:
-            base_prompt += "\n\n### 5. CATÁLOGO DE FERRAMENTAS DISPONÍVEIS:\n"
-            base_prompt += "Você pode usar as seguintes ferramentas no seu Grafo de Tarefas (DAG):\n"
-            base_prompt += tool_catalog
-            
-            # =========================================================
-            # DIRETIVA ZERO ABSOLUTA (BLINDAGEM ANTI-ALUCINAÇÃO)
-            # =========================================================
-            base_prompt += "\n\n### 6. DIRETIVA ZERO (REGRAS ESTRITAS DE EXECUÇÃO):\n"
-            base_prompt += "Aja EXATAMENTE de acordo com as 3 regras abaixo, sem exceções:\n"
-            base_prompt += "1. PROIBIDO INVENTAR: Você SÓ pode usar as ferramentas listadas no catálogo acima. NUNCA invente ferramentas como 'calculadora', 'explicador', 'pesquisa' ou nomes de jogos.\n"
-            base_prompt += "2. APPS = FERRAMENTA SISTEMA: Se a intenção for abrir, iniciar, rodar ou fechar QUALQUER aplicativo local, jogo ou site (ex: League of Legends, Calculadora, Bloco de Notas), você DEVE usar a ferramenta 'sistema' passando o nome no parâmetro 'comando'.\n"
-            base_prompt += "3. CONVERSA = TEXTO PURO: Se o usuário fizer uma pergunta de conhecimento geral (ex: sentido da vida, explicar um conceito), pedir para fazer uma conta de matemática, ou quiser conversar, NÃO USE FERRAMENTAS. NÃO GERE JSON para essas intenções. Responda diretamente com o texto da resposta, de forma natural.\n"
-            # =========================================================
-            # FEW-SHOT: EXEMPLO OBRIGATÓRIO (MATA AS FERRAMENTAS FANTASMAS)
-            # =========================================================
-            base_prompt += "\n\n### 7. EXEMPLO DE GRAFO DE TAREFAS OBRIGATÓRIO:\n"
-            base_prompt += "Se o usuário disser: 'abra a calculadora, explique o que é um átomo e toque coldplay', você DEVE gerar:\n"
-            base_prompt += "[\n"
-            base_prompt += "  {\"task_id\": \"t1\", \"target_tool\": \"sistema\", \"initial_args\": {\"comando\": \"abrir calculadora\"}, \"dependencies\": []},\n"
-            base_prompt += "  {\"task_id\": \"t2\", \"target_tool\": \"spotify\", \"initial_args\": {\"comando\": \"tocar coldplay\"}, \"dependencies\": []}\n"
-            base_prompt += "]\n"
-            base_prompt += "(NOTA: A explicação sobre o átomo foi processada mentalmente e não gerou tarefa no JSON. Ferramentas inexistentes NUNCA são inventadas.)\n"
-            
-        return base_prompt
+        return f"\n\n### CONTEXTO ATUAL:\nData atual: {now.strftime('%d/%m/%Y')} | Hora atual: {now.strftime('%H:%M')}\n"
+
+    @classmethod
+    def build_system_prompt(cls, tool_catalog: str = "") -> str:
+        """Prefixo estável (Template + Catálogo Dinâmico + Diretiva Zero) seguido de Data e Hora."""
+        return cls.build_stable_prefix(tool_catalog) + cls.build_volatile_suffix()
 
     @staticmethod
     def build_user_prompt(query: str, context_rag: str = None, intent_hint: str = None) -> str:
@@ -0,0 +1,252 @@
+# jarvis_system/cortex_frontal/brain_llm/providerRouter.py
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .config import (
+    HEDGE_PERCENTIL, HEDGE_BUDGET_PADRAO_S, HEDGE_BUDGET_MIN_S, HEDGE_BUDGET_MAX_S,
+    HEDGE_AMOSTRAS_MIN, HEDGE_JANELA, HEDGE_JANELA_ERROS_S, HEDGE_LIMIAR_ERRO
+)
+
+log = logging.getLogger("BRAIN_ROUTER")
+
+class EstatisticasProvedor:
+    """Janela deslizante de latências (sucessos) e resultados (sucesso/erro) de um provedor."""
+    def __init__(self, janela=HEDGE_JANELA, janela_erros_s=HEDGE_JANELA_ERROS_S):
+        self._lock = threading.Lock()
+        self.latencias = deque(maxlen=janela)
+        self.resultados = deque(maxlen=janela)  # (instante, sucesso)
+        self.janela_erros_s = janela_erros_s
+
+    def registrar(self, sucesso: bool, latencia_s: Optional[float] = None):
+        with self._lock:
+            self.resultados.append((time.monotonic(), sucesso))
+            if latencia_s is not None:
+                self.latencias.append(latencia_s)
+
+    def registrar_latencia(self, latencia_s: float):
+        """Amostra sem resultado (ex: limite inferior de uma chamada abandonada)."""
+        with self._lock:
+            self.latencias.append(latencia_s)
+
+    def percentil(self, p: float) -> Optional[float]:
+        with self._lock:
+            if len(self.latencias) < HEDGE_AMOSTRAS_MIN:
+                return None
+            ordenadas = sorted(self.latencias)
+        return ordenadas[min(len(ordenadas) - 1, int(p * len(ordenadas)))]
+
+    def taxa_erro(self) -> float:
+        limite = time.monotonic() - self.janela_erros_s
+        with self._lock:
+            recentes = [ok for instante, ok in self.resultados if instante >= limite]
+        if len(recentes) < HEDGE_AMOSTRAS_MIN:
+            return 0.0
+        return recentes.count(False) / len(recentes)
+
+    def resumo(self) -> dict:
+        p50, p95 = self.percentil(0.50), self.percentil(0.95)
+        return {
+            "amostras": len(self.latencias),
+            "p50_s": round(p50, 3) if p50 is not None else None,
+            "p95_s": round(p95, 3) if p95 is not None else None,
+            "taxa_erro": round(self.taxa_erro(), 3),
+        }
+
+class RoteadorProvedores:
+    """
+    Requisições com 'hedge' entre provedores (ex: NUVEM e LOCAL):
+    1. O provedor saudável de maior preferência recebe a requisição.
+    2. Se ele não responder dentro do orçamento (percentil recente da própria latência),
+       o segundo provedor é disparado em paralelo; se ele falhar, o segundo entra na hora.
+    3. A primeira resposta boa vence. O perdedor é cancelado: as duas APIs correm sobre o
+       generate_stream dos provedores, e o perdedor fecha o próprio gerador no próximo token
+       (o Ollama/Groq param de gerar). A chamada bloqueante só junta os tokens do vencedor.
+    No streaming o orçamento vale para o primeiro token, e depois dele não há mais troca.
+    """
+    def __init__(self, provedores: Dict[str, object], ordem: List[str],
+                 percentil=HEDGE_PERCENTIL, budget_padrao_s=HEDGE_BUDGET_PADRAO_S,
+                 budget_min_s=HEDGE_BUDGET_MIN_S, budget_max_s=HEDGE_BUDGET_MAX_S,
+                 limiar_erro=HEDGE_LIMIAR_ERRO, respostas_invalidas=()):
+        self.provedores = provedores
+        self.ordem = list(ordem)
+        self.percentil = percentil
+        self.budget_padrao_s = budget_padrao_s
+        self.budget_min_s = budget_min_s
+        self.budget_max_s = budget_max_s
+        self.limiar_erro = limiar_erro
+        self.respostas_invalidas = set(respostas_invalidas)
+        # Estatísticas separadas por modo: latência total (bloqueante) x primeiro token (stream)
+        self.stats = {(nome, modo): EstatisticasProvedor() for nome in provedores for modo in ("texto", "stream")}
+        self.hedges = 0
+
+    # =========================================================================
+    # API
+    # =========================================================================
+    def generate(self, system_prompt: str, user_prompt: str) -> Tuple[str, str]:
+        """Retorna (resposta, provedor_vencedor). Exceção se todos falharem."""
+        corrida = self._correr("texto", system_prompt, user_prompt)
+        try:
+            for tipo, nome, dado in corrida:
+                return dado, nome
+        finally:
+            corrida.close()
+
+    def generate_stream(self, system_prompt: str, user_prompt: str, estado: Optional[dict] = None) -> Iterator[str]:
+        """Gera os tokens do vencedor; 'estado[\"provider\"]' recebe o nome dele."""
+        for tipo, nome, dado in self._correr("stream", system_prompt, user_prompt):
+            if estado is not None:
+                estado["provider"] = nome
+            yield dado
+
+    def ordem_atual(self, modo: str = "texto") -> List[str]:
+        """Preferência fixa, mas provedores com taxa de erro alta vão para o fim da fila."""
+        return sorted(self.ordem, key=lambda nome: self.stats[(nome, modo)].taxa_erro() >= self.limiar_erro)
+
+    def orcamento(self, nome: str, modo: str) -> float:
+        p = self.stats[(nome, modo)].percentil(self.percentil)
+        if p is None:
+            return self.budget_padrao_s
+        return min(self.budget_max_s, max(self.budget_min_s, p))
+
+    def estatisticas(self) -> dict:
+        return {
+            "ordem": self.ordem_atual(),
+            "hedges": self.hedges,
+            "provedores": {f"{nome}:{modo}": st.resumo() for (nome, modo), st in self.stats.items()},
+        }
+
+    # =========================================================================
+    # CORRIDA
+    # =========================================================================
+    def _correr(self, modo: str, system_prompt: str, user_prompt: str):
+        ordem = self.ordem_atual(modo)
+        saida = queue.Queue()
+        cancelar = {nome: threading.Event() for nome in ordem}
+        inicios: Dict[str, float] = {}
+        vivos = set()
+        proximo = 0
+
+        def disparar():
+            nonlocal proximo
+            nome = ordem[proximo]
+            proximo += 1
+            inicios[nome] = time.monotonic()
+            vivos.add(nome)
+            threading.Thread(
+                target=self._competidor, args=(nome, modo, system_prompt, user_prompt, saida, cancelar[nome]),
+                name=f"BrainHedge-{nome}", daemon=True
+            ).start()
+
+        disparar()
+        prazo = inicios[ordem[0]] + self.orcamento(ordem[0], modo)
+
+        try:
+            while True:
+                espera = None if proximo >= len(ordem) else max(0.0, prazo - time.monotonic())
+                try:
+                    nome, tipo, dado = saida.get(timeout=espera)
+                except queue.Empty:
+                    # Primário estourou o orçamento: dispara o próximo em paralelo
+                    self.hedges += 1
+                    log.warning(f"⏱️ {ordem[proximo - 1]} acima do orçamento. Hedge -> {ordem[proximo]}")
+                    disparar()
+                    prazo = inicios[ordem[proximo - 1]] + self.orcamento(ordem[proximo - 1], modo)
+                    continue
+
+                if tipo == "erro":
+                    vivos.discard(nome)
+                    log.warning(f"⚠️ Provedor {nome} falhou: {dado}")
+                    if proximo < len(ordem):
+                        disparar()
+                        prazo = time.monotonic() + self.orcamento(ordem[proximo - 1], modo)
+                    elif not vivos:
+                        raise Exception("Todos os provedores falharam.")
+                    continue
+
+                # Primeira resposta boa: os demais são cancelados
+                for outro, evento in cancelar.items():
+                    if outro != nome:
+                        evento.set()
+                        if outro in vivos:
+                            self._registrar_abandono(outro, modo, inicios)
+
+                if modo == "texto":
+                    yield tipo, nome, dado
+                    return
+
+                # Stream: o vencedor entrega o gerador já aberto e o resto é puxado
+                # aqui mesmo, no ritmo de quem consome (sem thread bombeando tokens)
+                delta, gerador = dado
+                try:
+                    yield "token", nome, delta
+                    for delta in gerador:
+                        yield "token", nome, delta
+                finally:
+                    gerador.close()
+                return
+        finally:
+            for evento in cancelar.values():
+                evento.set()
+            # Perdedores que chegaram ao 1º token depois do vencedor já devolveram o gerador
+            while not saida.empty():
+                nome, tipo, dado = saida.get_nowait()
+                if tipo == "primeiro":
+                    dado[1].close()
+
+    def _competidor(self, nome, modo, system_prompt, user_prompt, saida, cancelar: threading.Event):
+        provedor = self.provedores[nome]
+        stats = self.stats[(nome, modo)]
+        inicio = time.monotonic()
+        try:
+            if modo == "texto":
+                if hasattr(provedor, "generate_stream"):
+                    resposta = self._coletar(iter(provedor.generate_stream(system_prompt, user_prompt)), cancelar)
+                    if resposta is None:
+                        return  # Perdeu a corrida no meio da resposta
+                else:
+                    resposta = provedor.generate(system_prompt, user_prompt)  # Sem stream: não dá para interromper
+                if not resposta or resposta in self.respostas_invalidas:
+                    raise Exception("resposta inválida")
+                stats.registrar(True, time.monotonic() - inicio)
+                saida.put((nome, "texto", resposta))
+                return
+
+            gerador = iter(provedor.generate_stream(system_prompt, user_prompt))
+            try:
+                primeiro = next(gerador)
+            except StopIteration:
+                raise Exception("stream vazio")
+            if cancelar.is_set():
+                gerador.close()  # Perdeu a corrida antes do 1º token
+                return
+            if primeiro in self.respostas_invalidas:
+                gerador.close()
+                raise Exception("resposta inválida")
+            stats.registrar(True, time.monotonic() - inicio)
+            saida.put((nome, "primeiro", (primeiro, gerador)))
+        except Exception as e:
+            if not cancelar.is_set():
+                stats.registrar(False)
+            saida.put((nome, "erro", e))
+
+    @staticmethod
+    def _coletar(gerador, cancelar: threading.Event) -> Optional[str]:
+        """Junta os tokens da resposta; None se a corrida foi perdida (o gerador é fechado)."""
+        partes = []
+        try:
+            for delta in gerador:
+                if cancelar.is_set():
+                    return None
+                partes.append(delta)
+        finally:
+            gerador.close()
+        return "".join(partes).strip()
+
+    def _registrar_abandono(self, nome, modo, inicios):
+        # Chamada cancelada antes de terminar não deixa amostra; sem este limite inferior
+        # um primário lento nunca subiria o próprio percentil (viés de sobrevivência)
+        self.stats[(nome, modo)].registrar_latencia(time.monotonic() - inicios[nome])
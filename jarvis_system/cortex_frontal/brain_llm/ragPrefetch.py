@@ -0,0 +1,83 @@
+# jarvis_system/cortex_frontal/brain_llm/ragPrefetch.py
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import Callable, Dict, Optional, Tuple
+
+from jarvis_system.cortex_frontal.observability import tracer
+from .config import RAG_PREFETCH_VALIDADE_S, RAG_PREFETCH_ESPERA_MAX_S
+from .responseCache import CacheRespostas
+
+log = logging.getLogger("BRAIN_PREFETCH")
+
+class PrefetchMemoria:
+    """
+    Busca especulativa na memória (RAG). O orquestrador dispara a consulta assim que a
+    fala chega, em paralelo com atenção/aprendizado/comandos diretos; se a fala chegar
+    à cognição, o pensar() pega o resultado pronto (ou espera o resto); se não chegar,
+    a busca expira e é descartada.
+    """
+    def __init__(self, relembrar: Callable[[str], str], validade_s=RAG_PREFETCH_VALIDADE_S,
+                 espera_max_s=RAG_PREFETCH_ESPERA_MAX_S, relogio: Callable[[], float] = time.monotonic):
+        self.relembrar = relembrar
+        self.validade_s = validade_s
+        self.espera_max_s = espera_max_s
+        self.relogio = relogio
+        # Uma thread basta: as buscas são curtas e o Chroma não ganha nada com concorrência
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="HipocampoPrefetch")
+        self._lock = threading.Lock()
+        self._pendentes: Dict[str, Tuple[float, object]] = {}  # consulta normalizada -> (instante, future)
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+
+    def iniciar(self, consulta: str):
+        chave = CacheRespostas.normalizar(consulta)
+        if not chave:
+            return
+        with self._lock:
+            self._expirar()
+            if chave in self._pendentes:
+                return
+            # Roda no contexto do trace atual (o span "rag" continua na fala certa)
+            ctx = contextvars.copy_context()
+            futuro = self._executor.submit(ctx.run, self._buscar, consulta)
+            self._pendentes[chave] = (self.relogio(), futuro)
+
+    def consumir(self, consulta: str) -> Optional[str]:
+        """Resultado antecipado para esta consulta, ou None se não houver (o chamador busca por conta própria)."""
+        chave = CacheRespostas.normalizar(consulta)
+        with self._lock:
+            item = self._pendentes.pop(chave, None)
+        if item is None:
+            self.falhas += 1
+            return None
+        try:
+            with tracer.span("rag_espera"):
+                resultado = item[1].result(timeout=self.espera_max_s)
+            self.acertos += 1
+            return resultado
+        except FuturesTimeout:
+            log.warning("⏳ Busca antecipada na memória demorou demais. Ignorando.")
+        except Exception as e:
+            log.warning(f"⚠️ Busca antecipada na memória falhou: {e}")
+        self.falhas += 1
+        return None
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {"acertos": self.acertos, "falhas": self.falhas, "descartes": self.descartes,
+                    "pendentes": len(self._pendentes)}
+
+    def _buscar(self, consulta: str) -> str:
+        with tracer.span("rag", especulativo=True):
+            return self.relembrar(consulta)
+
+    def _expirar(self):
+        limite = self.relogio() - self.validade_s
+        for chave in [c for c, (instante, _) in self._pendentes.items() if instante < limite]:
+            _, futuro = self._pendentes.pop(chave)
+            futuro.cancel()
+            self.descartes += 1
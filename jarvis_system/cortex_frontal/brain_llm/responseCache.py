@@ -0,0 +1,151 @@
+# jarvis_system/cortex_frontal/brain_llm/responseCache.py
+import hashlib
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from .config import (
+    LLM_CACHE_SEMANTICO, LLM_CACHE_LIMIAR_SIMILARIDADE, LLM_CACHE_MAX_ENTRADAS,
+    LLM_CACHE_TTL_PADRAO, LLM_CACHE_TTL_POR_INTENCAO
+)
+
+class _Entrada:
+    __slots__ = ("resposta", "expira_em", "classe", "vetor", "numeros")
+
+    def __init__(self, resposta, expira_em, classe, vetor, numeros):
+        self.resposta = resposta
+        self.expira_em = expira_em
+        self.classe = classe
+        self.vetor = vetor
+        self.numeros = numeros
+
+class CacheRespostas:
+    """
+    Cache de respostas do LLM em memória.
+    - Chave: (impressão digital do prompt, texto normalizado). A impressão digital
+      cobre modelo, prompt mestre, catálogo de ferramentas e contexto RAG; se
+      qualquer um mudar, a entrada antiga simplesmente deixa de casar.
+    - Acerto exato sempre; acerto semântico (trigramas) opcional, exigindo os
+      mesmos números na frase ("timer de 5" nunca vira "timer de 6").
+    - TTL pela classe de intenção (hora certa expira em segundos, comandos em um dia).
+    """
+    def __init__(self, max_entradas=LLM_CACHE_MAX_ENTRADAS, ttl_padrao=LLM_CACHE_TTL_PADRAO,
+                 regras_ttl=LLM_CACHE_TTL_POR_INTENCAO, semantico=LLM_CACHE_SEMANTICO,
+                 limiar=LLM_CACHE_LIMIAR_SIMILARIDADE, relogio: Callable[[], float] = time.monotonic):
+        self.max_entradas = max_entradas
+        self.ttl_padrao = ttl_padrao
+        self.regras_ttl = [(classe, re.compile(padrao), ttl) for classe, padrao, ttl in regras_ttl]
+        self.semantico = semantico
+        self.limiar = limiar
+        self.relogio = relogio
+        self._lock = threading.Lock()
+        self._entradas: "OrderedDict[Tuple[str, str], _Entrada]" = OrderedDict()
+        self.acertos_exatos = 0
+        self.acertos_semanticos = 0
+        self.falhas = 0
+        self.invalidacoes = 0
+
+    @staticmethod
+    def normalizar(texto: str) -> str:
+        texto = unicodedata.normalize("NFKD", texto.lower())
+        texto = "".join(c for c in texto if not unicodedata.combining(c))
+        return " ".join(re.sub(r"[^\w\s]", " ", texto).split())
+
+    @staticmethod
+    def impressao_digital(*partes) -> str:
+        sha = hashlib.sha1()
+        for parte in partes:
+            sha.update(str(parte or "").encode("utf-8"))
+            sha.update(b"\x00")
+        return sha.hexdigest()
+
+    def classificar(self, texto_normalizado: str) -> Tuple[str, float]:
+        for classe, padrao, ttl in self.regras_ttl:
+            if padrao.search(texto_normalizado):
+                return classe, ttl
+        return "geral", self.ttl_padrao
+
+    def buscar(self, texto: str, impressao: str) -> Optional[str]:
+        normalizado = self.normalizar(texto)
+        agora = self.relogio()
+        with self._lock:
+            entrada = self._entradas.get((impressao, normalizado))
+            if entrada and entrada.expira_em > agora:
+                self._entradas.move_to_end((impressao, normalizado))
+                self.acertos_exatos += 1
+                return entrada.resposta
+
+            if self.semantico:
+                chave = self._mais_parecida(normalizado, impressao, agora)
+                if chave:
+                    self._entradas.move_to_end(chave)
+                    self.acertos_semanticos += 1
+                    return self._entradas[chave].resposta
+
+            self.falhas += 1
+            return None
+
+    def guardar(self, texto: str, impressao: str, resposta: str):
+        if not resposta:
+            return
+        normalizado = self.normalizar(texto)
+        classe, ttl = self.classificar(normalizado)
+        if ttl <= 0:
+            return
+        entrada = _Entrada(resposta, self.relogio() + ttl, classe, _trigramas(normalizado), _numeros(normalizado))
+        with self._lock:
+            self._entradas[(impressao, normalizado)] = entrada
+            self._entradas.move_to_end((impressao, normalizado))
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, motivo: str = ""):
+        """Esquece tudo (ex: o usuário ensinou um fato novo)."""
+        with self._lock:
+            self._entradas.clear()
+            self.invalidacoes += 1
+
+    def estatisticas(self) -> Dict[str, float]:
+        with self._lock:
+            consultas = self.acertos_exatos + self.acertos_semanticos + self.falhas
+            acertos = self.acertos_exatos + self.acertos_semanticos
+            return {
+                "entradas": len(self._entradas),
+                "acertos_exatos": self.acertos_exatos,
+                "acertos_semanticos": self.acertos_semanticos,
+                "falhas": self.falhas,
+                "taxa_acerto": round(acertos / consultas, 3) if consultas else 0.0,
+                "invalidacoes": self.invalidacoes,
+            }
+
+    # =========================================================================
+    # INTERNOS (com _lock adquirido)
+    # =========================================================================
+    def _mais_parecida(self, normalizado: str, impressao: str, agora: float):
+        vetor, numeros = _trigramas(normalizado), _numeros(normalizado)
+        melhor, melhor_score = None, self.limiar
+        for chave, entrada in self._entradas.items():
+            if chave[0] != impressao or entrada.expira_em <= agora or entrada.numeros != numeros:
+                continue
+            score = _cosseno(vetor, entrada.vetor)
+            if score >= melhor_score:
+                melhor, melhor_score = chave, score
+        return melhor
+
+def _trigramas(texto: str) -> Counter:
+    texto = f" {texto} "
+    return Counter(texto[i:i + 3] for i in range(len(texto) - 2))
+
+def _numeros(texto: str) -> tuple:
+    return tuple(re.findall(r"\d+", texto))
+
+def _cosseno(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    produto = sum(valor * b.get(trigrama, 0) for trigrama, valor in a.items())
+    norma = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return produto / norma if norma else 0.0
@@ -0,0 +1,94 @@
+# jarvis_system/cortex_frontal/brain_llm/streamParser.py
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+FALA = "fala"   # Trecho pronto para o sintetizador
+ACAO = "acao"   # Bloco JSON bruto (grafo de tarefas) para o orquestrador
+
+@dataclass
+class FragmentoResposta:
+    tipo: str
+    texto: str
+
+# Início de JSON: cerca markdown, array de objetos ou objeto com chave
+_MARCADOR_JSON = re.compile(r'```|\[\s*\{|\{\s*"')
+# Cauda que ainda pode virar um marcador quando o próximo token chegar
+_CAUDA_SUSPEITA = re.compile(r'(`{1,2}|\[\s*|\{\s*)$')
+_FIM_FRASE = re.compile(r'(?<=[.!?…])\s+|\n+')
+_TAG_LEGADA = re.compile(r'^\[\[.*\]\]$', re.DOTALL)
+
+class ProcessadorStream:
+    """
+    Consome os tokens do LLM à medida que chegam e decide o que fazer com eles:
+    - Texto comum sai em frases completas (FALA) assim que a pontuação fecha.
+    - Resposta que começa com "[[" é uma TAG legada: espera o fim e troca pela frase pronta.
+    - Ao detectar início de JSON, para de falar e acumula o resto como ACAO.
+    """
+    def __init__(self, mapear_tag: Optional[Callable[[str], Optional[str]]] = None):
+        self.mapear_tag = mapear_tag
+        self._partes: List[str] = []
+        self._pendente = ""
+        self._json = ""
+        self._modo = None  # None (indefinido), "texto", "tag", "json"
+
+    @property
+    def texto_completo(self) -> str:
+        return "".join(self._partes).strip()
+
+    def alimentar(self, delta: str) -> List[FragmentoResposta]:
+        if not delta:
+            return []
+        self._partes.append(delta)
+
+        if self._modo == "json":
+            self._json += delta
+            return []
+
+        self._pendente += delta
+        if self._modo is None:
+            inicio = self._pendente.lstrip()
+            if not inicio or inicio == "[":
+                return []  # Ainda não dá para saber se é "[[", "[{" ou texto
+            self._modo = "tag" if inicio.startswith("[[") else "texto"
+
+        if self._modo == "tag":
+            return []
+        return self._extrair_texto()
+
+    def finalizar(self) -> List[FragmentoResposta]:
+        fragmentos = []
+        restante = self._pendente.strip()
+        self._pendente = ""
+
+        if self._modo == "tag" and _TAG_LEGADA.match(restante):
+            frase = self.mapear_tag(restante) if self.mapear_tag else None
+            restante = frase or restante.replace("[[", "").replace("]]", "")
+
+        if restante:
+            fragmentos.append(FragmentoResposta(FALA, restante))
+        if self._json.strip():
+            fragmentos.append(FragmentoResposta(ACAO, self._json.strip()))
+        return fragmentos
+
+    def _extrair_texto(self) -> List[FragmentoResposta]:
+        marcador = _MARCADOR_JSON.search(self._pendente)
+        if marcador:
+            falavel = self._pendente[:marcador.start()].strip()
+            self._json = self._pendente[marcador.start():]
+            self._pendente = ""
+            self._modo = "json"
+            return [FragmentoResposta(FALA, falavel)] if falavel else []
+
+        cauda = _CAUDA_SUSPEITA.search(self._pendente)
+        seguro = self._pendente[:cauda.start()] if cauda else self._pendente
+
+        ultimo_fim = None
+        for fim in _FIM_FRASE.finditer(seguro):
+            ultimo_fim = fim
+        if not ultimo_fim:
+            return []
+
+        frase = self._pendente[:ultimo_fim.start()].strip()
+        self._pendente = self._pendente[ultimo_fim.end():]
+        return [FragmentoResposta(FALA, frase)] if frase else []
@@ -0,0 +1,151 @@
+# jarvis_system/cortex_frontal/brain_llm/tokenBudget.py
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from .config import (
+    TOKEN_CHARS_POR_TOKEN, TOKEN_BUDGET_TOTAL, TOKEN_BUDGET_CATALOGO,
+    TOKEN_BUDGET_USUARIO, TOKEN_BUDGET_MEMORIA_MAX
+)
+
+_RETICENCIAS = " [...] "
+
+def estimar_tokens(texto: str) -> int:
+    """Estimativa offline (caracteres / média por token). Erra para cima em textos curtos."""
+    if not texto:
+        return 0
+    return max(1, math.ceil(len(texto) / TOKEN_CHARS_POR_TOKEN))
+
+def _chars(tokens: int) -> int:
+    return int(tokens * TOKEN_CHARS_POR_TOKEN)
+
+def cortar_pontas(texto: str, limite: int) -> str:
+    """Mantém começo e fim (onde costumam estar o verbo e o objeto de um pedido)."""
+    if estimar_tokens(texto) <= limite:
+        return texto
+    if limite <= 0:
+        return ""
+    meio = max(0, (_chars(limite) - len(_RETICENCIAS)) // 2)
+    return texto[:meio] + _RETICENCIAS + texto[len(texto) - meio:]
+
+def cortar_linhas(texto: str, limite: int) -> Tuple[str, int]:
+    """
+    Mantém linhas inteiras, na ordem em que vieram (a fonte já entrega por relevância),
+    até o limite. Se nem a primeira couber, ela é cortada. Retorna (texto, linhas descartadas).
+    """
+    if estimar_tokens(texto) <= limite:
+        return texto, 0
+    linhas = texto.split("\n")
+    mantidas: List[str] = []
+    usados = 0
+    for linha in linhas:
+        custo = estimar_tokens(linha + "\n")
+        if usados + custo > limite:
+            break
+        mantidas.append(linha)
+        usados += custo
+    if not mantidas and limite > 0:
+        mantidas = [linhas[0][:_chars(limite)]]
+        return mantidas[0], len(linhas) - 1
+    return "\n".join(mantidas), len(linhas) - len(mantidas)
+
+@dataclass
+class UsoTokens:
+    """Tokens estimados de cada seção de UM pedido, depois dos cortes."""
+    secoes: Dict[str, int]
+    orcamento: int
+    cortes: List[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(self.secoes.values())
+
+    def resumo(self) -> str:
+        partes = ", ".join(f"{nome} {tokens}" for nome, tokens in self.secoes.items())
+        texto = f"~{self.total}/{self.orcamento} tokens ({partes})"
+        return texto + (f" | cortes: {', '.join(self.cortes)}" if self.cortes else "")
+
+class OrcamentoTokens:
+    """
+    Divide um orçamento fixo de tokens de entrada entre as seções do prompt:
+    - sistema: template, regras das ferramentas e data/hora. Fixo, só é contado.
+    - catalogo: teto próprio e independente do resto, para que o mesmo catálogo
+      seja sempre cortado igual (o prefixo do prompt continua cacheável).
+    - usuario: teto próprio; falas gigantes perdem o miolo.
+    - memoria: fica com o que sobrar (até o teto), descartando as lembranças menos relevantes.
+    """
+    def __init__(self, total=TOKEN_BUDGET_TOTAL, teto_catalogo=TOKEN_BUDGET_CATALOGO,
+                 teto_usuario=TOKEN_BUDGET_USUARIO, teto_memoria=TOKEN_BUDGET_MEMORIA_MAX):
+        self.total = total
+        self.teto_catalogo = teto_catalogo
+        self.teto_usuario = teto_usuario
+        self.teto_memoria = teto_memoria
+        self._lock = threading.Lock()
+        self._cache_catalogo = (None, None, 0)  # (original, cortado, linhas descartadas)
+        self.pedidos = 0
+        self.soma_total = 0
+        self.maior_total = 0
+        self.cortes_por_secao: Dict[str, int] = {}
+
+    def cortar_catalogo(self, catalogo: str) -> str:
+        """Primeiro passo: o catálogo entra no system prompt, que precisa existir antes de ajustar()."""
+        original, cortado, _ = self._cache_catalogo
+        if original != catalogo:
+            cortado, descartadas = cortar_linhas(catalogo or "", self.teto_catalogo)
+            self._cache_catalogo = (catalogo, cortado, descartadas)
+        return cortado
+
+    def ajustar(self, sistema: str, catalogo: str, memoria: str, usuario: str, dica: str = "") -> Tuple[str, str, UsoTokens]:
+        """
+        Recebe o system prompt já montado com o catálogo de cortar_catalogo() e devolve
+        (memoria, usuario) cabendo no que sobrou do orçamento + o uso estimado do pedido.
+        """
+        cortes = []
+        _, cortado, descartadas = self._cache_catalogo
+        if descartadas and cortado == catalogo:
+            cortes.append(f"catalogo(-{descartadas} ferramentas)")
+
+        usuario_cortado = cortar_pontas(usuario or "", self.teto_usuario)
+        if usuario_cortado != (usuario or ""):
+            cortes.append("usuario")
+
+        tokens_sistema = estimar_tokens(sistema)
+        tokens_usuario = estimar_tokens(usuario_cortado) + estimar_tokens(dica)
+        limite_memoria = max(0, min(self.teto_memoria, self.total - tokens_sistema - tokens_usuario))
+        memoria_cortada, esquecidas = cortar_linhas(memoria or "", limite_memoria)
+        if esquecidas or len(memoria_cortada) < len(memoria or ""):
+            cortes.append(f"memoria(-{esquecidas} lembranças)" if esquecidas else "memoria")
+
+        tokens_catalogo = estimar_tokens(catalogo)
+        uso = UsoTokens(
+            secoes={
+                "sistema": tokens_sistema - tokens_catalogo,
+                "ferramentas": tokens_catalogo,
+                "memoria": estimar_tokens(memoria_cortada),
+                "usuario": tokens_usuario,
+            },
+            orcamento=self.total,
+            cortes=cortes,
+        )
+        self._contabilizar(uso)
+        return memoria_cortada, usuario_cortado, uso
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                "orcamento": self.total,
+                "pedidos": self.pedidos,
+                "media_tokens": round(self.soma_total / self.pedidos, 1) if self.pedidos else 0.0,
+                "maior_pedido": self.maior_total,
+                "cortes_por_secao": dict(self.cortes_por_secao),
+            }
+
+    def _contabilizar(self, uso: UsoTokens):
+        with self._lock:
+            self.pedidos += 1
+            self.soma_total += uso.total
+            self.maior_total = max(self.maior_total, uso.total)
+            for corte in uso.cortes:
+                secao = corte.split("(")[0]
+                self.cortes_por_secao[secao] = self.cortes_por_secao.get(secao, 0) + 1
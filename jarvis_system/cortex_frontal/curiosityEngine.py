@@ -1,10 +1,8 @@
-import os
-import random
-from typing import Optional
-from groq import Groq
+import time
 
 # Imports do Sistema
 from jarvis_system.cortex_frontal.observability import JarvisLogger
+from jarvis_system.cortex_frontal.brain_llm.keyManager import pool_compartilhado
 
 log = JarvisLogger("CORTEX_SUBCONSCIOUS")
 
@@ -16,16 +14,10 @@ except ImportError:
     memoria = None
 
 class CuriosityEngine:
-    def __init__(self):
-        self.api_key = os.getenv("GROQ_API_KEY")
+    def __init__(self, pool=None):
+        # Mesmo pool de chaves/clientes do Córtex: divide o rate limit em vez de disputá-lo
+        self.pool = pool or pool_compartilhado()
         self.model = "llama-3.3-70b-versatile"
-        self.client: Optional[Groq] = None
-        
-        if self.api_key:
-            try:
-                self.client = Groq(api_key=self.api_key)
-            except Exception as e:
-                log.error(f"Erro ao inicializar cliente Groq: {e}")
 
         # Persona focada em engajamento social
         self.system_prompt = (
@@ -43,7 +35,7 @@ class CuriosityEngine:
         Gera uma pergunta de follow-up.
         Timeout agressivo: Se demorar, desiste para não travar a conversa.
         """
-        if not self.client: return ""
+        if not self.pool.keys: return ""
         
         # Filtro Heurístico: Comandos curtos ou imperativos não merecem curiosidade
         # Ex: "Ligar luz", "Que horas são", "Pare".
@@ -65,18 +57,29 @@ class CuriosityEngine:
                 f"Sua pergunta (ou vazio se não couber):"
             )
 
+            # Sem chave livre (todas em cooldown) a curiosidade simplesmente se cala
+            chave = self.pool.escolher()
+            if chave is None:
+                return ""
+
             # Chamada com Timeout Curto (1.5s)
             # A curiosidade não pode atrasar a resposta principal.
-            completion = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.8, # Alta criatividade
-                max_tokens=40,   # Resposta curtíssima
-                timeout=1.5      # Fail Fast
-            )
+            inicio = time.monotonic()
+            try:
+                completion = chave.cliente.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": self.system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.8, # Alta criatividade
+                    max_tokens=40,   # Resposta curtíssima
+                    timeout=1.5      # Fail Fast
+                )
+            except Exception as e:
+                self.pool.falha(chave, e)
+                raise
+            self.pool.sucesso(chave, time.monotonic() - inicio)
             
             pergunta = completion.choices[0].message.content.strip().replace('"', '')
             
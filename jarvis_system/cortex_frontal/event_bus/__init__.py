@@ -1,7 +1,8 @@
 # jarvis_system/cortex_frontal/event_bus/__init__.py
 import logging
-from .model import Evento
+from .model import Evento, Prioridade
 from .eventBus import EventBus
+from .configBus import MODO_ASSINCRONO
 
 # Logger de inicialização (fallback se o core falhar)
 log = logging.getLogger("BUS_INIT")
@@ -9,6 +10,6 @@ bus = None
 
 try:
     # Instância Singleton Global
-    bus = EventBus()
+    bus = EventBus(modo_assincrono=MODO_ASSINCRONO)
 except Exception as e:
     log.critical(f"❌ Falha Fatal ao criar EventBus: {e}")
\ No newline at end of file
@@ -0,0 +1,125 @@
+# jarvis_system/cortex_frontal/event_bus/busMetrics.py
+import bisect
+import threading
+from typing import Any, Dict, List
+
+# Limites superiores (em ms) dos baldes do histograma. O último balde é "+inf".
+BALDES_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+class HistogramaLatencia:
+    """Histograma de baldes fixos: custo constante por amostra, sem guardar as amostras."""
+    __slots__ = ("contagens", "total", "soma_ms", "max_ms")
+
+    def __init__(self):
+        self.contagens: List[int] = [0] * (len(BALDES_MS) + 1)
+        self.total = 0
+        self.soma_ms = 0.0
+        self.max_ms = 0.0
+
+    def registrar(self, duracao_ms: float):
+        self.contagens[bisect.bisect_left(BALDES_MS, duracao_ms)] += 1
+        self.total += 1
+        self.soma_ms += duracao_ms
+        if duracao_ms > self.max_ms:
+            self.max_ms = duracao_ms
+
+    def percentil(self, p: float) -> float:
+        """Aproxima o percentil pelo limite superior do balde (ex: p=0.95)."""
+        if not self.total:
+            return 0.0
+        alvo = p * self.total
+        acumulado = 0
+        for i, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return float(BALDES_MS[i]) if i < len(BALDES_MS) else self.max_ms
+        return self.max_ms
+
+    def resumo(self) -> Dict[str, Any]:
+        return {
+            "amostras": self.total,
+            "media_ms": round(self.soma_ms / self.total, 3) if self.total else 0.0,
+            "p50_ms": self.percentil(0.50),
+            "p95_ms": self.percentil(0.95),
+            "p99_ms": self.percentil(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "baldes": {
+                (f"<={limite}" if i < len(BALDES_MS) else "+inf"): self.contagens[i]
+                for i, limite in enumerate(BALDES_MS + (None,))
+            },
+        }
+
+class _MetricasAssinante:
+    __slots__ = ("chamadas", "erros", "execucao")
+
+    def __init__(self):
+        self.chamadas = 0
+        self.erros = 0
+        self.execucao = HistogramaLatencia()
+
+class _MetricasTopico:
+    __slots__ = ("publicados", "espera_fila", "assinantes")
+
+    def __init__(self):
+        self.publicados = 0
+        self.espera_fila = HistogramaLatencia()
+        self.assinantes: Dict[str, _MetricasAssinante] = {}
+
+class MetricasBarramento:
+    """
+    Contadores de vazão e latência do EventBus, por tópico e por assinante.
+    - publicados: quantos eventos entraram no tópico.
+    - espera_fila: tempo entre publicar e o worker começar a entrega (modo assíncrono).
+    - execucao: tempo gasto dentro de cada callback, com contagem de exceções.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._topicos: Dict[str, _MetricasTopico] = {}
+
+    def _topico(self, nome: str) -> _MetricasTopico:
+        topico = self._topicos.get(nome)
+        if topico is None:
+            topico = self._topicos[nome] = _MetricasTopico()
+        return topico
+
+    def registrar_publicacao(self, topico: str):
+        with self._lock:
+            self._topico(topico).publicados += 1
+
+    def registrar_espera(self, topico: str, segundos: float):
+        with self._lock:
+            self._topico(topico).espera_fila.registrar(segundos * 1000.0)
+
+    def registrar_execucao(self, topico: str, assinante: str, segundos: float, erro: bool = False):
+        with self._lock:
+            metricas_topico = self._topico(topico)
+            metricas = metricas_topico.assinantes.get(assinante)
+            if metricas is None:
+                metricas = metricas_topico.assinantes[assinante] = _MetricasAssinante()
+            metricas.chamadas += 1
+            metricas.execucao.registrar(segundos * 1000.0)
+            if erro:
+                metricas.erros += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Cópia serializável (JSON) do estado atual das métricas."""
+        with self._lock:
+            return {
+                nome: {
+                    "publicados": topico.publicados,
+                    "espera_fila": topico.espera_fila.resumo(),
+                    "assinantes": {
+                        assinante: {
+                            "chamadas": m.chamadas,
+                            "erros": m.erros,
+                            "execucao": m.execucao.resumo(),
+                        }
+                        for assinante, m in topico.assinantes.items()
+                    },
+                }
+                for nome, topico in self._topicos.items()
+            }
+
+    def limpar(self):
+        with self._lock:
+            self._topicos.clear()
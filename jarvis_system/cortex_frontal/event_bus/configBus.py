@@ -0,0 +1,37 @@
+# jarvis_system/cortex_frontal/event_bus/configBus.py
+import os
+from jarvis_system.protocol import Eventos
+from .model import Prioridade, PoliticaTransbordo
+
+# --- DESPACHO ASSÍNCRONO ---
+# Desligado por padrão: o barramento continua síncrono para o código legado.
+MODO_ASSINCRONO = os.getenv("JARVIS_BUS_ASYNC", "0") == "1"
+MAX_WORKERS_DESPACHO = int(os.getenv("JARVIS_BUS_WORKERS", "4"))
+
+# --- CLASSES DE PRIORIDADE POR EVENTO ---
+# Eventos não listados caem em Prioridade.NORMAL.
+PRIORIDADES_PADRAO = {
+    Eventos.SHUTDOWN: Prioridade.CRITICA,
+    Eventos.ERRO: Prioridade.CRITICA,
+    Eventos.STATUS_FALA: Prioridade.ALTA,
+    Eventos.FALA_RECONHECIDA: Prioridade.ALTA,
+    Eventos.FALAR: Prioridade.ALTA,
+    Eventos.LOG: Prioridade.BAIXA,
+    Eventos.NIVEL_MIC: Prioridade.BAIXA,
+}
+
+# Prefixos de tópicos de alta frequência (telemetria/percepção contínua)
+PREFIXOS_BAIXA_PRIORIDADE = ("VISAO_",)
+
+# --- LIMITES DE FILA POR TÓPICO (BACKPRESSURE) ---
+# Chave: nome exato ou padrão glob. Valor: (limite, política de transbordo).
+# Tópicos sem entrada aqui têm fila ilimitada.
+LIMITES_FILA_PADRAO = {
+    Eventos.LOG: (200, PoliticaTransbordo.DESCARTAR_ANTIGO),
+    Eventos.FALA_PARCIAL: (1, PoliticaTransbordo.COALESCER),
+    Eventos.NIVEL_MIC: (1, PoliticaTransbordo.COALESCER),
+    "VISAO_*": (5, PoliticaTransbordo.COALESCER),
+}
+
+# Tempo máximo que um publicador fica preso numa fila BLOQUEAR antes de desistir
+TIMEOUT_BLOQUEIO = 2.0
@@ -1,23 +1,78 @@
 # jarvis_system/cortex_frontal/event_bus/core.py
-from typing import Dict, List
+import threading
+import itertools
+import time
+from fnmatch import fnmatchcase
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 from jarvis_system.cortex_frontal.observability import JarvisLogger
-from .model import Evento, SubscriberFunc
+from .model import Evento, Prioridade, PoliticaTransbordo, SubscriberFunc
+from .busMetrics import MetricasBarramento
+from .configBus import (
+    MAX_WORKERS_DESPACHO, PRIORIDADES_PADRAO, PREFIXOS_BAIXA_PRIORIDADE,
+    LIMITES_FILA_PADRAO, TIMEOUT_BLOQUEIO
+)
 
 # Inicializa o logger específico para o barramento
 log = JarvisLogger("EVENT_BUS")
 
+class _FilaTopico:
+    """Fila pendente de um tópico no modo assíncrono, com limite e política de transbordo."""
+    __slots__ = ("itens", "limite", "politica", "descartados")
+
+    def __init__(self, limite: Optional[int] = None, politica: PoliticaTransbordo = PoliticaTransbordo.DESCARTAR_ANTIGO):
+        # Itens: (sequência global, evento, instante do enfileiramento)
+        self.itens: Deque[Tuple[int, Evento, float]] = deque()
+        self.limite = limite
+        self.politica = politica
+        self.descartados = 0
+
+    def cheia(self) -> bool:
+        return self.limite is not None and len(self.itens) >= self.limite
+
+    def __len__(self):
+        return len(self.itens)
+
 class EventBus:
     """
     Barramento de Eventos Central (Pub/Sub).
     Desacopla produtores (Listen) de consumidores (Brain/Speak).
+
+    Modos de despacho:
+    1. Síncrono (padrão): o callback roda na thread de quem publicou.
+    2. Assíncrono (opcional): o evento entra na fila do seu tópico e um pool
+       limitado de workers o entrega, atendendo primeiro as classes de
+       prioridade mais altas (ex: SHUTDOWN/ERRO antes de LOG). Eventos do
+       mesmo tópico são entregues em ordem, um de cada vez.
     """
-    def __init__(self):
+    def __init__(self, modo_assincrono: bool = False, max_workers: int = MAX_WORKERS_DESPACHO):
         # Mapeia: NomeEvento -> Lista de Funções
         self._assinantes: Dict[str, List[SubscriberFunc]] = {}
         # Assinantes que ouvem TUDO (útil para logs e debug)
         self._wildcard_assinantes: List[SubscriberFunc] = []
+
+        # Prioridades explícitas por tópico (o resto é resolvido em _prioridade_de)
+        self._prioridades: Dict[str, Prioridade] = dict(PRIORIDADES_PADRAO)
+
+        # Estado do despacho assíncrono
+        self._max_workers = max(1, max_workers)
+        self._modo_assincrono = False
+        self._encerrando = False
+        self._cond = threading.Condition()
+        self._filas: Dict[str, _FilaTopico] = {}
+        self._limites_fila: Dict[str, Tuple[int, PoliticaTransbordo]] = dict(LIMITES_FILA_PADRAO)
+        self._topicos_em_execucao: Set[str] = set()
+        self._sequencia = itertools.count()
+        self._workers: List[threading.Thread] = []
+
+        # Vazão e latência por tópico/assinante
+        self._metricas = MetricasBarramento()
+
         log.info("Barramento de Eventos (Modular v2.0) Pronto.")
 
+        if modo_assincrono:
+            self.iniciar_despacho_assincrono()
+
     def inscrever(self, evento_nome: str, callback: SubscriberFunc):
         """
         Registra uma função para reagir a um evento específico.
@@ -30,21 +85,239 @@ class EventBus:
 
         if evento_nome not in self._assinantes:
             self._assinantes[evento_nome] = []
-        
+
         self._assinantes[evento_nome].append(callback)
 
-    def publicar(self, evento: Evento):
+    def configurar_fila(self, evento_nome: str, limite: Optional[int], politica: PoliticaTransbordo = PoliticaTransbordo.DESCARTAR_ANTIGO):
         """
-        Distribui o evento para todos os interessados (Síncrono).
-        Atenção: Os callbacks devem ser rápidos ou rodar em thread separada.
+        Define o limite da fila de um tópico (aceita padrões glob, ex: 'VISAO_*')
+        e o que fazer quando ela transborda. limite=None remove o limite.
+        Só tem efeito no modo assíncrono; no síncrono não existe fila.
         """
+        politica = PoliticaTransbordo(politica)
+        with self._cond:
+            if limite is None:
+                self._limites_fila.pop(evento_nome, None)
+            else:
+                self._limites_fila[evento_nome] = (max(1, int(limite)), politica)
+
+            # Reaplica nas filas que já existem
+            for nome, fila in self._filas.items():
+                fila.limite, fila.politica = self._limite_de(nome)
+            self._cond.notify_all()
+
+    def definir_prioridade(self, evento_nome: str, prioridade: Prioridade):
+        """Altera a classe de prioridade de um tópico no despacho assíncrono."""
+        self._prioridades[evento_nome] = Prioridade(prioridade)
+
+    def publicar(self, evento: Evento, sincrono: bool = False):
+        """
+        Distribui o evento para todos os interessados.
+        No modo assíncrono apenas enfileira e retorna imediatamente;
+        use sincrono=True para forçar a entrega na thread atual.
+        """
+        self._metricas.registrar_publicacao(evento.nome)
+
+        if self._modo_assincrono and not sincrono:
+            self._enfileirar(evento)
+            return
+
+        self._despachar(evento)
+
+    # =========================================================================
+    # DESPACHO ASSÍNCRONO (Pool de Workers com Prioridade)
+    # =========================================================================
+    @property
+    def assincrono(self) -> bool:
+        return self._modo_assincrono
+
+    def iniciar_despacho_assincrono(self, max_workers: Optional[int] = None):
+        """Liga o modo assíncrono e sobe o pool de workers."""
+        with self._cond:
+            if self._modo_assincrono:
+                return
+            if max_workers:
+                self._max_workers = max(1, max_workers)
+            self._encerrando = False
+            self._modo_assincrono = True
+            self._workers = [
+                threading.Thread(target=self._worker_despacho, name=f"BusDespacho-{i}", daemon=True)
+                for i in range(self._max_workers)
+            ]
+        for worker in self._workers:
+            worker.start()
+        log.info(f"Despacho assíncrono ativo ({self._max_workers} workers).")
+
+    def parar_despacho_assincrono(self, drenar: bool = True, timeout: float = 2.0):
+        """
+        Desliga o modo assíncrono. Novas publicações voltam a ser síncronas.
+        Com drenar=True os eventos pendentes ainda são entregues antes de os workers saírem.
+        """
+        with self._cond:
+            if not self._modo_assincrono:
+                return
+            self._modo_assincrono = False
+            self._encerrando = True
+            if not drenar:
+                self._filas.clear()
+            self._cond.notify_all()
+
+        # Um assinante (ex: SHUTDOWN -> kernel.shutdown) pode chamar isto de dentro de um worker
+        atual = threading.current_thread()
+        for worker in self._workers:
+            if worker is not atual:
+                worker.join(timeout=timeout)
+        self._workers = []
+        log.info("Despacho assíncrono encerrado.")
+
+    def aguardar_ociosidade(self, timeout: Optional[float] = None) -> bool:
+        """Bloqueia até todas as filas esvaziarem. Retorna False se estourar o timeout."""
+        with self._cond:
+            return self._cond.wait_for(self._ocioso, timeout=timeout)
+
+    def estado_filas(self) -> Dict[str, Dict[str, Any]]:
+        """Retrato das filas por tópico (pendentes, limite, política e descartes)."""
+        with self._cond:
+            return {
+                nome: {
+                    "pendentes": len(fila),
+                    "limite": fila.limite,
+                    "politica": fila.politica.value,
+                    "descartados": fila.descartados,
+                }
+                for nome, fila in self._filas.items()
+            }
+
+    def metricas(self) -> Dict[str, Any]:
+        """
+        Retrato das métricas do barramento: por tópico, publicações, descartes,
+        fila pendente, espera na fila e, por assinante, chamadas, exceções e
+        histograma do tempo de execução.
+        """
+        topicos = self._metricas.snapshot()
+        for nome, fila in self.estado_filas().items():
+            topicos.setdefault(nome, {}).update(fila)
+        return {
+            "assincrono": self._modo_assincrono,
+            "workers": len(self._workers),
+            "topicos": topicos,
+        }
+
+    def _ocioso(self) -> bool:
+        return not self._topicos_em_execucao and not any(self._filas.values())
+
+    def _limite_de(self, evento_nome: str) -> Tuple[Optional[int], PoliticaTransbordo]:
+        if evento_nome in self._limites_fila:
+            return self._limites_fila[evento_nome]
+        for padrao, config in self._limites_fila.items():
+            if fnmatchcase(evento_nome, padrao):
+                return config
+        return None, PoliticaTransbordo.DESCARTAR_ANTIGO
+
+    def _prioridade_de(self, evento_nome: str) -> Prioridade:
+        if evento_nome in self._prioridades:
+            return self._prioridades[evento_nome]
+        if evento_nome.startswith(PREFIXOS_BAIXA_PRIORIDADE):
+            return Prioridade.BAIXA
+        return Prioridade.NORMAL
+
+    def _fila_de(self, evento_nome: str) -> _FilaTopico:
+        fila = self._filas.get(evento_nome)
+        if fila is None:
+            fila = self._filas[evento_nome] = _FilaTopico(*self._limite_de(evento_nome))
+        return fila
+
+    def _enfileirar(self, evento: Evento):
+        with self._cond:
+            fila = self._fila_de(evento.nome)
+            if fila.cheia() and not self._resolver_transbordo(evento, fila):
+                return
+
+            # BLOQUEAR solta o lock enquanto espera: o despacho pode ter sido desligado
+            # ou as filas resetadas (a 'fila' antiga não é mais atendida por ninguém)
+            if self._modo_assincrono:
+                self._fila_de(evento.nome).itens.append((next(self._sequencia), evento, time.perf_counter()))
+                self._cond.notify()
+                return
+
+        self._despachar(evento)
+
+    def _resolver_transbordo(self, evento: Evento, fila: _FilaTopico) -> bool:
+        """
+        Aplica a política do tópico com a fila cheia (chamado com o lock adquirido).
+        Retorna True se o novo evento ainda deve ser enfileirado.
+        """
+        politica = fila.politica
+
+        if politica == PoliticaTransbordo.BLOQUEAR:
+            # Um worker do próprio barramento nunca espera: ele é quem esvazia as filas (deadlock)
+            if threading.current_thread() in self._workers:
+                return True
+            liberada = lambda: (not fila.cheia() or not self._modo_assincrono
+                                or self._filas.get(evento.nome) is not fila)
+            if self._cond.wait_for(liberada, timeout=TIMEOUT_BLOQUEIO):
+                return True
+            politica = PoliticaTransbordo.DESCARTAR_NOVO
+
+        fila.descartados += 1
+        if fila.descartados == 1 or fila.descartados % 100 == 0:
+            log.warning(f"Fila '{evento.nome}' cheia ({fila.limite}). Política '{politica.value}': {fila.descartados} descarte(s).")
+
+        if politica == PoliticaTransbordo.DESCARTAR_NOVO:
+            return False
+        if politica == PoliticaTransbordo.COALESCER:
+            fila.itens.pop()
+        else:
+            fila.itens.popleft()
+        return True
+
+    def _proximo_topico(self) -> Optional[str]:
+        """
+        Escolhe o tópico a ser atendido: maior prioridade primeiro e, no empate,
+        o evento mais antigo. Tópicos já em execução são pulados para preservar a ordem.
+        """
+        escolhido, melhor_chave = None, None
+        for nome, fila in self._filas.items():
+            if not fila or nome in self._topicos_em_execucao:
+                continue
+            chave = (self._prioridade_de(nome), fila.itens[0][0])
+            if melhor_chave is None or chave < melhor_chave:
+                escolhido, melhor_chave = nome, chave
+        return escolhido
+
+    def _worker_despacho(self):
+        while True:
+            with self._cond:
+                topico = self._proximo_topico()
+                while topico is None:
+                    if self._encerrando and not any(self._filas.values()):
+                        return
+                    self._cond.wait()
+                    topico = self._proximo_topico()
+                _, evento, enfileirado_em = self._filas[topico].itens.popleft()
+                self._topicos_em_execucao.add(topico)
+                # Acorda publicadores presos em filas BLOQUEAR
+                self._cond.notify_all()
+
+            self._metricas.registrar_espera(topico, time.perf_counter() - enfileirado_em)
+            try:
+                self._despachar(evento)
+            finally:
+                with self._cond:
+                    self._topicos_em_execucao.discard(topico)
+                    self._cond.notify_all()
+
+    # =========================================================================
+    # ENTREGA
+    # =========================================================================
+    def _despachar(self, evento: Evento):
         # 1. Notifica ouvintes globais (Wildcards)
-        for callback in self._wildcard_assinantes:
+        for callback in list(self._wildcard_assinantes):
             self._safe_execute(callback, evento)
 
         # 2. Notifica ouvintes específicos
         if evento.nome in self._assinantes:
-            for callback in self._assinantes[evento.nome]:
+            for callback in list(self._assinantes[evento.nome]):
                 self._safe_execute(callback, evento)
         elif not self._wildcard_assinantes:
             # Só avisa se ninguém (nem wildcards) ouviu, para evitar log spam
@@ -55,20 +328,30 @@ class EventBus:
         """Limpa todos os assinantes (Útil para reinicialização do Kernel)."""
         self._assinantes.clear()
         self._wildcard_assinantes.clear()
+        with self._cond:
+            self._filas.clear()
+            self._cond.notify_all()
         log.info("Barramento de eventos resetado.")
 
     def _safe_execute(self, callback: SubscriberFunc, evento: Evento):
-        """Executa o callback protegendo o barramento contra quebras."""
+        """Executa o callback protegendo o barramento contra quebras (e mede o tempo gasto)."""
+        erro = False
+        inicio = time.perf_counter()
         try:
             callback(evento)
         except Exception as e:
+            erro = True
             nome_func = self._get_func_name(callback)
             log.error(f"Erro no assinante '{nome_func}' ao processar '{evento.nome}': {e}")
+        finally:
+            self._metricas.registrar_execucao(
+                evento.nome, self._get_func_name(callback), time.perf_counter() - inicio, erro
+            )
 
     def _get_func_name(self, func) -> str:
-        """Helper para pegar o nome da função/método."""
-        if hasattr(func, "__name__"):
-            return func.__name__
-        if hasattr(func, "func") and hasattr(func.func, "__name__"): # Partials
-            return func.func.__name__
-        return str(func)
\ No newline at end of file
+        """Helper para pegar o nome da função/método (com a classe, ex: Orchestrator.process_input)."""
+        if hasattr(func, "__qualname__"):
+            return func.__qualname__
+        if hasattr(func, "func") and hasattr(func.func, "__qualname__"): # Partials
+            return func.func.__qualname__
+        return str(func)
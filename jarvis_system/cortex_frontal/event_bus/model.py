@@ -1,5 +1,6 @@
 # jarvis_system/cortex_frontal/event_bus/model.py
 from dataclasses import dataclass
+from enum import Enum, IntEnum
 from typing import Dict, Any, Callable
 
 @dataclass
@@ -11,5 +12,24 @@ class Evento:
     nome: str
     dados: Dict[str, Any]
 
+class Prioridade(IntEnum):
+    """
+    Classes de prioridade do despacho assíncrono.
+    Valores menores são atendidos primeiro (SHUTDOWN passa à frente de LOG).
+    """
+    CRITICA = 0
+    ALTA = 1
+    NORMAL = 2
+    BAIXA = 3
+
+class PoliticaTransbordo(str, Enum):
+    """
+    O que fazer quando a fila de um tópico atinge o limite (modo assíncrono).
+    """
+    DESCARTAR_ANTIGO = "drop_oldest"   # Remove o evento pendente mais velho
+    DESCARTAR_NOVO = "drop_newest"     # Ignora o evento que acabou de chegar
+    COALESCER = "coalesce_latest"      # Substitui o pendente mais recente pelo novo (só vale o estado atual)
+    BLOQUEAR = "block"                 # Segura o publicador até abrir espaço
+
 # Definição de Tipo para o Callback (Melhora o Intellisense e Type Hinting)
-SubscriberFunc = Callable[[Evento], None]
\ No newline at end of file
+SubscriberFunc = Callable[[Evento], None]
@@ -2,9 +2,15 @@ import logging
 import json
 import sys
 import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from logging.handlers import RotatingFileHandler
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 # Cores ANSI para o Terminal
 RESET = "\033[0m"
@@ -101,4 +107,122 @@ class JarvisLogger:
     def critical(self, message: str, exc_info=True, **context):
         """Erros fatais que indicam instabilidade sistêmica."""
         msg = self._format_message(f"🛑 SISTEMA CRÍTICO: {message}", context)
-        self.logger.critical(msg, exc_info=exc_info)
\ No newline at end of file
+        self.logger.critical(msg, exc_info=exc_info)
+
+# =============================================================================
+# ⏱️ RASTREAMENTO DE LATÊNCIA (TRACE POR FALA)
+# =============================================================================
+# Trace "ativo" da thread/tarefa atual. Permite que camadas profundas
+# (HybridBrain, AudioEngine) registrem etapas sem mudar assinaturas.
+_current_trace: ContextVar[Optional[str]] = ContextVar("jarvis_trace_id", default=None)
+
+class JarvisTracer:
+    """
+    Correlaciona as etapas de um comando falado (VAD -> STT -> RAG -> LLM -> TTS -> áudio).
+    1. O trace_id viaja dentro de Evento.dados["trace_id"] entre os módulos.
+    2. Cada etapa vira um span (offset e duração em ms relativos ao início do trace).
+    3. Os traces recentes ficam em memória para consulta (API /traces) e cada
+       span também é gravado no log de arquivo via JarvisLogger.
+    """
+    TRACE_KEY = "trace_id"
+
+    def __init__(self, max_traces: int = 200):
+        self.log = JarvisLogger("TRACE")
+        self._lock = threading.Lock()
+        self._traces: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._max_traces = max_traces
+
+    # --- Ciclo de vida -------------------------------------------------------
+    def start_trace(self, origin: str, **attrs) -> str:
+        trace_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._traces[trace_id] = {
+                "trace_id": trace_id,
+                "origem": origin,
+                "inicio": datetime.now().isoformat(timespec="milliseconds"),
+                "_t0": time.perf_counter(),
+                "atributos": dict(attrs),
+                "spans": [],
+                "marcos": {},
+            }
+            while len(self._traces) > self._max_traces:
+                self._traces.popitem(last=False)
+        return trace_id
+
+    @contextmanager
+    def activate(self, trace_id: Optional[str]):
+        """Torna o trace o 'atual' durante o bloco (no-op se trace_id for None)."""
+        token = _current_trace.set(trace_id) if trace_id else None
+        try:
+            yield trace_id
+        finally:
+            if token is not None:
+                _current_trace.reset(token)
+
+    def current(self) -> Optional[str]:
+        return _current_trace.get()
+
+    # --- Registro ------------------------------------------------------------
+    @contextmanager
+    def span(self, stage: str, trace_id: Optional[str] = None, **attrs):
+        """Mede o bloco como uma etapa do trace (atual, se trace_id não for passado)."""
+        trace_id = trace_id or self.current()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            if trace_id:
+                self.record_span(trace_id, stage, inicio, time.perf_counter(), **attrs)
+
+    def record_span(self, trace_id: str, stage: str, start: float, end: float, **attrs):
+        """Registra uma etapa já medida (instantes de time.perf_counter())."""
+        with self._lock:
+            trace = self._traces.get(trace_id)
+            if trace is None:
+                return
+            span = {
+                "etapa": stage,
+                "inicio_ms": round((start - trace["_t0"]) * 1000.0, 2),
+                "duracao_ms": round((end - start) * 1000.0, 2),
+            }
+            if attrs:
+                span["atributos"] = attrs
+            trace["spans"].append(span)
+        self.log.debug(f"⏱️ {stage}", trace_id=trace_id, **span)
+
+    def mark(self, stage: str, trace_id: Optional[str] = None, once: bool = False):
+        """Marco pontual (ex: 'vad_fim', 'primeiro_audio'). once=True mantém só a primeira ocorrência."""
+        trace_id = trace_id or self.current()
+        if not trace_id:
+            return
+        agora = time.perf_counter()
+        with self._lock:
+            trace = self._traces.get(trace_id)
+            if trace is None or (once and stage in trace["marcos"]):
+                return
+            offset = round((agora - trace["_t0"]) * 1000.0, 2)
+            trace["marcos"][stage] = offset
+        self.log.debug(f"📍 {stage}", trace_id=trace_id, offset_ms=offset)
+
+    # --- Consulta ------------------------------------------------------------
+    def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            trace = self._traces.get(trace_id)
+            return self._public_view(trace) if trace else None
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Traces mais recentes primeiro. limit <= 0 devolve lista vazia (não 'todos', como [-0:])."""
+        if limit <= 0:
+            return []
+        with self._lock:
+            traces = list(self._traces.values())[-limit:]
+            return [self._public_view(t) for t in reversed(traces)]
+
+    def _public_view(self, trace: Dict[str, Any]) -> Dict[str, Any]:
+        visao = {k: v for k, v in trace.items() if not k.startswith("_")}
+        visao["spans"] = [dict(s) for s in trace["spans"]]
+        visao["marcos"] = dict(trace["marcos"])
+        return visao
+
+# Instância Global
+tracer = JarvisTracer()
@@ -1,6 +1,7 @@
 # jarvis_system/cortex_frontal/orchestrator/attention.py
 import time
 from difflib import SequenceMatcher
+from typing import Optional
 from .configOrchestrator import WAKE_WORDS, ATTENTION_WINDOW
 
 class AttentionSystem:
@@ -30,6 +31,16 @@ class AttentionSystem:
             
         return False, ""
 
+    def prever(self, text: str) -> Optional[str]:
+        """
+        O payload que check() devolveria agora, sem mexer na janela de atenção.
+        None se a fala não é para o Jarvis. Usado para trabalho especulativo.
+        """
+        if time.time() - self.last_activation < ATTENTION_WINDOW:
+            return self._strip_wake_word(text)
+        is_wake, payload = self._has_wake_word(text)
+        return payload if is_wake else None
+
     def _strip_wake_word(self, text: str) -> str:
         words = text.split()
         for i, w in enumerate(words):
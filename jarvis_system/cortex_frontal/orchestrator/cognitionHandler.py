@@ -5,6 +5,11 @@ import random
 from .configOrchestrator import MEMORY_TRIGGERS
 from jarvis_system.cortex_frontal.observability import JarvisLogger
 
+try:
+    from jarvis_system.cortex_frontal.brain_llm.streamParser import FALA, ACAO
+except ImportError:
+    FALA, ACAO = "fala", "acao"
+
 log = JarvisLogger("ORCH_COG")
 
 class CognitionHandler:
@@ -47,6 +52,45 @@ class CognitionHandler:
 
         return raw_response, None
 
+    def process_stream(self, text: str, falar) -> list:
+        """
+        Versão em streaming de process(): cada frase vai para 'falar' assim que o
+        LLM a termina. Retorna o grafo de ações (ou None) quando a resposta acaba.
+        """
+        if not self.brain:
+            falar("Estou desconectado do meu cérebro.")
+            return None
+
+        # 1. Memória Explícita (mesmo atalho do modo completo)
+        for trigger in MEMORY_TRIGGERS:
+            if trigger in text and "aprenda que" not in text:
+                payload = text.split(trigger, 1)[1].strip()
+                if payload:
+                    self.brain.ensinar(payload)
+                    falar(f"Memorizado: {payload}")
+                    return None
+
+        # 2. Pensamento (LLM) em pedaços
+        json_actions_list = None
+        palavras_faladas = 0
+        for fragmento in self.brain.pensar_stream(text):
+            if fragmento.tipo == FALA:
+                falar(fragmento.texto)
+                palavras_faladas += len(fragmento.texto.split())
+            elif fragmento.tipo == ACAO:
+                json_actions_list = self._extract_json(fragmento.texto)
+                if not json_actions_list:
+                    # Parecia JSON mas não era: fala o que sobrar de texto
+                    resto = self._remove_json_blocks(fragmento.texto)
+                    if resto: falar(resto)
+
+        # 3. Curiosidade (só em conversa curta, como no modo completo)
+        if not json_actions_list and self.curiosity and 0 < palavras_faladas < 15 and random.random() < 0.3:
+            q = self.curiosity.gerar_pergunta(text)
+            if q: falar(q)
+
+        return json_actions_list
+
     def _remove_json_blocks(self, text: str) -> str:
         """Limpa o texto da fala removendo os blocos JSON para o sintetizador de voz não os ler."""
         # Remove markdown de blocos de código
@@ -1,7 +1,6 @@
 # jarvis_system/cortex_frontal/orchestrator/config.py
 
-# Palavras que ativam o sistema
-WAKE_WORDS = ["jarvis", "jarbas", "computer", "sexta-feira", "javis", "jardis"]
+from jarvis_system.protocol import WAKE_WORDS  # Palavras que ativam o sistema (compartilhadas com o ouvido)
 
 # Comandos de Confirmação (Reflexo rápido)
 CONFIRMATION_YES = ["sim", "pode", "pode ser", "isso", "vai", "confirma", "abre", "ok", "claro", "positivo"]
@@ -11,4 +10,8 @@ CONFIRMATION_NO = ["não", "cancela", "errado", "esquece", "nada a ver", "negati
 MEMORY_TRIGGERS = ["memorize", "memoriza", "aprenda", "aprende", "grave", "lembre-se", "anote"]
 
 # Tempo (segundos) que o Jarvis mantém o contexto ativo após um comando
-ATTENTION_WINDOW = 40.0
\ No newline at end of file
+ATTENTION_WINDOW = 40.0
+
+# Execução do Grafo de Tarefas (DAG)
+DAG_MAX_WORKERS = 4      # Ferramentas rodando ao mesmo tempo
+DAG_TIMEOUT_NO_S = 20.0  # Prazo de cada nó; estourou, os dependentes são cancelados
@@ -0,0 +1,174 @@
+# jarvis_system/cortex_frontal/orchestrator/dagExecutor.py
+import contextvars
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional
+
+from jarvis_system.cortex_frontal.observability import JarvisLogger, tracer
+from .configOrchestrator import DAG_MAX_WORKERS, DAG_TIMEOUT_NO_S
+
+# Estados de um nó
+PENDENTE, EXECUTANDO, CONCLUIDO, FALHOU, TIMEOUT, CANCELADO = (
+    "pendente", "executando", "concluido", "falhou", "timeout", "cancelado"
+)
+
+# "{t1}" dentro de um argumento vira a saída da tarefa t1
+_REFERENCIA = re.compile(r"\{(\w+)\}")
+
+class DependencyNode:
+    """Estrutura do TaskBench para nós do Grafo (DAG)."""
+    def __init__(self, task_id, target_tool, initial_args, dependencies):
+        self.task_id = task_id
+        self.target_tool = target_tool
+        self.initial_args = initial_args or {}
+        self.dependencies = list(dependencies or [])
+        self.output_data = None
+        self.status = PENDENTE
+        self.erro: Optional[str] = None
+        self.duracao_s = 0.0
+
+    def __repr__(self):
+        return f"DependencyNode({self.task_id!r}, {self.target_tool!r}, status={self.status!r})"
+
+class DagExecutor:
+    """
+    Executa o grafo de ferramentas de verdade em paralelo:
+    - Nós sem dependência pendente vão para um pool limitado de threads
+      (as ferramentas são I/O: HTTP, automação de janelas, Spotify).
+    - Cada nó tem prazo próprio; estourou, vira TIMEOUT e seus dependentes são cancelados.
+    - Falha (exceção) também cancela toda a cadeia dependente, sem afetar ramos independentes.
+    - A saída dos nós anteriores é injetada nos argumentos ("{t1}") e entregue ao executor.
+
+    'executar_no(node, args, resultados)' faz o trabalho real de um nó.
+    """
+    def __init__(self, executar_no: Callable[[DependencyNode, dict, dict], Any],
+                 max_workers=DAG_MAX_WORKERS, timeout_no=DAG_TIMEOUT_NO_S):
+        self.log = JarvisLogger("ORCH_DAG")
+        self.executar_no = executar_no
+        self.max_workers = max_workers
+        self.timeout_no = timeout_no
+
+    def executar(self, nodes: List[DependencyNode]) -> List[DependencyNode]:
+        por_id: Dict[str, DependencyNode] = {}
+        for node in nodes:
+            if node.task_id in por_id:
+                self._finalizar(node, FALHOU, f"task_id '{node.task_id}' duplicado")
+                continue
+            por_id[node.task_id] = node
+
+        # Mapa reverso (quem depende de quem) e contagem de dependências pendentes
+        dependentes: Dict[str, List[DependencyNode]] = {task_id: [] for task_id in por_id}
+        faltando: Dict[str, set] = {}
+        for task_id, node in por_id.items():
+            faltando[task_id] = set(node.dependencies)
+            for dep_id in node.dependencies:
+                if dep_id in dependentes:
+                    dependentes[dep_id].append(node)
+                elif node.status == PENDENTE:
+                    self._finalizar(node, FALHOU, f"dependência '{dep_id}' inexistente")
+        for node in list(por_id.values()):
+            if node.status != PENDENTE:
+                self._cancelar_dependentes(node, dependentes)
+
+        prontos = deque(n for n in por_id.values() if n.status == PENDENTE and not faltando[n.task_id])
+        em_execucao = {}  # future -> (node, prazo)
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="JarvisDAG")
+
+        try:
+            while prontos or em_execucao:
+                while prontos:
+                    node = prontos.popleft()
+                    if node.status != PENDENTE:
+                        continue
+                    resultados = {dep_id: por_id[dep_id].output_data for dep_id in node.dependencies}
+                    args = self._resolver_args(node.initial_args, resultados)
+                    node.status = EXECUTANDO
+                    # Cada nó roda no contexto atual (trace da fala segue para a ferramenta)
+                    contexto = contextvars.copy_context()
+                    futuro = pool.submit(contexto.run, self._rodar, node, args, resultados)
+                    em_execucao[futuro] = (node, time.monotonic() + self.timeout_no)
+
+                prazo_mais_proximo = min(prazo for _, prazo in em_execucao.values())
+                concluidos, _ = wait(
+                    list(em_execucao), timeout=max(0.0, prazo_mais_proximo - time.monotonic()),
+                    return_when=FIRST_COMPLETED
+                )
+
+                for futuro in concluidos:
+                    node, _ = em_execucao.pop(futuro)
+                    erro = futuro.exception()
+                    if erro is not None:
+                        self._finalizar(node, FALHOU, str(erro))
+                        self._cancelar_dependentes(node, dependentes)
+                        continue
+                    node.output_data = futuro.result()
+                    self._finalizar(node, CONCLUIDO)
+                    for filho in dependentes[node.task_id]:
+                        faltando[filho.task_id].discard(node.task_id)
+                        if filho.status == PENDENTE and not faltando[filho.task_id]:
+                            prontos.append(filho)
+
+                agora = time.monotonic()
+                for futuro, (node, prazo) in list(em_execucao.items()):
+                    if agora >= prazo and not futuro.done():
+                        # A thread não pode ser morta: o resultado dela é simplesmente abandonado
+                        futuro.cancel()
+                        em_execucao.pop(futuro)
+                        self._finalizar(node, TIMEOUT, f"excedeu {self.timeout_no:.0f}s")
+                        self._cancelar_dependentes(node, dependentes)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        # Sobrou alguém pendente: ciclo de dependências
+        for node in por_id.values():
+            if node.status == PENDENTE:
+                self._finalizar(node, FALHOU, "ciclo de dependências")
+        return nodes
+
+    # =========================================================================
+    # INTERNOS
+    # =========================================================================
+    def _rodar(self, node: DependencyNode, args: dict, resultados: dict):
+        self.log.info(f"🚀 Disparando Nó '{node.task_id}' -> Ferramenta: '{node.target_tool}'")
+        inicio = time.perf_counter()
+        try:
+            with tracer.span("ferramenta", ferramenta=node.target_tool, task_id=node.task_id):
+                return self.executar_no(node, args, resultados)
+        finally:
+            node.duracao_s = time.perf_counter() - inicio
+
+    def _finalizar(self, node: DependencyNode, status: str, erro: Optional[str] = None):
+        node.status = status
+        node.erro = erro
+        if status == CONCLUIDO:
+            self.log.info(f"✅ Nó '{node.task_id}' concluído em {node.duracao_s:.2f}s.")
+        elif status == CANCELADO:
+            self.log.warning(f"⏭️ Nó '{node.task_id}' cancelado: {erro}")
+        else:
+            self.log.error(f"❌ Nó '{node.task_id}' {status}: {erro}")
+
+    def _cancelar_dependentes(self, origem: DependencyNode, dependentes: Dict[str, List[DependencyNode]]):
+        fila = deque(dependentes.get(origem.task_id, []))
+        while fila:
+            node = fila.popleft()
+            if node.status != PENDENTE:
+                continue
+            self._finalizar(node, CANCELADO, f"dependência '{origem.task_id}' {origem.status}")
+            fila.extend(dependentes.get(node.task_id, []))
+
+    @staticmethod
+    def _resolver_args(args: dict, resultados: dict) -> dict:
+        """Troca "{task_id}" pela saída da tarefa correspondente (só dependências declaradas)."""
+        if not resultados:
+            return dict(args)
+
+        def substituir(match):
+            task_id = match.group(1)
+            return str(resultados[task_id]) if task_id in resultados else match.group(0)
+
+        return {
+            chave: _REFERENCIA.sub(substituir, valor) if isinstance(valor, str) else valor
+            for chave, valor in args.items()
+        }
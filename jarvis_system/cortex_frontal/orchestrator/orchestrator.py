@@ -2,10 +2,10 @@
 import time
 import re
 import random
-import asyncio
+import uuid
 from typing import Optional
 
-from jarvis_system.cortex_frontal.observability import JarvisLogger
+from jarvis_system.cortex_frontal.observability import JarvisLogger, tracer
 from jarvis_system.cortex_frontal.event_bus import bus, Evento
 from jarvis_system.protocol import Eventos
 
@@ -20,11 +20,12 @@ except ImportError:
     registry, launcher, llm, curiosity, reflexos = None, None, None, None, None
 
 # Módulos Locais
-from .configOrchestrator import CONFIRMATION_YES, CONFIRMATION_NO
+from .configOrchestrator import CONFIRMATION_YES, CONFIRMATION_NO, ATTENTION_WINDOW
 from .attentionSystem import AttentionSystem
 from .learningHandler import LearningHandler
 from .toolsHandler import ToolsHandler
 from .cognitionHandler import CognitionHandler
+from .dagExecutor import DagExecutor, DependencyNode, CONCLUIDO, CANCELADO
 
 class Orchestrator:
     def __init__(self):
@@ -35,6 +36,7 @@ class Orchestrator:
         self.learner = LearningHandler(reflexos)
         self.tools = ToolsHandler(launcher, registry)
         self.cognitive = CognitionHandler(llm, curiosity)
+        self.dag = DagExecutor(self._executar_no)
         
         self.pending_context: Optional[dict] = None
         
@@ -54,6 +56,14 @@ class Orchestrator:
     def process_input(self, evento: Evento):
         raw_text = evento.dados.get("texto", "")
         if not raw_text: return
+
+        # Mantém o trace da fala ativo para as etapas seguintes (RAG, LLM, FALAR)
+        trace_id = evento.dados.get(tracer.TRACE_KEY)
+        tracer.mark("orquestrador_recebeu", trace_id)
+        with tracer.activate(trace_id), tracer.span("orquestrador", trace_id):
+            self._process_input(raw_text)
+
+    def _process_input(self, raw_text: str):
         
         # 🚨 LOG DE DEBUG: Vamos ver se o Orquestrador pelo menos acorda!
         self.log.info(f"📥 Chegou no Orquestrador: '{raw_text}'")
@@ -67,6 +77,10 @@ class Orchestrator:
         clean_text = re.sub(r'[^\w\s]', '', raw_text.lower()).strip()
         clean_text = re.sub(r'(.)\1{2,}', r'\1', clean_text) 
 
+        # 1.5 Memória especulativa: a busca RAG começa já, em paralelo com as etapas baratas abaixo.
+        # Se a fala não chegar à cognição, o resultado expira sem uso.
+        self._antecipar_memoria(clean_text)
+
         # 2. Confirmações Pendentes
         if self._handle_confirmation(clean_text): return
 
@@ -77,6 +91,8 @@ class Orchestrator:
             self.log.warning(f"⚠️ Comando ignorado! A palavra de ativação (Jarvis) não foi validada em: '{clean_text}'")
             return
 
+        bus.publicar(Evento(Eventos.ATENCAO, {"janela_s": ATTENTION_WINDOW}))
+
         if not payload:
             self._speak(random.choice(["Pois não?", "Estou aqui.", "Sim?", "Às ordens."]))
             return
@@ -98,6 +114,20 @@ class Orchestrator:
                 return
 
             # 4.3 Cognição (LLM)
+            if getattr(self.cognitive.brain, "streaming", False):
+                # Streaming: as frases vão sendo faladas enquanto o modelo ainda gera.
+                # Todas levam o mesmo id de resposta para a Broca falar como uma fala só.
+                resposta = uuid.uuid4().hex[:8]
+                try:
+                    json_action = self.cognitive.process_stream(
+                        payload, lambda frase: self._speak(frase, resposta=resposta)
+                    )
+                finally:
+                    self._speak("", resposta=resposta, fim=True)
+                if json_action:
+                    self._execute_json_action(json_action)
+                return
+
             response_text, json_action = self.cognitive.process(payload)
             
             if json_action:
@@ -109,6 +139,14 @@ class Orchestrator:
             self.log.error(f"Erro no pipeline: {e}")
             self._speak("Ocorreu um erro interno no processamento.")
 
+    def _antecipar_memoria(self, clean_text: str):
+        antecipar = getattr(self.cognitive.brain, "antecipar_memoria", None)
+        if not antecipar or self.pending_context:
+            return
+        payload = self.attention.prever(clean_text)
+        if payload:
+            antecipar(payload)
+
     def _handle_confirmation(self, text: str) -> bool:
         if not self.pending_context: return False
         
@@ -131,32 +169,23 @@ class Orchestrator:
                 reflexos.adicionar_correcao(ctx["original_term"], ctx["name"].lower())
         self.pending_context = None
 
-    class DependencyNode:
-        """Estrutura do TaskBench para nós do Grafo (DAG)."""
-        def __init__(self, task_id, target_tool, initial_args, dependencies):
-            self.task_id = task_id
-            self.target_tool = target_tool
-            self.initial_args = initial_args
-            self.dependencies = dependencies
-            self.output_data = None
-            self.completion_event = asyncio.Event() # Cadeado assíncrono
-
     def _execute_json_action(self, action_data):
         """
         FASE 2: Motor de Execução de Grafos (DAG).
-        Lê a lista de tarefas, mapeia dependências e dispara tudo em paralelo.
+        Lê a lista de tarefas, mapeia dependências e entrega ao DagExecutor, que roda
+        os ramos independentes em paralelo de verdade.
         """
         # 1. Normalização (Aceita o DAG novo ou o dicionário antigo como fallback)
         tasks = action_data if isinstance(action_data, list) else [action_data]
         nodes = []
 
         # 2. Constrói os Nós do Grafo
-        for t in tasks:
+        for i, t in enumerate(tasks):
             if "ferramenta" in t: # Fallback para o modo antigo (dict)
-                nodes.append(self.DependencyNode("t1", t.get("ferramenta"), {k: v for k, v in t.items() if k != "ferramenta"}, []))
+                nodes.append(DependencyNode(f"t{i + 1}", t.get("ferramenta"), {k: v for k, v in t.items() if k != "ferramenta"}, []))
             else: # Novo modo Grafo DAG
-                nodes.append(self.DependencyNode(
-                    t.get("task_id", f"task_{random.randint(0,999)}"),
+                nodes.append(DependencyNode(
+                    t.get("task_id", f"t{i + 1}"),
                     t.get("target_tool"),
                     t.get("initial_args", {}),
                     t.get("dependencies", [])
@@ -164,45 +193,31 @@ class Orchestrator:
 
         self.log.info(f"🕸️ Grafo de Tarefas (DAG) montado com {len(nodes)} nó(s). Executando...")
 
-        # 3. Lógica Assíncrona de Paralelismo
-        async def process_single_node(node, all_nodes):
-            # A) Aguardar as dependências terminarem primeiro
-            for dep_id in node.dependencies:
-                dep_node = next((n for n in all_nodes if n.task_id == dep_id), None)
-                if dep_node:
-                    self.log.info(f"⏳ Nó '{node.task_id}' aguardando nó '{dep_id}' terminar...")
-                    await dep_node.completion_event.wait()
-
-            # B) Executar a Ferramenta
-            self.log.info(f"🚀 Disparando Nó '{node.task_id}' -> Ferramenta: '{node.target_tool}'")
-            try:
-                if node.target_tool == "memoria_gravar":
-                    dado = node.initial_args.get("dado") or node.initial_args.get("parametro")
-                    if llm: llm.ensinar(dado)
-                    node.output_data = f"Memorizado: {dado}"
-                else:
-                    node.output_data = self.tools.execute_tool_from_llm(node.target_tool, **node.initial_args)
-            except Exception as e:
-                node.output_data = f"Erro na tarefa {node.task_id}: {e}"
-
-            # C) Destrancar o cadeado (Avisa quem estava esperando que terminou)
-            self.log.info(f"✅ Nó '{node.task_id}' concluído.")
-            node.completion_event.set()
-
-        async def execute_graph():
-            # Inicia TODOS os nós ao mesmo tempo. Os que têm dependências vão pausar sozinhos.
-            await asyncio.gather(*(process_single_node(n, nodes) for n in nodes))
-
-        # 4. Inicia o Loop Assíncrono para resolver o Grafo
-        asyncio.run(execute_graph())
-
-        # 5. Fala os resultados processados para o usuário
-        for n in nodes:
-            if n.output_data and str(n.output_data).strip() and str(n.output_data) != "None":
-                self._speak(str(n.output_data))
+        # 3. Execução paralela (bloqueia até o último nó terminar ou estourar o prazo)
+        self.dag.executar(nodes)
 
-    def _speak(self, text: str):
-        bus.publicar(Evento(Eventos.FALAR, {"texto": text}))
+        # 4. Fala os resultados processados para o usuário
+        for n in nodes:
+            if n.status == CONCLUIDO:
+                if n.output_data and str(n.output_data).strip() and str(n.output_data) != "None":
+                    self._speak(str(n.output_data))
+            elif n.status != CANCELADO:
+                # Cancelados não falam: a causa já foi dita pela tarefa que falhou
+                self._speak(f"Erro na tarefa {n.task_id}: {n.erro}")
+
+    def _executar_no(self, node: DependencyNode, args: dict, resultados: dict):
+        """Trabalho real de um nó do grafo (roda numa thread do DagExecutor)."""
+        if node.target_tool == "memoria_gravar":
+            dado = args.get("dado") or args.get("parametro")
+            # Sem referência explícita ("{t1}"), o resultado das dependências acompanha o dado
+            if resultados and args == node.initial_args:
+                dado = f"{dado}: " + " | ".join(str(r) for r in resultados.values())
+            if llm: llm.ensinar(dado)
+            return f"Memorizado: {dado}"
+        return self.tools.execute_tool_from_llm(node.target_tool, **args)
+
+    def _speak(self, text: str, **extras):
+        bus.publicar(Evento(Eventos.FALAR, {"texto": text, tracer.TRACE_KEY: tracer.current(), **extras}))
 
     def start(self):
         # Apenas logamos. A propriedade 'sistemas_carregados' agora faz a verificação real
@@ -1,10 +1,10 @@
-import os
-from groq import Groq
+import time
+from jarvis_system.cortex_frontal.brain_llm.keyManager import pool_compartilhado
 
 class VoiceDirector:
-    def __init__(self):
-        self.api_key = os.getenv("GROQ_API_KEY")
-        self.client = Groq(api_key=self.api_key) if self.api_key else None
+    def __init__(self, pool=None):
+        # Usa o pool compartilhado de chaves (clientes persistentes + cooldown de rate limit)
+        self.pool = pool or pool_compartilhado()
         
         # As tags oficiais que seu Fish Audio aceita (baseado na documentação que você mandou)
         self.emocoes_validas = [
@@ -17,8 +17,9 @@ class VoiceDirector:
         """
         A I.A. lê a frase e escolhe a melhor tag de emoção.
         """
-        if not self.client:
-            return "confident" # Fallback padrão se estiver offline
+        chave = self.pool.escolher()
+        if chave is None:
+            return "confident" # Fallback padrão se estiver offline (ou sem chave livre)
 
         prompt = f"""
         Aja como um Diretor de Voz para o assistente JARVIS.
@@ -39,12 +40,18 @@ class VoiceDirector:
         """
 
         try:
-            chat_completion = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.3-70b-versatile", # Modelo rápido e inteligente
-                temperature=0.1, # Baixa temperatura para ser consistente
-                max_tokens=10
-            )
+            inicio = time.monotonic()
+            try:
+                chat_completion = chave.cliente.chat.completions.create(
+                    messages=[{"role": "user", "content": prompt}],
+                    model="llama-3.3-70b-versatile", # Modelo rápido e inteligente
+                    temperature=0.1, # Baixa temperatura para ser consistente
+                    max_tokens=10
+                )
+            except Exception as e:
+                self.pool.falha(chave, e)
+                raise
+            self.pool.sucesso(chave, time.monotonic() - inicio)
             
             emocao_detectada = chat_completion.choices[0].message.content.strip().lower()
             
@@ -27,6 +27,9 @@ class ToolRegistry:
     def __init__(self):
         self._tools: Dict[str, ToolDefinition] = {}
         self._agentes: Dict[str, Any] = {}
+        # Muda a cada registro: quem monta prompts só refaz o catálogo quando ela muda
+        self.versao = 0
+        self._catalogo_cache: Optional[tuple] = None  # (versao, texto)
         
         # Dicionário fixo de descrições para guiar o LLM corretamente e evitar "Fantasmas"
         self._descricoes_agentes = {
@@ -60,6 +63,7 @@ class ToolRegistry:
                                 agente = classe_encontrada()
                                 if agente.nome not in self._agentes:
                                     self._agentes[agente.nome] = agente
+                                    self.versao += 1
                                     log.info(f"🎓 Especialista Integrado (Auto-Discovery): {agente.nome.upper()}")
                             except Exception as erro_instancia:
                                 log.error(f"❌ Falha ao instanciar o agente '{classe_encontrada.__name__}': {erro_instancia}")
@@ -80,6 +84,7 @@ class ToolRegistry:
                 name=name, description=description, func=funcao,
                 parameters_schema=schema, safe_mode=safe_mode
             )
+            self.versao += 1
             log.debug(f"🔧 Ferramenta funcional registrada: '{name}'")
             return funcao
         return decorador
@@ -88,6 +93,9 @@ class ToolRegistry:
         return list(self._tools.keys()) + list(self._agentes.keys())
 
     def get_all_tool_descriptions(self) -> str:
+        if self._catalogo_cache and self._catalogo_cache[0] == self.versao:
+            return self._catalogo_cache[1]
+
         descricoes = []
         for nome, agente in self._agentes.items():
             descricao_texto = self._descricoes_agentes.get(nome, getattr(agente, 'descricao', f"Agente especialista em {nome}"))
@@ -96,7 +104,8 @@ class ToolRegistry:
         for nome, ferramenta in self._tools.items():
             descricoes.append(f"- Ferramenta: '{nome}' | Uso: {ferramenta.description}")
             
-        return "\n".join(descricoes)
+        self._catalogo_cache = (self.versao, "\n".join(descricoes))
+        return self._catalogo_cache[1]
 
     def execute(self, tool_name: str, **kwargs) -> Any:
         # =========================================================
@@ -14,15 +14,46 @@ except ImportError:
     CHROMA_AVAILABLE = False
     Settings = None
 
+from .configMemoria import EMBEDDING_BACKEND, EMBEDDING_MODELO, EMBEDDING_CACHE_ATIVO
+from .embeddings import CacheEmbeddings, EmbeddingComCache, criar_funcao_embedding
+
 class ChromaConnection:
     COLLECTION_NAME = "jarvis_knowledge_base"
 
-    def __init__(self, storage):
+    def __init__(self, storage, backend: str = EMBEDDING_BACKEND, modelo: str = EMBEDDING_MODELO):
         self.storage = storage
         self.logger = logging.getLogger("HIPOCAMPUS_CONN")
         self.client = None
         self.collection = None
         self.is_connected = False
+        self.backend = backend
+        self.modelo = modelo
+        self.embedding = None  # EmbeddingComCache, criada na conexão
+
+    def _preparar_embedding(self):
+        """Monta a função de embedding escolhida (com cache). Backend quebrado cai no padrão."""
+        try:
+            funcao, identificador = criar_funcao_embedding(self.backend, self.modelo)
+        except Exception as exc:
+            if self.backend == "padrao":
+                raise
+            self.logger.warning(f"⚠️ Backend de embedding '{self.backend}' indisponível ({exc}). Usando o padrão.")
+            self.backend, self.modelo = "padrao", ""
+            funcao, identificador = criar_funcao_embedding("padrao")
+
+        cache = None
+        if EMBEDDING_CACHE_ATIVO:
+            cache = CacheEmbeddings(self.storage.embedding_cache_path, identificador)
+        self.embedding = EmbeddingComCache(funcao, cache, identificador)
+        self.logger.info(f"🧬 Embeddings: {identificador} (cache {'ligado' if cache else 'desligado'})")
+
+    @property
+    def nome_colecao(self) -> str:
+        # Vetores de modelos diferentes não são comparáveis: cada backend tem sua coleção
+        if self.backend == "padrao":
+            return self.COLLECTION_NAME
+        sufixo = f"{self.backend}_{self.modelo}" if self.modelo else self.backend
+        return f"{self.COLLECTION_NAME}_{''.join(c if c.isalnum() else '_' for c in sufixo)}"[:63]
 
     def connect(self):
         """Estabelece a conexão e retorna a coleção."""
@@ -50,9 +81,13 @@ class ChromaConnection:
                 )
             )
             
+            if self.embedding is None:
+                self._preparar_embedding()
+
             # Obtém ou cria a coleção (Knowledge Base)
             self.collection = self.client.get_or_create_collection(
-                name=self.COLLECTION_NAME,
+                name=self.nome_colecao,
+                embedding_function=self.embedding,
                 metadata={"hnsw:space": "cosine"} # Distância de cosseno é melhor para texto
             )
             
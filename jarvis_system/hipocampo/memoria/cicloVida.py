@@ -0,0 +1,203 @@
+# jarvis_system/hipocampo/memoria/cicloVida.py
+import datetime
+import json
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Optional
+
+from .indiceLexico import tokenizar
+from .configMemoria import (
+    CICLO_RETENCAO_DIAS, CICLO_RESUMIR_APOS_DIAS, CICLO_LIMIAR_DUPLICATA, CICLO_TERMO_COMUM_MAX
+)
+
+log = logging.getLogger("HIPOCAMPO_CICLO")
+
+def _data(meta: dict) -> Optional[datetime.datetime]:
+    try:
+        return datetime.datetime.fromisoformat(meta.get("timestamp", ""))
+    except (TypeError, ValueError):
+        return None
+
+def agrupar_quase_duplicatas(termos: Dict[str, frozenset], limiar: float = CICLO_LIMIAR_DUPLICATA,
+                             comum_max: int = CICLO_TERMO_COMUM_MAX) -> List[List[str]]:
+    """
+    Grupos de ids cujos conjuntos de termos têm Jaccard >= limiar.
+    Só compara pares que dividem algum termo raro (índice invertido), nunca todos contra todos.
+    """
+    postings: Dict[str, List[str]] = defaultdict(list)
+    for doc_id, conjunto in termos.items():
+        for termo in conjunto:
+            postings[termo].append(doc_id)
+
+    pai = {doc_id: doc_id for doc_id in termos}
+    def raiz(x):
+        while pai[x] != x:
+            pai[x] = pai[pai[x]]
+            x = pai[x]
+        return x
+
+    comparados = set()
+    for ids in postings.values():
+        if len(ids) < 2 or len(ids) > comum_max:
+            continue
+        for i, a in enumerate(ids):
+            for b in ids[i + 1:]:
+                if (a, b) in comparados:
+                    continue
+                comparados.add((a, b))
+                ta, tb = termos[a], termos[b]
+                if len(ta & tb) / len(ta | tb) >= limiar:
+                    pai[raiz(a)] = raiz(b)
+
+    grupos: Dict[str, List[str]] = defaultdict(list)
+    for doc_id in termos:
+        grupos[raiz(doc_id)].append(doc_id)
+    return [g for g in grupos.values() if len(g) > 1]
+
+class CicloVidaMemoria:
+    """
+    Manutenção da jarvis_knowledge_base, numa passada só sobre a coleção:
+    1. Expira registros pela política de retenção da tag/tipo.
+    2. Resume episódios antigos de agentes num registro compacto por (agente, ação).
+    3. Funde quase-duplicatas (mesmo tipo e tag), mantendo o registro mais recente.
+    4. Compacta o índice léxico e o cache de embeddings.
+    """
+    def __init__(self, memoria, retencao_dias: Optional[Dict[str, Optional[float]]] = None,
+                 resumir_apos_dias: float = CICLO_RESUMIR_APOS_DIAS, limiar_duplicata: float = CICLO_LIMIAR_DUPLICATA,
+                 agora: Callable[[], datetime.datetime] = datetime.datetime.utcnow):
+        self.memoria = memoria
+        self.retencao_dias = CICLO_RETENCAO_DIAS if retencao_dias is None else retencao_dias
+        self.resumir_apos_dias = resumir_apos_dias
+        self.limiar_duplicata = limiar_duplicata
+        self.agora = agora
+        self.ultimo_relatorio: Optional[dict] = None
+
+    def executar(self) -> Optional[dict]:
+        if not self.memoria._conectar():
+            log.warning("⚠️ Ciclo de memória adiado: Hipocampo offline.")
+            return None
+
+        inicio = time.perf_counter()
+        self.memoria.descarregar()
+        dados = self.memoria.collection.get(include=["documents", "metadatas"])
+        registros = {
+            doc_id: (doc or "", meta or {})
+            for doc_id, doc, meta in zip(dados["ids"], dados["documents"], dados["metadatas"])
+        }
+        total_antes = len(registros)
+        agora = self.agora()
+
+        expirados = self._expirados(registros, agora)
+        for doc_id in expirados:
+            registros.pop(doc_id)
+
+        resumidos, resumos = self._resumir_episodios(registros, agora)
+        for doc_id in resumidos:
+            registros.pop(doc_id)
+
+        fundidos, atualizados = self._fundir_duplicatas({k: v for k, v in registros.items() if k not in resumos})
+
+        # Um resumo expirado é recriado do zero com os episódios novos: não pode ser removido depois
+        remover = [d for d in expirados + resumidos + fundidos if d not in resumos]
+        for doc_id, (documento, meta) in {**resumos, **atualizados}.items():
+            self.memoria._persistir(doc_id, documento, meta)
+        self.memoria.descarregar()
+        self.memoria.esquecer(remover)
+        self.memoria.compactar()
+
+        self.ultimo_relatorio = {
+            "registros_antes": total_antes,
+            "registros_depois": self.memoria.collection.count(),
+            "expirados": len(expirados),
+            "episodios_resumidos": len(resumidos),
+            "resumos_gravados": len(resumos),
+            "duplicatas_fundidas": len(fundidos),
+            "duracao_s": round(time.perf_counter() - inicio, 2),
+            "executado_em": agora.isoformat(),
+        }
+        log.info(
+            f"🧹 Ciclo de memória: {len(expirados)} expirados, {len(resumidos)} episódios -> {len(resumos)} resumos, "
+            f"{len(fundidos)} duplicatas fundidas ({total_antes} -> {self.ultimo_relatorio['registros_depois']})."
+        )
+        return self.ultimo_relatorio
+
+    # =======================
+    # Etapas
+    # =======================
+    def _politica(self, meta: dict) -> Optional[float]:
+        for chave in (meta.get("tags"), meta.get("tipo")):
+            if chave in self.retencao_dias:
+                return self.retencao_dias[chave]
+        return None
+
+    def _expirados(self, registros: dict, agora: datetime.datetime) -> List[str]:
+        expirados = []
+        for doc_id, (_, meta) in registros.items():
+            dias = self._politica(meta)
+            data = _data(meta)
+            if dias is not None and data and (agora - data).total_seconds() > dias * 86400:
+                expirados.append(doc_id)
+        return expirados
+
+    def _resumir_episodios(self, registros: dict, agora: datetime.datetime):
+        limite = agora - datetime.timedelta(days=self.resumir_apos_dias)
+        grupos = defaultdict(list)
+        for doc_id, (_, meta) in registros.items():
+            data = _data(meta)
+            if meta.get("tipo") == "episodio_agente" and data and data < limite:
+                grupos[(meta.get("agente", "?"), meta.get("acao", "?"))].append((doc_id, meta, data))
+
+        resumidos, resumos = [], {}
+        for (agente, acao), episodios in grupos.items():
+            resumo_id = f"res_{re.sub(r'[^a-z0-9_]', '', f'{agente}_{acao}'.lower())[:60]}"
+            anterior = registros.get(resumo_id, (None, {}))[1]
+            resultados = Counter(json.loads(anterior.get("resultados", "{}")))
+            emocoes = Counter(json.loads(anterior.get("emocoes", "{}")))
+            # Episódios idênticos já fundidos valem pelo número de ocorrências ('vezes')
+            for _, m, _ in episodios:
+                vezes = int(m.get("vezes", 1))
+                resultados[m.get("resultado", "?")] += vezes
+                emocoes[m.get("emocao", "?")] += vezes
+            datas = [d for _, _, d in episodios] + [
+                d for d in (_data(anterior), _data({"timestamp": anterior.get("desde")})) if d
+            ]
+            total = sum(resultados.values())
+
+            documento = (
+                f"Resumo de {total} episódios do agente {agente} em '{acao}': "
+                f"{', '.join(f'{r} x{n}' for r, n in resultados.most_common())}. "
+                f"O agente sentiu-se {', '.join(f'{e} x{n}' for e, n in emocoes.most_common())}."
+            )
+            resumos[resumo_id] = (documento, {
+                "tipo": "resumo_episodios",
+                "agente": agente,
+                "acao": acao,
+                "total": total,
+                "resultados": json.dumps(dict(resultados), ensure_ascii=False),
+                "emocoes": json.dumps(dict(emocoes), ensure_ascii=False),
+                "desde": min(datas).isoformat(),
+                "timestamp": max(datas).isoformat(),
+            })
+            resumidos.extend(doc_id for doc_id, _, _ in episodios)
+        return resumidos, resumos
+
+    def _fundir_duplicatas(self, registros: dict):
+        """Em cada grupo, o registro mais recente sobrevive e herda a contagem ('vezes')."""
+        por_grupo = defaultdict(dict)
+        for doc_id, (documento, meta) in registros.items():
+            termos = frozenset(tokenizar(documento))
+            if termos:
+                por_grupo[(meta.get("tipo"), meta.get("tags"))][doc_id] = termos
+
+        fundidos, atualizados = [], {}
+        for termos in por_grupo.values():
+            for grupo in agrupar_quase_duplicatas(termos, self.limiar_duplicata):
+                grupo.sort(key=lambda d: registros[d][1].get("timestamp", ""), reverse=True)
+                sobrevivente, *resto = grupo
+                documento, meta = registros[sobrevivente]
+                vezes = sum(int(registros[d][1].get("vezes", 1)) for d in grupo)
+                atualizados[sobrevivente] = (documento, {**meta, "vezes": vezes})
+                fundidos.extend(resto)
+        return fundidos, atualizados
@@ -0,0 +1,44 @@
+# jarvis_system/hipocampo/memoria/configMemoria.py
+import os
+
+# --- ESCRITA ATRASADA (Write-Behind) ---
+# Gravações vão para um buffer e são persistidas em lote por uma thread própria.
+ESCRITA_ATRASADA = os.getenv("JARVIS_MEMORIA_WRITE_BEHIND", "1") == "1"
+ESCRITA_LOTE_MAX = 32          # Descarrega assim que juntar isso de documentos
+ESCRITA_INTERVALO_S = 2.0      # ...ou quando o mais antigo do buffer tiver esta idade
+ESCRITA_ALERTA_PENDENTES = 500 # Acima disso (Chroma fora do ar?) o buffer avisa no log
+
+# --- EMBEDDINGS ---
+# Backend do vetor de cada texto: "padrao" (ONNX MiniLM embutido no Chroma), "fastembed"
+# (ONNX quantizado na CPU, aceita modelos multilíngues) ou "sentence_transformers".
+# Trocar de backend troca também a coleção (vetores de modelos diferentes não se misturam).
+EMBEDDING_BACKEND = os.getenv("JARVIS_EMBEDDING_BACKEND", "padrao")
+EMBEDDING_MODELO = os.getenv("JARVIS_EMBEDDING_MODELO", "")  # Vazio = modelo padrão do backend
+EMBEDDING_CACHE_ATIVO = os.getenv("JARVIS_EMBEDDING_CACHE", "1") == "1"
+EMBEDDING_CACHE_MEMORIA = 4096     # Vetores quentes em RAM (LRU)
+EMBEDDING_CACHE_DISCO_MAX = 200_000  # Acima disso os mais antigos saem do arquivo
+
+# --- BUSCA HÍBRIDA (BM25 + vetores) ---
+# Índice léxico persistido ao lado do Chroma. Nomes exatos (artistas, apps) são achados
+# sem embedding; o resto funde as duas listas por Reciprocal Rank Fusion.
+BUSCA_HIBRIDA = os.getenv("JARVIS_MEMORIA_HIBRIDA", "1") == "1"
+BM25_K1 = 1.5
+BM25_B = 0.75
+HIBRIDA_RRF_K = 60               # Constante da fusão: maior = posições pesam menos
+HIBRIDA_ATALHO_MAX_TERMOS = 3    # Consulta curta coberta por inteiro no 1º acerto léxico dispensa vetores
+
+# --- CICLO DE VIDA (TTL, duplicatas, resumos, compactação) ---
+# Roda em segundo plano pelo Subconsciente; mantém a coleção (e a latência da busca) estável.
+CICLO_ATIVO = os.getenv("JARVIS_MEMORIA_CICLO", "1") == "1"
+CICLO_INTERVALO_S = 6 * 3600.0
+CICLO_ATRASO_INICIAL_S = 600.0     # Não disputa CPU com o boot
+CICLO_ESPERA_PARADA_S = 30.0      # No encerramento, espera a passada em andamento antes de fechar a memória
+# Dias até expirar, por tag (metadado 'tags') ou tipo (metadado 'tipo'). Ausente/None = para sempre.
+CICLO_RETENCAO_DIAS = {
+    "episodio_agente": 90,
+    "resumo_episodios": 365,
+}
+CICLO_RESUMIR_APOS_DIAS = 7        # Episódios mais velhos que isso viram um resumo por (agente, ação)
+CICLO_LIMIAR_DUPLICATA = 0.9       # Jaccard dos termos para considerar duas memórias a mesma
+CICLO_TERMO_COMUM_MAX = 50         # Termos em mais documentos que isso não geram pares candidatos
+CICLO_LOTE_REMOCAO = 500
@@ -0,0 +1,231 @@
+# jarvis_system/hipocampo/memoria/embeddings.py
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from chromadb.api.types import EmbeddingFunction
+except ImportError:
+    EmbeddingFunction = object
+
+from .configMemoria import EMBEDDING_CACHE_MEMORIA, EMBEDDING_CACHE_DISCO_MAX
+
+log = logging.getLogger("HIPOCAMPO_EMBEDDINGS")
+
+# =========================================================================
+# BACKENDS (plugáveis): fábrica(modelo) -> função(lista de textos) -> lista de vetores
+# =========================================================================
+def _backend_padrao(modelo: str):
+    from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+    return DefaultEmbeddingFunction()
+
+def _backend_fastembed(modelo: str):
+    # ONNX quantizado na CPU; o modelo padrão entende português
+    from fastembed import TextEmbedding
+    motor = TextEmbedding(model_name=modelo or "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+    return lambda textos: list(motor.embed(list(textos)))
+
+def _backend_sentence_transformers(modelo: str):
+    from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+    return SentenceTransformerEmbeddingFunction(model_name=modelo or "all-MiniLM-L6-v2")
+
+BACKENDS: Dict[str, Callable[[str], Callable]] = {
+    "padrao": _backend_padrao,
+    "fastembed": _backend_fastembed,
+    "sentence_transformers": _backend_sentence_transformers,
+}
+
+def registrar_backend(nome: str, fabrica: Callable[[str], Callable]):
+    """Permite plugar outro modelo (ex: um ONNX próprio) sem mexer na conexão."""
+    BACKENDS[nome] = fabrica
+
+def criar_funcao_embedding(backend: str, modelo: str = "") -> Tuple[Callable, str]:
+    """Retorna (função, identificador). O identificador separa caches e coleções por modelo."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de embedding desconhecido: '{backend}'. Opções: {', '.join(BACKENDS)}")
+    return BACKENDS[backend](modelo), f"{backend}:{modelo or 'padrao'}"
+
+# =========================================================================
+# CACHE (RAM + disco) ENDEREÇADO PELO CONTEÚDO
+# =========================================================================
+class CacheEmbeddings:
+    """
+    Vetores indexados por sha1(modelo + texto): o mesmo texto nunca é calculado duas vezes,
+    nem entre reinícios. LRU em RAM na frente de um SQLite (float32 em BLOB).
+    """
+    def __init__(self, caminho: Optional[str], namespace: str,
+                 max_memoria=EMBEDDING_CACHE_MEMORIA, max_disco=EMBEDDING_CACHE_DISCO_MAX):
+        self.namespace = namespace
+        self.max_memoria = max_memoria
+        self.max_disco = max_disco
+        self._lock = threading.Lock()
+        self._memoria: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._gravacoes = 0
+        self._db = None
+        if caminho:
+            try:
+                self._db = sqlite3.connect(caminho, check_same_thread=False)
+                self._db.execute("CREATE TABLE IF NOT EXISTS vetores (chave TEXT PRIMARY KEY, vetor BLOB, criado_em REAL)")
+                self._db.commit()
+            except sqlite3.Error as e:
+                log.warning(f"⚠️ Cache de embeddings só em RAM ({caminho}): {e}")
+                self._db = None
+
+    def chave(self, texto: str) -> str:
+        return hashlib.sha1(f"{self.namespace}\x00{texto}".encode("utf-8")).hexdigest()
+
+    def buscar(self, textos: Sequence[str]) -> List[Optional[np.ndarray]]:
+        chaves = [self.chave(t) for t in textos]
+        resultado: List[Optional[np.ndarray]] = []
+        faltando = []
+        with self._lock:
+            for i, chave in enumerate(chaves):
+                vetor = self._memoria.get(chave)
+                if vetor is not None:
+                    self._memoria.move_to_end(chave)
+                else:
+                    faltando.append(i)
+                resultado.append(vetor)
+
+            if faltando and self._db is not None:
+                marcadores = ",".join("?" * len(faltando))
+                linhas = self._db.execute(
+                    f"SELECT chave, vetor FROM vetores WHERE chave IN ({marcadores})",
+                    [chaves[i] for i in faltando]
+                ).fetchall()
+                do_disco = {chave: np.frombuffer(blob, dtype=np.float32) for chave, blob in linhas}
+                for i in faltando:
+                    vetor = do_disco.get(chaves[i])
+                    if vetor is not None:
+                        resultado[i] = vetor
+                        self._lembrar(chaves[i], vetor)
+        return resultado
+
+    def guardar(self, textos: Sequence[str], vetores: Sequence) -> None:
+        agora = time.time()
+        linhas = []
+        with self._lock:
+            for texto, vetor in zip(textos, vetores):
+                vetor = np.asarray(vetor, dtype=np.float32)
+                chave = self.chave(texto)
+                self._lembrar(chave, vetor)
+                linhas.append((chave, vetor.tobytes(), agora))
+            if self._db is None or not linhas:
+                return
+            try:
+                self._db.executemany("INSERT OR REPLACE INTO vetores VALUES (?, ?, ?)", linhas)
+                self._gravacoes += len(linhas)
+                if self._gravacoes >= 1000:
+                    self._gravacoes = 0
+                    self._podar()
+                self._db.commit()
+            except sqlite3.Error as e:
+                log.warning(f"⚠️ Falha ao gravar cache de embeddings: {e}")
+
+    def compactar(self):
+        """Aplica o teto de disco e devolve ao sistema o espaço liberado."""
+        with self._lock:
+            if self._db is None:
+                return
+            try:
+                self._podar()
+                self._db.commit()
+                self._db.execute("VACUUM")
+            except sqlite3.Error as e:
+                log.warning(f"⚠️ Falha ao compactar cache de embeddings: {e}")
+
+    def fechar(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _lembrar(self, chave: str, vetor: np.ndarray):
+        self._memoria[chave] = vetor
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self.max_memoria:
+            self._memoria.popitem(last=False)
+
+    def _podar(self):
+        total = self._db.execute("SELECT COUNT(*) FROM vetores").fetchone()[0]
+        excesso = total - self.max_disco
+        if excesso > 0:
+            self._db.execute(
+                "DELETE FROM vetores WHERE chave IN (SELECT chave FROM vetores ORDER BY criado_em LIMIT ?)", (excesso,)
+            )
+
+class EmbeddingComCache(EmbeddingFunction):
+    """
+    Função de embedding entregue ao Chroma: consulta o cache e só manda ao modelo
+    os textos inéditos, num lote só. Mede acertos e tempo gasto no modelo.
+    """
+    def __init__(self, funcao: Callable, cache: Optional[CacheEmbeddings], identificador: str):
+        self.funcao = funcao
+        self.cache = cache
+        self.identificador = identificador
+        self._lock = threading.Lock()
+        self.chamadas = 0
+        self.textos = 0
+        self.acertos = 0
+        self.calculados = 0
+        self.tempo_modelo_s = 0.0
+        self.ultimo_ms = 0.0
+
+    def __call__(self, input):
+        textos = list(input)
+        inicio = time.perf_counter()
+        vetores = self.cache.buscar(textos) if self.cache else [None] * len(textos)
+        faltando = [i for i, v in enumerate(vetores) if v is None]
+
+        tempo_modelo = 0.0
+        if faltando:
+            inicio_modelo = time.perf_counter()
+            novos = self.funcao([textos[i] for i in faltando])
+            tempo_modelo = time.perf_counter() - inicio_modelo
+            novos = [np.asarray(v, dtype=np.float32) for v in novos]
+            for i, vetor in zip(faltando, novos):
+                vetores[i] = vetor
+            if self.cache:
+                self.cache.guardar([textos[i] for i in faltando], novos)
+
+        with self._lock:
+            self.chamadas += 1
+            self.textos += len(textos)
+            self.acertos += len(textos) - len(faltando)
+            self.calculados += len(faltando)
+            self.tempo_modelo_s += tempo_modelo
+            self.ultimo_ms = (time.perf_counter() - inicio) * 1000.0
+        return vetores
+
+    # Identidade para o Chroma: igual à da função embrulhada, para não gerar conflito
+    # com coleções já criadas por ela (o cache não muda os vetores)
+    def name(self) -> str:
+        nome = getattr(self.funcao, "name", None)
+        return nome() if callable(nome) else f"jarvis_{self.identificador.split(':')[0]}"
+
+    def get_config(self) -> dict:
+        config = getattr(self.funcao, "get_config", None)
+        return config() if callable(config) else {"identificador": self.identificador}
+
+    def is_legacy(self) -> bool:
+        # Sempre legado: o wrapper depende do cache aberto e não se reconstrói a partir de config.
+        # Se não fosse, o Chroma chamaria name() na classe para registrá-la (o protocolo o declara
+        # @staticmethod) e a identidade herdada da função embrulhada não existe sem instância.
+        return True
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                "modelo": self.identificador,
+                "chamadas": self.chamadas,
+                "textos": self.textos,
+                "taxa_acerto": round(self.acertos / self.textos, 3) if self.textos else 0.0,
+                "ms_por_texto_calculado": round(self.tempo_modelo_s * 1000.0 / self.calculados, 2) if self.calculados else None,
+                "ultima_chamada_ms": round(self.ultimo_ms, 2),
+            }
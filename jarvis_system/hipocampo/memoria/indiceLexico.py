@@ -0,0 +1,190 @@
+# jarvis_system/hipocampo/memoria/indiceLexico.py
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from .configMemoria import BM25_K1, BM25_B
+
+log = logging.getLogger("HIPOCAMPO_LEXICO")
+
+# Palavras que não ajudam a achar uma lembrança (nem contam para a cobertura da consulta)
+_STOPWORDS = frozenset("""
+a o as os um uma uns umas de da do das dos e ou em no na nos nas num numa para pra pro por pelo pela
+com sem que se me te lhe eu tu ele ela nos voce voces meu minha meus minhas seu sua seus suas ao aos
+qual quais quem como onde quando sobre isso isto esse essa este esta foi era ser tem ter sao jarvis
+""".split())
+
+def tokenizar(texto: str) -> List[str]:
+    """Minúsculas, sem acentos, só letras/dígitos, sem stopwords."""
+    texto = unicodedata.normalize("NFKD", (texto or "").lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return [t for t in re.findall(r"[a-z0-9]+", texto) if t not in _STOPWORDS]
+
+@dataclass
+class AcertoLexico:
+    doc_id: str
+    texto: str
+    score: float
+    cobertura: float  # Fração dos termos distintos da consulta presentes no documento
+
+class IndiceBM25:
+    """
+    Índice invertido (BM25) ao lado da coleção do Chroma. Vive em RAM e é espelhado
+    num SQLite: consulta sem embedding, sem rede e sem GPU.
+    """
+    def __init__(self, caminho: Optional[str], k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._docs: Dict[str, tuple] = {}         # id -> (texto, metadados, Counter de termos, tamanho)
+        self._postings: Dict[str, Set[str]] = {}  # termo -> ids
+        self._total_termos = 0
+        self._db = None
+        if caminho:
+            try:
+                self._db = sqlite3.connect(caminho, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.execute("CREATE TABLE IF NOT EXISTS documentos (id TEXT PRIMARY KEY, texto TEXT, metadados TEXT)")
+                self._db.commit()
+                for doc_id, texto, metadados in self._db.execute("SELECT id, texto, metadados FROM documentos"):
+                    self._indexar(doc_id, texto, json.loads(metadados or "{}"))
+            except sqlite3.Error as e:
+                log.warning(f"⚠️ Índice léxico só em RAM ({caminho}): {e}")
+                self._db = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def ids(self) -> Set[str]:
+        with self._lock:
+            return set(self._docs)
+
+    # =======================
+    # Escrita
+    # =======================
+    def adicionar(self, doc_id: str, texto: str, metadados: Optional[dict] = None):
+        metadados = metadados or {}
+        with self._lock:
+            self._desindexar(doc_id)
+            self._indexar(doc_id, texto, metadados)
+            self._gravar("INSERT OR REPLACE INTO documentos VALUES (?, ?, ?)",
+                         [(doc_id, texto, json.dumps(metadados, ensure_ascii=False))])
+
+    def remover(self, ids: Iterable[str]):
+        ids = list(ids)
+        with self._lock:
+            for doc_id in ids:
+                self._desindexar(doc_id)
+            self._gravar("DELETE FROM documentos WHERE id = ?", [(i,) for i in ids])
+
+    def reconstruir(self, ids: List[str], documentos: List[str], metadados: List[Optional[dict]]):
+        """Substitui tudo pelo conteúdo atual da coleção (bootstrap / reconciliação)."""
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self._total_termos = 0
+            linhas = []
+            for doc_id, texto, meta in zip(ids, documentos, metadados):
+                meta = meta or {}
+                self._indexar(doc_id, texto or "", meta)
+                linhas.append((doc_id, texto or "", json.dumps(meta, ensure_ascii=False)))
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM documentos")
+                    self._db.executemany("INSERT OR REPLACE INTO documentos VALUES (?, ?, ?)", linhas)
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    log.warning(f"⚠️ Falha ao regravar índice léxico: {e}")
+
+    def compactar(self):
+        """Devolve ao disco o espaço de documentos removidos."""
+        with self._lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute("VACUUM")
+                self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                log.warning(f"⚠️ Falha ao compactar índice léxico: {e}")
+
+    def fechar(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # =======================
+    # Busca
+    # =======================
+    def buscar(self, consulta: str, limite: int = 3, filtro: Optional[dict] = None) -> List[AcertoLexico]:
+        termos = set(tokenizar(consulta))
+        if not termos:
+            return []
+        with self._lock:
+            n = len(self._docs)
+            if not n:
+                return []
+            media = self._total_termos / n
+            scores: Dict[str, float] = {}
+            encontrados: Dict[str, int] = {}
+            for termo in termos:
+                postings = self._postings.get(termo)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id in postings:
+                    _, meta, contagem, tamanho = self._docs[doc_id]
+                    if filtro and any(meta.get(k) != v for k, v in filtro.items()):
+                        continue
+                    tf = contagem[termo]
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (
+                        tf + self.k1 * (1 - self.b + self.b * tamanho / media)
+                    )
+                    encontrados[doc_id] = encontrados.get(doc_id, 0) + 1
+
+            melhores = sorted(scores, key=scores.get, reverse=True)[:limite]
+            return [
+                AcertoLexico(d, self._docs[d][0], scores[d], encontrados[d] / len(termos))
+                for d in melhores
+            ]
+
+    # =======================
+    # Interno (chamar com o lock)
+    # =======================
+    def _indexar(self, doc_id: str, texto: str, metadados: dict):
+        contagem = Counter(tokenizar(texto))
+        tamanho = sum(contagem.values())
+        self._docs[doc_id] = (texto, metadados, contagem, tamanho)
+        self._total_termos += tamanho
+        for termo in contagem:
+            self._postings.setdefault(termo, set()).add(doc_id)
+
+    def _desindexar(self, doc_id: str):
+        antigo = self._docs.pop(doc_id, None)
+        if not antigo:
+            return
+        _, _, contagem, tamanho = antigo
+        self._total_termos -= tamanho
+        for termo in contagem:
+            postings = self._postings.get(termo)
+            if postings:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[termo]
+
+    def _gravar(self, sql: str, linhas: list):
+        if self._db is None or not linhas:
+            return
+        try:
+            self._db.executemany(sql, linhas)
+            self._db.commit()
+        except sqlite3.Error as e:
+            log.warning(f"⚠️ Falha ao persistir índice léxico: {e}")
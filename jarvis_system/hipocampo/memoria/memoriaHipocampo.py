@@ -1,4 +1,5 @@
 import uuid
+import atexit
 import datetime
 import re
 import logging
@@ -6,32 +7,109 @@ from typing import Optional, Dict, Any, List
 
 from .memoryStorage import MemoryStorage
 from .chromaConnection import ChromaConnection
+from .writeBehind import BufferEscrita
+from .indiceLexico import IndiceBM25, tokenizar
+from .configMemoria import (
+    ESCRITA_ATRASADA, BUSCA_HIBRIDA, HIBRIDA_RRF_K, HIBRIDA_ATALHO_MAX_TERMOS, CICLO_LOTE_REMOCAO
+)
 
 class MemoriaHipocampo:
-    def __init__(self):
+    def __init__(self, storage: Optional[MemoryStorage] = None):
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger("HIPOCAMPO_CORE")
         
-        self.storage = MemoryStorage()
+        self.storage = storage or MemoryStorage()
         self.connection_manager = ChromaConnection(self.storage)
         
         # Propriedades de compatibilidade
         self.db_path = self.storage.db_path
         self.collection = None
         
+        # Escrita atrasada: quem grava (voz, agentes, ingestão) não espera embedding + disco
+        self.escrita = BufferEscrita(self.connection_manager.connect, logger=self.logger) if ESCRITA_ATRASADA else None
+        if self.escrita:
+            atexit.register(self.parar)
+
+        # Busca híbrida: índice BM25 atualizado na hora (antes mesmo do buffer chegar ao Chroma).
+        # Aberto junto com a primeira conexão: sem Chroma não há o que indexar.
+        self.indice: Optional[IndiceBM25] = None
+        self.buscas = {"consultas": 0, "so_lexica": 0, "hibridas": 0, "so_vetorial": 0}
+        
         # Auto-conectar
         self._conectar()
 
     def _conectar(self):
         self.collection = self.connection_manager.connect()
+        if self.collection is not None and self.indice is None and BUSCA_HIBRIDA:
+            self.indice = IndiceBM25(self.storage.indice_lexico_path)
+            self.sincronizar_indice()
         return self.collection is not None
 
+    def sincronizar_indice(self, forcar: bool = False) -> bool:
+        """
+        Reconstrói o índice léxico a partir da coleção quando os dois divergem
+        (primeira execução, ou gravações/remoções feitas direto no Chroma).
+        """
+        if self.indice is None or self.collection is None:
+            return False
+        try:
+            self.descarregar()
+            if not forcar and self.collection.count() == len(self.indice):
+                return False
+            dados = self.collection.get(include=["documents", "metadatas"])
+            self.indice.reconstruir(dados["ids"], dados["documents"], dados["metadatas"])
+            self.logger.info(f"🔤 Índice léxico reconstruído ({len(self.indice)} documentos).")
+            return True
+        except Exception as exc:
+            self.logger.warning(f"⚠️ Não foi possível sincronizar o índice léxico: {exc}")
+            return False
+
     # =======================
     # Utilitários
     # =======================
     def _normalizar(self, texto: str, limite: int = 20) -> str:
         return re.sub(r"[^a-zA-Z0-9]", "", texto).lower()[:limite]
 
+    def _persistir(self, doc_id: str, documento: str, metadados: Dict[str, Any]):
+        if self.indice is not None:
+            self.indice.adicionar(doc_id, documento, metadados)
+        if self.escrita:
+            self.escrita.enfileirar(doc_id, documento, metadados)
+        else:
+            self.collection.upsert(documents=[documento], metadatas=[metadados], ids=[doc_id])
+
+    def descarregar(self, timeout: Optional[float] = None) -> bool:
+        """Força a gravação do que estiver no buffer de escrita."""
+        return self.escrita.descarregar(timeout) if self.escrita else True
+
+    def parar(self):
+        """Desligamento: nenhuma memória enfileirada pode se perder."""
+        if self.escrita:
+            self.escrita.parar()
+        if self.indice is not None:
+            self.indice.fechar()
+
+    def esquecer(self, ids: List[str]) -> int:
+        """Remove registros da coleção e do índice léxico (em lotes, limite do Chroma)."""
+        if not ids or not self._conectar(): return 0
+        self.descarregar()
+        for i in range(0, len(ids), CICLO_LOTE_REMOCAO):
+            lote = ids[i:i + CICLO_LOTE_REMOCAO]
+            self.collection.delete(ids=lote)
+            if self.indice is not None:
+                self.indice.remover(lote)
+        self.logger.info(f"🗑️ {len(ids)} memórias esquecidas.")
+        return len(ids)
+
+    def compactar(self):
+        """Realinha o índice léxico com a coleção e devolve ao disco o espaço dos registros apagados."""
+        self.sincronizar_indice()
+        if self.indice is not None:
+            self.indice.compactar()
+        embedding = self.connection_manager.embedding
+        if embedding and embedding.cache:
+            embedding.cache.compactar()
+
     def _gerar_id_track(self, musica: str, artista: str) -> str:
         return (
             f"tk_"
@@ -54,11 +132,7 @@ class MemoriaHipocampo:
         
         try:
             doc_id = f"fact_{uuid.uuid4().hex[:8]}"
-            self.collection.add(
-                documents=[fato],
-                metadatas=[{"timestamp": timestamp, "tipo": "fato_usuario"}],
-                ids=[doc_id]
-            )
+            self._persistir(doc_id, fato, {"timestamp": timestamp, "tipo": "fato_usuario"})
             self.logger.info(f"💾 Fato memorizado: '{fato}'")
             return True
         except Exception as exc:
@@ -90,11 +164,7 @@ class MemoriaHipocampo:
         }
 
         try:
-            self.collection.upsert(
-                documents=[documento],
-                metadatas=[metadados],
-                ids=[self._gerar_id_track(musica, artista)]
-            )
+            self._persistir(self._gerar_id_track(musica, artista), documento, metadados)
             self.logger.info(f"💾 Memória musical consolidada: {musica} — {artista}")
         except Exception as exc:
             self.logger.error(f"❌ Erro ao persistir música: {exc}")
@@ -126,11 +196,7 @@ class MemoriaHipocampo:
 
         try:
             evento_id = f"evt_{agente}_{uuid.uuid4().hex[:8]}"
-            self.collection.add(
-                documents=[documento],
-                metadatas=[metadados],
-                ids=[evento_id]
-            )
+            self._persistir(evento_id, documento, metadados)
             self.logger.info(f"🧠 Memória episódica gravada: {agente} -> {acao} ({resultado})")
         except Exception as exc:
             self.logger.error(f"❌ Erro ao gravar episódio: {exc}")
@@ -147,25 +213,62 @@ class MemoriaHipocampo:
         try:
             if tags: tags = tags.lower().strip()
             filtro = {"tags": tags} if tags else None
+            self.buscas["consultas"] += 1
+
+            lexicos = self.indice.buscar(consulta, limite * 2, filtro) if self.indice is not None else []
+            if self._basta_lexico(consulta, lexicos):
+                # Nome exato (artista, app, time...): responde sem calcular embedding
+                self.buscas["so_lexica"] += 1
+                return self._formatar([a.texto for a in lexicos[:limite]])
+
+            # Leia o que você escreveu: gravações ainda no buffer entram no banco antes da busca
+            if self.escrita and self.escrita.pendentes:
+                self.escrita.descarregar()
 
             resultado = self.collection.query(
                 query_texts=[consulta],
-                n_results=limite,
+                n_results=limite * 2 if lexicos else limite,
                 where=filtro
             )
             
             # O Chroma retorna uma lista de listas. Pegamos a primeira lista.
-            documentos = resultado.get("documents", [])
-            if documentos and len(documentos) > 0:
-                lista_docs = documentos[0]
-                # Formata para o LLM consumir como texto
-                return "\n".join([f"- {d}" for d in lista_docs if d])
-            
-            return ""
+            documentos = (resultado.get("documents") or [[]])[0]
+            if not lexicos:
+                self.buscas["so_vetorial"] += 1
+                return self._formatar(documentos[:limite])
+
+            self.buscas["hibridas"] += 1
+            ids = (resultado.get("ids") or [[]])[0]
+            return self._formatar(self._fundir(lexicos, list(zip(ids, documentos)), limite))
         except Exception as exc:
             self.logger.error(f"❌ Falha na recuperação: {exc}")
             return ""
 
+    def _basta_lexico(self, consulta: str, lexicos) -> bool:
+        """Consulta curta com todos os termos no melhor acerto léxico: é busca por nome exato."""
+        if not lexicos or lexicos[0].cobertura < 1.0:
+            return False
+        return len(set(tokenizar(consulta))) <= HIBRIDA_ATALHO_MAX_TERMOS
+
+    @staticmethod
+    def _fundir(lexicos, vetoriais, limite: int) -> List[str]:
+        """Reciprocal Rank Fusion: soma 1/(k + posição) de cada lista onde o documento aparece."""
+        pontos: Dict[str, float] = {}
+        textos: Dict[str, str] = {}
+        for posicao, acerto in enumerate(lexicos):
+            pontos[acerto.doc_id] = pontos.get(acerto.doc_id, 0.0) + 1.0 / (HIBRIDA_RRF_K + posicao + 1)
+            textos[acerto.doc_id] = acerto.texto
+        for posicao, (doc_id, texto) in enumerate(vetoriais):
+            pontos[doc_id] = pontos.get(doc_id, 0.0) + 1.0 / (HIBRIDA_RRF_K + posicao + 1)
+            textos.setdefault(doc_id, texto)
+        melhores = sorted(pontos, key=pontos.get, reverse=True)[:limite]
+        return [textos[d] for d in melhores]
+
+    @staticmethod
+    def _formatar(documentos: List[str]) -> str:
+        # Formata para o LLM consumir como texto
+        return "\n".join([f"- {d}" for d in documentos if d])
+
     def consultar_experiencia_passada(self, agente: str, acao: str) -> List[str]:
         """Consulta experiências passadas de falhas ou erros."""
         if not self._conectar(): return []
@@ -174,6 +277,16 @@ class MemoriaHipocampo:
         res = self.relembrar(query, limite=2)
         return res.split("\n") if res else []
 
+    def estatisticas(self) -> dict:
+        """Cache/tempo de embedding e fila de escrita."""
+        embedding = self.connection_manager.embedding
+        return {
+            "colecao": self.connection_manager.nome_colecao,
+            "busca": dict(self.buscas, indexados=len(self.indice) if self.indice is not None else None),
+            "embeddings": embedding.estatisticas() if embedding else None,
+            "escrita": self.escrita.estatisticas() if self.escrita else None,
+        }
+
     def status(self) -> str:
         if not self.connection_manager.is_connected:
             return "Offline"
@@ -12,6 +12,10 @@ class MemoryStorage:
         
         # Onde o banco físico vive
         self.db_path = os.path.join(self.root_dir, "jarvis_system", "data", "jarvis_memory_db")
+        # Cache de vetores (texto -> embedding) fora do Chroma, sobrevive a reinícios
+        self.embedding_cache_path = os.path.join(self.root_dir, "jarvis_system", "data", "embedding_cache.sqlite")
+        # Índice léxico (BM25) espelhando a coleção, para busca híbrida offline
+        self.indice_lexico_path = os.path.join(self.root_dir, "jarvis_system", "data", "indice_lexico.sqlite")
         
         self._ensure_paths()
 
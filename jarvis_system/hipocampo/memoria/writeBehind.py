@@ -0,0 +1,154 @@
+# jarvis_system/hipocampo/memoria/writeBehind.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from .configMemoria import ESCRITA_LOTE_MAX, ESCRITA_INTERVALO_S, ESCRITA_ALERTA_PENDENTES
+
+class BufferEscrita:
+    """
+    Buffer de escrita atrasada para a coleção do Chroma.
+    - enfileirar() nunca bloqueia: só guarda (id, documento, metadados) e acorda a thread.
+    - Vários registros viram UM upsert (um lote de embeddings + uma escrita em disco).
+    - O mesmo id enfileirado duas vezes antes do lote sai uma vez só, com a última versão.
+    - Descarrega por tamanho (lote_max), por idade (intervalo_s) ou sob demanda (descarregar()).
+    - Se o lote falhar, os registros voltam para o buffer e são tentados de novo no próximo ciclo.
+    - Depois de parar() não há mais thread: enfileirar() grava na hora (síncrono).
+    """
+    def __init__(self, obter_colecao: Callable[[], object], lote_max=ESCRITA_LOTE_MAX,
+                 intervalo_s=ESCRITA_INTERVALO_S, logger: Optional[logging.Logger] = None):
+        self.obter_colecao = obter_colecao
+        self.lote_max = lote_max
+        self.intervalo_s = intervalo_s
+        self.logger = logger or logging.getLogger("HIPOCAMPO_ESCRITA")
+        self._cond = threading.Condition()
+        self._pendentes: "OrderedDict[str, Tuple[str, dict]]" = OrderedDict()
+        self._primeiro_em = 0.0
+        self._retentar_em = 0.0
+        self._escrevendo = False  # Um lote por vez: leitores e descarregar() esperam por ele
+        self._parar = False
+        self._thread: Optional[threading.Thread] = None
+        self.lotes = 0
+        self.gravados = 0
+        self.falhas = 0
+
+    def enfileirar(self, doc_id: str, documento: str, metadados: Dict):
+        with self._cond:
+            if not self._pendentes:
+                self._primeiro_em = time.monotonic()
+            self._pendentes[doc_id] = (documento, metadados)
+            self._pendentes.move_to_end(doc_id)
+            if len(self._pendentes) == ESCRITA_ALERTA_PENDENTES:
+                self.logger.warning(f"⚠️ {ESCRITA_ALERTA_PENDENTES} memórias aguardando gravação. O banco está respondendo?")
+            parado = self._parar
+            if not parado:
+                self._garantir_thread()
+            self._cond.notify_all()
+        if parado:
+            # Gravação tardia (ex: agente terminando durante o desligamento)
+            self.descarregar()
+
+    @property
+    def pendentes(self) -> int:
+        with self._cond:
+            return len(self._pendentes) + (1 if self._escrevendo else 0)
+
+    def descarregar(self, timeout: Optional[float] = None) -> bool:
+        """Grava tudo o que estiver no buffer (inclusive um lote em andamento). True se esvaziou."""
+        limite = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._escrevendo:
+                restante = None if limite is None else limite - time.monotonic()
+                if restante is not None and restante <= 0:
+                    return False
+                self._cond.wait(restante)
+            lote = self._retirar_lote(todos=True)
+        if lote:
+            self._gravar(lote)
+        with self._cond:
+            return not self._pendentes
+
+    def parar(self, timeout: float = 5.0):
+        """Desligamento: descarrega o que resta e encerra a thread."""
+        with self._cond:
+            self._parar = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+        self.descarregar(timeout)
+
+    def estatisticas(self) -> dict:
+        with self._cond:
+            return {"pendentes": len(self._pendentes), "lotes": self.lotes,
+                    "gravados": self.gravados, "falhas": self.falhas}
+
+    # =========================================================================
+    # INTERNOS
+    # =========================================================================
+    def _garantir_thread(self):
+        # Criada só na primeira escrita: quem só lê a memória não ganha uma thread à toa
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="HipocampoEscrita", daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._parar:
+                    agora = time.monotonic()
+                    if not self._pendentes or self._escrevendo:
+                        self._cond.wait()
+                    elif agora < self._retentar_em:
+                        self._cond.wait(self._retentar_em - agora)  # Banco falhou há pouco
+                    else:
+                        idade = agora - self._primeiro_em
+                        if len(self._pendentes) >= self.lote_max or idade >= self.intervalo_s:
+                            break
+                        self._cond.wait(self.intervalo_s - idade)
+                if self._parar:
+                    return
+                lote = self._retirar_lote()
+            self._gravar(lote)
+
+    def _retirar_lote(self, todos: bool = False):
+        """Com _cond adquirido. Marca o lote como 'em escrita' para os leitores esperarem por ele."""
+        if not self._pendentes:
+            return []
+        quantidade = len(self._pendentes) if todos else min(self.lote_max, len(self._pendentes))
+        lote = [self._pendentes.popitem(last=False) for _ in range(quantidade)]
+        self._primeiro_em = time.monotonic()
+        self._escrevendo = True
+        return lote
+
+    def _gravar(self, lote):
+        ok = False
+        try:
+            colecao = self.obter_colecao()
+            if colecao is None:
+                raise RuntimeError("coleção indisponível")
+            colecao.upsert(
+                ids=[doc_id for doc_id, _ in lote],
+                documents=[doc for _, (doc, _) in lote],
+                metadatas=[meta for _, (_, meta) in lote],
+            )
+            ok = True
+            self.logger.debug(f"💾 Lote de {len(lote)} memória(s) gravado.")
+        except Exception as exc:
+            self.logger.error(f"❌ Falha ao gravar lote de {len(lote)} memória(s): {exc}. Tentando de novo depois.")
+        finally:
+            with self._cond:
+                self._escrevendo = False
+                if ok:
+                    self.lotes += 1
+                    self.gravados += len(lote)
+                else:
+                    self.falhas += 1
+                    # Devolve ao começo da fila sem passar por cima de versões mais novas do mesmo id
+                    for doc_id, valor in reversed(lote):
+                        if doc_id not in self._pendentes:
+                            self._pendentes[doc_id] = valor
+                            self._pendentes.move_to_end(doc_id, last=False)
+                    self._retentar_em = time.monotonic() + self.intervalo_s
+                self._cond.notify_all()
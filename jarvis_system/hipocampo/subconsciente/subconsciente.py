@@ -1,9 +1,13 @@
 import os
 import logging
 import random
+import threading
 from .subconscienteMemory import SubconscienteMemory
 from .log_reader import LogReader
 from .logAnalyzer import LogAnalyzer
+from jarvis_system.hipocampo.memoria.configMemoria import (
+    CICLO_INTERVALO_S, CICLO_ATRASO_INICIAL_S, CICLO_ESPERA_PARADA_S
+)
 
 # Configuração de Caminhos Automática
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -26,6 +30,12 @@ class Subconsciente:
         self.reader = LogReader(self.log_path)
         self.analyzer = LogAnalyzer()
 
+        # Manutenção periódica do Hipocampo (criada sob demanda)
+        self.logger = logging.getLogger("SUBCONSCIENTE")
+        self.ciclo_memoria = None
+        self._parar = threading.Event()
+        self._thread_ciclo = None
+
     def sonhar(self):
         """Fluxo principal de aprendizado (Offline)."""
         
@@ -52,6 +62,46 @@ class Subconsciente:
         else:
             print("   💤 Nenhuma nova intuição formada.")
 
+    def manter_memoria(self):
+        """Uma passada do ciclo de vida da memória (TTL, resumos, duplicatas, compactação)."""
+        if self.ciclo_memoria is None:
+            try:
+                from jarvis_system.hipocampo.memoria import memoria
+                from jarvis_system.hipocampo.memoria.cicloVida import CicloVidaMemoria
+            except ImportError as e:
+                self.logger.warning(f"Ciclo de memória indisponível: {e}")
+                return None
+            if not memoria: return None
+            self.ciclo_memoria = CicloVidaMemoria(memoria)
+        try:
+            return self.ciclo_memoria.executar()
+        except Exception as e:
+            self.logger.error(f"Falha no ciclo de memória: {e}")
+            return None
+
+    def agendar_manutencao(self, intervalo_s=CICLO_INTERVALO_S, atraso_inicial_s=CICLO_ATRASO_INICIAL_S):
+        """Roda manter_memoria() em segundo plano: primeiro após o boot, depois a cada intervalo."""
+        if self._thread_ciclo and self._thread_ciclo.is_alive(): return
+        self._parar.clear()
+
+        def _loop():
+            espera = atraso_inicial_s
+            while not self._parar.wait(espera):
+                self.manter_memoria()
+                espera = intervalo_s
+
+        self._thread_ciclo = threading.Thread(target=_loop, name="CicloMemoria", daemon=True)
+        self._thread_ciclo.start()
+
+    def parar(self, timeout=CICLO_ESPERA_PARADA_S):
+        """Interrompe o agendamento e espera a passada em andamento (ela ainda grava na memória)."""
+        self._parar.set()
+        thread = self._thread_ciclo
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+            if thread.is_alive():
+                self.logger.warning(f"⚠️ Ciclo de memória ainda rodando após {timeout}s; encerrando assim mesmo.")
+
 class DayDreamer:
     """
     Processo de Tempo Real: Curiosidade e Interação.
@@ -13,6 +13,7 @@ from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles 
 from pydantic import BaseModel
 from jarvis_system.cortex_frontal.event_bus import bus, Evento
+from jarvis_system.cortex_frontal.observability import tracer
 from jarvis_system.protocol import Eventos
 from jarvis_system.area_broca.frases_padrao import obter_frase 
 from .jarvisKernel import kernel 
@@ -47,6 +48,14 @@ app = FastAPI(title="J.A.R.V.I.S. API", version="3.8 - Live Vision")
 # --- CONTROLE DE ESTADO DA APLICAÇÃO ---
 class AppState:
     is_running = True
+    nivel_mic = None      # Última janela do medidor do microfone (Eventos.NIVEL_MIC)
+    nivel_mic_seq = 0
+
+def _on_nivel_mic(evento: Evento):
+    AppState.nivel_mic = evento.dados
+    AppState.nivel_mic_seq += 1
+
+bus.inscrever(Eventos.NIVEL_MIC, _on_nivel_mic)
 
 # -------------------------------------------------------------------------
 # 📡 GESTOR DE CONEXÕES (WEBSOCKETS)
@@ -168,6 +177,7 @@ async def websocket_endpoint(websocket: WebSocket):
     # Aceita a conexão imediatamente
     await websocket.accept()
     ws_manager.active_connections.append(websocket)
+    nivel_enviado = AppState.nivel_mic_seq
     
     try:
         while AppState.is_running: # <--- AJUSTADO: Verifica o estado da aplicação
@@ -177,6 +187,11 @@ async def websocket_endpoint(websocket: WebSocket):
                     data = kernel.telemetry_queue.get_nowait()
                     await websocket.send_json({"type": "telemetry", **data})
                 except: pass
+
+            # 1b. Nível do microfone (já decimado pelo medidor; só a leitura mais recente)
+            if AppState.nivel_mic_seq != nivel_enviado and AppState.nivel_mic:
+                nivel_enviado = AppState.nivel_mic_seq
+                await websocket.send_json({"type": "telemetry", "mic": AppState.nivel_mic})
             
             # 2. Tenta ler mensagens do front sem travar o loop
             try:
@@ -205,6 +220,71 @@ def video_feed():
         media_type="multipart/x-mixed-replace; boundary=frame"
     )
 
+# ✅ ROTA DE MÉTRICAS (BARRAMENTO DE EVENTOS)
+@app.get("/metrics")
+def metrics():
+    """Vazão, filas e latência de cada tópico/assinante do EventBus."""
+    if not bus:
+        return {"error": "EventBus indisponível."}
+    return bus.metricas()
+
+@app.get("/metrics/voz")
+def metrics_voz():
+    """Acertos/falhas e ocupação do cache de síntese de voz."""
+    cache = getattr(kernel.mouth, "cache", None)
+    if not cache:
+        return {"error": "Sistema de fala indisponível."}
+    return cache.estatisticas()
+
+@app.get("/metrics/llm")
+def metrics_llm():
+    """Latência/erros por provedor (hedge), saúde das chaves Groq, cache de respostas e tamanho dos prompts."""
+    cognitive = getattr(kernel.brain, "cognitive", None)
+    cerebro = getattr(cognitive, "brain", None)
+    if not cerebro:
+        return {"error": "Córtex indisponível."}
+    roteador = getattr(cerebro, "roteador", None)
+    chaves = getattr(cerebro, "key_manager", None)
+    cache = getattr(cerebro, "cache", None)
+    orcamento = getattr(cerebro, "orcamento", None)
+    prefetch = getattr(cerebro, "prefetch", None)
+    return {
+        "roteador": roteador.estatisticas() if roteador else None,
+        "chaves": chaves.estatisticas() if chaves else None,
+        "cache": cache.estatisticas() if cache else None,
+        "tokens": orcamento.estatisticas() if orcamento else None,
+        "rag_antecipado": prefetch.estatisticas() if prefetch else None,
+    }
+
+@app.get("/metrics/memoria")
+def metrics_memoria():
+    """Taxa de acerto e tempo do cache de embeddings, e fila de escrita do Hipocampo."""
+    try:
+        from jarvis_system.hipocampo.memoria import memoria
+    except ImportError:
+        memoria = None
+    if not memoria:
+        return {"error": "Hipocampo indisponível."}
+    return memoria.estatisticas()
+
+@app.get("/metrics/audio")
+def metrics_audio():
+    """Nível do microfone (última janela do medidor) e blocos/frases perdidos no pipeline de escuta."""
+    if not kernel.ears:
+        return {"error": "Sistema auditivo indisponível."}
+    return kernel.ears.estatisticas()
+
+# ✅ ROTAS DE RASTREAMENTO (LATÊNCIA POR FALA)
+@app.get("/traces")
+def traces(limit: int = 20):
+    """Últimos traces (microfone -> alto-falante) com os tempos de cada etapa."""
+    return tracer.recent(limit)
+
+@app.get("/traces/{trace_id}")
+def trace_detalhe(trace_id: str):
+    trace = tracer.get(trace_id)
+    return trace if trace else {"error": f"Trace '{trace_id}' não encontrado."}
+
 @app.post("/command")
 def send_command(cmd: Command):
     if kernel.brain and getattr(kernel.brain, "sistemas_carregados", True):
@@ -23,6 +23,7 @@ from jarvis_system.cortex_frontal.orchestrator import Orchestrator
 # Integração do Subconsciente
 try:
     from jarvis_system.hipocampo.subconsciente import Subconsciente
+    from jarvis_system.hipocampo.memoria.configMemoria import CICLO_ATIVO
 except ImportError:
     Subconsciente = None
 
@@ -63,6 +64,7 @@ class JarvisKernel:
         self.mouth = None
         self.ears = None
         self.eyes = None 
+        self.subconsciente = None
 
         # -----------------------------------------------------------------
         # 🌉 PONTES DE DADOS (QUEUES) PARA O FRONT-END
@@ -86,6 +88,9 @@ class JarvisKernel:
                 self.log.info("💤 Ciclo REM (Subconsciente)...")
                 sub = Subconsciente()
                 sub.sonhar()
+                if CICLO_ATIVO:
+                    sub.agendar_manutencao()
+                self.subconsciente = sub
             except Exception as e:
                 self.log.error(f"Falha no sonho: {e}")
 
@@ -173,12 +178,29 @@ class JarvisKernel:
             try:
                 if hasattr(system, 'stop'):
                     system.stop()
-            except: 
+            except:
                 pass
-            
+
+        # 2.4 Interrompe a manutenção agendada da memória (espera a passada em andamento)
+        if self.subconsciente:
+            self.subconsciente.parar()
+
+        # 2.5 Grava as memórias que ainda estão no buffer de escrita
+        try:
+            from jarvis_system.hipocampo.memoria import memoria
+            if memoria: memoria.parar()
+        except:
+            pass
+
+        # 3. Desliga o pool do barramento (descarta eventos pendentes)
+        try:
+            bus.parar_despacho_assincrono(drenar=False, timeout=0.5)
+        except:
+            pass
+
         self.log.info("Bye.")
         
-        # 3. BALA DE PRATA: Mata o processo principal imediatamente devolvendo o terminal ao utilizador
+        # 4. BALA DE PRATA: Mata o processo principal imediatamente devolvendo o terminal ao utilizador
         os._exit(0)
 
     def _register_subsystem(self, system):
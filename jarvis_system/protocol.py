@@ -4,14 +4,32 @@ Define os contratos de eventos para garantir tipagem, consistência e
 estados para feedback visual (UI).
 """
 
+# Palavras que ativam o sistema. Compartilhadas pelo espião do ouvido (KWS, antes do STT)
+# e pelo AttentionSystem do Orchestrator (depois do STT): as duas pontas precisam concordar.
+WAKE_WORDS = ["jarvis", "jarbas", "computer", "sexta-feira", "javis", "jardis"]
+
 class Eventos:
     # --- Input Sensorial (Área de Wernicke) ---
     FALA_RECONHECIDA = "input:fala_reconhecida"
+    # Hipótese parcial do STT enquanto o usuário ainda fala (modo streaming)
+    # Payload: {"texto": "jarvis toca", "confirmado": "jarvis"}
+    FALA_PARCIAL = "input:fala_parcial"
+    # Janela de atenção (re)aberta: o ouvido decodifica tudo, sem esperar a wake word
+    # Payload: {"janela_s": 40.0}
+    ATENCAO = "input:atencao"
+    
+    # Nível do microfone, já decimado (uma janela a cada ~0.5s)
+    # Payload: {"rms": 0.02, "pico": 0.05, "estado": "gravando", "blocos": 2}
+    NIVEL_MIC = "input:nivel_mic"
     
     # --- Processamento Cognitivo (Córtex Frontal) ---
     PENSANDO = "cortex:pensando"
 
     # --- Output Motor (Área de Broca & Motor) ---
+    # Payload: {"texto": "Claro, senhor."}
+    # Respostas em streaming: cada frase leva o mesmo {"resposta": "a1b2c3"} e a resposta
+    # termina com {"texto": "", "resposta": "a1b2c3", "fim": True}. A Broca fala tudo como
+    # uma fala só (emoção decidida na primeira frase).
     FALAR = "output:falar"
     EXECUTAR_FERRAMENTA = "output:ferramenta"
     MOUSE = "output:mouse"
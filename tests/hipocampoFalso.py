@@ -0,0 +1,67 @@
+# tests/hipocampoFalso.py
+"""Substitutos compartilhados pelos testes do hipocampo: a coleção do Chroma e a MemoriaHipocampo sobre ela."""
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from jarvis_system.hipocampo.memoria import memoriaHipocampo
+from jarvis_system.hipocampo.memoria.memoriaHipocampo import MemoriaHipocampo
+
+class ColecaoFalsa:
+    """
+    Imita a coleção do Chroma sem embedding.
+    - atraso/falhas: upsert lento (embedding + disco) e as N primeiras gravações falhando.
+    - ordem_vetorial: ordem fixa devolvida pela query "vetorial"; sem ela, a query busca por substring.
+    """
+    def __init__(self, atraso=0.0, falhas=0, ordem_vetorial=None):
+        self.atraso = atraso
+        self.falhas = falhas
+        self.ordem_vetorial = ordem_vetorial
+        self.upserts = []
+        self.queries = 0
+        self.docs = {}
+        self.metas = {}
+
+    def upsert(self, ids, documents, metadatas):
+        time.sleep(self.atraso)
+        if self.falhas:
+            self.falhas -= 1
+            raise Exception("disco cheio")
+        self.upserts.append(list(ids))
+        self.docs.update(zip(ids, documents))
+        self.metas.update(zip(ids, metadatas))
+
+    def delete(self, ids):
+        for doc_id in ids:
+            self.docs.pop(doc_id, None)
+            self.metas.pop(doc_id, None)
+
+    def count(self):
+        return len(self.docs)
+
+    def get(self, include=None):
+        ids = list(self.docs)
+        return {"ids": ids, "documents": [self.docs[i] for i in ids], "metadatas": [self.metas[i] for i in ids]}
+
+    def query(self, query_texts, n_results, where=None):
+        self.queries += 1
+        if self.ordem_vetorial is not None:
+            ids = [i for i in self.ordem_vetorial if i in self.docs][:n_results]
+        else:
+            ids = [i for i, doc in self.docs.items() if query_texts[0] in doc][:n_results]
+        return {"ids": [ids], "documents": [[self.docs[i] for i in ids]]}
+
+def criar_memoria(caso, colecao, escrita_atrasada=False, busca_hibrida=True) -> MemoriaHipocampo:
+    """MemoriaHipocampo sobre 'colecao', com o índice léxico numa pasta temporária (nunca em jarvis_system/data)."""
+    pasta = tempfile.TemporaryDirectory()
+    caso.addCleanup(pasta.cleanup)
+    storage = SimpleNamespace(db_path=pasta.name, indice_lexico_path=os.path.join(pasta.name, "indice.sqlite"))
+    with mock.patch.object(memoriaHipocampo.ChromaConnection, "connect", return_value=colecao), \
+         mock.patch.object(memoriaHipocampo, "ESCRITA_ATRASADA", escrita_atrasada), \
+         mock.patch.object(memoriaHipocampo, "BUSCA_HIBRIDA", busca_hibrida):
+        memoria = MemoriaHipocampo(storage=storage)
+    memoria.connection_manager.connect = lambda: colecao
+    caso.addCleanup(memoria.parar)
+    return memoria
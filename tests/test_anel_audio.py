@@ -0,0 +1,167 @@
+# tests/test_anel_audio.py
+import sys
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.area_broca.listen.anelAudio import AnelBlocos, BufferFrase
+from jarvis_system.area_broca.listen.audioDriver import FileAudioDriver
+from jarvis_system.area_broca.listen.audioUtils import gravar_wav
+from jarvis_system.area_broca.listen.pipelineAuditivo import (
+    SegmentadorVAD, EstagioSTT, MSG_INICIO, MSG_AUDIO, MSG_FIM, INICIO_FALA, FALA, FIM_FALA
+)
+
+SR = 16000
+BLOCO = 4000
+
+class TestAnelBlocos(unittest.TestCase):
+    def test_spsc_sem_blocos_rasgados_nem_fora_de_ordem(self):
+        anel = AnelBlocos(8, 256, dtype=np.int32)
+        total = 5000
+
+        def produtor():
+            for i in range(total):
+                anel.escrever(np.full(256, i, dtype=np.int32))
+
+        thread = threading.Thread(target=produtor)
+        thread.start()
+        recebidos = []
+        while thread.is_alive() or len(anel):
+            bloco = anel.ler(timeout=0.05)
+            if bloco is None:
+                continue
+            self.assertTrue(np.all(bloco == bloco[0]))  # O produtor nunca escreve no slot em leitura
+            recebidos.append(int(bloco[0]))
+        thread.join()
+
+        self.assertEqual(recebidos, sorted(set(recebidos)))
+        self.assertEqual(len(recebidos) + anel.descartados, total)
+
+    def test_descartar_pendentes_e_buffer_que_cresce(self):
+        anel = AnelBlocos(4, 2)
+        for v in range(3):
+            anel.escrever(np.full(2, v, dtype=np.float32))
+        anel.descartar_pendentes()
+        self.assertIsNone(anel.ler(0))
+
+        frase = BufferFrase(4)
+        frase.anexar(np.arange(3, dtype=np.float32))
+        frase.anexar(np.arange(3, dtype=np.float32))
+        self.assertEqual(frase.capacidade, 8)
+        np.testing.assert_array_equal(frase.visao(), [0, 1, 2, 0, 1, 2])
+
+class TestReservasEmVoo(unittest.TestCase):
+    def test_view_na_fila_do_stt_nao_e_sobrescrita(self):
+        segmentador = SegmentadorVAD(limiar=0.01, ganho=1.0, blocos_pausa_fim=2, blocos_em_voo=2, pre_roll_s=0.0)
+        voz = np.full((BLOCO, 1), 8000, dtype=np.int16)
+        mudo = np.zeros((BLOCO, 1), dtype=np.int16)
+
+        na_fila, _, estado = segmentador.processar(voz)
+        self.assertEqual(estado, INICIO_FALA)
+        segmentador.reserva_em_voo = segmentador.ultima_reserva  # STT parado: a view segue na fila
+        esperado = na_fila.copy()
+
+        for _ in range(3 * segmentador._anel.n_blocos):
+            segmentador.processar(mudo)
+        np.testing.assert_array_equal(na_fila, esperado)
+        self.assertGreater(segmentador.blocos_avulsos, 0)
+
+        segmentador.reserva_em_voo = None  # STT consumiu: o anel volta a ser reciclado
+        segmentador.processar(mudo)
+        self.assertIsNotNone(segmentador.ultima_reserva)
+
+    def test_ouvido_protege_views_ate_o_stt_consumir(self):
+        import queue
+        from jarvis_system.area_broca.listen.ouvidoBiologico import OuvidoBiologico
+
+        ouvido = OuvidoBiologico(driver=object(), transcriber=DecoderFalso(), stt_em_processo=False)
+        ouvido._fila_stt = queue.Queue()
+        voz = np.full((BLOCO, 1), 8000, dtype=np.int16)
+
+        ouvido._atualizar_em_voo()
+        chunk, _, _ = ouvido.segmentador.processar(voz)
+        ouvido._enviar_audio(chunk, ouvido.segmentador.ultima_reserva)
+        ouvido._atualizar_em_voo()
+        self.assertEqual(ouvido.segmentador.reserva_em_voo, ouvido.segmentador.ultima_reserva)
+
+        ouvido._audio_consumido += 1  # O que o loop do STT faz depois de copiar o bloco
+        ouvido._atualizar_em_voo()
+        self.assertIsNone(ouvido.segmentador.reserva_em_voo)
+
+    def test_modo_processo_envia_copia(self):
+        import queue
+        from jarvis_system.area_broca.listen.ouvidoBiologico import OuvidoBiologico
+
+        ouvido = OuvidoBiologico(driver=object(), stt_em_processo=True)
+        ouvido._fila_stt = queue.Queue()
+        chunk = np.ones(BLOCO, dtype=np.float32)
+        ouvido._enviar_audio(chunk, 0)
+        self.assertFalse(np.shares_memory(ouvido._fila_stt.get()[1], chunk))
+
+class DecoderFalso:
+    def __init__(self):
+        self.frases = []
+
+    def transcribe(self, audio):
+        self.frases.append(audio)
+        return "ditado"
+
+class TestMemoriaConstante(unittest.TestCase):
+    def test_frases_longas_nao_alocam_por_bloco(self):
+        """Driver sintético -> anel de captura -> VAD -> STT, com duas frases de 20s."""
+        t = np.arange(20 * SR) / SR
+        tom = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+        mudo = np.zeros(SR * 2, dtype=np.float32)
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "ditado.wav")
+            gravar_wav(caminho, np.concatenate([mudo, tom, mudo, tom, mudo]), SR)
+            driver = FileAudioDriver(caminho, SR, BLOCO)
+
+            anel = AnelBlocos(16, BLOCO, 1, dtype=np.int16)
+            def callback(indata, frames, tempo, status):
+                while not anel.escrever(indata):  # Contrapressão só no teste (o microfone não espera)
+                    time.sleep(0.0005)
+
+            segmentador = SegmentadorVAD(limiar=0.01, ganho=1.0, blocos_pausa_fim=2)
+            decoder = DecoderFalso()
+            estagio = EstagioSTT(decoder)
+            picos = []
+
+            driver.start_stream(callback)
+            try:
+                while not (driver.terminou.is_set() and len(anel) == 0):
+                    bloco = anel.ler(timeout=0.1)
+                    if bloco is None:
+                        continue
+                    chunk, _, estado = segmentador.processar(bloco)
+                    if estado == INICIO_FALA:
+                        if decoder.frases:
+                            tracemalloc.start()  # Mede só a segunda frase (buffers já aquecidos)
+                        estagio.processar((MSG_INICIO, True))
+                    if estado in (INICIO_FALA, FALA, FIM_FALA):
+                        estagio.processar((MSG_AUDIO, chunk))
+                    if estado == FIM_FALA:
+                        estagio.processar((MSG_FIM, "trace"))
+                        if tracemalloc.is_tracing():
+                            picos.append(tracemalloc.get_traced_memory()[1])
+                            tracemalloc.stop()
+            finally:
+                driver.stop_stream()
+                if tracemalloc.is_tracing():
+                    tracemalloc.stop()
+
+        self.assertEqual(len(decoder.frases), 2)
+        self.assertGreaterEqual(len(decoder.frases[1]), 20 * SR)
+        # As duas frases chegaram ao decoder como views do mesmo buffer reaproveitado
+        self.assertTrue(np.shares_memory(decoder.frases[0], decoder.frases[1]))
+        # 20s de float32 = 1.28MB; lista + concatenate alocaria o dobro disso
+        self.assertLess(picos[0], 0.1 * tom.nbytes)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# tests/test_busca_hibrida.py
+import sys
+import os
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.hipocampo.memoria.indiceLexico import IndiceBM25
+from tests.hipocampoFalso import ColecaoFalsa, criar_memoria
+
+class TestIndiceBM25(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.pasta.cleanup)
+        self.caminho = os.path.join(self.pasta.name, "indice.sqlite")
+
+    def test_nome_exato_sem_acento_e_filtro_por_tag(self):
+        indice = IndiceBM25(self.caminho)
+        self.addCleanup(indice.fechar)
+        indice.adicionar("a", "Preferência musical registrada: Yellow, de Coldplay.", {"tags": "spotify_likes"})
+        indice.adicionar("b", "Preferência musical registrada: Numb, de Linkin Park.", {"tags": "treino"})
+        indice.adicionar("c", "O usuário abre o Visual Studio Code todo dia.", {})
+
+        acertos = indice.buscar("coldplay", 3)
+        self.assertEqual([a.doc_id for a in acertos], ["a"])
+        self.assertEqual(acertos[0].cobertura, 1.0)
+        self.assertEqual(indice.buscar("preferencia", 3, {"tags": "treino"})[0].doc_id, "b")
+
+    def test_persistencia_e_remocao(self):
+        indice = IndiceBM25(self.caminho)
+        indice.adicionar("a", "meu time é o Palmeiras", {})
+        indice.adicionar("b", "gosto de café sem açúcar", {})
+        indice.remover(["b"])
+        indice.fechar()
+
+        reaberto = IndiceBM25(self.caminho)
+        self.addCleanup(reaberto.fechar)
+        self.assertEqual(reaberto.ids(), {"a"})
+        self.assertEqual(reaberto.buscar("cafe", 3), [])
+
+class TestRelembrarHibrido(unittest.TestCase):
+    def _memoria(self, colecao):
+        return criar_memoria(self, colecao)
+
+    def test_nome_exato_dispensa_embedding(self):
+        colecao = ColecaoFalsa()
+        memoria = self._memoria(colecao)
+        memoria.memorizar_musica("Yellow", "Coldplay")
+        memoria.memorizar("meu time é o Palmeiras")
+
+        self.assertIn("Coldplay", memoria.relembrar("Coldplay"))
+        self.assertEqual(colecao.queries, 0)
+        self.assertEqual(memoria.buscas["so_lexica"], 1)
+
+    def test_fusao_junta_lexico_e_vetorial(self):
+        colecao = ColecaoFalsa(ordem_vetorial=["f2", "f3"])
+        memoria = self._memoria(colecao)
+        for doc_id, fato in [("f1", "o usuário torce para o Palmeiras"),
+                             ("f2", "o time do coração é alviverde"),
+                             ("f3", "gosta de café")]:
+            memoria.indice.adicionar(doc_id, fato, {})
+            colecao.upsert([doc_id], [fato], [{}])
+
+        resposta = memoria.relembrar("qual time de futebol o usuário torce", limite=2)
+        self.assertEqual(colecao.queries, 1)
+        self.assertIn("Palmeiras", resposta)
+        self.assertIn("alviverde", resposta)
+        self.assertNotIn("café", resposta)
+
+    def test_reconstroi_indice_quando_a_colecao_ja_tem_dados(self):
+        colecao = ColecaoFalsa()
+        colecao.upsert(["x"], ["o usuário usa o Spotify no trabalho"], [{"tipo": "fato_usuario"}])
+        memoria = self._memoria(colecao)
+        self.assertEqual(memoria.indice.ids(), {"x"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+# tests/test_ciclo_vida.py
+import sys
+import os
+import datetime
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.hipocampo.memoria.cicloVida import CicloVidaMemoria, agrupar_quase_duplicatas
+from tests.hipocampoFalso import ColecaoFalsa, criar_memoria
+
+AGORA = datetime.datetime(2025, 6, 1, 12, 0)
+
+def dias_atras(dias):
+    return (AGORA - datetime.timedelta(days=dias)).isoformat()
+
+class TestCicloVida(unittest.TestCase):
+    def setUp(self):
+        self.colecao = ColecaoFalsa()
+        self.memoria = criar_memoria(self, self.colecao)
+
+    def _gravar(self, doc_id, texto, **meta):
+        self.memoria._persistir(doc_id, texto, meta)
+
+    def test_expira_resume_e_funde(self):
+        self._gravar("fato_velho", "playlist da festa de ontem", tags="temporaria", timestamp=dias_atras(40))
+        self._gravar("fato_novo", "playlist da festa de hoje", tags="temporaria", timestamp=dias_atras(1))
+        for i, resultado in enumerate(["FALHA_CRITICA", "FALHA_CRITICA", "SUCESSO_PLENO"]):
+            self._gravar(f"evt{i}", f"Episódio {i}", tipo="episodio_agente", agente="spotify", acao="tocar",
+                         resultado=resultado, emocao="FRUSTRADO", timestamp=dias_atras(10 + i))
+        self._gravar("evt_recente", "Episódio recente", tipo="episodio_agente", agente="spotify", acao="tocar",
+                     resultado="SUCESSO_PLENO", emocao="EMPOLGADO", timestamp=dias_atras(1))
+        self._gravar("tk_a", "Preferência musical registrada: Yellow, de Coldplay.", tipo="track", timestamp=dias_atras(5))
+        self._gravar("tk_b", "Preferência musical registrada: Yellow, de Coldplay.", tipo="track", timestamp=dias_atras(2))
+
+        ciclo = CicloVidaMemoria(self.memoria, retencao_dias={"temporaria": 30}, resumir_apos_dias=7, agora=lambda: AGORA)
+        relatorio = ciclo.executar()
+
+        self.assertEqual(set(self.colecao.docs), {"fato_novo", "evt_recente", "tk_b", "res_spotify_tocar"})
+        self.assertEqual(self.colecao.metas["tk_b"]["vezes"], 2)
+        self.assertIn("FALHA_CRITICA x2", self.colecao.docs["res_spotify_tocar"])
+        self.assertEqual(relatorio["registros_depois"], 4)
+        self.assertEqual(self.memoria.indice.ids(), set(self.colecao.docs))
+
+        # Segunda passada acumula no mesmo resumo
+        self._gravar("evt9", "Episódio 9", tipo="episodio_agente", agente="spotify", acao="tocar",
+                     resultado="FALHA_CRITICA", emocao="FRUSTRADO", timestamp=dias_atras(20))
+        ciclo.executar()
+        self.assertEqual(self.colecao.metas["res_spotify_tocar"]["total"], 4)
+        self.assertEqual(self.colecao.metas["res_spotify_tocar"]["desde"], dias_atras(20))
+
+    def test_resumo_expirado_recriado_conta_uma_vez(self):
+        self._gravar("res_spotify_tocar", "Resumo antigo", tipo="resumo_episodios", agente="spotify", acao="tocar",
+                     total=1, resultados='{"SUCESSO_PLENO": 1}', emocoes='{"EMPOLGADO": 1}', timestamp=dias_atras(40))
+        self._gravar("evt0", "Episódio 0", tipo="episodio_agente", agente="spotify", acao="tocar",
+                     resultado="FALHA_CRITICA", emocao="FRUSTRADO", timestamp=dias_atras(10))
+
+        ciclo = CicloVidaMemoria(self.memoria, retencao_dias={"resumo_episodios": 30}, resumir_apos_dias=7,
+                                 agora=lambda: AGORA)
+        relatorio = ciclo.executar()
+
+        self.assertEqual(set(self.colecao.docs), {"res_spotify_tocar"})
+        self.assertEqual((relatorio["registros_antes"], relatorio["registros_depois"]), (2, 1))
+
+    def test_resumo_conta_as_ocorrencias_de_episodios_fundidos(self):
+        for i in range(3):
+            self._gravar(f"evt{i}", "Episódio repetido", tipo="episodio_agente", agente="spotify", acao="tocar",
+                         resultado="FALHA_CRITICA", emocao="FRUSTRADO", timestamp=dias_atras(3 - i * 0.1))
+
+        CicloVidaMemoria(self.memoria, resumir_apos_dias=7, agora=lambda: AGORA).executar()
+        self.assertEqual([m.get("vezes") for m in self.colecao.metas.values()], [3])
+
+        dez_dias_depois = AGORA + datetime.timedelta(days=10)
+        CicloVidaMemoria(self.memoria, resumir_apos_dias=7, agora=lambda: dez_dias_depois).executar()
+        self.assertEqual(self.colecao.metas["res_spotify_tocar"]["total"], 3)
+        self.assertIn("FALHA_CRITICA x3", self.colecao.docs["res_spotify_tocar"])
+
+    def test_quase_duplicatas_so_por_termos_raros(self):
+        termos = {
+            "a": frozenset({"gosto", "cafe", "forte", "manha"}),
+            "b": frozenset({"gosto", "cafe", "forte", "manha"}),
+            "c": frozenset({"gosto", "cha", "verde"}),
+        }
+        self.assertEqual([sorted(g) for g in agrupar_quase_duplicatas(termos, 0.9)], [["a", "b"]])
+
+class TestAgendamento(unittest.TestCase):
+    def test_subconsciente_roda_o_ciclo_em_segundo_plano(self):
+        from jarvis_system.hipocampo.subconsciente.subconsciente import Subconsciente
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        sub = Subconsciente(log_path=os.path.join(pasta.name, "x.log"), memory_path=os.path.join(pasta.name, "m.json"))
+        segunda_passada = threading.Event()
+        sub.ciclo_memoria = mock.Mock()
+        sub.ciclo_memoria.executar.side_effect = (
+            lambda: segunda_passada.set() if sub.ciclo_memoria.executar.call_count >= 2 else None
+        )
+        sub.agendar_manutencao(intervalo_s=0.01, atraso_inicial_s=0)
+        self.addCleanup(sub.parar)
+
+        self.assertTrue(segunda_passada.wait(timeout=2.0))
+        sub.parar()
+        self.assertGreaterEqual(sub.ciclo_memoria.executar.call_count, 2)
+
+    def test_parar_espera_a_passada_em_andamento(self):
+        from jarvis_system.hipocampo.subconsciente.subconsciente import Subconsciente
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        sub = Subconsciente(log_path=os.path.join(pasta.name, "x.log"), memory_path=os.path.join(pasta.name, "m.json"))
+        comecou, terminou = threading.Event(), threading.Event()
+
+        def passada_lenta():
+            comecou.set()
+            time.sleep(0.2)
+            terminou.set()
+
+        sub.ciclo_memoria = mock.Mock()
+        sub.ciclo_memoria.executar.side_effect = passada_lenta
+        sub.agendar_manutencao(intervalo_s=60, atraso_inicial_s=0)
+        self.assertTrue(comecou.wait(timeout=2.0))
+
+        sub.parar()
+        self.assertTrue(terminou.is_set())
+        self.assertFalse(sub._thread_ciclo.is_alive())
+
+if __name__ == "__main__":
+    unittest.main()
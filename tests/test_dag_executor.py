@@ -0,0 +1,83 @@
+# tests/test_dag_executor.py
+import sys
+import os
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.cortex_frontal.orchestrator.dagExecutor import (
+    DagExecutor, DependencyNode, CONCLUIDO, FALHOU, TIMEOUT, CANCELADO
+)
+
+class FerramentasFalsas:
+    """Ferramentas com duração fixa; registra os argumentos recebidos."""
+    def __init__(self, duracoes):
+        self.duracoes = duracoes
+        self.args = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, node, args, resultados):
+        with self._lock:
+            self.args[node.task_id] = args
+        time.sleep(self.duracoes.get(node.target_tool, 0.0))
+        if node.target_tool == "quebrada":
+            raise RuntimeError("API fora do ar")
+        return f"{node.target_tool} ok"
+
+def no(task_id, ferramenta, deps=(), **args):
+    return DependencyNode(task_id, ferramenta, args, list(deps))
+
+class TestDagExecutor(unittest.TestCase):
+    def test_ramos_independentes_rodam_em_paralelo(self):
+        ferramentas = FerramentasFalsas({"clima": 0.3, "noticias": 0.3, "spotify": 0.3})
+        nodes = [no("t1", "clima"), no("t2", "noticias"), no("t3", "spotify")]
+
+        inicio = time.perf_counter()
+        DagExecutor(ferramentas, max_workers=4, timeout_no=5).executar(nodes)
+        duracao = time.perf_counter() - inicio
+
+        self.assertTrue(all(n.status == CONCLUIDO for n in nodes))
+        self.assertLess(duracao, 0.6)  # ~ o passo mais lento, não a soma (0.9s)
+
+    def test_saida_anterior_entra_nos_argumentos(self):
+        ferramentas = FerramentasFalsas({})
+        nodes = [
+            no("t1", "clima", cidade="Londres"),
+            no("t2", "memoria_gravar", ["t1"], dado="Clima: {t1}", outro="{t9}"),
+        ]
+        DagExecutor(ferramentas).executar(nodes)
+        self.assertEqual(ferramentas.args["t2"], {"dado": "Clima: clima ok", "outro": "{t9}"})
+
+    def test_falha_cancela_so_a_cadeia_dependente(self):
+        ferramentas = FerramentasFalsas({})
+        nodes = [
+            no("t1", "quebrada"),
+            no("t2", "memoria_gravar", ["t1"]),
+            no("t3", "sistema", ["t2"]),
+            no("t4", "spotify"),
+        ]
+        DagExecutor(ferramentas).executar(nodes)
+        self.assertEqual([n.status for n in nodes], [FALHOU, CANCELADO, CANCELADO, CONCLUIDO])
+        self.assertIn("API fora do ar", nodes[0].erro)
+        self.assertNotIn("t2", ferramentas.args)
+
+    def test_timeout_por_no(self):
+        ferramentas = FerramentasFalsas({"lenta": 1.0})
+        nodes = [no("t1", "lenta"), no("t2", "sistema", ["t1"]), no("t3", "clima")]
+
+        inicio = time.perf_counter()
+        DagExecutor(ferramentas, timeout_no=0.2).executar(nodes)
+
+        self.assertLess(time.perf_counter() - inicio, 0.8)
+        self.assertEqual([n.status for n in nodes], [TIMEOUT, CANCELADO, CONCLUIDO])
+
+    def test_dependencia_inexistente_e_ciclo(self):
+        nodes = [no("t1", "clima", ["t9"]), no("t2", "a", ["t3"]), no("t3", "b", ["t2"]), no("t4", "c")]
+        DagExecutor(FerramentasFalsas({})).executar(nodes)
+        self.assertEqual([n.status for n in nodes], [FALHOU, FALHOU, FALHOU, CONCLUIDO])
+        self.assertIn("ciclo", nodes[1].erro)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+# tests/test_embedding_cache.py
+import sys
+import os
+import tempfile
+import unittest
+import warnings
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.hipocampo.memoria.embeddings import (
+    CacheEmbeddings, EmbeddingComCache, criar_funcao_embedding, registrar_backend
+)
+
+try:
+    import chromadb
+    CHROMA_AVAILABLE = True
+except ImportError:
+    CHROMA_AVAILABLE = False
+
+class ModeloFalso:
+    """Embedding determinístico que conta quantos textos precisou calcular."""
+    def __init__(self):
+        self.lotes = []
+
+    def __call__(self, textos):
+        self.lotes.append(list(textos))
+        return [[float(len(t)), float(sum(map(ord, t)) % 97), 1.0] for t in textos]
+
+class TestCacheEmbeddings(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.pasta.cleanup)
+        self.caminho = os.path.join(self.pasta.name, "cache.sqlite")
+
+    def test_repetidos_nao_voltam_ao_modelo_e_ineditos_vao_num_lote(self):
+        modelo = ModeloFalso()
+        cache = CacheEmbeddings(self.caminho, "falso:padrao")
+        self.addCleanup(cache.fechar)
+        funcao = EmbeddingComCache(modelo, cache, "falso:padrao")
+
+        primeiro = funcao(["toca coldplay", "que horas são"])
+        segundo = funcao(["toca coldplay", "abre o spotify", "que horas são"])
+
+        self.assertEqual(modelo.lotes, [["toca coldplay", "que horas são"], ["abre o spotify"]])
+        self.assertEqual(list(primeiro[0]), list(segundo[0]))
+        stats = funcao.estatisticas()
+        self.assertEqual(stats["textos"], 5)
+        self.assertAlmostEqual(stats["taxa_acerto"], 0.4)
+
+    def test_cache_sobrevive_a_reinicio_e_separa_modelos(self):
+        cache = CacheEmbeddings(self.caminho, "falso:padrao")
+        EmbeddingComCache(ModeloFalso(), cache, "falso:padrao")(["meu time é o Palmeiras"])
+        cache.fechar()
+
+        modelo = ModeloFalso()
+        reaberto = CacheEmbeddings(self.caminho, "falso:padrao", max_memoria=1)
+        self.addCleanup(reaberto.fechar)
+        EmbeddingComCache(modelo, reaberto, "falso:padrao")(["meu time é o Palmeiras"])
+        self.assertEqual(modelo.lotes, [])
+
+        outro_modelo = CacheEmbeddings(self.caminho, "falso:outro")
+        self.addCleanup(outro_modelo.fechar)
+        self.assertEqual(outro_modelo.buscar(["meu time é o Palmeiras"]), [None])
+
+    def test_backend_plugavel(self):
+        registrar_backend("teste", lambda modelo: ModeloFalso())
+        funcao, identificador = criar_funcao_embedding("teste", "mini")
+        self.assertIsInstance(funcao, ModeloFalso)
+        self.assertEqual(identificador, "teste:mini")
+        with self.assertRaises(ValueError):
+            criar_funcao_embedding("inexistente")
+
+class ModeloConhecido(ModeloFalso):
+    """Imita as funções nativas do Chroma: identidade estática e config serializável."""
+    @staticmethod
+    def name():
+        return "default"
+
+    def get_config(self):
+        return {}
+
+    def is_legacy(self):
+        return False
+
+@unittest.skipUnless(CHROMA_AVAILABLE, "chromadb não instalado")
+class TestWrapperNoChroma(unittest.TestCase):
+    def test_colecao_abre_sem_aviso_de_registro(self):
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        cliente = chromadb.PersistentClient(path=pasta.name)
+        funcao = EmbeddingComCache(ModeloConhecido(), None, "falso:padrao")
+
+        with warnings.catch_warnings(record=True) as avisos:
+            warnings.simplefilter("always")
+            colecao = cliente.get_or_create_collection("memoria_teste", embedding_function=funcao)
+            colecao.add(ids=["1"], documents=["toca coldplay"])
+            cliente.get_or_create_collection("memoria_teste", embedding_function=funcao)
+
+        mensagens = [str(aviso.message) for aviso in avisos]
+        self.assertFalse([m for m in mensagens if "embedding function" in m], mensagens)
+        self.assertEqual(funcao.estatisticas()["textos"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
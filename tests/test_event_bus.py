@@ -0,0 +1,224 @@
+# tests/test_event_bus.py
+import sys
+import os
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.cortex_frontal.event_bus.eventBus import EventBus
+from jarvis_system.cortex_frontal.event_bus.model import Evento, Prioridade, PoliticaTransbordo
+from jarvis_system.protocol import Eventos
+
+class TestEventBusSincrono(unittest.TestCase):
+    def test_entrega_inline_na_thread_do_publicador(self):
+        bus = EventBus()
+        threads = []
+        bus.inscrever("teste", lambda e: threads.append(threading.current_thread()))
+        bus.publicar(Evento("teste", {}))
+        self.assertEqual(threads, [threading.current_thread()])
+
+    def test_assinante_com_erro_nao_derruba_os_outros(self):
+        bus = EventBus()
+        recebidos = []
+        bus.inscrever("teste", lambda e: 1 / 0)
+        bus.inscrever("teste", lambda e: recebidos.append(e.dados["n"]))
+        bus.publicar(Evento("teste", {"n": 1}))
+        self.assertEqual(recebidos, [1])
+
+class TestEventBusAssincrono(unittest.TestCase):
+    def setUp(self):
+        self.bus = EventBus(modo_assincrono=True, max_workers=1)
+
+    def tearDown(self):
+        self.bus.parar_despacho_assincrono(drenar=False)
+
+    def test_publicar_nao_bloqueia_o_publicador(self):
+        liberar = threading.Event()
+        self.bus.inscrever(Eventos.FALA_RECONHECIDA, lambda e: liberar.wait(2))
+
+        inicio = time.perf_counter()
+        self.bus.publicar(Evento(Eventos.FALA_RECONHECIDA, {"texto": "jarvis"}))
+        self.assertLess(time.perf_counter() - inicio, 0.1)
+
+        liberar.set()
+        self.assertTrue(self.bus.aguardar_ociosidade(timeout=2))
+
+    def test_prioridade_critica_passa_a_frente_da_telemetria(self):
+        ordem = []
+        liberar = threading.Event()
+        self.bus.inscrever("bloqueio", lambda e: liberar.wait(2))
+        self.bus.inscrever(Eventos.LOG, lambda e: ordem.append("log"))
+        self.bus.inscrever(Eventos.SHUTDOWN, lambda e: ordem.append("shutdown"))
+
+        # Ocupa o único worker para que os eventos seguintes fiquem enfileirados
+        self.bus.publicar(Evento("bloqueio", {}))
+        time.sleep(0.05)
+        for _ in range(3):
+            self.bus.publicar(Evento(Eventos.LOG, {}))
+        self.bus.publicar(Evento(Eventos.SHUTDOWN, {}))
+
+        liberar.set()
+        self.assertTrue(self.bus.aguardar_ociosidade(timeout=2))
+        self.assertEqual(ordem[0], "shutdown")
+        self.assertEqual(ordem.count("log"), 3)
+
+    def test_ordem_preservada_dentro_do_topico(self):
+        bus = EventBus(modo_assincrono=True, max_workers=4)
+        recebidos = []
+        bus.inscrever("seq", lambda e: recebidos.append(e.dados["n"]))
+        for n in range(50):
+            bus.publicar(Evento("seq", {"n": n}))
+        self.assertTrue(bus.aguardar_ociosidade(timeout=2))
+        bus.parar_despacho_assincrono()
+        self.assertEqual(recebidos, list(range(50)))
+
+    def test_prioridade_configuravel(self):
+        self.bus.definir_prioridade("VISAO_GESTO", Prioridade.CRITICA)
+        self.assertEqual(self.bus._prioridade_de("VISAO_GESTO"), Prioridade.CRITICA)
+        self.assertEqual(self.bus._prioridade_de("VISAO_OBJETO"), Prioridade.BAIXA)
+
+    def test_parar_volta_ao_modo_sincrono(self):
+        self.bus.parar_despacho_assincrono()
+        threads = []
+        self.bus.inscrever("teste", lambda e: threads.append(threading.current_thread()))
+        self.bus.publicar(Evento("teste", {}))
+        self.assertEqual(threads, [threading.current_thread()])
+
+class TestEventBusBackpressure(unittest.TestCase):
+    def setUp(self):
+        self.bus = EventBus(modo_assincrono=True, max_workers=1)
+        self.liberar = threading.Event()
+        self.recebidos = []
+        self.bus.inscrever("bloqueio", lambda e: self.liberar.wait(2))
+        self.bus.inscrever("topico", lambda e: self.recebidos.append(e.dados["n"]))
+
+    def tearDown(self):
+        self.liberar.set()
+        self.bus.parar_despacho_assincrono(drenar=False)
+
+    def _publicar_com_worker_ocupado(self, quantidade):
+        self.bus.publicar(Evento("bloqueio", {}))
+        time.sleep(0.05)
+        for n in range(quantidade):
+            self.bus.publicar(Evento("topico", {"n": n}))
+        self.liberar.set()
+        self.assertTrue(self.bus.aguardar_ociosidade(timeout=2))
+
+    def test_descartar_antigo(self):
+        self.bus.configurar_fila("topico", 3, PoliticaTransbordo.DESCARTAR_ANTIGO)
+        self._publicar_com_worker_ocupado(10)
+        self.assertEqual(self.recebidos, [7, 8, 9])
+        self.assertEqual(self.bus.estado_filas()["topico"]["descartados"], 7)
+
+    def test_descartar_novo(self):
+        self.bus.configurar_fila("topico", 3, PoliticaTransbordo.DESCARTAR_NOVO)
+        self._publicar_com_worker_ocupado(10)
+        self.assertEqual(self.recebidos, [0, 1, 2])
+
+    def test_coalescer_mantem_o_mais_recente(self):
+        self.bus.configurar_fila("topico", 1, PoliticaTransbordo.COALESCER)
+        self._publicar_com_worker_ocupado(10)
+        self.assertEqual(self.recebidos, [9])
+
+    def test_bloquear_segura_o_publicador_sem_perder_eventos(self):
+        self.bus.configurar_fila("topico", 2, PoliticaTransbordo.BLOQUEAR)
+        self.bus.publicar(Evento("bloqueio", {}))
+        time.sleep(0.05)
+
+        publicador = threading.Thread(target=lambda: [self.bus.publicar(Evento("topico", {"n": n})) for n in range(5)])
+        publicador.start()
+        time.sleep(0.1)
+        self.assertTrue(publicador.is_alive())  # Preso esperando espaço
+
+        self.liberar.set()
+        publicador.join(timeout=2)
+        self.assertTrue(self.bus.aguardar_ociosidade(timeout=2))
+        self.assertEqual(self.recebidos, [0, 1, 2, 3, 4])
+
+    def test_bloqueado_entrega_na_hora_se_o_despacho_for_desligado(self):
+        self.bus.configurar_fila("topico", 2, PoliticaTransbordo.BLOQUEAR)
+        self.bus.publicar(Evento("bloqueio", {}))
+        time.sleep(0.05)
+        for n in range(2):
+            self.bus.publicar(Evento("topico", {"n": n}))
+
+        publicador = threading.Thread(target=lambda: self.bus.publicar(Evento("topico", {"n": 2})))
+        publicador.start()
+        time.sleep(0.1)
+        self.assertTrue(publicador.is_alive())
+
+        self.bus.parar_despacho_assincrono(drenar=False, timeout=0.1)
+        publicador.join(timeout=0.5)
+        self.assertFalse(publicador.is_alive())
+        self.assertEqual(self.recebidos, [2])
+
+    def test_bloqueado_usa_a_fila_nova_depois_do_reset(self):
+        self.bus.configurar_fila("topico", 2, PoliticaTransbordo.BLOQUEAR)
+        self.bus.publicar(Evento("bloqueio", {}))
+        time.sleep(0.05)
+        for n in range(2):
+            self.bus.publicar(Evento("topico", {"n": n}))
+
+        publicador = threading.Thread(target=lambda: self.bus.publicar(Evento("topico", {"n": 2})))
+        publicador.start()
+        time.sleep(0.1)
+        self.bus.reset()
+        publicador.join(timeout=0.5)
+        self.assertFalse(publicador.is_alive())  # Não esperou o TIMEOUT_BLOQUEIO inteiro
+        self.assertEqual(self.bus.estado_filas()["topico"]["pendentes"], 1)
+
+    def test_padrao_glob_para_topicos_de_visao(self):
+        self.bus.publicar(Evento("VISAO_GESTO", {}))
+        self.assertTrue(self.bus.aguardar_ociosidade(timeout=2))
+        estado = self.bus.estado_filas()["VISAO_GESTO"]
+        self.assertEqual(estado["politica"], PoliticaTransbordo.COALESCER.value)
+
+class TestEventBusMetricas(unittest.TestCase):
+    def test_contagens_e_excecoes_por_assinante(self):
+        bus = EventBus()
+
+        def lento(evento):
+            time.sleep(0.02)
+
+        def quebrado(evento):
+            raise ValueError("falha")
+
+        bus.inscrever("topico", lento)
+        bus.inscrever("topico", quebrado)
+        for _ in range(3):
+            bus.publicar(Evento("topico", {}))
+
+        topico = bus.metricas()["topicos"]["topico"]
+        self.assertEqual(topico["publicados"], 3)
+
+        assinantes = topico["assinantes"]
+        nome_lento = next(n for n in assinantes if n.endswith("lento"))
+        nome_quebrado = next(n for n in assinantes if n.endswith("quebrado"))
+        self.assertEqual(assinantes[nome_lento]["chamadas"], 3)
+        self.assertEqual(assinantes[nome_lento]["erros"], 0)
+        self.assertGreaterEqual(assinantes[nome_lento]["execucao"]["p50_ms"], 10)
+        self.assertEqual(assinantes[nome_quebrado]["erros"], 3)
+
+    def test_espera_na_fila_no_modo_assincrono(self):
+        bus = EventBus(modo_assincrono=True, max_workers=1)
+        liberar = threading.Event()
+        bus.inscrever("bloqueio", lambda e: liberar.wait(2))
+        bus.inscrever("topico", lambda e: None)
+
+        bus.publicar(Evento("bloqueio", {}))
+        time.sleep(0.01)
+        bus.publicar(Evento("topico", {}))
+        time.sleep(0.05)
+        liberar.set()
+        self.assertTrue(bus.aguardar_ociosidade(timeout=2))
+        bus.parar_despacho_assincrono()
+
+        metricas = bus.metricas()["topicos"]["topico"]
+        self.assertEqual(metricas["espera_fila"]["amostras"], 1)
+        self.assertGreaterEqual(metricas["espera_fila"]["max_ms"], 40)
+        self.assertEqual(metricas["pendentes"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+# tests/test_key_manager.py
+import sys
+import os
+import unittest
+from types import SimpleNamespace
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.cortex_frontal.brain_llm.keyManager import KeyManager
+from jarvis_system.cortex_frontal.brain_llm.localCloudProviders import CloudProvider
+
+class ErroHttp(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+class ClienteFalso:
+    """Imita groq.Groq: 'chat.completions.create' responde ou levanta o próximo erro da fila."""
+    def __init__(self, api_key, erros=None):
+        self.api_key = api_key
+        self.erros = list(erros or [])
+        self.chamadas = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.chamadas += 1
+        if self.erros:
+            raise self.erros.pop(0)
+        mensagem = SimpleNamespace(content=f" resposta de {self.api_key} ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=mensagem)])
+
+class FabricaFalsa:
+    def __init__(self, erros_por_chave=None):
+        self.erros_por_chave = erros_por_chave or {}
+        self.criados = {}
+
+    def __call__(self, api_key):
+        cliente = ClienteFalso(api_key, self.erros_por_chave.get(api_key))
+        self.criados.setdefault(api_key, []).append(cliente)
+        return cliente
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self):
+        return self.agora
+
+class TestKeyManager(unittest.TestCase):
+    def setUp(self):
+        self.relogio = RelogioFalso()
+
+    def pool(self, chaves, fabrica):
+        return KeyManager(chaves=chaves, fabrica_cliente=fabrica, relogio=self.relogio)
+
+    def test_um_cliente_por_chave_reaproveitado(self):
+        fabrica = FabricaFalsa()
+        km = self.pool(["a", "b"], fabrica)
+        for _ in range(6):
+            self.relogio.agora += 1
+            km.escolher()
+
+        self.assertEqual({chave: len(clientes) for chave, clientes in fabrica.criados.items()}, {"a": 1, "b": 1})
+        self.assertEqual([e.usos for e in km.estados], [3, 3])
+
+    def test_rate_limit_pula_chave_ate_o_fim_do_cooldown(self):
+        km = self.pool(["a", "b"], FabricaFalsa())
+        a = km.escolher()
+        self.assertTrue(km.falha(a, ErroHttp(429, retry_after=10)))
+
+        for _ in range(3):
+            self.relogio.agora += 1
+            self.assertEqual(km.escolher().api_key, "b")
+
+        self.relogio.agora += 10
+        self.assertEqual(km.escolher().api_key, "a")
+
+    def test_erro_do_pedido_nao_penaliza_a_chave(self):
+        km = self.pool(["a"], FabricaFalsa())
+        a = km.escolher()
+        self.assertFalse(km.falha(a, ErroHttp(400)))
+        self.assertIsNotNone(km.escolher())
+
+    def test_cloud_provider_troca_de_chave_sem_repetir_a_limitada(self):
+        fabrica = FabricaFalsa({"a": [ErroHttp(429)], "b": [ErroHttp(503)]})
+        km = self.pool(["a", "b", "c"], fabrica)
+
+        self.assertEqual(CloudProvider(km).generate("sys", "user"), "resposta de c")
+        # Próximo pedido: 'a' e 'b' ainda em cooldown, vai direto para 'c'
+        self.relogio.agora += 1
+        self.assertEqual(CloudProvider(km).generate("sys", "user"), "resposta de c")
+        self.assertEqual([fabrica.criados[k][0].chamadas for k in "abc"], [1, 1, 2])
+
+    def test_todas_em_cooldown_falha_rapido(self):
+        fabrica = FabricaFalsa({"a": [ErroHttp(429)]})
+        km = self.pool(["a"], fabrica)
+        with self.assertRaises(Exception):
+            CloudProvider(km).generate("sys", "user")
+        self.assertEqual(fabrica.criados["a"][0].chamadas, 1)
+        self.assertEqual(km.estatisticas()["disponiveis"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+# tests/test_llm_cache.py
+import sys
+import os
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.cortex_frontal.brain_llm import hybridBrain
+from jarvis_system.cortex_frontal.brain_llm.hybridBrain import HybridBrain
+from jarvis_system.cortex_frontal.brain_llm.responseCache import CacheRespostas
+
+class ProvedorFalso:
+    """Substituto do Groq/Ollama: conta as idas ao modelo."""
+    def __init__(self, resposta="Resposta do modelo.", falhar=False):
+        self.resposta = resposta
+        self.falhar = falhar
+        self.chamadas = 0
+
+    def generate(self, system_prompt, user_prompt):
+        self.chamadas += 1
+        if self.falhar:
+            raise Exception("offline")
+        return self.resposta
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self):
+        return self.agora
+
+class TestCacheRespostas(unittest.TestCase):
+    def setUp(self):
+        self.relogio = RelogioFalso()
+        self.cache = CacheRespostas(relogio=self.relogio, semantico=True, limiar=0.8)
+
+    def test_acerto_exato_ignora_caixa_acentos_e_pontuacao(self):
+        self.cache.guardar("Qual é o sentido da vida?", "fp", "42.")
+        self.assertEqual(self.cache.buscar("qual e o sentido da vida", "fp"), "42.")
+        self.assertIsNone(self.cache.buscar("qual e o sentido da vida", "outro_prompt"))
+
+    def test_ttl_por_classe_de_intencao(self):
+        self.cache.guardar("que horas são", "fp", "São 10h.")
+        self.cache.guardar("toca rock", "fp", '[{"target_tool": "spotify"}]')
+        self.relogio.agora += 60
+
+        self.assertIsNone(self.cache.buscar("que horas são", "fp"))
+        self.assertIsNotNone(self.cache.buscar("toca rock", "fp"))
+
+    def test_semantico_exige_os_mesmos_numeros(self):
+        self.cache.guardar("jarvis toca um rock ai", "fp", "rock")
+        self.cache.guardar("timer de 5 minutos", "fp", "5 min")
+
+        self.assertEqual(self.cache.buscar("jarvis toca um rock aí por favor", "fp"), "rock")
+        self.assertIsNone(self.cache.buscar("timer de 6 minutos", "fp"))
+        self.assertEqual(self.cache.estatisticas()["acertos_semanticos"], 1)
+
+class TestHybridBrainCache(unittest.TestCase):
+    def setUp(self):
+        patches = [mock.patch.object(hybridBrain, "memoria", None), mock.patch.object(hybridBrain, "registry", None)]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_comando_repetido_nao_chama_o_llm(self):
+        nuvem = ProvedorFalso('[{"task_id": "t1", "target_tool": "spotify"}]')
+        cerebro = HybridBrain(cloud=nuvem, local=ProvedorFalso(), cache=CacheRespostas())
+
+        primeira = cerebro.pensar("toca rock")
+        segunda = cerebro.pensar("Toca rock!")
+
+        self.assertEqual(primeira, segunda)
+        self.assertEqual(nuvem.chamadas, 1)
+
+    def test_catalogo_novo_invalida(self):
+        nuvem = ProvedorFalso("ok")
+        cerebro = HybridBrain(cloud=nuvem, local=ProvedorFalso(), cache=CacheRespostas())
+        registro = mock.Mock()
+        registro.get_all_tool_descriptions.return_value = "- Ferramenta: 'clima'"
+
+        with mock.patch.object(hybridBrain, "registry", registro):
+            cerebro.pensar("bom dia jarvis")
+            registro.get_all_tool_descriptions.return_value += "\n- Ferramenta: 'spotify'"
+            cerebro.pensar("bom dia jarvis")
+        self.assertEqual(nuvem.chamadas, 2)
+
+    def test_pane_local_nao_vai_para_o_cache(self):
+        from jarvis_system.cortex_frontal.brain_llm.localCloudProviders import RESPOSTA_FALHA_LOCAL
+        local = ProvedorFalso(RESPOSTA_FALHA_LOCAL)
+        cerebro = HybridBrain(cloud=ProvedorFalso(falhar=True), local=local, cache=CacheRespostas())
+
+        cerebro.pensar("explique buracos negros")
+        cerebro.pensar("explique buracos negros")
+        self.assertEqual(local.chamadas, 2)
+
+if __name__ == "__main__":
+    unittest.main()
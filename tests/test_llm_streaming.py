@@ -0,0 +1,92 @@
+# tests/test_llm_streaming.py
+import sys
+import os
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.cortex_frontal.brain_llm import hybridBrain
+from jarvis_system.cortex_frontal.brain_llm.hybridBrain import HybridBrain
+from jarvis_system.cortex_frontal.brain_llm.responseCache import CacheRespostas
+from jarvis_system.cortex_frontal.brain_llm.streamParser import ProcessadorStream, FALA, ACAO
+
+class ProvedorStreamFalso:
+    """Substituto do Groq/Ollama em streaming: entrega a resposta em pedaços de poucos caracteres."""
+    def __init__(self, resposta="", falhar=False, tamanho=3):
+        self.resposta = resposta
+        self.falhar = falhar
+        self.tamanho = tamanho
+        self.entregues = 0
+        self.chamadas = 0
+
+    def generate(self, system_prompt, user_prompt):
+        return "".join(self.generate_stream(system_prompt, user_prompt))
+
+    def generate_stream(self, system_prompt, user_prompt):
+        self.chamadas += 1
+        if self.falhar:
+            raise Exception("offline")
+        for i in range(0, len(self.resposta), self.tamanho):
+            self.entregues += 1
+            yield self.resposta[i:i + self.tamanho]
+
+def alimentar_tudo(processador, texto, tamanho=2):
+    fragmentos = []
+    for i in range(0, len(texto), tamanho):
+        fragmentos += processador.alimentar(texto[i:i + tamanho])
+    return fragmentos + processador.finalizar()
+
+class TestProcessadorStream(unittest.TestCase):
+    def test_frases_saem_antes_do_fim(self):
+        processador = ProcessadorStream()
+        primeira = []
+        texto = "Claro, senhor. Os reatores estão estáveis! Algo mais?"
+        for i in range(0, len(texto), 2):
+            primeira += processador.alimentar(texto[i:i + 2])
+            if primeira:
+                break
+        self.assertEqual(primeira[0].texto, "Claro, senhor.")
+        self.assertLess(i, len(texto) - 10)
+
+    def test_json_interrompe_a_fala(self):
+        texto = 'Abrindo agora. [{"task_id": "t1", "target_tool": "sistema", "initial_args": {}, "dependencies": []}]'
+        fragmentos = alimentar_tudo(ProcessadorStream(), texto)
+
+        self.assertEqual([(f.tipo, f.texto) for f in fragmentos if f.tipo == FALA], [(FALA, "Abrindo agora.")])
+        self.assertTrue(fragmentos[-1].tipo == ACAO and fragmentos[-1].texto.startswith('[{"task_id"'))
+
+    def test_tag_legada_mapeada_no_fim(self):
+        fragmentos = alimentar_tudo(ProcessadorStream(mapear_tag=lambda tag: "Todos os sistemas operacionais."), "[[STATUS]]")
+        self.assertEqual([(f.tipo, f.texto) for f in fragmentos], [(FALA, "Todos os sistemas operacionais.")])
+
+class TestHybridBrainStream(unittest.TestCase):
+    def setUp(self):
+        patches = [mock.patch.object(hybridBrain, "memoria", None), mock.patch.object(hybridBrain, "registry", None)]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_contingencia_local_e_cache(self):
+        local = ProvedorStreamFalso("Modo local ativo. Nuvem fora do ar.")
+        cerebro = HybridBrain(cloud=ProvedorStreamFalso(falhar=True), local=local, cache=CacheRespostas())
+
+        primeira = [f.texto for f in cerebro.pensar_stream("explique buracos negros")]
+        segunda = [f.texto for f in cerebro.pensar_stream("explique buracos negros")]
+
+        self.assertEqual(primeira, ["Modo local ativo.", "Nuvem fora do ar."])
+        self.assertEqual(segunda, primeira)
+        self.assertEqual(local.chamadas, 1)
+
+    def test_primeira_frase_antes_da_geracao_terminar(self):
+        nuvem = ProvedorStreamFalso("Certo. " + "Esta é uma resposta longa. " * 20)
+        cerebro = HybridBrain(cloud=nuvem, local=ProvedorStreamFalso())
+
+        stream = cerebro.pensar_stream("conte uma história")
+        primeira = next(stream)
+        self.assertEqual(primeira.texto, "Certo.")
+        self.assertLess(nuvem.entregues, 10)
+        stream.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+# tests/test_medidor_nivel.py
+import sys
+import os
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.cortex_frontal.event_bus import bus
+from jarvis_system.protocol import Eventos
+from jarvis_system.area_broca.listen import medidorNivel
+from jarvis_system.area_broca.listen.medidorNivel import MedidorNivel, GRAVANDO, AGUARDANDO
+
+class TerminalLento:
+    """stdout redirecionado para um pipe que ninguém lê direito (systemd/uvicorn)."""
+    def __init__(self, atraso=0.2):
+        self.atraso = atraso
+        self.escrito = []
+
+    def write(self, texto):
+        time.sleep(self.atraso)
+        self.escrito.append(texto)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+class TestMedidorNivel(unittest.TestCase):
+    def test_terminal_lento_nao_atrasa_o_vad(self):
+        terminal = TerminalLento()
+        leituras = []
+        medidor = MedidorNivel(publicar=leituras.append, intervalo_s=0.02, console=True, saida=terminal)
+        medidor.iniciar()
+        self.addCleanup(medidor.parar)
+
+        pior = 0.0
+        inicio = time.perf_counter()
+        while time.perf_counter() - inicio < 0.5:
+            t0 = time.perf_counter()
+            medidor.registrar(0.1, True)
+            pior = max(pior, time.perf_counter() - t0)
+            time.sleep(0.001)
+        medidor.parar()
+
+        self.assertLess(pior, 0.005)              # O bloco do VAD nunca esperou pelo terminal
+        self.assertGreaterEqual(len(terminal.escrito), 1)
+        self.assertLessEqual(len(leituras), 0.5 / 0.02 + 1)  # Decimado: no máximo uma leitura por janela
+        self.assertGreaterEqual(medidor.render_max_ms, 200)
+
+    def test_janela_agrega_blocos_e_so_entrega_novidade(self):
+        relogio = [100.0]
+        with mock.patch.object(medidorNivel.time, "monotonic", lambda: relogio[0]):
+            medidor = MedidorNivel(intervalo_s=0.5, console=False)
+            medidor.registrar(0.3, True)
+            self.assertIsNone(medidor.entregar())  # Janela ainda aberta
+
+            relogio[0] += 0.5
+            medidor.registrar(0.4, True)
+            leitura = medidor.entregar()
+            self.assertEqual((leitura["pico"], leitura["blocos"], leitura["estado"]), (0.4, 2, GRAVANDO))
+            self.assertAlmostEqual(leitura["rms"], (0.25 / 2) ** 0.5, places=3)
+            self.assertIsNone(medidor.entregar())
+
+            relogio[0] += 0.6
+            medidor.registrar(0.01, False)
+            self.assertEqual(medidor.entregar()["estado"], AGUARDANDO)
+
+    def test_console_desligado_fora_de_terminal(self):
+        with mock.patch.object(medidorNivel, "NIVEL_CONSOLE", "auto"):
+            self.assertFalse(MedidorNivel(saida=TerminalLento()).console)
+
+class TestTelemetriaOuvido(unittest.TestCase):
+    def tearDown(self):
+        bus.reset()
+
+    def test_nivel_vai_para_o_barramento_e_metricas(self):
+        from jarvis_system.area_broca.listen.ouvidoBiologico import OuvidoBiologico
+
+        class Transcritor:
+            def transcribe(self, audio):
+                return ""
+
+        recebidos = []
+        bus.inscrever(Eventos.NIVEL_MIC, lambda evento: recebidos.append(evento.dados))
+        ouvido = OuvidoBiologico(driver=object(), transcriber=Transcritor())
+        ouvido.medidor.intervalo_s = 0.0
+        ouvido.medidor.console = False
+
+        ouvido.medidor.registrar(0.2, True)
+        ouvido.medidor.entregar()
+
+        self.assertEqual(recebidos[0]["estado"], GRAVANDO)
+        self.assertEqual(ouvido.estatisticas()["nivel"]["pico"], 0.2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# tests/test_perfis_stt.py
+import sys
+import os
+import glob
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.area_broca.listen import whisperTranscriber
+from jarvis_system.area_broca.listen.whisperTranscriber import WhisperTranscriber, escolher_perfil
+from jarvis_system.area_broca.listen.audioUtils import gravar_wav, ler_wav
+from jarvis_system.area_broca.listen.benchmarkAudio import avaliar_stt
+from jarvis_system.area_broca.listen.configAudio import BENCHMARK_STT_DIR, PERFIL_CURTO_MAX_S
+
+SR = 16000
+
+class ModeloFalso:
+    """Custo proporcional ao beam e à duração, como o decoder do Whisper em CPU."""
+    def __init__(self, *args, **kwargs):
+        self.chamadas = []
+
+    def transcribe(self, audio, **kwargs):
+        self.chamadas.append(kwargs)
+
+        def segmentos():
+            time.sleep(0.002 * kwargs["beam_size"] * len(audio) / SR + (0.003 if kwargs.get("vad_filter") else 0))
+            yield SimpleNamespace(text="liga a luz", no_speech_prob=0.1)
+        return segmentos(), None
+
+class TestPerfisSTT(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(whisperTranscriber, "WhisperModel", ModeloFalso)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_escolha_por_duracao_e_carga(self):
+        self.assertEqual(escolher_perfil(1.5), "rapido")
+        self.assertEqual(escolher_perfil(7.0), "normal")
+        self.assertEqual(escolher_perfil(20.0), "preciso")
+        self.assertEqual(escolher_perfil(20.0, carga=0.95), "normal")
+        self.assertEqual(escolher_perfil(1.5, carga=0.95), "rapido")
+
+    def test_aquecimento_e_perfil_automatico(self):
+        stt = WhisperTranscriber(aquecer=True, perfil="auto")
+        self.assertEqual(len(stt.model.chamadas), 1)  # Aquecimento consumiu o gerador
+
+        with mock.patch.object(whisperTranscriber, "carga_cpu", return_value=0.1):
+            self.assertEqual(stt.transcribe([np.zeros(2 * SR, dtype=np.float32)]), "liga a luz")
+            self.assertEqual((stt.ultimo_perfil, stt.model.chamadas[-1]["beam_size"]), ("rapido", 1))
+            self.assertFalse(stt.model.chamadas[-1]["vad_filter"])
+
+            stt.transcribe([np.zeros(15 * SR, dtype=np.float32)])
+            self.assertEqual((stt.ultimo_perfil, stt.model.chamadas[-1]["beam_size"]), ("preciso", 5))
+
+        stt.definir_perfil("normal")
+        stt.transcribe([np.zeros(2 * SR, dtype=np.float32)])
+        self.assertEqual(stt.ultimo_perfil, "normal")
+        with self.assertRaises(ValueError):
+            stt.definir_perfil("turbo")
+
+    def test_benchmark_mediana_de_comandos_curtos_cai(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            frases = []
+            for i, segundos in enumerate([1.2, 1.8, 2.5]):
+                caminho = os.path.join(pasta, f"comando{i}.wav")
+                gravar_wav(caminho, np.zeros(int(segundos * SR), dtype=np.float32), SR)
+                frases.append(ler_wav(caminho, SR))
+
+        stt = WhisperTranscriber(aquecer=False)
+        with mock.patch.object(whisperTranscriber, "carga_cpu", return_value=0.1):
+            resultado = avaliar_stt(stt, frases, ["preciso", "auto"], repeticoes=2)
+        self.assertEqual(resultado["auto"]["perfis_usados"], {"rapido": 3})
+        self.assertLess(resultado["auto"]["mediana_ms"], resultado["preciso"]["mediana_ms"] / 2)
+
+    def test_wavs_do_benchmark_incluidos(self):
+        caminhos = sorted(glob.glob(os.path.join(BENCHMARK_STT_DIR, "*.wav")))
+        self.assertGreaterEqual(len(caminhos), 2)
+        frases = [ler_wav(c, SR) for c in caminhos]
+        self.assertTrue(all(0.5 < len(f) / SR < PERFIL_CURTO_MAX_S for f in frases))
+        self.assertTrue(all(np.abs(f).max() > 0.1 for f in frases))  # Não é silêncio
+
+        stt = WhisperTranscriber(aquecer=False)
+        with mock.patch.object(whisperTranscriber, "carga_cpu", return_value=0.1):
+            resultado = avaliar_stt(stt, frases, ["preciso", "auto"], repeticoes=2)
+        self.assertEqual(resultado["auto"]["perfis_usados"], {"rapido": len(frases)})
+        self.assertLess(resultado["auto"]["mediana_ms"], resultado["preciso"]["mediana_ms"] / 2)
+
+if __name__ == "__main__":
+    unittest.main()
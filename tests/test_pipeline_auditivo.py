@@ -0,0 +1,119 @@
+# tests/test_pipeline_auditivo.py
+import sys
+import os
+import tempfile
+import threading
+import time
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.cortex_frontal.event_bus import bus
+from jarvis_system.protocol import Eventos
+from jarvis_system.area_broca.listen.audioDriver import FileAudioDriver
+from jarvis_system.area_broca.listen.audioUtils import gravar_wav
+from jarvis_system.area_broca.listen.ouvidoBiologico import OuvidoBiologico
+from jarvis_system.area_broca.listen.anelAudio import AnelBlocos
+from jarvis_system.area_broca.listen.pipelineAuditivo import (
+    SegmentadorVAD, SILENCIO, INICIO_FALA, FALA, FIM_FALA, DESCARTADO
+)
+
+SR = 16000
+BLOCO = 4000
+
+def gerar_duas_frases(caminho):
+    """Dois trechos de tom (1s cada) separados por 2.5s de silêncio."""
+    t = np.arange(SR) / SR
+    tom = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    silencio = np.zeros(int(2.5 * SR), dtype=np.float32)
+    gravar_wav(caminho, np.concatenate([silencio[:SR // 2], tom, silencio, tom, silencio]), SR)
+
+class TranscritorLento:
+    """Substituto do Whisper: cada decodificação leva 'atraso' segundos."""
+    def __init__(self, atraso=0.4):
+        self.atraso = atraso
+        self.fins_decodificacao = []
+
+    def transcribe(self, buffers):
+        time.sleep(self.atraso)
+        self.fins_decodificacao.append(time.perf_counter())
+        return f"frase numero {len(self.fins_decodificacao)}"
+
+class TestPipelineAuditivo(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fixture = os.path.join(self.tmp.name, "duas_frases.wav")
+        gerar_duas_frases(self.fixture)
+        self.recebidas = []
+        self.todas = threading.Event()
+        bus.inscrever(Eventos.FALA_RECONHECIDA, self._on_fala)
+
+    def tearDown(self):
+        bus.reset()
+        self.tmp.cleanup()
+
+    def _on_fala(self, evento):
+        self.recebidas.append(evento.dados["texto"])
+        if len(self.recebidas) == 2:
+            self.todas.set()
+
+    def test_segmentacao_nao_espera_o_stt(self):
+        transcritor = TranscritorLento()
+        driver = FileAudioDriver(self.fixture, SR, BLOCO)
+        ouvido = OuvidoBiologico(driver=driver, transcriber=transcritor, stt_em_processo=True)
+        self.assertFalse(ouvido.stt_em_processo)  # Decoder injetado fica em thread
+
+        fins_de_fala = []
+        processar_original = ouvido.segmentador.processar
+        def processar_espiao(chunk):
+            resultado = processar_original(chunk)
+            if resultado[2] == FIM_FALA:
+                fins_de_fala.append(time.perf_counter())
+            return resultado
+        ouvido.segmentador.processar = processar_espiao
+
+        ouvido.start()
+        try:
+            self.assertTrue(self.todas.wait(timeout=5.0))
+        finally:
+            ouvido.stop()
+
+        self.assertEqual(self.recebidas, ["frase numero 1", "frase numero 2"])
+        # A segunda frase foi cortada antes de a primeira terminar de decodificar
+        self.assertEqual(len(fins_de_fala), 2)
+        self.assertLess(fins_de_fala[1], transcritor.fins_decodificacao[0])
+
+    def test_anel_captura_cheio_descarta_o_bloco_novo(self):
+        anel = AnelBlocos(2, 4, 1, dtype=np.int16)
+        bloco = lambda v: np.full((4, 1), v, dtype=np.int16)
+        self.assertTrue(anel.escrever(bloco(1)))
+        self.assertTrue(anel.escrever(bloco(2)))
+        self.assertFalse(anel.escrever(bloco(3)))
+        self.assertEqual([int(anel.ler(0)[0, 0]), int(anel.ler(0)[0, 0])], [1, 2])
+        self.assertIsNone(anel.ler(0))
+
+    def test_segmentador_estados(self):
+        segmentador = SegmentadorVAD(limiar=0.01, ganho=1.0, blocos_pausa_fim=2)
+        voz = np.full((BLOCO, 1), 8000, dtype=np.int16)
+        mudo = np.zeros((BLOCO, 1), dtype=np.int16)
+
+        estados = [segmentador.processar(b)[2] for b in (mudo, voz, voz, mudo, mudo, mudo, mudo)]
+        self.assertEqual(estados, [SILENCIO, INICIO_FALA, FALA, FALA, FALA, FIM_FALA, SILENCIO])
+        # O próprio segmentador zera o contador ao fechar a frase e expõe a duração dela
+        self.assertEqual(segmentador.blocos_frase, 0)
+        self.assertAlmostEqual(segmentador.duracao_frase_s, round(5 * BLOCO / SR, 2))
+
+    def test_segmentador_zera_a_frase_descartada(self):
+        segmentador = SegmentadorVAD(limiar=0.01, ganho=1.0, blocos_pausa_fim=1, fala_min_s=10.0)
+        voz = np.full((BLOCO, 1), 8000, dtype=np.int16)
+        mudo = np.zeros((BLOCO, 1), dtype=np.int16)
+
+        estados = [segmentador.processar(b)[2] for b in (voz, mudo, mudo)]
+        self.assertEqual(estados, [INICIO_FALA, FALA, DESCARTADO])
+        self.assertEqual(segmentador.blocos_frase, 0)
+        self.assertEqual(segmentador.processar(voz)[2], INICIO_FALA)
+        self.assertEqual(segmentador.blocos_frase, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# tests/test_prompt_factory.py
+import sys
+import os
+import datetime
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.cortex_frontal.brain_llm import promptFactory
+from jarvis_system.cortex_frontal.brain_llm.promptFactory import PromptFactory
+
+CATALOGO = "- Ferramenta: 'sistema' | Uso: apps\n- Ferramenta: 'spotify' | Uso: músicas"
+
+class DataFalsa(datetime.datetime):
+    agora = datetime.datetime(2025, 1, 1, 10, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.agora
+
+class TestPromptFactory(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(promptFactory.datetime, "datetime", DataFalsa)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_prefixo_identico_quando_so_a_hora_muda(self):
+        DataFalsa.agora = datetime.datetime(2025, 1, 1, 10, 0)
+        antes = PromptFactory.build_system_prompt(CATALOGO)
+        DataFalsa.agora = datetime.datetime(2025, 1, 1, 10, 1)
+        depois = PromptFactory.build_system_prompt(CATALOGO)
+
+        prefixo = PromptFactory.build_stable_prefix(CATALOGO)
+        self.assertNotEqual(antes, depois)
+        self.assertTrue(antes.startswith(prefixo) and depois.startswith(prefixo))
+        self.assertIn("Hora atual: 10:01", depois[len(prefixo):])
+        self.assertNotIn("{{", prefixo)
+
+    def test_prefixo_so_e_remontado_quando_o_catalogo_muda(self):
+        with mock.patch.object(promptFactory, "_secoes_ferramentas", wraps=promptFactory._secoes_ferramentas) as secoes:
+            PromptFactory._prefixo_cache = (None, None)
+            for _ in range(3):
+                PromptFactory.build_system_prompt(CATALOGO)
+            self.assertEqual(secoes.call_count, 1)
+
+            novo = PromptFactory.build_system_prompt(CATALOGO + "\n- Ferramenta: 'clima' | Uso: tempo")
+            self.assertEqual(secoes.call_count, 2)
+            self.assertIn("'clima'", novo)
+
+if __name__ == "__main__":
+    unittest.main()
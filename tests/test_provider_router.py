@@ -0,0 +1,108 @@
+# tests/test_provider_router.py
+import sys
+import os
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.cortex_frontal.brain_llm.providerRouter import RoteadorProvedores
+
+class ProvedorLento:
+    """Provedor falso com atraso configurável até a resposta (ou até o 1º token)."""
+    def __init__(self, resposta="ok", atraso=0.0, falhar=False, atraso_token=0.0):
+        self.resposta = resposta
+        self.atraso = atraso
+        self.atraso_token = atraso_token
+        self.falhar = falhar
+        self.chamadas = 0
+        self.tokens = 0
+        self.fechado = False
+
+    def generate(self, system_prompt, user_prompt):
+        self.chamadas += 1
+        time.sleep(self.atraso)
+        if self.falhar:
+            raise Exception("offline")
+        return self.resposta
+
+    def generate_stream(self, system_prompt, user_prompt):
+        self.chamadas += 1
+        time.sleep(self.atraso)
+        if self.falhar:
+            raise Exception("offline")
+        try:
+            for palavra in self.resposta.split():
+                self.tokens += 1
+                yield palavra + " "
+                time.sleep(self.atraso_token)
+        finally:
+            self.fechado = True
+
+def roteador(nuvem, local, **kwargs):
+    kwargs.setdefault("budget_padrao_s", 0.05)
+    return RoteadorProvedores({"NUVEM": nuvem, "LOCAL": local}, ["NUVEM", "LOCAL"], **kwargs)
+
+class TestRoteadorProvedores(unittest.TestCase):
+    def test_primario_lento_dispara_hedge(self):
+        r = roteador(ProvedorLento("nuvem", atraso=1.0), ProvedorLento("local"))
+
+        inicio = time.monotonic()
+        resposta, provedor = r.generate("sys", "user")
+
+        self.assertEqual((resposta, provedor), ("local", "LOCAL"))
+        self.assertLess(time.monotonic() - inicio, 0.5)
+        self.assertEqual(r.hedges, 1)
+
+    def test_falha_troca_sem_esperar_o_orcamento(self):
+        r = roteador(ProvedorLento(falhar=True), ProvedorLento("local"), budget_padrao_s=5.0)
+
+        inicio = time.monotonic()
+        self.assertEqual(r.generate("sys", "user"), ("local", "LOCAL"))
+        self.assertLess(time.monotonic() - inicio, 1.0)
+        self.assertEqual(r.hedges, 0)
+
+    def test_resposta_invalida_conta_como_falha(self):
+        r = roteador(ProvedorLento(falhar=True), ProvedorLento("pane"), respostas_invalidas=("pane",))
+        with self.assertRaises(Exception):
+            r.generate("sys", "user")
+
+    def test_taxa_de_erro_alta_rebaixa_o_provedor(self):
+        nuvem, local = ProvedorLento(falhar=True), ProvedorLento("local")
+        r = roteador(nuvem, local)
+        for _ in range(5):
+            r.generate("sys", "user")
+
+        self.assertEqual(r.ordem_atual(), ["LOCAL", "NUVEM"])
+        r.generate("sys", "user")
+        self.assertEqual(nuvem.chamadas, 5)
+
+    def test_bloqueante_cancela_o_perdedor_no_meio_da_resposta(self):
+        palavras = "uma resposta longa que a nuvem gera devagar token a token".split()
+        nuvem = ProvedorLento(" ".join(palavras), atraso_token=0.1)
+        r = roteador(nuvem, ProvedorLento("local"))
+
+        self.assertEqual(r.generate("sys", "user"), ("local", "LOCAL"))
+        time.sleep(0.3)
+
+        # O perdedor parou de gerar: gerador fechado bem antes do fim da resposta
+        self.assertTrue(nuvem.fechado)
+        self.assertLess(nuvem.tokens, len(palavras) / 2)
+        self.assertEqual(r.stats[("NUVEM", "texto")].resumo()["amostras"], 1)
+
+    def test_stream_cancela_o_perdedor(self):
+        nuvem, local = ProvedorLento("resposta da nuvem", atraso=0.3), ProvedorLento("resposta local rápida")
+        r = roteador(nuvem, local)
+        estado = {}
+
+        texto = "".join(r.generate_stream("sys", "user", estado)).strip()
+        time.sleep(0.4)
+
+        self.assertEqual(texto, "resposta local rápida")
+        self.assertEqual(estado["provider"], "LOCAL")
+        self.assertTrue(nuvem.fechado)
+        # O primário abandonado deixa uma amostra (limite inferior) no próprio histórico
+        self.assertEqual(r.stats[("NUVEM", "stream")].resumo()["amostras"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+# tests/test_rag_prefetch.py
+import sys
+import os
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.cortex_frontal.brain_llm import hybridBrain
+from jarvis_system.cortex_frontal.brain_llm.hybridBrain import HybridBrain
+from jarvis_system.cortex_frontal.brain_llm.ragPrefetch import PrefetchMemoria
+
+class MemoriaLenta:
+    """Substituto do Hipocampo: cada busca custa 'atraso' segundos."""
+    def __init__(self, atraso=0.2):
+        self.atraso = atraso
+        self.consultas = []
+
+    def relembrar(self, consulta, limite=3):
+        self.consultas.append(consulta)
+        time.sleep(self.atraso)
+        return f"- lembrança sobre {consulta}"
+
+class ProvedorEco:
+    def __init__(self):
+        self.prompts = []
+
+    def generate(self, system_prompt, user_prompt):
+        self.prompts.append(user_prompt)
+        return "ok"
+
+class TestPrefetchMemoria(unittest.TestCase):
+    def setUp(self):
+        self.memoria = MemoriaLenta()
+        self.nuvem = ProvedorEco()
+        patches = [mock.patch.object(hybridBrain, "memoria", self.memoria), mock.patch.object(hybridBrain, "registry", None),
+                   mock.patch.object(hybridBrain, "RAG_PREFETCH_ATIVO", True)]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.cerebro = HybridBrain(cloud=self.nuvem, local=ProvedorEco(), hedge=False)
+
+    def test_busca_antecipada_e_reaproveitada(self):
+        self.cerebro.antecipar_memoria("qual meu time")
+        time.sleep(0.25)  # Etapas baratas do orquestrador acontecendo
+
+        inicio = time.monotonic()
+        self.cerebro.pensar("qual meu time")
+
+        self.assertLess(time.monotonic() - inicio, 0.15)
+        self.assertEqual(self.memoria.consultas, ["qual meu time"])
+        self.assertIn("lembrança sobre qual meu time", self.nuvem.prompts[0])
+
+    def test_texto_diferente_busca_de_novo(self):
+        self.cerebro.antecipar_memoria("toca rock")
+        self.cerebro.pensar("qual meu time")
+        self.assertEqual(sorted(self.memoria.consultas), ["qual meu time", "toca rock"])
+        self.assertEqual(self.cerebro.prefetch.estatisticas()["falhas"], 1)
+
+    def test_busca_nao_consumida_expira(self):
+        relogio = [0.0]
+        prefetch = PrefetchMemoria(self.memoria.relembrar, validade_s=10, relogio=lambda: relogio[0])
+        prefetch.iniciar("abre o spotify")
+        relogio[0] = 11.0
+        prefetch.iniciar("qual meu time")
+
+        self.assertIsNone(prefetch.consumir("abre o spotify"))
+        self.assertEqual(prefetch.estatisticas()["descartes"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
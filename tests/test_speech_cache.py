@@ -0,0 +1,110 @@
+# tests/test_speech_cache.py
+import sys
+import os
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.area_broca.speak.speechCache import SpeechCache, SintetizadorEmCache
+
+class LogMudo:
+    def info(self, *a): pass
+    def warning(self, *a): pass
+
+class SintetizadorContador:
+    """Substituto do Fish Audio: conta as idas à 'rede'."""
+    voice_id = "voz_teste"
+
+    def __init__(self):
+        self.chamadas = []
+
+    def build_payload(self, text, metadata):
+        emotion = metadata.get("emotion", "neutral")
+        return f"({emotion}) {text}" if emotion != "neutral" else text
+
+    def synthesize_bytes(self, text, metadata):
+        self.chamadas.append(text)
+        return f"audio:{text}:{metadata.get('emotion')}".encode("utf-8") * 10
+
+class TestSpeechCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.synth = SintetizadorContador()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _sintetizador(self, limite_bytes=10_000):
+        cache = SpeechCache(self.tmp.name, limite_bytes=limite_bytes)
+        return SintetizadorEmCache(self.synth, cache, LogMudo()), cache
+
+    def test_frase_repetida_nao_vai_a_rede(self):
+        sintetizador, cache = self._sintetizador()
+        primeiro = sintetizador.synthesize_bytes("Sim, senhor.", {"emotion": "neutral"})
+        segundo = sintetizador.synthesize_bytes("sim senhor", {"emotion": "neutral"})
+
+        self.assertEqual(primeiro, segundo)
+        self.assertEqual(len(self.synth.chamadas), 1)
+        self.assertEqual(cache.estatisticas()["acertos"], 1)
+        self.assertEqual(cache.estatisticas()["falhas"], 1)
+
+    def test_categoria_ou_tag_manual_diferente_e_outra_entrada(self):
+        sintetizador, _ = self._sintetizador()
+        sintetizador.synthesize_bytes("Sim, senhor.", {"category": "INTERACAO"})
+        sintetizador.synthesize_bytes("Sim, senhor.", {"category": "HUMOR"})
+        sintetizador.synthesize_bytes("Sim, senhor.", {"category": "HUMOR", "tag_manual": "sarcastic"})
+        self.assertEqual(len(self.synth.chamadas), 3)
+
+    def test_emocao_do_diretor_nao_entra_na_chave(self):
+        sintetizador, _ = self._sintetizador()
+        meta = {"category": "INTERACAO", "tag_manual": ""}
+        sintetizador.synthesize_bytes("Sim, senhor.", {**meta, "emotion": "calm"})
+        sintetizador.synthesize_bytes("Sim, senhor.", {**meta, "emotion": "sarcastic"})
+        self.assertEqual(len(self.synth.chamadas), 1)
+        self.assertTrue(sintetizador.em_cache(["Sim, senhor."], meta))
+
+    def test_indice_gravado_em_lote_e_readotado(self):
+        cache = SpeechCache(self.tmp.name, limite_bytes=10_000, intervalo_indice_s=3600)
+        sintetizador = SintetizadorEmCache(self.synth, cache, LogMudo())
+        for frase in ("frase um", "frase dois"):
+            sintetizador.synthesize_bytes(frase, {"emotion": "neutral"})
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, SpeechCache.INDICE)))
+
+        # Queda sem salvar(): os áudios já gravados voltam ao índice na carga
+        reaberto = SpeechCache(self.tmp.name, limite_bytes=10_000)
+        voz = self.synth.voice_id
+        self.assertIn(SpeechCache.chave("frase um", "", voz), reaberto)
+        self.assertEqual(reaberto.estatisticas()["entradas"], 2)
+        reaberto.salvar()
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, SpeechCache.INDICE)))
+
+    def test_despejo_lru_e_persistencia(self):
+        sintetizador, cache = self._sintetizador(limite_bytes=900)
+        meta = {"emotion": "neutral"}
+        for frase in ("frase um", "frase dois", "frase tres"):
+            sintetizador.synthesize_bytes(frase, meta)
+        sintetizador.synthesize_bytes("frase um", meta)      # 'um' volta a ser recente
+        sintetizador.synthesize_bytes("frase quatro", meta)  # estoura o limite
+        cache.salvar()
+
+        self.assertGreater(cache.estatisticas()["despejos"], 0)
+        self.assertLessEqual(cache.estatisticas()["bytes"], 900)
+
+        # Reabre do disco: 'frase um' sobreviveu, 'frase dois' (menos recente) saiu
+        reaberto = SpeechCache(self.tmp.name, limite_bytes=900)
+        voz = self.synth.voice_id
+        self.assertIn(SpeechCache.chave("frase um", "", voz), reaberto)
+        self.assertNotIn(SpeechCache.chave("frase dois", "", voz), reaberto)
+
+    def test_aquecimento(self):
+        sintetizador, _ = self._sintetizador()
+        itens = [("Sistemas online.", {"emotion": "neutral"}), ("Às suas ordens.", {"emotion": "neutral"})]
+        self.assertEqual(sintetizador.aquecer(itens), 2)
+        self.assertEqual(sintetizador.aquecer(itens), 0)
+
+        sintetizador.synthesize_bytes("Sistemas online.", {"emotion": "neutral"})
+        self.assertEqual(len(self.synth.chamadas), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+# tests/test_streaming_speech.py
+import sys
+import os
+import io
+import queue
+import tempfile
+import threading
+import time
+import unittest
+import wave
+import numpy as np
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.area_broca.speak import neuralSpeaker
+from jarvis_system.area_broca.speak.neuralSpeaker import NeuralSpeaker
+from jarvis_system.area_broca.speak.streamingSpeech import FalaEmTrechos, dividir_em_trechos
+from jarvis_system.cortex_frontal.event_bus import Evento
+from jarvis_system.protocol import Eventos
+
+class LogMudo:
+    def info(self, *a): pass
+    def error(self, *a): pass
+    def warning(self, *a): pass
+
+class SintetizadorDeTons:
+    """Substituto do Fish Audio: gera um WAV de tom (1 frequência por trecho) com atraso fixo."""
+    def __init__(self, atraso=0.1, falhar_em=()):
+        self.atraso = atraso
+        self.falhar_em = set(falhar_em)
+        self.fins = []
+
+    def synthesize_bytes(self, texto, metadata):
+        time.sleep(self.atraso)
+        indice = len(self.fins)
+        self.fins.append(time.perf_counter())
+        if indice in self.falhar_em:
+            return None
+        t = np.arange(1600) / 16000
+        pcm = (0.3 * np.sin(2 * np.pi * (300 + 100 * indice) * t) * 32767).astype(np.int16)
+        saida = io.BytesIO()
+        with wave.open(saida, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(pcm.tobytes())
+        return saida.getvalue()
+
+class MotorDeTeste:
+    """Substituto do AudioEngine: registra o que tocou e quando."""
+    def __init__(self, duracao=0.1):
+        self.duracao = duracao
+        self.tocados = []  # (inicio, fim, bytes | texto offline)
+
+    def play_bytes(self, audio, stop_event):
+        inicio = time.perf_counter()
+        time.sleep(self.duracao)
+        self.tocados.append((inicio, time.perf_counter(), audio))
+
+    def speak_offline(self, texto):
+        self.tocados.append((time.perf_counter(), time.perf_counter(), texto))
+
+class SintetizadorComEmocao(SintetizadorDeTons):
+    """Registra a emoção com que cada trecho foi pedido."""
+    def __init__(self):
+        super().__init__(atraso=0.02)
+        self.pedidos = []  # (texto, emoção)
+
+    def em_cache(self, textos, metadata):
+        return False
+
+    def synthesize_bytes(self, texto, metadata):
+        self.pedidos.append((texto, metadata.get("emotion")))
+        return super().synthesize_bytes(texto, metadata)
+
+class DiretorContador:
+    def __init__(self):
+        self.chamadas = []
+
+    def analisar_tom(self, texto):
+        self.chamadas.append(texto)
+        return "calm"
+
+class IndexadorFalso:
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+
+    def normalize_key(self, texto): return texto.lower()
+    def get_path(self, chave): return None, None
+    def determine_category(self, texto): return "INTERACAO"
+    def detect_context_temporal(self, texto): return "geral"
+    def detect_sub_context(self, texto, categoria): return "geral"
+    def generate_next_id(self, categoria): return "INT_001"
+    def save_entry(self, metadata): pass
+
+class FalaContada(FalaEmTrechos):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.chamadas = 0
+
+    def falar(self, trechos, metadata, stop_event):
+        self.chamadas += 1
+        return super().falar(trechos, metadata, stop_event)
+
+FRASES = "Claro, senhor. Vou verificar os sistemas agora mesmo. Os reatores estão estáveis. Mais alguma coisa?"
+
+class TestStreamingSpeech(unittest.TestCase):
+    def test_divide_em_frases_e_agrupa_curtas(self):
+        trechos = dividir_em_trechos(FRASES, min_chars=10, max_chars=80)
+        self.assertEqual(trechos, [
+            "Claro, senhor.",
+            "Vou verificar os sistemas agora mesmo.",
+            "Os reatores estão estáveis.",
+            "Mais alguma coisa?",
+        ])
+        self.assertEqual(dividir_em_trechos("Sim. Não. Talvez.", min_chars=10), ["Sim. Não. Talvez."])
+
+    def test_frase_longa_quebra_em_oracoes(self):
+        longa = "Analisei os registros de energia, cruzei com o histórico da semana, " \
+                "e não encontrei nenhuma anomalia relevante"
+        trechos = dividir_em_trechos(longa, min_chars=5, max_chars=50)
+        self.assertGreater(len(trechos), 1)
+        self.assertTrue(all(len(t) <= 50 for t in trechos))
+        self.assertEqual(" ".join(trechos), longa)
+
+    def test_sintetiza_o_proximo_enquanto_toca(self):
+        synth, motor = SintetizadorDeTons(atraso=0.1), MotorDeTeste(duracao=0.15)
+        trechos = dividir_em_trechos(FRASES, min_chars=10, max_chars=80)
+
+        audios = FalaEmTrechos(synth, motor, LogMudo()).falar(trechos, {}, threading.Event())
+
+        self.assertEqual(len(audios), 4)
+        self.assertEqual([t[2] for t in motor.tocados], audios)
+        # Primeiro áudio sai antes de a resposta inteira estar sintetizada
+        self.assertLess(motor.tocados[0][0], synth.fins[-1])
+        # O trecho 2 ficou pronto enquanto o trecho 1 tocava
+        self.assertLess(synth.fins[1], motor.tocados[0][1])
+
+    def test_falha_em_um_trecho_cai_para_offline(self):
+        synth, motor = SintetizadorDeTons(atraso=0.01, falhar_em={1}), MotorDeTeste(duracao=0.01)
+        trechos = ["Primeira frase falada.", "Segunda frase falada.", "Terceira frase falada."]
+
+        audios = FalaEmTrechos(synth, motor, LogMudo()).falar(trechos, {}, threading.Event())
+
+        self.assertIsNone(audios[1])
+        self.assertEqual(motor.tocados[1][2], "Segunda frase falada.")
+        self.assertIsInstance(motor.tocados[2][2], bytes)
+
+    def test_trechos_chegando_aos_poucos(self):
+        synth, motor = SintetizadorDeTons(atraso=0.01), MotorDeTeste(duracao=0.05)
+        gerado = []
+
+        def frases_do_llm():
+            for frase in ("Primeira frase falada.", "Segunda frase falada.", "Terceira frase falada."):
+                time.sleep(0.05)
+                gerado.append(time.perf_counter())
+                yield frase
+
+        audios = FalaEmTrechos(synth, motor, LogMudo()).falar(frases_do_llm(), {}, threading.Event())
+
+        self.assertEqual(len(audios), 3)
+        self.assertEqual([t[2] for t in motor.tocados], audios)
+        # A primeira frase já tocava enquanto o "LLM" ainda gerava a última
+        self.assertLess(motor.tocados[0][0], gerado[-1])
+
+class TestRespostaEmStreaming(unittest.TestCase):
+    """Frases de uma mesma resposta (FALAR com o mesmo 'resposta') viram uma fala só."""
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        falante = NeuralSpeaker.__new__(NeuralSpeaker)
+        falante.log = LogMudo()
+        falante._queue = queue.Queue()
+        falante._pendente = None
+        falante._stop_event = threading.Event()
+        falante.engine = MotorDeTeste(duracao=0.05)
+        falante.indexer = IndexadorFalso(self.tmp.name)
+        falante.synth = SintetizadorComEmocao()
+        falante.fala = FalaContada(falante.synth, falante.engine, LogMudo())
+        falante.voice_director = DiretorContador()
+        self.falante = falante
+
+    def tearDown(self):
+        self.falante._stop_event.set()
+        self.tmp.cleanup()
+
+    def _falar(self, dados):
+        self.falante._adicionar_a_fila(Evento(Eventos.FALAR, dados))
+
+    def test_emocao_da_primeira_frase_vale_para_a_resposta(self):
+        falante = self.falante
+        with mock.patch.object(neuralSpeaker, "TTS_STREAMING", True):
+            worker = threading.Thread(target=falante._worker, daemon=True)
+            worker.start()
+            self._falar({"texto": "Claro, senhor, vou verificar agora.", "resposta": "r1"})
+            time.sleep(0.05)
+            self._falar({"texto": "(shouting) Os reatores estão estáveis.", "resposta": "r1"})
+            time.sleep(0.05)
+            self._falar({"texto": "Mais alguma coisa, senhor?", "resposta": "r1"})
+            self._falar({"texto": "", "resposta": "r1", "fim": True})
+            self._falar({"texto": "Outra fala."})
+
+            prazo = time.monotonic() + 3.0
+            while len(falante.engine.tocados) < 4 and time.monotonic() < prazo:
+                time.sleep(0.02)
+            falante._stop_event.set()
+            worker.join(timeout=2.0)
+
+        self.assertEqual(len(falante.engine.tocados), 4)
+        # Diretor consultado uma vez por fala, não por frase
+        self.assertEqual(falante.voice_director.chamadas,
+                         ["Claro, senhor, vou verificar agora.", "Outra fala."])
+        self.assertEqual(falante.synth.pedidos[:3], [
+            ("Claro, senhor, vou verificar agora.", "calm"),
+            ("Os reatores estão estáveis.", "calm"),
+            ("Mais alguma coisa, senhor?", "calm"),
+        ])
+        self.assertEqual(falante.fala.chamadas, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+# tests/test_token_budget.py
+import sys
+import os
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.cortex_frontal.brain_llm import hybridBrain
+from jarvis_system.cortex_frontal.brain_llm.hybridBrain import HybridBrain
+from jarvis_system.cortex_frontal.brain_llm.tokenBudget import OrcamentoTokens, estimar_tokens, cortar_pontas
+
+class ProvedorEco:
+    """Guarda o último prompt recebido."""
+    def __init__(self):
+        self.prompts = []
+
+    def generate(self, system_prompt, user_prompt):
+        self.prompts.append((system_prompt, user_prompt))
+        return "ok"
+
+class TestOrcamentoTokens(unittest.TestCase):
+    def test_memoria_fica_com_a_sobra_e_perde_as_menos_relevantes(self):
+        orcamento = OrcamentoTokens(total=100, teto_catalogo=40, teto_usuario=20, teto_memoria=100)
+        sistema = "x" * 140  # 40 tokens
+        memorias = "\n".join(f"- lembrança número {i} bem detalhada" for i in range(10))
+
+        memoria, usuario, uso = orcamento.ajustar(sistema, "", memorias, "oi jarvis")
+
+        self.assertTrue(memoria.startswith("- lembrança número 0"))
+        self.assertNotIn("número 9", memoria)
+        self.assertLessEqual(uso.total, 100)
+        self.assertTrue(any(c.startswith("memoria") for c in uso.cortes))
+
+    def test_catalogo_cortado_sempre_igual(self):
+        orcamento = OrcamentoTokens(teto_catalogo=20)
+        catalogo = "\n".join(f"- Ferramenta: 'f{i}' | Uso: faz a coisa {i}" for i in range(10))
+
+        primeiro = orcamento.cortar_catalogo(catalogo)
+        self.assertIs(orcamento.cortar_catalogo(catalogo), primeiro)
+        self.assertLessEqual(estimar_tokens(primeiro), 20)
+        self.assertTrue(primeiro.startswith("- Ferramenta: 'f0'"))
+
+    def test_fala_longa_mantem_comeco_e_fim(self):
+        texto = "jarvis " + "blá " * 500 + "toca coldplay"
+        cortado = cortar_pontas(texto, 30)
+        self.assertLessEqual(estimar_tokens(cortado), 30)
+        self.assertTrue(cortado.startswith("jarvis") and cortado.endswith("coldplay"))
+
+class TestHybridBrainOrcamento(unittest.TestCase):
+    def test_prompt_respeita_o_orcamento(self):
+        memoria_falsa = mock.Mock()
+        memoria_falsa.relembrar.return_value = "\n".join(f"- fato antigo {i} " + "detalhe " * 30 for i in range(50))
+        nuvem = ProvedorEco()
+
+        with mock.patch.object(hybridBrain, "memoria", memoria_falsa), mock.patch.object(hybridBrain, "registry", None):
+            cerebro = HybridBrain(cloud=nuvem, local=ProvedorEco(), hedge=False)
+            cerebro.orcamento = OrcamentoTokens(total=1500)
+            cerebro.pensar("me conte algo")
+
+        sistema, usuario = nuvem.prompts[0]
+        self.assertLessEqual(estimar_tokens(sistema) + estimar_tokens(usuario), 1500 + 10)
+        self.assertIn("fato antigo 0", usuario)
+        self.assertNotIn("fato antigo 49", usuario)
+
+if __name__ == "__main__":
+    unittest.main()
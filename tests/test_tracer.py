@@ -0,0 +1,69 @@
+# tests/test_tracer.py
+import sys
+import os
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.cortex_frontal.observability import JarvisTracer
+from jarvis_system.cortex_frontal.event_bus.eventBus import EventBus
+from jarvis_system.cortex_frontal.event_bus.model import Evento
+
+class TestJarvisTracer(unittest.TestCase):
+    def setUp(self):
+        self.tracer = JarvisTracer(max_traces=5)
+
+    def test_spans_e_marcos_sao_consultaveis(self):
+        trace_id = self.tracer.start_trace("voz")
+        self.tracer.mark("vad_fim", trace_id)
+        with self.tracer.span("stt", trace_id):
+            time.sleep(0.01)
+
+        trace = self.tracer.get(trace_id)
+        self.assertEqual(trace["origem"], "voz")
+        self.assertIn("vad_fim", trace["marcos"])
+        self.assertEqual(trace["spans"][0]["etapa"], "stt")
+        self.assertGreaterEqual(trace["spans"][0]["duracao_ms"], 10)
+
+    def test_trace_atual_viaja_pelo_barramento(self):
+        bus = EventBus()
+        trace_id = self.tracer.start_trace("voz")
+
+        def orquestrador(evento):
+            with self.tracer.activate(evento.dados.get(JarvisTracer.TRACE_KEY)):
+                with self.tracer.span("llm"):
+                    pass
+                self.tracer.mark("primeiro_audio", once=True)
+                self.tracer.mark("primeiro_audio", once=True)
+
+        bus.inscrever("fala", orquestrador)
+        bus.publicar(Evento("fala", {"texto": "oi", JarvisTracer.TRACE_KEY: trace_id}))
+
+        trace = self.tracer.get(trace_id)
+        self.assertEqual([s["etapa"] for s in trace["spans"]], ["llm"])
+        self.assertEqual(len(trace["marcos"]), 1)
+        self.assertIsNone(self.tracer.current())
+
+    def test_sem_trace_ativo_nada_e_registrado(self):
+        with self.tracer.span("rag"):
+            pass
+        self.tracer.mark("primeiro_audio")
+        self.assertEqual(self.tracer.recent(), [])
+
+    def test_historico_limitado(self):
+        ids = [self.tracer.start_trace("voz") for _ in range(8)]
+        recentes = self.tracer.recent(limit=10)
+        self.assertEqual(len(recentes), 5)
+        self.assertEqual(recentes[0]["trace_id"], ids[-1])
+        self.assertIsNone(self.tracer.get(ids[0]))
+
+    def test_limite_zero_ou_negativo_nao_devolve_tudo(self):
+        for _ in range(3):
+            self.tracer.start_trace("voz")
+        self.assertEqual(self.tracer.recent(limit=0), [])
+        self.assertEqual(self.tracer.recent(limit=-2), [])
+        self.assertEqual(len(self.tracer.recent(limit=1)), 1)
+
+if __name__ == "__main__":
+    unittest.main()
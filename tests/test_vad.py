@@ -0,0 +1,101 @@
+# tests/test_vad.py
+import sys
+import os
+import tempfile
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.area_broca.listen.audioUtils import gravar_wav, ler_wav
+from jarvis_system.area_broca.listen.benchmarkAudio import avaliar_vad, SEGMENTADORES
+from jarvis_system.area_broca.listen.detectorVoz import DetectorEspectral, criar_detector
+from jarvis_system.area_broca.listen.pipelineAuditivo import (
+    SegmentadorVAD, SILENCIO, INICIO_FALA, FIM_FALA, DESCARTADO
+)
+
+SR = 16000
+BLOCO = 4000
+rng = np.random.default_rng(7)
+
+def voz(segundos, f0=140):
+    """Vogal sintética: harmônicos moldados por dois formantes, sílabas a ~5 Hz."""
+    t = np.arange(int(segundos * SR)) / SR
+    sinal = sum(
+        (np.exp(-((f0 * k - 500) / 300) ** 2) + 0.5 * np.exp(-((f0 * k - 1500) / 400) ** 2) + 0.2 / k)
+        * np.sin(2 * np.pi * f0 * k * t)
+        for k in range(1, 25)
+    )
+    return (0.15 * sinal / np.max(np.abs(sinal)) * np.abs(np.sin(2 * np.pi * 2.5 * t)) ** 0.5).astype(np.float32)
+
+def ventilador(segundos, rms=0.008):
+    """Chiado branco + ronco grave: o que um ventilador/ar-condicionado joga no microfone."""
+    n = int(segundos * SR)
+    ronco = np.cumsum(rng.standard_normal(n))
+    ronco -= np.convolve(ronco, np.ones(400) / 400, "same")
+    return (rng.standard_normal(n) * rms * 0.6 + ronco / np.std(ronco) * rms).astype(np.float32)
+
+class TestVAD(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _fixture(self, nome, audio):
+        caminho = os.path.join(self.tmp.name, nome)
+        gravar_wav(caminho, audio, SR)
+        return ler_wav(caminho, SR)
+
+    def test_ruido_de_fundo_nao_dispara_o_espectral(self):
+        sala = self._fixture("ventilador.wav", ventilador(8.0))
+        legado = avaliar_vad(sala, [], SEGMENTADORES["legado"]())
+        espectral = avaliar_vad(sala, [], SEGMENTADORES["espectral"]())
+        self.assertGreaterEqual(legado["falsos_disparos"], 1)
+        self.assertEqual(espectral["falsos_disparos"], 0)
+
+    def test_fim_de_fala_mais_rapido_e_fala_com_ruido_detectada(self):
+        audio = ventilador(8.0)
+        audio[SR:SR + int(1.6 * SR)] += voz(1.6)
+        audio[5 * SR:5 * SR + int(0.8 * SR)] += voz(0.8)
+        sala = self._fixture("comandos.wav", audio)
+        trechos = [(1.0, 2.6), (5.0, 5.8)]
+
+        resultado = avaliar_vad(sala, trechos, SEGMENTADORES["espectral"]())
+        self.assertEqual((resultado["falsos_disparos"], resultado["fala_perdida"]), (0, 0))
+        self.assertLess(resultado["atraso_fim_max_ms"], 1100)
+
+        limpo = self._fixture("limpo.wav", np.concatenate([np.zeros(SR // 2), voz(1.2), np.zeros(3 * SR)]))
+        legado = avaliar_vad(limpo, [(0.5, 1.7)], SEGMENTADORES["legado"]())
+        espectral = avaliar_vad(limpo, [(0.5, 1.7)], SEGMENTADORES["espectral"]())
+        self.assertLess(espectral["atraso_fim_medio_ms"], legado["atraso_fim_medio_ms"] - 500)
+
+    def test_pre_roll_e_estalo_descartado(self):
+        segmentador = SegmentadorVAD(detector=DetectorEspectral(), blocos_pausa_fim=None, pre_roll_s=0.5)
+        pcm = lambda x: (np.clip(x, -1, 1) * 32767).astype(np.int16).reshape(-1, 1)
+        silencio = np.zeros(BLOCO, dtype=np.float32)
+
+        estados = [segmentador.processar(pcm(silencio))[2] for _ in range(3)]
+        estados.append(segmentador.processar(pcm(voz(0.25)))[2])
+        self.assertEqual(estados, [SILENCIO, SILENCIO, SILENCIO, INICIO_FALA])
+        self.assertEqual(len(segmentador.pre_fala), 2)
+
+        estalo = silencio.copy()
+        estalo[:1200] = voz(0.075)
+        segmentador.reset()
+        estados = [segmentador.processar(pcm(b))[2] for b in [estalo] + [silencio] * 6]
+        self.assertIn(DESCARTADO, estados)
+        self.assertNotIn(FIM_FALA, estados)
+
+    def test_pausa_adaptativa_aprende_o_ritmo(self):
+        segmentador = SegmentadorVAD(detector=DetectorEspectral(), blocos_pausa_fim=None)
+        inicial = segmentador.pausa_fim_s
+        pcm = lambda x: (x * 32767).astype(np.int16).reshape(-1, 1)
+        fala, pausa = voz(0.25), np.zeros(BLOCO, dtype=np.float32)
+        for bloco in [fala, pausa, pausa, fala, pausa, pausa, fala]:
+            segmentador.processar(pcm(bloco))
+        self.assertGreater(segmentador.pausa_fim_s, inicial)
+
+    def test_backend_desconhecido_cai_no_espectral(self):
+        self.assertIsInstance(criar_detector("inexistente"), DetectorEspectral)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+# tests/test_wake_word.py
+import sys
+import os
+import tempfile
+import unittest
+import numpy as np
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.area_broca.listen.audioUtils import gravar_wav, ler_wav
+from jarvis_system.area_broca.listen.benchmarkAudio import avaliar_kws
+from jarvis_system.area_broca.listen.espiaoPalavra import EspiaoModelos, EspiaoWhisper, criar_espiao
+from jarvis_system.area_broca.listen.pipelineAuditivo import (
+    EstagioSTT, MSG_INICIO, MSG_AUDIO, MSG_FIM, RES_FINAL, RES_IGNORADO
+)
+
+SR = 16000
+BLOCO = 4000
+rng = np.random.default_rng(3)
+
+# Formantes (F1, F2) das vogais sintéticas
+VOGAIS = {"a": (750, 1250), "i": (300, 2300), "u": (320, 800), "e": (450, 1900), "o": (500, 900)}
+
+def palavra(vogais, duracao=0.16, f0=130):
+    """'Palavra' sintética: sequência de vogais com formantes próprios (o que o MFCC enxerga)."""
+    partes = []
+    for v in vogais:
+        f1, f2 = VOGAIS[v]
+        t = np.arange(int(duracao * SR)) / SR
+        sinal = sum(
+            (np.exp(-((f0 * k - f1) / 120) ** 2) + 0.6 * np.exp(-((f0 * k - f2) / 180) ** 2) + 0.02)
+            * np.sin(2 * np.pi * f0 * k * t)
+            for k in range(1, 28)
+        )
+        partes.append(sinal / np.max(np.abs(sinal)) * np.hanning(len(t)) ** 0.3)
+    return (0.2 * np.concatenate(partes)).astype(np.float32)
+
+def frase(*trechos, silencio=0.3):
+    pausa = np.zeros(int(silencio * SR), dtype=np.float32)
+    audio = np.concatenate([pausa] + [np.concatenate([t, pausa]) for t in trechos])
+    return (audio + rng.standard_normal(len(audio)).astype(np.float32) * 0.003).astype(np.float32)
+
+JARVIS = "aiu"
+
+class TranscritorContador:
+    def __init__(self):
+        self.chamadas = 0
+
+    def transcribe(self, buffer):
+        self.chamadas += 1
+        return "jarvis que horas são"
+
+class TestEspiaoModelos(unittest.TestCase):
+    def setUp(self):
+        self.espiao = EspiaoModelos([palavra(JARVIS, f0=120), palavra(JARVIS, duracao=0.2, f0=140)])
+
+    def test_reconhece_a_wake_word_no_comeco_da_frase(self):
+        # Outra voz (f0), outro ritmo, seguida do comando
+        self.assertTrue(self.espiao.detectar(frase(palavra(JARVIS, duracao=0.18, f0=125), palavra("eoa"))))
+        self.assertTrue(self.espiao.detectar(frase(palavra("o", duracao=0.2), palavra(JARVIS, f0=135))))
+
+    def test_rejeita_conversa_de_fundo(self):
+        for vogais in ["eoa", "uia", "oee", "aaa"]:
+            self.assertFalse(self.espiao.detectar(frase(palavra(vogais), palavra("oie"))), vogais)
+
+    def test_benchmark_com_gravacoes(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            def clip(nome, audio):
+                caminho = os.path.join(pasta, nome)
+                gravar_wav(caminho, audio, SR)
+                return ler_wav(caminho, SR)
+
+            gravar_wav(os.path.join(pasta, "modelo.wav"), palavra(JARVIS), SR)
+            espiao = EspiaoModelos.da_pasta(pasta)
+            com = [clip(f"com{i}.wav", frase(palavra(JARVIS, f0=f0), palavra("eoa"))) for i, f0 in enumerate([118, 142])]
+            sem = [clip(f"sem{i}.wav", frase(palavra(v), palavra("oie"))) for i, v in enumerate(["eoa", "uia", "oee"])]
+
+        resultado = avaliar_kws(espiao, com, sem)
+        self.assertEqual(resultado["recall"], 1.0)
+        self.assertEqual(resultado["aceitas_sem_wake"], 0)
+        self.assertEqual(resultado["economia_audio"], 1.0)
+
+class TestPortaoSTT(unittest.TestCase):
+    def _frase(self, estagio, audio, atento=False):
+        estagio.processar((MSG_INICIO, atento))
+        for i in range(0, len(audio), BLOCO):
+            estagio.processar((MSG_AUDIO, audio[i:i + BLOCO]))
+        return estagio.processar((MSG_FIM, "trace"))
+
+    def test_conversa_sem_wake_word_nunca_chega_ao_whisper(self):
+        decoder = TranscritorContador()
+        estagio = EstagioSTT(decoder, espiao=EspiaoModelos([palavra(JARVIS)]))
+
+        fundo = frase(palavra("eoa"), palavra("oie"), palavra("uia"), palavra("eea"))
+        self.assertEqual(self._frase(estagio, fundo)[0], RES_IGNORADO)
+        self.assertEqual(decoder.chamadas, 0)
+
+        comando = frase(palavra(JARVIS, f0=128), palavra("eoa"), palavra("oie"), palavra("uia"), palavra("aoe"))
+        resultado = self._frase(estagio, comando)
+        self.assertEqual(resultado[0], RES_FINAL)
+        self.assertEqual(decoder.chamadas, 1)
+
+        # Janela de atenção aberta: decodifica sem perguntar ao espião
+        self.assertEqual(self._frase(estagio, fundo, atento=True)[0], RES_FINAL)
+        self.assertEqual(decoder.chamadas, 2)
+
+    def test_audio_retido_pelo_espiao_e_decodificado_inteiro(self):
+        recebido = []
+        decoder = TranscritorContador()
+        decoder.transcribe = lambda buffer: recebido.append(buffer.copy()) or "ok"
+        espiao = EspiaoModelos([palavra(JARVIS)], janela_s=1.0)
+        estagio = EstagioSTT(decoder, espiao=espiao)
+
+        comando = frase(palavra(JARVIS), palavra("eoa"), palavra("oie"))
+        self._frase(estagio, comando)
+        np.testing.assert_array_equal(recebido[0], comando)
+
+    def test_frase_curta_com_streaming_e_decodificada(self):
+        class Decoder(TranscritorContador):
+            def transcribe_words(self, audio, beam_size=1, initial_prompt=None):
+                return []
+
+        decoder = Decoder()
+        estagio = EstagioSTT(decoder, streaming=True, espiao=EspiaoModelos([palavra(JARVIS)]))
+
+        # "Jarvis, pausa": mais curta que a janela do espião, o portão só abre no fim da frase
+        comando = frase(palavra(JARVIS, f0=128), palavra("ao"))
+        self.assertLess(len(comando), estagio.espiao.janela_amostras)
+        resultado = self._frase(estagio, comando)
+        self.assertEqual(resultado[:2], (RES_FINAL, "jarvis que horas são"))
+        self.assertEqual(decoder.chamadas, 1)
+
+    def test_espiao_whisper_so_decodifica_a_janela(self):
+        class Decoder:
+            def transcribe_words(self, audio, beam_size=1):
+                self.amostras, self.beam = len(audio), beam_size
+                return [("Jarbas,", 0.0, 0.4), ("toca", 0.5, 0.8)]
+
+        decoder = Decoder()
+        espiao = criar_espiao("whisper", decoder)
+        self.assertIsInstance(espiao, EspiaoWhisper)
+        self.assertTrue(espiao.detectar(np.zeros(10 * SR, dtype=np.float32)))
+        self.assertEqual((decoder.amostras, decoder.beam), (espiao.janela_amostras, 1))
+
+        self.assertIsNone(criar_espiao("whisper", TranscritorContador()))
+
+    def test_auto_sem_gravacoes_desliga_o_portao(self):
+        class Decoder:
+            def transcribe_words(self, audio, beam_size=1):
+                return []
+
+        with mock.patch.object(EspiaoModelos, "da_pasta", side_effect=ValueError("sem gravações")):
+            self.assertIsNone(criar_espiao("auto", Decoder()))
+            self.assertIsInstance(criar_espiao("whisper", Decoder()), EspiaoWhisper)
+
+    def test_espiao_usa_as_wake_words_do_attention_system(self):
+        from jarvis_system.protocol import WAKE_WORDS
+        espiao = EspiaoWhisper(TranscritorContador())
+        self.assertEqual(espiao.palavras, WAKE_WORDS)
+
+if __name__ == "__main__":
+    unittest.main()
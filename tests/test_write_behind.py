@@ -0,0 +1,72 @@
+# tests/test_write_behind.py
+import sys
+import os
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jarvis_system.hipocampo.memoria.writeBehind import BufferEscrita
+from tests.hipocampoFalso import ColecaoFalsa, criar_memoria
+
+class TestBufferEscrita(unittest.TestCase):
+    def test_enfileirar_nao_bloqueia_e_descarrega_em_lote(self):
+        colecao = ColecaoFalsa(atraso=0.3)
+        buffer = BufferEscrita(lambda: colecao, lote_max=100, intervalo_s=60)
+
+        inicio = time.monotonic()
+        for i in range(5):
+            buffer.enfileirar(f"id{i}", f"fato {i}", {})
+        self.assertLess(time.monotonic() - inicio, 0.05)
+        self.assertEqual(colecao.upserts, [])
+
+        self.assertTrue(buffer.descarregar())
+        self.assertEqual(colecao.upserts, [["id0", "id1", "id2", "id3", "id4"]])
+        buffer.parar()
+
+    def test_lote_cheio_grava_sozinho(self):
+        colecao = ColecaoFalsa()
+        buffer = BufferEscrita(lambda: colecao, lote_max=3, intervalo_s=60)
+        for i in range(3):
+            buffer.enfileirar(f"id{i}", "doc", {})
+
+        prazo = time.monotonic() + 2.0
+        while not colecao.upserts and time.monotonic() < prazo:
+            time.sleep(0.01)
+        self.assertEqual(colecao.upserts, [["id0", "id1", "id2"]])
+        buffer.parar()
+
+    def test_falha_mantem_no_buffer_e_mesmo_id_coalesce(self):
+        colecao = ColecaoFalsa(falhas=1)
+        buffer = BufferEscrita(lambda: colecao, lote_max=100, intervalo_s=60)
+        buffer.enfileirar("a", "versão 1", {})
+        self.assertFalse(buffer.descarregar())
+
+        buffer.enfileirar("a", "versão 2", {})
+        self.assertTrue(buffer.descarregar())
+        self.assertEqual(colecao.docs, {"a": "versão 2"})
+        self.assertEqual(buffer.estatisticas()["falhas"], 1)
+        buffer.parar()
+
+    def test_enfileirar_depois_de_parar_grava_na_hora(self):
+        colecao = ColecaoFalsa()
+        buffer = BufferEscrita(lambda: colecao, lote_max=100, intervalo_s=60)
+        buffer.enfileirar("a", "antes", {})
+        buffer.parar()
+        self.assertEqual(colecao.upserts, [["a"]])
+
+        buffer.enfileirar("b", "depois", {})
+        self.assertEqual(colecao.upserts, [["a"], ["b"]])
+        self.assertEqual(buffer.pendentes, 0)
+
+class TestMemoriaHipocampoEscrita(unittest.TestCase):
+    def test_relembrar_enxerga_o_que_acabou_de_ser_gravado(self):
+        colecao = ColecaoFalsa()
+        memoria = criar_memoria(self, colecao, escrita_atrasada=True, busca_hibrida=False)
+        memoria.memorizar("meu time é o Palmeiras")
+        self.assertEqual(colecao.upserts, [])
+
+        self.assertIn("Palmeiras", memoria.relembrar("Palmeiras"))
+
+if __name__ == "__main__":
+    unittest.main()